@@ -5,13 +5,13 @@ import os
 # Agregar el directorio raíz al path para importaciones
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from vistas.login_view import LoginView
-from vistas.dashboard_view import DashboardView
-from vistas.reservas_view import ReservasView
-from vistas.pagos_view import PagosView
-from vistas.validacion_view import mostrar_vista_validacion
-from logica_negocio.auth_manager import AuthManager
-from capa_datos.database_connection import get_db_connection
+from utils.pestanas_diferidas import PestanasDiferidas
+from utils.almacen_resultados import datos_vencidos, reiniciar_datos_vencidos
+from vistas.notificador_streamlit import instalar_notificador_streamlit
+from config.settings import obtener_configuracion
+
+# Las vistas se importan dentro de la función que las muestra: así la página
+# de login no carga pandas ni la lógica de las demás secciones
 
 # Configuración de la página
 st.set_page_config(
@@ -67,6 +67,9 @@ st.markdown("""
 def main():
     """Función principal de la aplicación"""
     
+    # Los mensajes de capa_datos y logica_negocio se muestran en la página
+    instalar_notificador_streamlit()
+    
     # Inicializar session state
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = False
@@ -89,17 +92,41 @@ def main():
     if 'current_page' not in st.session_state:
         st.session_state.current_page = "dashboard"
     
+    # Grabar las consultas para reproducirlas sin base de datos (capa_datos/grabacion.py)
+    ruta_grabacion = obtener_configuracion().texto('DB_GRABAR_SESION')
+    if ruta_grabacion:
+        from capa_datos.grabacion import activar_grabacion_sesion
+        activar_grabacion_sesion(ruta_grabacion)
+    
     # Header principal
     st.markdown('<h1 class="main-header">🏟️ Reservas de Canchas Deportivas</h1>', unsafe_allow_html=True)
     
+    # Lugar del aviso de datos guardados (se completa al final, cuando se sabe)
+    aviso_datos = st.empty()
+    reiniciar_datos_vencidos()
+    
     # Verificar autenticación
     if not st.session_state.authenticated:
         show_login()
     else:
         show_authenticated_content()
+    
+    show_aviso_datos_vencidos(aviso_datos)
+
+def show_aviso_datos_vencidos(aviso):
+    """Avisar si la página usó resultados guardados porque la base no respondió"""
+    vencidos = datos_vencidos()
+    if not vencidos:
+        return
+    minutos = max(vencidos.values()) / 60
+    aviso.warning(
+        f"⚠️ La base de datos no responde: se muestran datos guardados hace hasta {minutos:.0f} min. "
+        "Las modificaciones están deshabilitadas hasta que se recupere."
+    )
 
 def show_login():
     """Mostrar la vista de login"""
+    from vistas.login_view import LoginView
     login_view = LoginView()
     login_view.show()
     
@@ -156,16 +183,19 @@ def show_authenticated_content():
 
 def show_dashboard():
     """Mostrar el dashboard usando la vista correspondiente"""
+    from vistas.dashboard_view import DashboardView
     dashboard_view = DashboardView()
     dashboard_view.show()
 
 def show_reservas():
     """Mostrar la vista de reservas"""
+    from vistas.reservas_view import ReservasView
     reservas_view = ReservasView()
     reservas_view.show()
 
 def show_pagos():
     """Mostrar la vista de pagos"""
+    from vistas.pagos_view import PagosView
     pagos_view = PagosView()
     pagos_view.show()
 
@@ -173,23 +203,29 @@ def show_reportes():
     """Mostrar la vista de reportes"""
     st.markdown("## 📊 Reportes y Auditoría")
     
-    # Pestañas para diferentes tipos de reportes
-    tab1, tab2 = st.tabs(["📋 Auditoría del Sistema", "📈 Reportes Generales"])
-    
-    with tab1:
-        # Importar y mostrar la vista de auditoría
-        from vistas.auditoria_view import AuditoriaView
-        auditoria_view = AuditoriaView()
-        auditoria_view.show()
-    
-    with tab2:
-        # Importar y mostrar la vista de reportes generales
-        from vistas.reportes_generales_view import ReportesGeneralesView
-        reportes_view = ReportesGeneralesView()
-        reportes_view.show()
+    # Pestañas para diferentes tipos de reportes (solo se ejecuta la activa)
+    pestanas = PestanasDiferidas("reportes")
+    pestanas.agregar("📋 Auditoría del Sistema", show_auditoria)
+    pestanas.agregar("📈 Reportes Generales", show_reportes_generales)
+    pestanas.mostrar()
+
+def show_auditoria():
+    """Mostrar la vista de auditoría"""
+    # Importar y mostrar la vista de auditoría
+    from vistas.auditoria_view import AuditoriaView
+    auditoria_view = AuditoriaView()
+    auditoria_view.show()
+
+def show_reportes_generales():
+    """Mostrar la vista de reportes generales"""
+    # Importar y mostrar la vista de reportes generales
+    from vistas.reportes_generales_view import ReportesGeneralesView
+    reportes_view = ReportesGeneralesView()
+    reportes_view.show()
 
 def show_validacion():
     """Muestra la vista de validación y limpieza de datos"""
+    from vistas.validacion_view import mostrar_vista_validacion
     mostrar_vista_validacion()
 
 if __name__ == "__main__":
@@ -2,8 +2,8 @@
 Capa de datos para la tabla auditoria
 """
 import psycopg2
-import streamlit as st
-from capa_datos.data_access import execute_query, execute_query_dict, call_procedure
+from capa_datos import notificaciones
+from capa_datos.data_access import execute_query, execute_query_dict, iter_query_dict, call_procedure
 from capa_datos.database_connection import get_db_connection
 
 def registrar_accion_auditoria(conn, usuario_id, tipo_accion, tabla, registro_id, detalles, ip_address='127.0.0.1'):
@@ -39,12 +39,12 @@ def registrar_accion_auditoria(conn, usuario_id, tipo_accion, tabla, registro_id
         )
         
         if not success:
-            st.warning("⚠️ No se pudo registrar la acción en auditoría")
+            notificaciones.advertencia("⚠️ No se pudo registrar la acción en auditoría")
         
         return success
-        
+    
     except Exception as e:
-        st.error(f"Error al registrar auditoría: {e}")
+        notificaciones.error(f"Error al registrar auditoría: {e}")
         return False
 
 def get_auditoria_db():
@@ -58,7 +58,7 @@ def get_auditoria_db():
         conn = get_db_connection()
         if not conn:
             return []
-            
+        
         query = """
         SELECT 
             a.id,
@@ -79,9 +79,44 @@ def get_auditoria_db():
         conn.close()
         return result
     except Exception as e:
-        st.error(f"Error al obtener auditoría: {e}")
+        notificaciones.error(f"Error al obtener auditoría: {e}")
         return []
 
+def iter_auditoria_db(conn, fecha_inicio=None, fecha_fin=None, itersize=None, cancelar=None):
+    """
+    Recorre los registros de auditoría sin traerlos todos a memoria
+    
+    Args:
+        conn: Conexión a la base de datos
+        fecha_inicio (date): Fecha de inicio (opcional)
+        fecha_fin (date): Fecha de fin (opcional)
+        itersize (int): Filas por bloque (ver iter_query)
+        cancelar (threading.Event): Corta la iteración (ver iter_query)
+    
+    Yields:
+        Fila: Registros de auditoría del más reciente al más antiguo
+    """
+    query = """
+    SELECT 
+        a.id,
+        a.usuario_id,
+        u.nombre as usuario_nombre,
+        a.tipo_accion,
+        a.tabla,
+        a.registro_id,
+        a.detalles,
+        a.resultado,
+        a.ip_address,
+        a.fecha_hora
+    FROM auditoria a
+    LEFT JOIN usuarios u ON a.usuario_id = u.id
+    WHERE (%s::date IS NULL OR a.fecha_hora >= %s::date)
+    AND (%s::date IS NULL OR a.fecha_hora < %s::date + 1)
+    ORDER BY a.fecha_hora DESC
+    """
+    params = (fecha_inicio, fecha_inicio, fecha_fin, fecha_fin)
+    return iter_query_dict(conn, query, params, itersize=itersize, cancelar=cancelar)
+
 def get_auditoria_por_fecha_db(fecha_inicio, fecha_fin):
     """
     Obtiene registros de auditoría por rango de fechas
@@ -97,7 +132,7 @@ def get_auditoria_por_fecha_db(fecha_inicio, fecha_fin):
         conn = get_db_connection()
         if not conn:
             return []
-            
+        
         query = """
         SELECT 
             a.id,
@@ -119,7 +154,7 @@ def get_auditoria_por_fecha_db(fecha_inicio, fecha_fin):
         conn.close()
         return result
     except Exception as e:
-        st.error(f"Error al obtener auditoría por fecha: {e}")
+        notificaciones.error(f"Error al obtener auditoría por fecha: {e}")
         return []
 
 def get_auditoria_por_usuario_db(usuario_id):
@@ -136,7 +171,7 @@ def get_auditoria_por_usuario_db(usuario_id):
         conn = get_db_connection()
         if not conn:
             return []
-            
+        
         query = """
         SELECT 
             a.id,
@@ -158,7 +193,7 @@ def get_auditoria_por_usuario_db(usuario_id):
         conn.close()
         return result
     except Exception as e:
-        st.error(f"Error al obtener auditoría por usuario: {e}")
+        notificaciones.error(f"Error al obtener auditoría por usuario: {e}")
         return []
 
 def get_auditoria_por_tabla_db(tabla):
@@ -175,7 +210,7 @@ def get_auditoria_por_tabla_db(tabla):
         conn = get_db_connection()
         if not conn:
             return []
-            
+        
         query = """
         SELECT 
             a.id,
@@ -197,7 +232,7 @@ def get_auditoria_por_tabla_db(tabla):
         conn.close()
         return result
     except Exception as e:
-        st.error(f"Error al obtener auditoría por tabla: {e}")
+        notificaciones.error(f"Error al obtener auditoría por tabla: {e}")
         return []
 
 def get_auditoria_por_tipo_accion_db(tipo_accion):
@@ -214,7 +249,7 @@ def get_auditoria_por_tipo_accion_db(tipo_accion):
         conn = get_db_connection()
         if not conn:
             return []
-            
+        
         query = """
         SELECT 
             a.id,
@@ -236,7 +271,7 @@ def get_auditoria_por_tipo_accion_db(tipo_accion):
         conn.close()
         return result
     except Exception as e:
-        st.error(f"Error al obtener auditoría por tipo de acción: {e}")
+        notificaciones.error(f"Error al obtener auditoría por tipo de acción: {e}")
         return []
 
 def get_estadisticas_auditoria_db():
@@ -311,7 +346,7 @@ def get_estadisticas_auditoria_db():
             'dias': dias
         }
     except Exception as e:
-        st.error(f"Error al obtener estadísticas de auditoría: {e}")
+        notificaciones.error(f"Error al obtener estadísticas de auditoría: {e}")
         return {
             'total': 0,
             'acciones': [],
@@ -1,6 +1,56 @@
 import psycopg2
-import streamlit as st
-from psycopg2.extras import RealDictCursor
+from capa_datos import notificaciones
+import itertools
+import threading
+import contextlib
+from capa_datos.filas import CursorFilas
+from capa_datos.database_connection import SinConexion
+from capa_datos.unidad_trabajo import en_unidad_de_trabajo, terminar_lectura
+from capa_datos.reintentos import ejecutar_con_reintentos
+from config.settings import obtener_configuracion
+
+# Contexto por hilo: si está activo, las consultas relanzan los errores en lugar
+# de mostrarlos y retornar un valor vacío (lo usa la ejecución concurrente)
+_contexto_errores = threading.local()
+
+@contextlib.contextmanager
+def propagar_errores():
+    """
+    Hace que execute_query y execute_query_dict relancen los errores dentro del
+    bloque, para que quien ejecuta en otro hilo pueda detectarlos. La falta de
+    conexión se relanza como SinConexion.
+    """
+    anterior = getattr(_contexto_errores, 'activo', False)
+    _contexto_errores.activo = True
+    try:
+        yield
+    finally:
+        _contexto_errores.activo = anterior
+
+def _propagando_errores():
+    """
+    Indica si el hilo actual está dentro de propagar_errores().
+    """
+    return getattr(_contexto_errores, 'activo', False)
+
+def _sin_conexion():
+    """
+    Informa que no hay conexión; dentro de propagar_errores() lanza SinConexion.
+    """
+    if _propagando_errores():
+        raise SinConexion("No hay conexión a la base de datos")
+    notificaciones.error("❌ Error: No hay conexión a la base de datos")
+
+def _relanzar_errores(conn):
+    """
+    Indica si los errores de una consulta sobre conn deben relanzarse: dentro
+    de propagar_errores() y dentro de una unidad de trabajo (unidad_trabajo.py),
+    que decide el commit o rollback.
+    """
+    return _propagando_errores() or en_unidad_de_trabajo(conn)
+
+# Nombres únicos para los cursores del servidor de iter_query
+_cursores = itertools.count(1)
 
 def reset_transaction(conn):
     """
@@ -45,33 +95,46 @@ def execute_query(conn, sql, params=None, fetch=True):
     try:
         # Verificar que la conexión existe
         if conn is None:
-            st.error("❌ Error: No hay conexión a la base de datos")
+            _sin_conexion()
             return None
         
-        # Verificar si la transacción está abortada y reiniciarla
-        if hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
+        # Verificar si la transacción está abortada y reiniciarla (dentro de una
+        # unidad de trabajo la transacción es de la unidad)
+        if not en_unidad_de_trabajo(conn) and hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
             reset_transaction(conn)
         
         with conn.cursor() as cur:
             cur.execute(sql, params)
             if fetch:
-                return cur.fetchall()
+                filas = cur.fetchall()
             else:
-                conn.commit()
+                if not en_unidad_de_trabajo(conn):
+                    conn.commit()
                 return cur.rowcount
+        # No dejar la conexión "idle in transaction" después del SELECT
+        terminar_lectura(conn)
+        return filas
     except psycopg2.Error as e:
-        st.error(f"Error en consulta SQL: {e}")
         # Intentar reiniciar la transacción después del error
-        if conn is not None:
+        if conn is not None and not en_unidad_de_trabajo(conn):
             reset_transaction(conn)
+        if _relanzar_errores(conn):
+            raise
+        notificaciones.error(f"Error en consulta SQL: {e}")
         return None
     except Exception as e:
-        st.error(f"Error inesperado en consulta SQL: {e}")
+        if _relanzar_errores(conn):
+            raise
+        notificaciones.error(f"Error inesperado en consulta SQL: {e}")
         return None
 
 def execute_query_dict(conn, sql, params=None):
     """
-    Ejecuta una consulta SQL y retorna resultados como diccionarios.
+    Ejecuta una consulta SQL y retorna resultados con acceso por nombre de columna.
+    
+    Las filas son Fila (capa_datos/filas.py): se leen como los diccionarios de
+    RealDictCursor (fila['columna'], fila.get('columna')) o por atributo, sin
+    repetir los nombres de las columnas en cada fila.
     
     Args:
         conn: Conexión a la base de datos
@@ -79,35 +142,152 @@ def execute_query_dict(conn, sql, params=None):
         params (tuple): Parámetros para la consulta
     
     Returns:
-        list: Lista de diccionarios con los resultados
+        list: Lista de filas con los resultados
     """
     try:
         # Verificar que la conexión existe
         if conn is None:
-            st.error("❌ Error: No hay conexión a la base de datos")
+            _sin_conexion()
             return []
         
-        # Verificar si la transacción está abortada y reiniciarla
-        if hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
+        # Verificar si la transacción está abortada y reiniciarla (dentro de una
+        # unidad de trabajo la transacción es de la unidad)
+        if not en_unidad_de_trabajo(conn) and hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
             reset_transaction(conn)
         
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor(cursor_factory=CursorFilas) as cur:
             cur.execute(sql, params)
-            return cur.fetchall()
+            filas = cur.fetchall()
+        # No dejar la conexión "idle in transaction" después del SELECT
+        terminar_lectura(conn)
+        return filas
     except psycopg2.Error as e:
-        st.error(f"Error en consulta SQL: {e}")
         # Intentar reiniciar la transacción después del error
-        if conn is not None:
+        if conn is not None and not en_unidad_de_trabajo(conn):
             reset_transaction(conn)
+        if _relanzar_errores(conn):
+            raise
+        notificaciones.error(f"Error en consulta SQL: {e}")
         return []
     except Exception as e:
-        st.error(f"Error inesperado en consulta SQL: {e}")
+        if _relanzar_errores(conn):
+            raise
+        notificaciones.error(f"Error inesperado en consulta SQL: {e}")
         return []
 
+def _iterar(conn, sql, params, itersize, cancelar, cursor_factory):
+    """
+    Recorre el resultado de una consulta con un cursor con nombre (del servidor).
+    
+    Ver iter_query() e iter_query_dict().
+    """
+    if conn is None:
+        _sin_conexion()
+        return
+    if itersize is None:
+        itersize = obtener_configuracion().entero('DB_ITERSIZE', 2000)
+    
+    cur = None
+    autocommit = getattr(conn, 'autocommit', False)
+    readonly = None
+    try:
+        # Verificar si la transacción está abortada y reiniciarla (dentro de una
+        # unidad de trabajo la transacción es de la unidad)
+        if not en_unidad_de_trabajo(conn) and hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
+            reset_transaction(conn)
+        
+        if autocommit:
+            # Un cursor WITH HOLD en autocommit obliga al servidor a materializar
+            # todo el resultado antes del primer FETCH; se itera en una
+            # transacción READ ONLY propia que se cierra al terminar
+            readonly = conn.readonly
+            conn.autocommit = False
+            conn.readonly = True
+        
+        cur = conn.cursor(name=f"iter_{next(_cursores)}", cursor_factory=cursor_factory)
+        cur.itersize = itersize
+        cur.execute(sql, params)
+        while cancelar is None or not cancelar.is_set():
+            filas = cur.fetchmany(itersize)
+            if not filas:
+                break
+            yield from filas
+    except psycopg2.Error as e:
+        # conn.cancel() desde otro hilo interrumpe el FETCH en curso
+        if isinstance(e, psycopg2.extensions.QueryCanceledError) and cancelar is not None and cancelar.is_set():
+            return
+        if _relanzar_errores(conn):
+            raise
+        notificaciones.error(f"Error en consulta SQL: {e}")
+    except Exception as e:
+        if _relanzar_errores(conn):
+            raise
+        notificaciones.error(f"Error inesperado en consulta SQL: {e}")
+    finally:
+        # También al cortar la iteración antes de tiempo (break, close())
+        if cur is not None:
+            try:
+                cur.close()
+            except psycopg2.Error:
+                pass
+        # Terminar la transacción de lectura que abrió el cursor con nombre
+        if autocommit:
+            try:
+                conn.rollback()
+                conn.readonly = readonly
+                conn.autocommit = True
+            except psycopg2.Error:
+                pass
+        elif not en_unidad_de_trabajo(conn):
+            reset_transaction(conn)
+
+def iter_query(conn, sql, params=None, itersize=None, cancelar=None):
+    """
+    Ejecuta una consulta SQL y entrega las filas de a una, sin traerlas todas.
+    
+    Usa un cursor con nombre (del servidor): las filas llegan en bloques de
+    itersize, así la memoria no depende del tamaño del resultado. Si se deja
+    de iterar (break, close() o el generador se descarta) el cursor se cierra
+    en el servidor. Al terminar se hace rollback de la transacción de lectura,
+    así que no conviene escribir con la misma conexión mientras se itera.
+    
+    Args:
+        conn: Conexión a la base de datos
+        sql (str): Consulta SQL a ejecutar
+        params (tuple): Parámetros para la consulta
+        itersize (int): Filas por bloque (default: DB_ITERSIZE o 2000)
+        cancelar (threading.Event): Si se activa, la iteración termina después
+            del bloque en curso; con conn.cancel() se corta también un FETCH
+            que está esperando al servidor
+    
+    Yields:
+        tuple: Filas de la consulta (la iteración termina antes si hay error)
+    """
+    return _iterar(conn, sql, params, itersize, cancelar, None)
+
+def iter_query_dict(conn, sql, params=None, itersize=None, cancelar=None):
+    """
+    Igual que iter_query() pero con acceso por nombre de columna.
+    
+    Args:
+        conn: Conexión a la base de datos
+        sql (str): Consulta SQL a ejecutar
+        params (tuple): Parámetros para la consulta
+        itersize (int): Filas por bloque (default: DB_ITERSIZE o 2000)
+        cancelar (threading.Event): Ver iter_query()
+    
+    Yields:
+        Fila: Filas de la consulta (ver execute_query_dict)
+    """
+    return _iterar(conn, sql, params, itersize, cancelar, CursorFilas)
+
 def execute_transaction(conn, queries):
     """
     Ejecuta múltiples consultas en una transacción.
     
+    Si la transacción falla por un conflicto de serialización, un deadlock o
+    una conexión cortada se repite completa (ver capa_datos/reintentos.py).
+    
     Args:
         conn: Conexión a la base de datos
         queries (list): Lista de tuplas (sql, params) a ejecutar
@@ -115,28 +295,29 @@ def execute_transaction(conn, queries):
     Returns:
         bool: True si la transacción fue exitosa, False en caso contrario
     """
+    def ejecutar(actual):
+        with actual.cursor() as cur:
+            for sql, params in queries:
+                cur.execute(sql, params)
+        return True
+    
     try:
         # Verificar que la conexión existe
         if conn is None:
-            st.error("❌ Error: No hay conexión a la base de datos")
+            _sin_conexion()
             return False
         
-        # Verificar si la transacción está abortada y reiniciarla
-        if hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
-            reset_transaction(conn)
-        
-        with conn.cursor() as cur:
-            for sql, params in queries:
-                cur.execute(sql, params)
-            conn.commit()
-            return True
+        # Commit o rollback en escritura(); dentro de otra unidad, en la de ella
+        return ejecutar_con_reintentos(ejecutar, conn)
     except psycopg2.Error as e:
-        st.error(f"Error en transacción: {e}")
-        if conn is not None:
-            conn.rollback()
+        if en_unidad_de_trabajo(conn):
+            raise
+        notificaciones.error(f"Error en transacción: {e}")
         return False
     except Exception as e:
-        st.error(f"Error inesperado en transacción: {e}")
+        if en_unidad_de_trabajo(conn):
+            raise
+        notificaciones.error(f"Error inesperado en transacción: {e}")
         return False
 
 def call_function(conn, function_name, params=None):
@@ -154,11 +335,12 @@ def call_function(conn, function_name, params=None):
     try:
         # Verificar que la conexión existe
         if conn is None:
-            st.error("❌ Error: No hay conexión a la base de datos")
+            _sin_conexion()
             return None
         
-        # Verificar si la transacción está abortada y reiniciarla
-        if hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
+        # Verificar si la transacción está abortada y reiniciarla (dentro de una
+        # unidad de trabajo la transacción es de la unidad)
+        if not en_unidad_de_trabajo(conn) and hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
             reset_transaction(conn)
         
         with conn.cursor() as cur:
@@ -167,15 +349,20 @@ def call_function(conn, function_name, params=None):
             else:
                 cur.callproc(function_name)
             result = cur.fetchone()
-            conn.commit()
+            if not en_unidad_de_trabajo(conn):
+                conn.commit()
             return result
     except psycopg2.Error as e:
-        st.error(f"Error al llamar función {function_name}: {e}")
+        if en_unidad_de_trabajo(conn):
+            raise
+        notificaciones.error(f"Error al llamar función {function_name}: {e}")
         if conn is not None:
             conn.rollback()
         return None
     except Exception as e:
-        st.error(f"Error inesperado al llamar función {function_name}: {e}")
+        if en_unidad_de_trabajo(conn):
+            raise
+        notificaciones.error(f"Error inesperado al llamar función {function_name}: {e}")
         return None
 
 def call_procedure(conn, procedure_name, params=None):
@@ -193,11 +380,12 @@ def call_procedure(conn, procedure_name, params=None):
     try:
         # Verificar que la conexión existe
         if conn is None:
-            st.error("❌ Error: No hay conexión a la base de datos")
+            _sin_conexion()
             return False
         
-        # Verificar si la transacción está abortada y reiniciarla
-        if hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
+        # Verificar si la transacción está abortada y reiniciarla (dentro de una
+        # unidad de trabajo la transacción es de la unidad)
+        if not en_unidad_de_trabajo(conn) and hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
             reset_transaction(conn)
         
         with conn.cursor() as cur:
@@ -214,9 +402,14 @@ def call_procedure(conn, procedure_name, params=None):
             # No hacer commit aquí, dejar que la función llamadora maneje la transacción
             return True
     except psycopg2.Error as e:
-        st.error(f"Error al llamar procedimiento {procedure_name}: {e}")
+        # Dentro de escritura() el error sale del bloque y la unidad hace rollback
+        if en_unidad_de_trabajo(conn):
+            raise
+        notificaciones.error(f"Error al llamar procedimiento {procedure_name}: {e}")
         # No hacer rollback aquí, dejar que la función llamadora maneje la transacción
         return False
     except Exception as e:
-        st.error(f"Error inesperado al llamar procedimiento {procedure_name}: {e}")
+        if en_unidad_de_trabajo(conn):
+            raise
+        notificaciones.error(f"Error inesperado al llamar procedimiento {procedure_name}: {e}")
         return False 
\ No newline at end of file
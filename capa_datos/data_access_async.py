@@ -0,0 +1,224 @@
+"""
+Acceso a datos asíncrono (psycopg 3) con soporte de modo pipeline
+
+Versión asíncrona de data_access pensada para procesos sin Streamlit (un
+servidor de API o trabajos por lotes) que necesitan cientos de consultas
+concurrentes en un solo proceso. A diferencia de data_access, los errores no
+se envían al notificador (capa_datos/notificaciones.py): se relanzan para que el llamador decida.
+
+Ejemplo:
+    async with conexion_async() as conn:
+        reservas, total = await ejecutar_pipeline_async(conn, [
+            (SQL_RESERVAS_PAGINADAS, (10, 0)),
+            (SQL_TOTAL_RESERVAS, None)
+        ])
+"""
+import asyncio
+import weakref
+import contextlib
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from config.settings import obtener_configuracion
+from config.database_settings import get_database_config
+from capa_datos.database_connection import _opciones_sesion
+
+# Ciclo de eventos -> pools por credenciales: un pool asíncrono queda ligado al
+# ciclo de eventos en que se abrió. Las claves son débiles: al descartarse un
+# ciclo se van sus pools, y uno nuevo nunca hereda los de otro (id() sí se
+# puede reutilizar)
+_pools = weakref.WeakKeyDictionary()
+
+def get_async_pool_config():
+    """
+    Obtiene la configuración de los pools asíncronos desde las variables de entorno.
+    
+    Variables soportadas:
+        DB_ASYNC_POOL_MIN: Conexiones abiertas de forma permanente (default: 2)
+        DB_ASYNC_POOL_MAX: Conexiones máximas; las consultas que excedan esperan turno (default: 20)
+        DB_ASYNC_POOL_TIMEOUT: Segundos máximos de espera por una conexión (default: 30)
+    
+    Returns:
+        dict: Configuración de los pools asíncronos
+    """
+    configuracion = obtener_configuracion()
+    minimo = configuracion.entero('DB_ASYNC_POOL_MIN', 2)
+    return {
+        'min': minimo,
+        'max': max(minimo, configuracion.entero('DB_ASYNC_POOL_MAX', 20)),
+        'timeout': configuracion.decimal('DB_ASYNC_POOL_TIMEOUT', 30)
+    }
+
+def _conninfo(config):
+    """
+    Arma la cadena de conexión de psycopg a partir de la configuración.
+    
+    Args:
+        config (dict): Configuración de conexión
+    
+    Returns:
+        str: Cadena de conexión
+    """
+    return psycopg.conninfo.make_conninfo(
+        host=config['host'],
+        port=config['port'],
+        dbname=config['database'],
+        user=config['user'],
+        password=config['password'],
+        client_encoding='UTF8',
+        options=_opciones_sesion(),
+        connect_timeout=10,
+        application_name='sportcourt_app_async'
+    )
+
+async def get_async_pool(config=None):
+    """
+    Obtiene el pool asíncrono del ciclo de eventos actual, abriéndolo la primera vez.
+    
+    Args:
+        config (dict): Configuración de conexión (por defecto la actual)
+    
+    Returns:
+        psycopg_pool.AsyncConnectionPool: Pool abierto
+    """
+    if config is None:
+        config = get_database_config()
+    
+    pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    clave = (config['host'], str(config['port']), config['database'], config['user'], config['password'])
+    pool = pools.get(clave)
+    if pool is None or pool.closed:
+        pool_config = get_async_pool_config()
+        pool = AsyncConnectionPool(
+            _conninfo(config),
+            min_size=pool_config['min'],
+            max_size=pool_config['max'],
+            timeout=pool_config['timeout'],
+            open=False
+        )
+        pools[clave] = pool
+        await pool.open()
+    return pool
+
+async def cerrar_pools_async():
+    """
+    Cierra los pools asíncronos del ciclo de eventos actual.
+    """
+    for pool in _pools.pop(asyncio.get_running_loop(), {}).values():
+        await pool.close()
+
+@contextlib.asynccontextmanager
+async def conexion_async(config=None):
+    """
+    Toma una conexión del pool asíncrono durante el bloque.
+    
+    Al salir sin errores se confirma la transacción abierta; si hubo un error
+    se descarta.
+    
+    Args:
+        config (dict): Configuración de conexión (por defecto la actual)
+    
+    Yields:
+        psycopg.AsyncConnection: Conexión del pool
+    """
+    pool = await get_async_pool(config)
+    async with pool.connection() as conn:
+        yield conn
+
+@contextlib.asynccontextmanager
+async def transaccion_async(conn=None):
+    """
+    Ejecuta el bloque dentro de una transacción.
+    
+    Si no se pasa una conexión se toma una del pool. La transacción se
+    confirma al salir del bloque y se revierte si se produce un error.
+    
+    Args:
+        conn (psycopg.AsyncConnection): Conexión a usar (opcional)
+    
+    Yields:
+        psycopg.AsyncConnection: Conexión con la transacción abierta
+    """
+    if conn is not None:
+        async with conn.transaction():
+            yield conn
+        return
+    
+    async with conexion_async() as conn:
+        async with conn.transaction():
+            yield conn
+
+async def execute_query_async(conn, sql, params=None, fetch=True):
+    """
+    Ejecuta una consulta SQL genérica.
+    
+    Args:
+        conn: Conexión asíncrona
+        sql (str): Consulta SQL a ejecutar
+        params (tuple): Parámetros para la consulta
+        fetch (bool): Si debe hacer fetch de los resultados
+    
+    Returns:
+        list | int: Filas de la consulta o número de filas afectadas
+    """
+    async with conn.cursor() as cur:
+        await cur.execute(sql, params)
+        if fetch:
+            return await cur.fetchall()
+        return cur.rowcount
+
+async def execute_query_dict_async(conn, sql, params=None):
+    """
+    Ejecuta una consulta SQL y retorna resultados como diccionarios.
+    
+    Args:
+        conn: Conexión asíncrona
+        sql (str): Consulta SQL a ejecutar
+        params (tuple): Parámetros para la consulta
+    
+    Returns:
+        list: Lista de diccionarios con los resultados
+    """
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(sql, params)
+        return await cur.fetchall()
+
+async def ejecutar_pipeline_async(conn, consultas, como_dict=False):
+    """
+    Ejecuta varias consultas enviándolas juntas en modo pipeline.
+    
+    Todas las consultas salen en un solo viaje de red y los resultados se
+    leen al final, en lugar de esperar la respuesta de cada una antes de
+    enviar la siguiente. Si la librería libpq no soporta pipeline (versión
+    anterior a la 14) se ejecutan una tras otra con el mismo resultado.
+    
+    Args:
+        conn: Conexión asíncrona
+        consultas (list): Lista de tuplas (sql, params)
+        como_dict (bool): Retornar las filas como diccionarios
+    
+    Returns:
+        list: Lista con las filas de cada consulta, en el mismo orden
+    """
+    row_factory = dict_row if como_dict else None
+    
+    if not psycopg.Pipeline.is_supported():
+        resultados = []
+        for sql, params in consultas:
+            async with conn.cursor(row_factory=row_factory) as cur:
+                await cur.execute(sql, params)
+                resultados.append(await cur.fetchall())
+        return resultados
+    
+    cursores = []
+    try:
+        async with conn.pipeline():
+            for sql, params in consultas:
+                cur = conn.cursor(row_factory=row_factory)
+                await cur.execute(sql, params)
+                cursores.append(cur)
+        # Al cerrar el bloque del pipeline ya llegaron todos los resultados
+        return [await cur.fetchall() for cur in cursores]
+    finally:
+        for cur in cursores:
+            await cur.close()
@@ -1,12 +1,72 @@
 import psycopg2
-import streamlit as st
+from capa_datos import notificaciones
 from psycopg2.extras import RealDictCursor
 import os
-from dotenv import load_dotenv
+import time
+import threading
+import functools
+import contextlib
+from psycopg2 import pool as pg_pool
+from config.settings import obtener_configuracion
 from config.database_settings import get_database_config, get_connection_info
 
-# Cargar variables de entorno
-load_dotenv()
+# Modos de enrutamiento de las conexiones
+MODO_LECTURA = 'lectura'
+MODO_ESCRITURA = 'escritura'
+
+# Contexto por hilo con el modo de la operación en curso
+_contexto = threading.local()
+
+# Estado compartido de las réplicas (retraso medido, caídas y turno)
+_estado_replicas = {
+    'retraso': {},
+    'caidas': {},
+    'turno': 0
+}
+_lock_replicas = threading.Lock()
+
+# Pools de conexiones por credenciales (cada rol de usuario tiene el suyo)
+_pools = {}
+_lock_pools = threading.Lock()
+
+# Fábrica que reemplaza a get_db_connection() en las herramientas de medición
+_fabrica_conexiones = None
+
+# Circuito de get_db_connection() (se crea con la configuración al primer uso)
+_circuito = None
+_lock_circuito = threading.Lock()
+
+# Estados del circuito
+CIRCUITO_CERRADO = 'cerrado'
+CIRCUITO_ABIERTO = 'abierto'
+CIRCUITO_SEMIABIERTO = 'semiabierto'
+
+class SinConexion(psycopg2.OperationalError):
+    """
+    No hay conexión a la base de datos para ejecutar la operación.
+    """
+
+class CircuitoAbierto(psycopg2.OperationalError):
+    """
+    La base de datos no está disponible y el circuito rechazó la operación
+    sin intentar conectarse.
+    """
+
+def _opciones_sesion():
+    """
+    Arma las opciones de sesión que se envían al conectar.
+    
+    Con DB_IDLE_TX_TIMEOUT_MS el servidor cierra la sesión que quede
+    "idle in transaction" más de ese tiempo (0 = sin límite).
+    
+    Returns:
+        str: Valor del parámetro options de psycopg2.connect
+    """
+    opciones = '-c client_encoding=UTF8'
+    limite = obtener_configuracion().entero('DB_IDLE_TX_TIMEOUT_MS', 0)
+    if limite > 0:
+        opciones += f' -c idle_in_transaction_session_timeout={limite}'
+    return opciones
 
 def get_connection(user, password, host="localhost", port="5432", dbname="postgres"):
     """
@@ -31,7 +91,7 @@ def get_connection(user, password, host="localhost", port="5432", dbname="postgr
             'user': user,
             'password': password,
             'client_encoding': 'UTF8',
-            'options': '-c client_encoding=UTF8'
+            'options': _opciones_sesion()
         }
         
         # Si es un host remoto (no localhost), agregar configuración adicional
@@ -46,7 +106,7 @@ def get_connection(user, password, host="localhost", port="5432", dbname="postgr
         conn = psycopg2.connect(**conn_params)
         return conn
     except psycopg2.Error as e:
-        st.error(f"Error inesperado al conectar a PostgreSQL: {e}")
+        notificaciones.error(f"Error inesperado al conectar a PostgreSQL: {e}")
         return None
 
 def get_connection_dict(user, password, host="localhost", port="5432", dbname="postgres"):
@@ -71,14 +131,14 @@ def get_connection_dict(user, password, host="localhost", port="5432", dbname="p
             'user': user,
             'password': password,
             'client_encoding': 'UTF8',
-            'options': '-c client_encoding=UTF8'
+            'options': _opciones_sesion()
         }
         
         conn = psycopg2.connect(**conn_params)
         cur = conn.cursor(cursor_factory=RealDictCursor)
         return conn, cur
     except psycopg2.Error as e:
-        st.error(f"Error inesperado al conectar a PostgreSQL: {e}")
+        notificaciones.error(f"Error inesperado al conectar a PostgreSQL: {e}")
         return None, None
 
 def close_connection(conn):
@@ -92,7 +152,7 @@ def close_connection(conn):
         try:
             conn.close()
         except Exception as e:
-            st.warning(f"Error al cerrar conexión: {e}")
+            notificaciones.advertencia(f"Error al cerrar conexión: {e}")
 
 def test_connection(conn):
     """
@@ -115,32 +175,742 @@ def get_db_connection():
     """
     Obtiene una conexión a la base de datos usando la configuración actual.
     
+    Si la operación en curso está marcada como de solo lectura y hay réplicas
+    configuradas, la conexión se abre contra una réplica con retraso aceptable.
+    En cualquier otro caso se usa el servidor primario.
+    
+    Mientras el circuito está abierto (ver CircuitoBaseDatos) retorna None sin
+    intentar conectarse.
+    
     Returns:
         psycopg2.connection: Conexión a la base de datos o None si hay error
     """
+    circuito = obtener_circuito()
+    if not circuito.permitir():
+        # Sin esperar el connect_timeout; app.py muestra el aviso de datos guardados
+        if modo_actual() == MODO_ESCRITURA:
+            notificaciones.error("⛔ La base de datos no responde: las modificaciones están deshabilitadas por un momento")
+        return None
+    
+    inicio = time.perf_counter()
+    conn = None
     try:
-        # Obtener configuración actual
-        config = get_database_config()
+        if _fabrica_conexiones is not None:
+            conn = _fabrica_conexiones()
+        else:
+            conn = abrir_conexion_predeterminada()
+        return conn
+    
+    except Exception as e:
+        notificaciones.error(f"Error al conectar a la base de datos: {e}")
+        return None
+    finally:
+        circuito.registrar(conn is not None, time.perf_counter() - inicio)
+
+def abrir_conexion_predeterminada():
+    """
+    Abre una conexión por el camino normal (réplica de lectura o primario),
+    sin pasar por la fábrica establecida con establecer_fabrica_conexiones().
+    
+    Returns:
+        psycopg2.connection: Conexión a la base de datos o None si no se pudo abrir
+    """
+    # Obtener configuración actual
+    config = get_database_config()
+    
+    # Intentar enrutar las lecturas a una réplica
+    if modo_actual() == MODO_LECTURA:
+        conn_replica = get_replica_connection(config)
+        if conn_replica:
+            return conn_replica
+    
+    # Crear conexión
+    conn = get_connection(
+        user=config['user'],
+        password=config['password'],
+        host=config['host'],
+        port=config['port'],
+        dbname=config['database']
+    )
+    
+    if conn:
+        notificaciones.detalle(f"🔗 Conectado a: {get_connection_info()}")
+        return conn
+    else:
+        notificaciones.error("❌ No se pudo establecer conexión a la base de datos")
+        return None
+
+def establecer_fabrica_conexiones(fabrica):
+    """
+    Reemplaza la forma en que get_db_connection() y pool_para_operacion()
+    obtienen conexiones.
+    
+    Las herramientas de medición la usan para entregar conexiones
+    instrumentadas a la lógica de negocio sin modificarla. Con None se
+    vuelve al comportamiento normal (réplicas y primario).
+    
+    Args:
+        fabrica (callable): Función sin argumentos que retorna una conexión, o None
+    
+    Returns:
+        callable: Fábrica anterior (o None)
+    """
+    global _fabrica_conexiones
+    anterior = _fabrica_conexiones
+    _fabrica_conexiones = fabrica
+    return anterior
+
+class _PoolDeFabrica:
+    """
+    Pool aparente que abre cada conexión con la fábrica establecida y la
+    cierra al devolverla, para que las consultas de los lotes concurrentes
+    también pasen por ella.
+    """
+    closed = False
+    
+    def __init__(self, fabrica):
+        self.fabrica = fabrica
+    
+    def getconn(self):
+        return self.fabrica()
+    
+    def putconn(self, conn, close=False):
+        conn.close()
+
+class CircuitoBaseDatos:
+    """
+    Circuito que deja de intentar conexiones cuando la base de datos falla o
+    responde lento, para no sumar intentos a un servidor sobrecargado.
+    
+    Cerrado: se conecta normalmente y se anotan los últimos resultados; si
+    en la ventana hay umbral_fallas conexiones fallidas o más lentas que
+    umbral_lentitud, el circuito se abre. Abierto: get_db_connection()
+    retorna None sin intentar. Pasados segundos_abierto pasa a semiabierto
+    y deja pasar sondas conexiones de prueba: si funcionan se cierra, si
+    fallan vuelve a abrirse.
+    """
+    
+    def __init__(self, umbral_fallas=5, ventana=20, umbral_lentitud=3.0, segundos_abierto=30.0, sondas=1):
+        self.umbral_fallas = umbral_fallas
+        self.ventana = ventana
+        self.umbral_lentitud = umbral_lentitud
+        self.segundos_abierto = segundos_abierto
+        self.sondas = sondas
+        self._lock = threading.Lock()
+        self._resultados = []
+        self._estado = CIRCUITO_CERRADO
+        self._abierto_desde = None
+        self._sondas_en_curso = 0
+        self.aperturas = 0
+        self.rechazos = 0
+    
+    def permitir(self):
+        """
+        Indica si se puede intentar una conexión.
         
-        # Crear conexión
-        conn = get_connection(
-            user=config['user'],
-            password=config['password'],
-            host=config['host'],
-            port=config['port'],
-            dbname=config['database']
-        )
+        Returns:
+            bool: False si el circuito está abierto (o semiabierto con las sondas ocupadas)
+        """
+        with self._lock:
+            if self._estado == CIRCUITO_ABIERTO and time.time() - self._abierto_desde >= self.segundos_abierto:
+                self._estado = CIRCUITO_SEMIABIERTO
+                self._sondas_en_curso = 0
+            if self._estado == CIRCUITO_CERRADO:
+                return True
+            if self._estado == CIRCUITO_SEMIABIERTO and self._sondas_en_curso < self.sondas:
+                self._sondas_en_curso += 1
+                return True
+            self.rechazos += 1
+            return False
+    
+    def registrar(self, exito, segundos):
+        """
+        Anota el resultado de un intento de conexión.
         
-        if conn:
-            st.info(f"🔗 Conectado a: {get_connection_info()}")
-            return conn
-        else:
-            st.error("❌ No se pudo establecer conexión a la base de datos")
-            return None
+        Args:
+            exito (bool): Si se obtuvo la conexión
+            segundos (float): Lo que tardó el intento
+        """
+        mala = not exito or segundos > self.umbral_lentitud
+        with self._lock:
+            if self._estado == CIRCUITO_SEMIABIERTO:
+                self._sondas_en_curso = max(0, self._sondas_en_curso - 1)
+                if mala:
+                    self._abrir()
+                else:
+                    self._estado = CIRCUITO_CERRADO
+                    self._resultados = []
+                return
+            if self._estado == CIRCUITO_ABIERTO:
+                return
             
-    except Exception as e:
-        st.error(f"Error al conectar a la base de datos: {e}")
+            self._resultados.append(mala)
+            del self._resultados[:-self.ventana]
+            if sum(self._resultados) >= self.umbral_fallas:
+                self._abrir()
+    
+    def liberar(self):
+        """
+        Devuelve el permiso de un intento que terminó sin saber si la base
+        responde (por ejemplo, con el pool agotado), sin anotar un resultado.
+        """
+        with self._lock:
+            if self._estado == CIRCUITO_SEMIABIERTO:
+                self._sondas_en_curso = max(0, self._sondas_en_curso - 1)
+    
+    def _abrir(self):
+        self._estado = CIRCUITO_ABIERTO
+        self._abierto_desde = time.time()
+        self._resultados = []
+        self.aperturas += 1
+    
+    def estado(self):
+        """
+        Returns:
+            str: CIRCUITO_CERRADO, CIRCUITO_ABIERTO o CIRCUITO_SEMIABIERTO
+        """
+        with self._lock:
+            return self._estado
+    
+    def instantanea(self):
+        """
+        Returns:
+            dict: Estado, segundos abierto, aperturas y conexiones rechazadas
+        """
+        with self._lock:
+            return {
+                'estado': self._estado,
+                'segundos_abierto': time.time() - self._abierto_desde if self._estado != CIRCUITO_CERRADO else 0,
+                'aperturas': self.aperturas,
+                'rechazos': self.rechazos
+            }
+
+def obtener_circuito():
+    """
+    Obtiene el circuito de get_db_connection(), creándolo la primera vez.
+    
+    Variables soportadas:
+        DB_BREAKER_FAILURES: Conexiones fallidas o lentas que abren el circuito (default: 5)
+        DB_BREAKER_WINDOW: Últimos intentos que se consideran (default: 20)
+        DB_BREAKER_SLOW_MS: Desde cuántos milisegundos una conexión cuenta como lenta (default: 3000)
+        DB_BREAKER_OPEN_SECONDS: Segundos abierto antes de probar de nuevo (default: 30)
+        DB_BREAKER_PROBES: Conexiones de prueba en semiabierto (default: 1)
+    
+    Returns:
+        CircuitoBaseDatos: Circuito del proceso
+    """
+    global _circuito
+    with _lock_circuito:
+        if _circuito is None:
+            configuracion = obtener_configuracion()
+            _circuito = CircuitoBaseDatos(
+                umbral_fallas=configuracion.entero('DB_BREAKER_FAILURES', 5),
+                ventana=configuracion.entero('DB_BREAKER_WINDOW', 20),
+                umbral_lentitud=configuracion.decimal('DB_BREAKER_SLOW_MS', 3000) / 1000,
+                segundos_abierto=configuracion.decimal('DB_BREAKER_OPEN_SECONDS', 30),
+                sondas=configuracion.entero('DB_BREAKER_PROBES', 1)
+            )
+        return _circuito
+
+def base_de_datos_disponible():
+    """
+    Indica si el circuito de conexiones está cerrado (la base responde).
+    
+    Returns:
+        bool: False mientras el circuito está abierto o probando
+    """
+    return obtener_circuito().estado() == CIRCUITO_CERRADO
+
+def get_pool_config():
+    """
+    Obtiene la configuración de los pools de conexiones desde las variables de entorno.
+    
+    Variables soportadas:
+        DB_POOL_MIN: Conexiones inactivas que se conservan por pool; las que
+            superan este número se cierran al devolverse (default: 4)
+        DB_POOL_MAX: Conexiones máximas por pool (default: 8)
+    
+    Returns:
+        dict: Configuración de los pools
+    """
+    configuracion = obtener_configuracion()
+    minimo = configuracion.entero('DB_POOL_MIN', 4)
+    maximo = configuracion.entero('DB_POOL_MAX', 8)
+    return {
+        'min': minimo,
+        'max': max(minimo, maximo)
+    }
+
+def get_connection_pool(config=None, replica=False):
+    """
+    Obtiene el pool de conexiones al primario para las credenciales actuales
+    (o al servidor de config, por ejemplo una réplica), creándolo la primera vez.
+    Para elegir según el modo de la operación, ver pool_para_operacion().
+    
+    Debe llamarse desde el hilo de la sesión (la configuración puede depender
+    del usuario autenticado); las conexiones del pool sí pueden usarse desde
+    otros hilos.
+    
+    Args:
+        config (dict): Configuración de conexión (por defecto la actual)
+        replica (bool): Si el servidor es una réplica: sus intentos no pasan
+            por el circuito del primario (una réplica caída queda fuera de
+            rotación, ver _replica_disponible)
+    
+    Returns:
+        psycopg2.pool.ThreadedConnectionPool: Pool de conexiones
+    """
+    if _fabrica_conexiones is not None and config is None:
+        return _PoolDeFabrica(_fabrica_conexiones)
+    
+    if config is None:
+        config = get_database_config()
+    
+    clave = (config['host'], str(config['port']), config['database'], config['user'], config['password'])
+    with _lock_pools:
+        pool = _pools.get(clave)
+        if pool is None or pool.closed:
+            pool_config = get_pool_config()
+            circuito = None if replica else obtener_circuito()
+            # Crear el pool abre sus conexiones mínimas: pasa por el circuito
+            # como cualquier intento de conexión
+            with _intento_de_conexion(circuito):
+                pool = pg_pool.ThreadedConnectionPool(
+                    pool_config['min'],
+                    pool_config['max'],
+                    host=config['host'],
+                    port=config['port'],
+                    database=config['database'],
+                    user=config['user'],
+                    password=config['password'],
+                    client_encoding='UTF8',
+                    options=_opciones_sesion(),
+                    connect_timeout=10,
+                    application_name='sportcourt_app_pool'
+                )
+            pool.circuito = circuito
+            _pools[clave] = pool
+    return pool
+
+@contextlib.contextmanager
+def _intento_de_conexion(circuito):
+    """
+    Pasa un intento de conexión por el circuito: lanza CircuitoAbierto sin
+    intentar si está abierto y, si no, anota si el bloque lo logró y cuánto tardó.
+    
+    Entrega True si el intento es la prueba del circuito semiabierto. Con
+    circuito None (pools de réplicas) el bloque se ejecuta sin anotar nada.
+    """
+    if circuito is None:
+        yield False
+        return
+    if not circuito.permitir():
+        raise CircuitoAbierto("La base de datos no responde; se intentará de nuevo en unos segundos")
+    inicio = time.perf_counter()
+    exito = False
+    try:
+        yield circuito.estado() == CIRCUITO_SEMIABIERTO
+        exito = True
+    except pg_pool.PoolError:
+        # Pool agotado: no dice nada de la base de datos
+        exito = None
+        raise
+    finally:
+        if exito is None:
+            circuito.liberar()
+        else:
+            circuito.registrar(exito, time.perf_counter() - inicio)
+
+@contextlib.contextmanager
+def conexion_del_pool(pool):
+    """
+    Toma una conexión del pool y la devuelve al terminar el bloque.
+    
+    La transacción abierta se descarta antes de devolverla; si la conexión
+    quedó inutilizable (por ejemplo, tras cancelar una consulta que no llegó
+    a terminar) se cierra en lugar de reutilizarse.
+    
+    Tomar la conexión pasa por el circuito del pool (ver CircuitoBaseDatos;
+    los pools de réplicas no tienen): con el circuito abierto se lanza
+    CircuitoAbierto sin esperar el connect_timeout, y una conexión que se
+    pierde durante el bloque cuenta como falla. En la prueba del circuito
+    semiabierto se ejecuta SELECT 1 antes de darla por buena, porque el pool
+    suele entregar una conexión inactiva sin contactar al servidor.
+    
+    Args:
+        pool: Pool obtenido con get_connection_pool()
+    
+    Yields:
+        psycopg2.connection: Conexión del pool
+    
+    Raises:
+        CircuitoAbierto: Si el circuito está abierto
+    """
+    circuito = getattr(pool, 'circuito', obtener_circuito())
+    with _intento_de_conexion(circuito) as prueba:
+        conn = pool.getconn()
+        if prueba:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error:
+                pool.putconn(conn, close=True)
+                raise
+    descartar = False
+    try:
+        yield conn
+    finally:
+        try:
+            if not conn.closed:
+                conn.rollback()
+        except psycopg2.Error:
+            descartar = True
+        if conn.closed and circuito is not None:
+            # El servidor cortó la conexión (caído o reiniciándose)
+            circuito.registrar(False, 0)
+        pool.putconn(conn, close=descartar or bool(conn.closed))
+
+def cerrar_pools():
+    """
+    Cierra todas las conexiones de todos los pools.
+    """
+    with _lock_pools:
+        for pool in _pools.values():
+            if not pool.closed:
+                pool.closeall()
+        _pools.clear()
+
+def get_replica_config():
+    """
+    Obtiene la configuración de réplicas de lectura desde las variables de entorno.
+    
+    Variables soportadas:
+        DB_REPLICA_HOSTS: Lista separada por comas de host:puerto
+        DB_REPLICA_MAX_LAG: Retraso máximo tolerado en segundos (default: 5)
+        DB_REPLICA_LAG_CHECK: Segundos durante los que se reutiliza una medición de retraso (default: 2)
+        DB_REPLICA_RYW_WINDOW: Segundos tras una escritura de la sesión en los que se lee del primario (default: 10)
+        DB_REPLICA_RETRY: Segundos que una réplica caída queda fuera de rotación (default: 30)
+    
+    Returns:
+        dict: Configuración de réplicas
+    """
+    configuracion = obtener_configuracion()
+    replicas = []
+    for entrada in configuracion.texto('DB_REPLICA_HOSTS', '').split(','):
+        entrada = entrada.strip()
+        if not entrada:
+            continue
+        if ':' in entrada:
+            host, port = entrada.rsplit(':', 1)
+        else:
+            host, port = entrada, '5432'
+        replicas.append((host, port))
+    
+    return {
+        'replicas': replicas,
+        'max_lag': configuracion.decimal('DB_REPLICA_MAX_LAG', 5),
+        'lag_check': configuracion.decimal('DB_REPLICA_LAG_CHECK', 2),
+        'ryw_window': configuracion.decimal('DB_REPLICA_RYW_WINDOW', 10),
+        'retry': configuracion.decimal('DB_REPLICA_RETRY', 30)
+    }
+
+def modo_actual():
+    """
+    Retorna el modo de enrutamiento de la operación en curso en este hilo.
+    
+    Returns:
+        str: MODO_LECTURA, MODO_ESCRITURA o None si no está marcado
+    """
+    return getattr(_contexto, 'modo', None)
+
+def solo_lectura(func):
+    """
+    Decorador que marca un método de lógica como de solo lectura.
+    
+    Las conexiones obtenidas con get_db_connection() dentro del método se
+    enrutan a una réplica. Si el método se invoca dentro de una operación de
+    escritura, se respeta el modo de escritura y se usa el primario.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        anterior = modo_actual()
+        if anterior is None:
+            _contexto.modo = MODO_LECTURA
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _contexto.modo = anterior
+    return wrapper
+
+def lectura_escritura(func):
+    """
+    Decorador que marca un método de lógica como de lectura-escritura.
+    
+    Las conexiones se abren siempre contra el primario y, al terminar, se
+    registra la escritura para garantizar que la sesión lea sus propios cambios.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        anterior = modo_actual()
+        _contexto.modo = MODO_ESCRITURA
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _contexto.modo = anterior
+            registrar_escritura()
+    return wrapper
+
+def registrar_escritura():
+    """
+    Registra que la sesión actual acaba de escribir en el primario.
+    """
+    notificaciones.estado_sesion()['_ultima_escritura_db'] = time.time()
+
+def _segundos_desde_ultima_escritura():
+    """
+    Calcula los segundos transcurridos desde la última escritura de la sesión.
+    
+    Returns:
+        float: Segundos desde la última escritura o None si no hubo escrituras
+    """
+    marca = notificaciones.estado_sesion().get('_ultima_escritura_db')
+    if marca is None:
+        return None
+    return time.time() - marca
+
+def medir_retraso_replica(conn):
+    """
+    Mide el retraso de replicación de una réplica en segundos.
+    
+    Un servidor que no está en recuperación (por ejemplo, una segunda
+    instancia local usada en pruebas) se considera sin retraso.
+    
+    Args:
+        conn: Conexión abierta contra la réplica
+    
+    Returns:
+        float: Retraso en segundos o None si no se pudo medir
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN 0
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp())), 0)
+                END
+            """)
+            retraso = float(cur.fetchone()[0])
+        conn.rollback()
+        return retraso
+    except psycopg2.Error:
+        return None
+
+def _replica_disponible(replica, replica_config):
+    """
+    Indica si una réplica puede recibir lecturas según la última medición conocida.
+    
+    Args:
+        replica (tuple): (host, puerto) de la réplica
+        replica_config (dict): Configuración de réplicas
+    
+    Returns:
+        bool: False si la réplica está marcada como caída o con demasiado retraso
+    """
+    ahora = time.time()
+    with _lock_replicas:
+        caida = _estado_replicas['caidas'].get(replica)
+        medicion = _estado_replicas['retraso'].get(replica)
+    
+    if caida and ahora - caida < replica_config['retry']:
+        return False
+    
+    if medicion and ahora - medicion[0] < replica_config['lag_check']:
+        return medicion[1] <= replica_config['max_lag']
+    
+    return True
+
+def get_replica_connection(config=None):
+    """
+    Obtiene una conexión a una réplica de lectura apta.
+    
+    Retorna None (para usar el primario) si no hay réplicas configuradas, si la
+    sesión escribió hace menos de DB_REPLICA_RYW_WINDOW segundos o si ninguna
+    réplica tiene un retraso menor a DB_REPLICA_MAX_LAG.
+    
+    Args:
+        config (dict): Configuración del primario (usuario, contraseña, base de datos)
+    
+    Returns:
+        psycopg2.connection: Conexión a la réplica o None
+    """
+    replica_config = get_replica_config()
+    replicas = _replicas_en_turno(replica_config)
+    if not replicas:
+        return None
+    
+    if config is None:
+        config = get_database_config()
+    
+    # Recorrer las réplicas en turno rotativo
+    for replica in replicas:
+        if not _replica_disponible(replica, replica_config):
+            continue
+        
+        host, port = replica
+        try:
+            conn = psycopg2.connect(
+                host=host,
+                port=port,
+                database=config['database'],
+                user=config['user'],
+                password=config['password'],
+                client_encoding='UTF8',
+                options=_opciones_sesion(),
+                connect_timeout=5,
+                application_name='sportcourt_app_lectura'
+            )
+        except psycopg2.Error:
+            with _lock_replicas:
+                _estado_replicas['caidas'][replica] = time.time()
+            continue
+        
+        if not _retraso_aceptable(replica, conn, replica_config):
+            conn.close()
+            continue
+        
+        return conn
+    
+    return None
+
+def _replicas_en_turno(replica_config):
+    """
+    Retorna las réplicas a probar para una lectura, empezando por la del turno.
+    
+    Retorna una lista vacía (usar el primario) si no hay réplicas o si la
+    sesión escribió hace menos de DB_REPLICA_RYW_WINDOW segundos.
+    """
+    replicas = replica_config['replicas']
+    if not replicas:
+        return []
+    
+    # Leer lo propio: tras una escritura reciente se lee del primario
+    desde_escritura = _segundos_desde_ultima_escritura()
+    if desde_escritura is not None and desde_escritura < replica_config['ryw_window']:
+        return []
+    
+    with _lock_replicas:
+        inicio = _estado_replicas['turno']
+        _estado_replicas['turno'] = (inicio + 1) % len(replicas)
+    return [replicas[(inicio + i) % len(replicas)] for i in range(len(replicas))]
+
+def _retraso_aceptable(replica, conn, replica_config):
+    """
+    Verifica el retraso de una réplica, midiéndolo en conn si la última
+    medición está vencida. Si no se puede medir, la réplica queda como caída.
+    
+    Returns:
+        bool: True si el retraso no supera DB_REPLICA_MAX_LAG
+    """
+    with _lock_replicas:
+        medicion = _estado_replicas['retraso'].get(replica)
+    if not medicion or time.time() - medicion[0] >= replica_config['lag_check']:
+        retraso = medir_retraso_replica(conn)
+        if retraso is None:
+            with _lock_replicas:
+                _estado_replicas['caidas'][replica] = time.time()
+            return False
+        medicion = (time.time(), retraso)
+        with _lock_replicas:
+            _estado_replicas['retraso'][replica] = medicion
+            _estado_replicas['caidas'].pop(replica, None)
+    return medicion[1] <= replica_config['max_lag']
+
+def get_replica_pool(config=None):
+    """
+    Obtiene el pool de una réplica de lectura apta (uno por réplica).
+    
+    Sigue las mismas reglas que get_replica_connection(): turno rotativo,
+    réplicas caídas fuera de rotación, retraso máximo y lectura de lo propio.
+    
+    Args:
+        config (dict): Configuración del primario (usuario, contraseña, base de datos)
+    
+    Returns:
+        Pool de la réplica, o None para usar el del primario
+    """
+    replica_config = get_replica_config()
+    replicas = _replicas_en_turno(replica_config)
+    if not replicas:
         return None
+    
+    if config is None:
+        config = get_database_config()
+    
+    for replica in replicas:
+        if not _replica_disponible(replica, replica_config):
+            continue
+        
+        host, port = replica
+        try:
+            pool = get_connection_pool(dict(config, host=host, port=port), replica=True)
+            with conexion_del_pool(pool) as conn:
+                aceptable = _retraso_aceptable(replica, conn, replica_config)
+        except psycopg2.Error:
+            with _lock_replicas:
+                _estado_replicas['caidas'][replica] = time.time()
+            continue
+        
+        if aceptable:
+            return pool
+    
+    return None
+
+def pool_para_operacion():
+    """
+    Obtiene el pool que corresponde al modo de la operación en curso.
+    
+    Dentro de un método de solo lectura se usa el pool de una réplica apta
+    (get_replica_pool); en cualquier otro caso, o si ninguna réplica es
+    apta, el del primario. Debe llamarse desde el hilo de la sesión.
+    
+    Returns:
+        Pool de conexiones
+    """
+    if _fabrica_conexiones is not None:
+        return _PoolDeFabrica(_fabrica_conexiones)
+    
+    config = get_database_config()
+    if modo_actual() == MODO_LECTURA:
+        pool = get_replica_pool(config)
+        if pool is not None:
+            return pool
+    return get_connection_pool(config)
+
+def get_estado_replicas():
+    """
+    Obtiene el estado conocido de las réplicas configuradas.
+    
+    Returns:
+        list: Lista de diccionarios con host, puerto, retraso y disponibilidad
+    """
+    replica_config = get_replica_config()
+    estado = []
+    with _lock_replicas:
+        retrasos = dict(_estado_replicas['retraso'])
+        caidas = dict(_estado_replicas['caidas'])
+    
+    for replica in replica_config['replicas']:
+        medicion = retrasos.get(replica)
+        estado.append({
+            'host': replica[0],
+            'puerto': replica[1],
+            'retraso_segundos': medicion[1] if medicion else None,
+            'caida': replica in caidas,
+            'disponible': _replica_disponible(replica, replica_config)
+        })
+    return estado
 
 def reset_connection_if_needed(conn, username=None, password=None, host=None, port=None, dbname=None):
     """
@@ -185,12 +955,12 @@ def reset_connection_if_needed(conn, username=None, password=None, host=None, po
         # Crear nueva conexión
         new_conn = get_connection(username, password, host, port, dbname)
         if new_conn:
-            st.success("✅ Conexión a la base de datos reiniciada correctamente")
+            notificaciones.exito("✅ Conexión a la base de datos reiniciada correctamente")
             return new_conn
         else:
-            st.error("❌ No se pudo reiniciar la conexión a la base de datos")
+            notificaciones.error("❌ No se pudo reiniciar la conexión a la base de datos")
             return None
-            
+    
     except Exception as e:
-        st.error(f"Error al reiniciar conexión: {e}")
+        notificaciones.error(f"Error al reiniciar conexión: {e}")
         return None 
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+Lectura de resultados directamente a DataFrames de pandas
+
+fetch_dataframe() evita las copias intermedias (tuplas de fetchall(), lista de
+diccionarios y luego el DataFrame): el servidor envía el resultado con
+COPY ... TO STDOUT en formato CSV y pandas lo lee por columnas con el tipo de
+cada una decidido antes de leer (fechas como datetime64, enteros que admiten
+nulos, categorías). Se importa solo desde las vistas, que ya cargan pandas.
+"""
+import io
+import psycopg2
+import pandas as pd
+from capa_datos import notificaciones
+from capa_datos.data_access import reset_transaction, _relanzar_errores, _sin_conexion
+from capa_datos.unidad_trabajo import en_unidad_de_trabajo, terminar_lectura
+
+# Tipo de PostgreSQL (OID) -> tipo de la columna en el DataFrame
+TIPOS_POR_OID = {
+    16: 'booleano',
+    20: 'entero',
+    21: 'entero',
+    23: 'entero',
+    700: 'decimal',
+    701: 'decimal',
+    1700: 'decimal',
+    1082: 'fecha',
+    1083: 'hora',
+    1114: 'fecha_hora',
+    1184: 'fecha_hora_tz',
+    25: 'texto',
+    1042: 'texto',
+    1043: 'texto'
+}
+
+# Tipos que read_csv asigna al leer; los demás se convierten después
+_DTYPE_CSV = {
+    'entero': 'Int64',
+    'decimal': 'float64',
+    'texto': 'object',
+    'hora': 'object',
+    'categoria': 'category',
+    'booleano': 'object',
+    'fecha': 'object',
+    'fecha_hora': 'object',
+    'fecha_hora_tz': 'object'
+}
+
+# Marca de NULL en el CSV; así las cadenas vacías no se confunden con NULL
+NULO_CSV = '\\N'
+
+def convertir_columna(serie, tipo):
+    """
+    Convierte una columna leída (texto del CSV u objetos de psycopg2) a su tipo.
+    
+    Args:
+        serie (pd.Series): Columna
+        tipo (str): Tipo de la columna (ver TIPOS_POR_OID), o None para no convertir
+    
+    Returns:
+        pd.Series: Columna convertida
+    """
+    if tipo in ('fecha', 'fecha_hora', 'fecha_hora_tz'):
+        return pd.to_datetime(serie, format='ISO8601', errors='coerce', utc=tipo == 'fecha_hora_tz')
+    if tipo == 'hora':
+        # Texto HH:MM:SS, igual que lo escribe COPY
+        if pd.api.types.is_string_dtype(serie):
+            return serie
+        return serie.map(lambda valor: valor.isoformat(), na_action='ignore')
+    if tipo == 'booleano':
+        return serie.map({'t': True, 'f': False, True: True, False: False}).astype('boolean')
+    if tipo in ('entero', 'decimal', 'categoria') and serie.dtype != _DTYPE_CSV[tipo]:
+        if tipo == 'decimal':
+            return pd.to_numeric(serie, errors='coerce').astype('float64')
+        return serie.astype(_DTYPE_CSV[tipo])
+    return serie
+
+def _describir(cur, consulta, params):
+    """
+    Obtiene nombres y tipos de las columnas sin traer filas.
+    
+    Returns:
+        list: Tuplas (nombre, tipo)
+    """
+    cur.execute(f"SELECT * FROM ({consulta}) AS consulta LIMIT 0", params)
+    return [(col[0], TIPOS_POR_OID.get(col[1])) for col in cur.description]
+
+def _leer_copy(cur, consulta, params, columnas):
+    comando = cur.mogrify(
+        f"COPY ({consulta}) TO STDOUT WITH (FORMAT csv, HEADER, NULL '{NULO_CSV}')", params
+    )
+    buffer = io.BytesIO()
+    cur.copy_expert(comando, buffer)
+    buffer.seek(0)
+    return pd.read_csv(
+        buffer,
+        dtype={nombre: _DTYPE_CSV[tipo] for nombre, tipo in columnas if tipo},
+        na_values=[NULO_CSV],
+        keep_default_na=False,
+        encoding='utf-8'
+    )
+
+def _leer_filas(cur, consulta, params, columnas):
+    # Cursores sin COPY (conexiones ficticias o reproducidas): se arma por columnas
+    cur.execute(consulta, params)
+    filas = cur.fetchall()
+    valores = list(zip(*filas)) if filas else [()] * len(columnas)
+    return pd.DataFrame({
+        nombre: pd.Series(columna, dtype='object')
+        for (nombre, _), columna in zip(columnas, valores)
+    })
+
+def fetch_dataframe(conn, sql, params=None, tipos=None):
+    """
+    Ejecuta una consulta SELECT y retorna el resultado como DataFrame tipado.
+    
+    Los tipos salen de las columnas de la consulta: fechas y timestamps como
+    datetime64, enteros como Int64 (admiten nulos), numeric como float64,
+    booleanos como boolean y horas como texto HH:MM:SS. Con tipos se
+    reemplazan por columna, por ejemplo {'estado': 'categoria'}.
+    
+    Args:
+        conn: Conexión a la base de datos
+        sql (str): Consulta SELECT (sin punto y coma final)
+        params (tuple): Parámetros de la consulta
+        tipos (dict): Columna -> tipo ('entero', 'decimal', 'texto', 'categoria',
+            'booleano', 'fecha', 'fecha_hora', 'fecha_hora_tz', 'hora')
+    
+    Returns:
+        pd.DataFrame: Resultado, o None si hay error
+    """
+    try:
+        if conn is None:
+            _sin_conexion()
+            return None
+        
+        # Verificar si la transacción está abortada y reiniciarla
+        if not en_unidad_de_trabajo(conn) and hasattr(conn, 'status') and conn.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
+            reset_transaction(conn)
+        
+        consulta = sql.strip().rstrip(';')
+        with conn.cursor() as cur:
+            columnas = [(nombre, (tipos or {}).get(nombre, tipo)) for nombre, tipo in _describir(cur, consulta, params)]
+            if hasattr(cur, 'copy_expert'):
+                df = _leer_copy(cur, consulta, params, columnas)
+            else:
+                df = _leer_filas(cur, consulta, params, columnas)
+        
+        terminar_lectura(conn)
+        
+        for nombre, tipo in columnas:
+            df[nombre] = convertir_columna(df[nombre], tipo)
+        return df
+    except psycopg2.Error as e:
+        if conn is not None and not en_unidad_de_trabajo(conn):
+            reset_transaction(conn)
+        if _relanzar_errores(conn):
+            raise
+        notificaciones.error(f"Error en consulta SQL: {e}")
+        return None
+    except Exception as e:
+        if _relanzar_errores(conn):
+            raise
+        notificaciones.error(f"Error inesperado en consulta SQL: {e}")
+        return None
@@ -0,0 +1,231 @@
+"""
+Ejecución concurrente de consultas independientes en conexiones del pool
+"""
+import time
+import threading
+import psycopg2
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from capa_datos.database_connection import pool_para_operacion, conexion_del_pool
+from capa_datos.data_access import propagar_errores
+from capa_datos import notificaciones
+from config.settings import obtener_configuracion
+
+# Hilos compartidos por todas las sesiones del proceso; acotan también las
+# conexiones simultáneas que se piden a cada pool
+MAX_HILOS = obtener_configuracion().entero('CONSULTAS_MAX_HILOS', 4)
+TIMEOUT_POR_DEFECTO = obtener_configuracion().decimal('CONSULTAS_TIMEOUT_SEGUNDOS', 30)
+# Espera máxima en la cola de hilos antes de empezar (no cuenta para el plazo de cada tarea)
+ESPERA_COLA_POR_DEFECTO = obtener_configuracion().decimal('CONSULTAS_ESPERA_COLA_SEGUNDOS', 60)
+# Cada cuánto se revisa si una tarea de la cola ya empezó
+INTERVALO_COLA = 0.05
+
+_ejecutor = ThreadPoolExecutor(max_workers=MAX_HILOS, thread_name_prefix='consultas')
+
+class EjecucionConcurrente:
+    """
+    Lote de consultas independientes que se ejecutan en paralelo.
+    
+    Cada consulta registrada con consulta() corre en su propia conexión del
+    pool; las tareas registradas con tarea() reciben solo sus argumentos (por
+    ejemplo, métodos de lógica que abren su propia conexión). ejecutar() espera
+    a todas: el plazo de cada tarea se cuenta desde que empieza a correr, no
+    desde que entra en la cola de hilos que comparten las sesiones. Si una
+    falla o se vence un plazo, cancela las consultas que siguen en curso y
+    relanza el error.
+    
+    Ejemplo:
+        lote = EjecucionConcurrente(timeout=10)
+        lote.consulta('usadas', get_canchas_mas_usadas_db, fecha_inicio, fecha_fin)
+        lote.consulta('recaudan', get_canchas_mas_recaudan_db, fecha_inicio, fecha_fin)
+        resultados = lote.ejecutar()
+    """
+    
+    def __init__(self, timeout=None, paralelo=True):
+        """
+        Args:
+            timeout (float): Segundos máximos de cada tarea desde que empieza
+                (por defecto CONSULTAS_TIMEOUT_SEGUNDOS)
+            paralelo (bool): Si es False las tareas se ejecutan una tras otra
+                en el hilo actual (útil para diagnosticar)
+        """
+        self.timeout = TIMEOUT_POR_DEFECTO if timeout is None else timeout
+        self.paralelo = paralelo
+        self._tareas = {}
+        self._conexiones = {}
+        self._inicios = {}
+        self._lock = threading.Lock()
+        self._pool = None
+    
+    def consulta(self, nombre, funcion_db, *args):
+        """
+        Registra una función de la capa de datos que recibe la conexión como
+        primer argumento.
+        
+        Args:
+            nombre (str): Nombre del resultado
+            funcion_db (callable): Función con firma funcion_db(conn, *args)
+            *args: Argumentos adicionales
+        """
+        if self._pool is None:
+            # El pool se resuelve en el hilo de la sesión (depende del usuario
+            # y del modo: réplica dentro de un método de solo lectura)
+            self._pool = pool_para_operacion()
+        self._tareas[nombre] = (self._ejecutar_consulta, (nombre, funcion_db, args))
+    
+    def tarea(self, nombre, funcion, *args):
+        """
+        Registra una función cualquiera; no usa una conexión del pool.
+        
+        Args:
+            nombre (str): Nombre del resultado
+            funcion (callable): Función a ejecutar
+            *args: Argumentos de la función
+        """
+        self._tareas[nombre] = (funcion, args)
+    
+    def _ejecutar_consulta(self, nombre, funcion_db, args):
+        """
+        Ejecuta una consulta en una conexión del pool (corre en un hilo del ejecutor).
+        """
+        with conexion_del_pool(self._pool) as conn:
+            with self._lock:
+                self._conexiones[nombre] = conn
+            try:
+                # Al vencer el plazo el servidor aborta la consulta aunque
+                # la cancelación desde el cliente no llegue. Es un SET de
+                # sesión (las funciones de datos reinician la transacción, así
+                # que SET LOCAL no llegaría a la consulta) y se deshace abajo.
+                with conn.cursor() as cur:
+                    cur.execute("SET statement_timeout = %s", (max(1, int(self.timeout * 1000)),))
+                conn.commit()
+                
+                with propagar_errores():
+                    return funcion_db(conn, *args)
+            finally:
+                with self._lock:
+                    self._conexiones.pop(nombre, None)
+                self._restaurar_timeout(conn)
+    
+    def _restaurar_timeout(self, conn):
+        """
+        Vuelve statement_timeout al valor de la sesión antes de devolver la
+        conexión al pool, para que no lo herede quien la tome después. Si no se
+        puede, la conexión se cierra y el pool la descarta.
+        """
+        if conn.closed:
+            return
+        try:
+            conn.rollback()
+            with conn.cursor() as cur:
+                cur.execute("RESET statement_timeout")
+            conn.commit()
+        except psycopg2.Error:
+            conn.close()
+    
+    def _en_hilo(self, contexto, nombre, funcion, args):
+        """
+        Ejecuta una tarea con el contexto de la sesión que la lanzó (ver
+        capturar_contexto en capa_datos/notificaciones.py), para que pueda leer
+        el estado de la sesión y mostrar mensajes. Anota cuándo empezó, que es
+        desde donde corre su plazo.
+        """
+        with self._lock:
+            self._inicios[nombre] = time.perf_counter()
+        notificaciones.activar_contexto(contexto)
+        return funcion(*args)
+    
+    def _vencidas(self, futuros, pendientes, limite_cola):
+        """
+        Tareas pendientes cuyo plazo se venció y segundos hasta el próximo vencimiento.
+        
+        Las que no empezaron se dan por vencidas al pasar limite_cola; mientras
+        haya alguna en la cola se revisa seguido, porque su plazo empieza a
+        correr cuando un hilo la toma.
+        """
+        ahora = time.perf_counter()
+        vencidas = []
+        proximo = limite_cola - ahora
+        with self._lock:
+            for futuro in pendientes:
+                inicio = self._inicios.get(futuros[futuro])
+                if inicio is None:
+                    vencida = limite_cola <= ahora
+                    restante = min(limite_cola - ahora, INTERVALO_COLA)
+                else:
+                    restante = inicio + self.timeout - ahora
+                    vencida = restante <= 0
+                if vencida:
+                    vencidas.append(futuro)
+                proximo = min(proximo, restante)
+        return vencidas, max(0, proximo)
+    
+    def cancelar(self):
+        """
+        Cancela las consultas del lote que siguen en curso en el servidor.
+        """
+        with self._lock:
+            conexiones = list(self._conexiones.values())
+        for conn in conexiones:
+            try:
+                conn.cancel()
+            except Exception:
+                pass
+    
+    def ejecutar(self):
+        """
+        Ejecuta todas las tareas registradas en paralelo.
+        
+        Returns:
+            dict: Resultado de cada tarea por nombre
+        
+        Raises:
+            TimeoutError: Si alguna tarea no terminó dentro de su plazo o no
+                llegó a empezar (CONSULTAS_ESPERA_COLA_SEGUNDOS)
+            Exception: El primer error producido por una tarea
+        """
+        if not self.paralelo:
+            return {nombre: funcion(*args) for nombre, (funcion, args) in self._tareas.items()}
+        
+        contexto = notificaciones.capturar_contexto()
+        inicio = time.perf_counter()
+        limite_cola = inicio + ESPERA_COLA_POR_DEFECTO
+        
+        futuros = {
+            _ejecutor.submit(self._en_hilo, contexto, nombre, funcion, args): nombre
+            for nombre, (funcion, args) in self._tareas.items()
+        }
+        terminados = set()
+        pendientes = set(futuros)
+        error = None
+        vencidas = []
+        while pendientes and error is None:
+            vencidas, espera = self._vencidas(futuros, pendientes, limite_cola)
+            if vencidas:
+                break
+            listos, pendientes = wait(pendientes, timeout=espera, return_when=FIRST_EXCEPTION)
+            terminados |= listos
+            error = next((futuro.exception() for futuro in listos if futuro.exception()), None)
+        
+        if pendientes:
+            for futuro in pendientes:
+                futuro.cancel()
+            self.cancelar()
+            if error is None:
+                with self._lock:
+                    sin_empezar = sorted(futuros[f] for f in vencidas if futuros[f] not in self._inicios)
+                    lentas = sorted(futuros[f] for f in vencidas if futuros[f] in self._inicios)
+                if lentas:
+                    error = TimeoutError(
+                        f"Las consultas {', '.join(lentas)} no terminaron en {self.timeout:g} s "
+                        f"(transcurridos {time.perf_counter() - inicio:.1f} s)"
+                    )
+                else:
+                    error = TimeoutError(
+                        f"Las consultas {', '.join(sin_empezar)} no empezaron en "
+                        f"{ESPERA_COLA_POR_DEFECTO:g} s: los hilos de consultas están ocupados"
+                    )
+        
+        if error is not None:
+            raise error
+        
+        return {futuros[futuro]: futuro.result() for futuro in terminados}
@@ -0,0 +1,175 @@
+"""
+Filas compactas para los resultados de las consultas
+
+Un RealDictRow guarda un diccionario por fila con las claves repetidas en cada
+una. Fila es una tupla (como las de namedtuple) cuya clase se comparte entre
+todas las filas de una consulta: los nombres de las columnas y sus posiciones
+se guardan una sola vez. Admite fila['columna'], fila.get('columna'),
+fila.columna, keys() e items(), así el código escrito para RealDictCursor
+sigue funcionando, y pandas la reconoce como namedtuple al crear DataFrames.
+"""
+import threading
+from operator import itemgetter
+from psycopg2.extensions import cursor as _cursor
+from psycopg2.extras import RealDictCursor
+
+class Fila(tuple):
+    """
+    Fila de resultado con acceso por posición, por clave y por atributo.
+    
+    Iterar o usar `in` recorre los valores, igual que en una namedtuple.
+    """
+    
+    __slots__ = ()
+    _fields = ()
+    _indices = {}
+    
+    def __getitem__(self, clave):
+        if isinstance(clave, str):
+            return tuple.__getitem__(self, self._indices[clave])
+        return tuple.__getitem__(self, clave)
+    
+    def get(self, clave, default=None):
+        """
+        Valor de una columna, o default si la consulta no la trae.
+        """
+        indice = self._indices.get(clave)
+        return default if indice is None else tuple.__getitem__(self, indice)
+    
+    def keys(self):
+        return self._fields
+    
+    def values(self):
+        return tuple(self)
+    
+    def items(self):
+        return list(zip(self._fields, self))
+    
+    def _asdict(self):
+        return dict(zip(self._fields, self))
+    
+    def __repr__(self):
+        return 'Fila(' + ', '.join(f"{nombre}={valor!r}" for nombre, valor in zip(self._fields, self)) + ')'
+    
+    def __reduce__(self):
+        # Las clases se crean por consulta; se reconstruyen a partir de los nombres
+        return _reconstruir, (self._fields, tuple(self))
+
+_clases = {}
+_lock_clases = threading.Lock()
+
+def clase_fila(columnas):
+    """
+    Obtiene la clase de fila para una lista de columnas (una por combinación).
+    
+    Args:
+        columnas (tuple): Nombres de las columnas en orden
+    
+    Returns:
+        type: Subclase de Fila
+    """
+    columnas = tuple(columnas)
+    clase = _clases.get(columnas)
+    if clase is None:
+        with _lock_clases:
+            clase = _clases.get(columnas)
+            if clase is None:
+                atributos = {
+                    '__slots__': (),
+                    '_fields': columnas,
+                    # Si un nombre se repite queda la última columna, como en RealDictCursor
+                    '_indices': {nombre: indice for indice, nombre in enumerate(columnas)}
+                }
+                for nombre, indice in atributos['_indices'].items():
+                    # Las columnas que chocan con un método (count, index, keys...) solo se leen por clave
+                    if not hasattr(Fila, nombre):
+                        atributos[nombre] = property(itemgetter(indice))
+                clase = type('Fila', (Fila,), atributos)
+                _clases[columnas] = clase
+    return clase
+
+def _reconstruir(columnas, valores):
+    return tuple.__new__(clase_fila(columnas), valores)
+
+class CursorFilas(_cursor):
+    """
+    Cursor de psycopg2 que entrega Fila en lugar de tuplas.
+    
+    Se usa como cursor_factory en lugar de RealDictCursor.
+    """
+    
+    def execute(self, query, vars=None):
+        self._clase_fila = None
+        return super().execute(query, vars)
+    
+    def executemany(self, query, vars_list):
+        self._clase_fila = None
+        return super().executemany(query, vars_list)
+    
+    def callproc(self, procname, parameters=None):
+        self._clase_fila = None
+        return super().callproc(procname, parameters)
+    
+    def _clase(self):
+        # En los cursores con nombre description existe recién después del primer fetch
+        clase = getattr(self, '_clase_fila', None)
+        if clase is None:
+            clase = self._clase_fila = clase_fila(columna[0] for columna in self.description)
+        return clase
+    
+    def fetchone(self):
+        fila = super().fetchone()
+        if fila is None:
+            return None
+        return tuple.__new__(self._clase(), fila)
+    
+    def fetchmany(self, size=None):
+        filas = super().fetchmany(self.arraysize if size is None else size)
+        if not filas:
+            return filas
+        clase = self._clase()
+        return [tuple.__new__(clase, fila) for fila in filas]
+    
+    def fetchall(self):
+        filas = super().fetchall()
+        if not filas:
+            return filas
+        clase = self._clase()
+        return [tuple.__new__(clase, fila) for fila in filas]
+    
+    def __iter__(self):
+        # super().__iter__() es el mismo cursor: se avanza con next() para no
+        # volver a entrar en este generador
+        iterador = super().__iter__()
+        clase = None
+        while True:
+            try:
+                fila = next(iterador)
+            except StopIteration:
+                return
+            if clase is None:
+                clase = self._clase()
+            yield tuple.__new__(clase, fila)
+
+def convertir_filas(filas, columnas, cursor_factory=None):
+    """
+    Da a filas ya leídas (tuplas) la forma que entregaría un cursor_factory.
+    
+    La usan las conexiones sin servidor (reproducidas o ficticias).
+    
+    Args:
+        filas (list): Tuplas de valores
+        columnas (list): Nombres de las columnas
+        cursor_factory (type): CursorFilas, RealDictCursor o None para tuplas
+    
+    Returns:
+        list: Filas convertidas
+    """
+    if cursor_factory is None or not filas:
+        return filas
+    if issubclass(cursor_factory, CursorFilas):
+        clase = clase_fila(columnas)
+        return [tuple.__new__(clase, fila) for fila in filas]
+    if issubclass(cursor_factory, RealDictCursor):
+        return [dict(zip(columnas, fila)) for fila in filas]
+    return filas
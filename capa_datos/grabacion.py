@@ -0,0 +1,598 @@
+"""
+Grabación y reproducción de las consultas de una sesión
+
+GrabadoraConexiones envuelve la fábrica de conexiones real y guarda cada
+consulta con sus parámetros, columnas, filas y duración en un archivo de
+líneas JSON comprimido. ReproductorConexiones responde después las mismas
+consultas desde ese archivo, sin base de datos, con la latencia grabada
+(escalada) o sin latencia. Ambas se instalan con establecer_fabrica_conexiones(),
+así la lógica de negocio y las vistas se miden sin modificarlas.
+
+Las filas conservan los tipos que entrega psycopg2 (date, time, datetime,
+Decimal, timedelta, bytes), para que el costo de convertirlas y darles formato
+sea el mismo que con la base real.
+"""
+import io
+import gzip
+import json
+import time
+import atexit
+import threading
+from collections import namedtuple
+from datetime import datetime
+import psycopg2
+import psycopg2.errors
+from psycopg2.extensions import STATUS_READY
+from capa_datos.filas import convertir_filas
+from capa_datos.database_connection import establecer_fabrica_conexiones, abrir_conexion_predeterminada
+from capa_datos.instrumentacion import Contadores
+from utils.json_tipado import codificar, decodificar
+
+FORMATO = 'sportcourt-grabacion'
+VERSION = 1
+
+# Elementos de cursor.description en la reproducción (admiten col.name y col[0])
+Columna = namedtuple('Columna', 'name type_code display_size internal_size precision scale null_ok')
+
+class ConsultaNoGrabada(psycopg2.DatabaseError):
+    """
+    La consulta no aparece en la grabación que se está reproduciendo.
+    """
+
+def normalizar_sql(consulta):
+    """
+    Texto de la consulta con los espacios colapsados, usado como clave.
+    
+    Args:
+        consulta: Consulta como str, bytes o psycopg2.sql.Composable
+    
+    Returns:
+        str: Texto normalizado
+    """
+    if isinstance(consulta, bytes):
+        consulta = consulta.decode('utf-8')
+    elif not isinstance(consulta, str):
+        # Los psycopg2.sql.Composed necesitan una conexión para as_string()
+        consulta = repr(consulta)
+    return ' '.join(consulta.split())
+
+def clave_parametros(parametros):
+    """
+    Representación estable de los parámetros de una consulta.
+    
+    Args:
+        parametros: Tupla, lista, diccionario o None
+    
+    Returns:
+        str: Parámetros como JSON
+    """
+    return json.dumps(parametros, default=codificar, sort_keys=True, ensure_ascii=False)
+
+def _clave_copy(cursor, sql):
+    """
+    Clave de un COPY: si el comando salió de mogrify() se usa la consulta
+    original y sus parámetros, que no dependen de cómo los cita el servidor.
+    """
+    if sql in cursor._mogrificadas:
+        return cursor._mogrificadas[sql]
+    return normalizar_sql(sql), clave_parametros(None)
+
+def _escribir_copia(archivo, datos):
+    archivo.write(datos.decode('utf-8') if isinstance(archivo, io.TextIOBase) else datos)
+
+def _valores_fila(fila):
+    return tuple(fila.values()) if isinstance(fila, dict) else tuple(fila)
+
+def _clase_error(datos):
+    """
+    Clase de psycopg2 con la que se relanza un error grabado.
+    """
+    if datos.get('pgcode'):
+        try:
+            return psycopg2.errors.lookup(datos['pgcode'])
+        except KeyError:
+            pass
+    return getattr(psycopg2, datos.get('clase', ''), psycopg2.DatabaseError)
+
+class _CursorGrabado:
+    """
+    Cursor que ejecuta en el cursor real y registra cada resultado.
+    
+    Las filas se leen completas al ejecutar (para grabarlas) y se entregan
+    desde memoria a quien llama a fetch*.
+    """
+    
+    def __init__(self, cursor, grabadora):
+        self._cursor = cursor
+        self._grabadora = grabadora
+        self._filas = []
+        self._posicion = 0
+        self._mogrificadas = {}
+    
+    def _ejecutar(self, sql, parametros, ejecutar, leer=True, copia=None):
+        inicio = time.perf_counter()
+        try:
+            ejecutar()
+            filas = []
+            # Los cursores con nombre solo tienen description después de leer
+            if leer and (self._cursor.name or self._cursor.description is not None):
+                filas = self._cursor.fetchall()
+        except psycopg2.Error as error:
+            self._grabadora.registrar({
+                'sql': sql,
+                'params': parametros,
+                'ms': (time.perf_counter() - inicio) * 1000,
+                'error': {
+                    'clase': type(error).__name__,
+                    'pgcode': error.pgcode,
+                    'mensaje': str(error)
+                }
+            })
+            raise
+        
+        descripcion = self._cursor.description
+        entrada = {
+            'sql': sql,
+            'params': parametros,
+            'ms': (time.perf_counter() - inicio) * 1000,
+            'columnas': [[col.name, col.type_code] for col in descripcion] if descripcion else None,
+            'rowcount': self._cursor.rowcount,
+            'estado': self._cursor.statusmessage,
+            'filas': [_valores_fila(fila) for fila in filas]
+        }
+        if copia is not None:
+            entrada['copia'] = copia.getvalue()
+        self._grabadora.registrar(entrada)
+        self._filas = filas
+        self._posicion = 0
+    
+    def execute(self, query, vars=None):
+        self._ejecutar(
+            normalizar_sql(query), clave_parametros(vars),
+            lambda: self._cursor.execute(query, vars)
+        )
+    
+    def executemany(self, query, vars_list):
+        vars_list = list(vars_list)
+        self._ejecutar(
+            normalizar_sql(query), clave_parametros(vars_list),
+            lambda: self._cursor.executemany(query, vars_list), leer=False
+        )
+    
+    def mogrify(self, query, vars=None):
+        resultado = self._cursor.mogrify(query, vars)
+        self._mogrificadas[resultado] = (normalizar_sql(query), clave_parametros(vars))
+        return resultado
+    
+    def copy_expert(self, sql, file, size=8192):
+        # Solo se graban los COPY ... TO STDOUT (lecturas)
+        if 'to stdout' not in normalizar_sql(sql).lower():
+            return self._cursor.copy_expert(sql, file, size)
+        copia = io.BytesIO()
+        texto, parametros = _clave_copy(self, sql)
+        self._ejecutar(texto, parametros, lambda: self._cursor.copy_expert(sql, copia, size), leer=False, copia=copia)
+        _escribir_copia(file, copia.getvalue())
+    
+    def callproc(self, procname, parameters=None):
+        self._ejecutar(
+            f"callproc {procname}", clave_parametros(parameters),
+            lambda: self._cursor.callproc(procname, parameters)
+        )
+        return parameters
+    
+    def fetchone(self):
+        if self._posicion >= len(self._filas):
+            return None
+        self._posicion += 1
+        return self._filas[self._posicion - 1]
+    
+    def fetchmany(self, size=None):
+        size = self._cursor.arraysize if size is None else size
+        filas = self._filas[self._posicion:self._posicion + size]
+        self._posicion += len(filas)
+        return filas
+    
+    def fetchall(self):
+        filas = self._filas[self._posicion:]
+        self._posicion = len(self._filas)
+        return filas
+    
+    def __iter__(self):
+        while self._posicion < len(self._filas):
+            yield self.fetchone()
+    
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+    
+    def close(self):
+        self._cursor.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+
+class _ConexionGrabada:
+    """
+    Conexión real cuyos cursores registran sus consultas; el resto se delega.
+    """
+    
+    def __init__(self, conn, grabadora):
+        self.__dict__['_conn'] = conn
+        self.__dict__['_grabadora'] = grabadora
+    
+    def cursor(self, *args, **kwargs):
+        return _CursorGrabado(self._conn.cursor(*args, **kwargs), self._grabadora)
+    
+    def __getattr__(self, nombre):
+        return getattr(self._conn, nombre)
+    
+    def __setattr__(self, nombre, valor):
+        # Por ejemplo conn.autocommit = True
+        setattr(self._conn, nombre, valor)
+    
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+    
+    def __exit__(self, *args):
+        return self._conn.__exit__(*args)
+
+class GrabadoraConexiones:
+    """
+    Fábrica para establecer_fabrica_conexiones() que graba las consultas de
+    las conexiones que entrega.
+    
+    Args:
+        fabrica (callable): Fábrica que abre las conexiones reales (por ejemplo
+            FabricaConexionesMedidas o abrir_conexion_predeterminada)
+        ruta (str): Archivo de salida; se comprime si termina en .gz
+    """
+    
+    def __init__(self, fabrica, ruta):
+        self.fabrica = fabrica
+        self.ruta = ruta
+        # Los benchmarks siguen contando con los contadores de la fábrica real
+        self.contadores = getattr(fabrica, 'contadores', None)
+        self.consultas = 0
+        self._lock = threading.Lock()
+        abrir = gzip.open if ruta.endswith('.gz') else open
+        self._archivo = abrir(ruta, 'wt', encoding='utf-8')
+        self._escribir({
+            'formato': FORMATO,
+            'version': VERSION,
+            'fecha': datetime.now().isoformat(timespec='seconds')
+        })
+    
+    def _escribir(self, entrada):
+        self._archivo.write(json.dumps(entrada, default=codificar, ensure_ascii=False, separators=(',', ':')))
+        self._archivo.write('\n')
+    
+    def __call__(self):
+        inicio = time.perf_counter()
+        conn = self.fabrica()
+        if conn is None:
+            return None
+        self.registrar({'conexion': (time.perf_counter() - inicio) * 1000})
+        return _ConexionGrabada(conn, self)
+    
+    def registrar(self, entrada):
+        """
+        Agrega una entrada (consulta o apertura de conexión) al archivo.
+        
+        Args:
+            entrada (dict): Datos de la entrada
+        """
+        with self._lock:
+            if self._archivo is None:
+                return
+            self._escribir(entrada)
+            if 'sql' in entrada:
+                self.consultas += 1
+    
+    def cerrar(self):
+        """
+        Cierra el archivo y la fábrica real (si tiene cerrar()).
+        """
+        with self._lock:
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None
+        if hasattr(self.fabrica, 'cerrar'):
+            self.fabrica.cerrar()
+
+def leer_grabacion(ruta):
+    """
+    Lee las entradas de una grabación.
+    
+    Una grabación interrumpida (sin el final del archivo comprimido) se lee
+    hasta la última línea completa.
+    
+    Args:
+        ruta (str): Archivo de la grabación
+    
+    Returns:
+        list: Entradas en el orden en que se grabaron (sin el encabezado)
+    
+    Raises:
+        ValueError: Si el archivo no es una grabación
+    """
+    abrir = gzip.open if ruta.endswith('.gz') else open
+    entradas = []
+    with abrir(ruta, 'rt', encoding='utf-8') as archivo:
+        try:
+            encabezado = json.loads(archivo.readline() or '{}')
+            if encabezado.get('formato') != FORMATO:
+                raise ValueError(f"{ruta} no es una grabación de consultas")
+            for linea in archivo:
+                if not linea.endswith('\n'):
+                    break
+                entradas.append(json.loads(linea, object_hook=decodificar))
+        except EOFError:
+            pass
+    return entradas
+
+class CursorReproducido:
+    """
+    Cursor que responde desde la grabación.
+    """
+    
+    arraysize = 1
+    itersize = 2000
+    
+    def __init__(self, conexion, cursor_factory=None, name=None):
+        self.connection = conexion
+        self.name = name
+        self._cursor_factory = cursor_factory
+        self._filas = []
+        self._posicion = 0
+        self.description = None
+        self.rowcount = -1
+        self.statusmessage = None
+        self.closed = False
+        self._mogrificadas = {}
+    
+    def _responder(self, sql, parametros, ida_vuelta=1):
+        reproductor = self.connection.reproductor
+        entrada = reproductor.buscar(sql, parametros)
+        reproductor.contadores.ida_vuelta += ida_vuelta
+        reproductor.esperar(entrada.get('ms', 0))
+        if not self.connection.autocommit:
+            self.connection.en_transaccion = True
+        
+        if 'error' in entrada:
+            raise _clase_error(entrada['error'])(entrada['error']['mensaje'])
+        
+        columnas = entrada.get('columnas')
+        filas = [tuple(fila) for fila in entrada.get('filas', [])]
+        if columnas:
+            filas = convertir_filas(filas, [nombre for nombre, _ in columnas], self._cursor_factory)
+        self._filas = filas
+        self._posicion = 0
+        self.description = [Columna(nombre, tipo, None, None, None, None, None)
+                            for nombre, tipo in columnas] if columnas else None
+        self.rowcount = entrada.get('rowcount', len(filas))
+        self.statusmessage = entrada.get('estado')
+        return entrada
+    
+    def execute(self, query, vars=None):
+        self._responder(normalizar_sql(query), clave_parametros(vars))
+    
+    def executemany(self, query, vars_list):
+        vars_list = list(vars_list)
+        self._responder(normalizar_sql(query), clave_parametros(vars_list), ida_vuelta=len(vars_list))
+    
+    def callproc(self, procname, parameters=None):
+        self._responder(f"callproc {procname}", clave_parametros(parameters))
+        return parameters
+    
+    def mogrify(self, query, vars=None):
+        # Sin servidor no se puede citar igual que psycopg2: basta con un
+        # comando que copy_expert() reconozca
+        clave = (normalizar_sql(query), clave_parametros(vars))
+        resultado = f"{clave[0]} /* {clave[1]} */".encode('utf-8')
+        self._mogrificadas[resultado] = clave
+        return resultado
+    
+    def copy_expert(self, sql, file, size=8192):
+        entrada = self._responder(*_clave_copy(self, sql))
+        _escribir_copia(file, entrada.get('copia') or b'')
+    
+    def _entregar(self, filas):
+        self.connection.reproductor.contadores.filas += len(filas)
+        return filas
+    
+    def fetchone(self):
+        if self._posicion >= len(self._filas):
+            return None
+        self._posicion += 1
+        self.connection.reproductor.contadores.filas += 1
+        return self._filas[self._posicion - 1]
+    
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        filas = self._filas[self._posicion:self._posicion + size]
+        self._posicion += len(filas)
+        return self._entregar(filas)
+    
+    def fetchall(self):
+        filas = self._filas[self._posicion:]
+        self._posicion = len(self._filas)
+        return self._entregar(filas)
+    
+    def __iter__(self):
+        while self._posicion < len(self._filas):
+            yield self.fetchone()
+    
+    @property
+    def rownumber(self):
+        return self._posicion
+    
+    def close(self):
+        self.closed = True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+
+class ConexionReproducida:
+    """
+    Conexión sin servidor que entrega CursorReproducido.
+    """
+    
+    def __init__(self, reproductor):
+        self.reproductor = reproductor
+        self.closed = 0
+        self.status = STATUS_READY
+        self.autocommit = False
+        self.cursor_factory = None
+        self.en_transaccion = False
+    
+    def cursor(self, name=None, cursor_factory=None, **kwargs):
+        return CursorReproducido(self, cursor_factory=cursor_factory or self.cursor_factory, name=name)
+    
+    def _fin_transaccion(self):
+        # Igual que ConexionMedida: sin transacción abierta no hay ida y vuelta
+        if self.en_transaccion:
+            self.reproductor.contadores.ida_vuelta += 1
+            self.en_transaccion = False
+    
+    def commit(self):
+        self._fin_transaccion()
+    
+    def rollback(self):
+        self._fin_transaccion()
+    
+    def cancel(self):
+        pass
+    
+    def close(self):
+        self.closed = 1
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.commit()
+        else:
+            self.rollback()
+
+class ReproductorConexiones:
+    """
+    Fábrica para establecer_fabrica_conexiones() que responde las consultas
+    desde una grabación.
+    
+    Cada consulta se busca primero por texto y parámetros; si esos parámetros
+    no se grabaron (por ejemplo, dependen de la fecha actual) se usa la
+    siguiente respuesta grabada para el mismo texto y se cuenta en
+    aproximadas. Las respuestas de una misma clave se entregan en el orden
+    grabado y vuelven a empezar al agotarse.
+    
+    Args:
+        ruta (str): Archivo de la grabación
+        latencia (float): Factor sobre la duración grabada de cada consulta y
+            conexión (1 = la real, 0 = sin esperas)
+        estricto (bool): Si es False, las consultas que no aparecen en la
+            grabación responden sin filas en lugar de lanzar ConsultaNoGrabada
+    """
+    
+    def __init__(self, ruta, latencia=1.0, estricto=True):
+        self.ruta = ruta
+        self.latencia = latencia
+        self.estricto = estricto
+        self.contadores = Contadores()
+        self.aproximadas = 0
+        self.faltantes = set()
+        self._exactas = {}
+        self._por_sql = {}
+        self._posiciones = {}
+        self._conexiones_ms = []
+        self._lock = threading.Lock()
+        
+        for entrada in leer_grabacion(ruta):
+            if 'conexion' in entrada:
+                self._conexiones_ms.append(entrada['conexion'])
+                continue
+            self._exactas.setdefault((entrada['sql'], entrada['params']), []).append(entrada)
+            self._por_sql.setdefault(entrada['sql'], []).append(entrada)
+        self.consultas = sum(len(entradas) for entradas in self._por_sql.values())
+    
+    def _siguiente(self, clave, entradas):
+        posicion = self._posiciones.get(clave, 0)
+        self._posiciones[clave] = posicion + 1
+        return entradas[posicion % len(entradas)]
+    
+    def buscar(self, sql, parametros):
+        """
+        Obtiene la respuesta grabada de una consulta.
+        
+        Args:
+            sql (str): Texto normalizado (normalizar_sql())
+            parametros (str): Parámetros normalizados (clave_parametros())
+        
+        Returns:
+            dict: Entrada de la grabación
+        
+        Raises:
+            ConsultaNoGrabada: Si el texto no se grabó y el modo es estricto
+        """
+        with self._lock:
+            exactas = self._exactas.get((sql, parametros))
+            if exactas:
+                return self._siguiente(('exacta', sql, parametros), exactas)
+            
+            por_sql = self._por_sql.get(sql)
+            if por_sql:
+                self.aproximadas += 1
+                return self._siguiente(('sql', sql), por_sql)
+            
+            self.faltantes.add(sql[:120])
+        if self.estricto:
+            raise ConsultaNoGrabada(f"Consulta no grabada: {sql[:120]}")
+        return {'columnas': None, 'filas': [], 'rowcount': 0}
+    
+    def esperar(self, ms):
+        """
+        Simula la latencia grabada, escalada por el factor de latencia.
+        """
+        if self.latencia > 0 and ms > 0:
+            time.sleep(ms * self.latencia / 1000)
+    
+    def __call__(self):
+        self.contadores.conexiones += 1
+        if self._conexiones_ms:
+            self.esperar(sum(self._conexiones_ms) / len(self._conexiones_ms))
+        return ConexionReproducida(self)
+    
+    def cerrar(self):
+        """
+        No hay recursos que liberar; existe para usarse igual que las otras fábricas.
+        """
+
+# Grabación de la sesión de Streamlit (DB_GRABAR_SESION)
+_grabadora_sesion = None
+_lock_sesion = threading.Lock()
+
+def activar_grabacion_sesion(ruta):
+    """
+    Graba todas las consultas del proceso que pasan por get_db_connection()
+    y pool_para_operacion(). Se puede llamar en cada ejecución del script: solo
+    la primera instala la grabadora; el archivo se cierra al salir del proceso.
+    
+    Args:
+        ruta (str): Archivo de salida
+    
+    Returns:
+        GrabadoraConexiones: Grabadora instalada
+    """
+    global _grabadora_sesion
+    with _lock_sesion:
+        if _grabadora_sesion is None:
+            _grabadora_sesion = GrabadoraConexiones(abrir_conexion_predeterminada, ruta)
+            establecer_fabrica_conexiones(_grabadora_sesion)
+            atexit.register(_grabadora_sesion.cerrar)
+    return _grabadora_sesion
@@ -0,0 +1,208 @@
+"""
+Conexiones instrumentadas que cuentan idas y vueltas al servidor y filas leídas
+
+Se usan desde las herramientas de medición junto con
+establecer_fabrica_conexiones(): la lógica de negocio sigue llamando a
+get_db_connection() y recibe una ConexionMedida sin saberlo.
+"""
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+class Contadores:
+    """
+    Totales acumulados por todas las conexiones de una fábrica.
+    """
+    
+    def __init__(self):
+        self.reiniciar()
+    
+    def reiniciar(self):
+        """
+        Pone los contadores en cero.
+        """
+        self.ida_vuelta = 0
+        self.filas = 0
+        self.conexiones = 0
+    
+    def instantanea(self):
+        """
+        Retorna los valores actuales.
+        
+        Returns:
+            dict: {'ida_vuelta', 'filas', 'conexiones'}
+        """
+        return {
+            'ida_vuelta': self.ida_vuelta,
+            'filas': self.filas,
+            'conexiones': self.conexiones
+        }
+
+class _CursorMedido:
+    """
+    Mezcla que cuenta las operaciones de un cursor de psycopg2.
+    
+    Cada execute, callproc o COPY es una ida y vuelta; executemany hace una
+    por cada juego de parámetros. En los cursores con nombre (del lado del
+    servidor) cada fetch también viaja al servidor.
+    """
+    
+    def _contar(self, ida_vuelta=0, filas=0):
+        contadores = getattr(self.connection, 'contadores', None)
+        if contadores is not None:
+            contadores.ida_vuelta += ida_vuelta
+            contadores.filas += filas
+    
+    def execute(self, query, vars=None):
+        self._contar(ida_vuelta=1)
+        return super().execute(query, vars)
+    
+    def executemany(self, query, vars_list):
+        vars_list = list(vars_list)
+        self._contar(ida_vuelta=len(vars_list))
+        return super().executemany(query, vars_list)
+    
+    def callproc(self, procname, parameters=None):
+        self._contar(ida_vuelta=1)
+        return super().callproc(procname, parameters)
+    
+    def copy_expert(self, sql, file, size=8192):
+        self._contar(ida_vuelta=1)
+        return super().copy_expert(sql, file, size)
+    
+    def fetchone(self):
+        fila = super().fetchone()
+        self._contar(ida_vuelta=1 if self.name else 0, filas=0 if fila is None else 1)
+        return fila
+    
+    def fetchmany(self, size=None):
+        filas = super().fetchmany(self.arraysize if size is None else size)
+        self._contar(ida_vuelta=1 if self.name else 0, filas=len(filas))
+        return filas
+    
+    def fetchall(self):
+        filas = super().fetchall()
+        self._contar(ida_vuelta=1 if self.name else 0, filas=len(filas))
+        return filas
+    
+    def __next__(self):
+        fila = super().__next__()
+        # Un cursor con nombre trae itersize filas por viaje
+        nuevo_lote = bool(self.name) and (self.rownumber - 1) % self.itersize == 0
+        self._contar(ida_vuelta=1 if nuevo_lote else 0, filas=1)
+        return fila
+
+_clases_medidas = {}
+
+def _clase_medida(clase):
+    """
+    Obtiene la variante medida de una clase de cursor (por ejemplo RealDictCursor).
+    
+    Args:
+        clase (type): Clase de cursor de psycopg2
+    
+    Returns:
+        type: Subclase que cuenta sus operaciones
+    """
+    if issubclass(clase, _CursorMedido):
+        return clase
+    medida = _clases_medidas.get(clase)
+    if medida is None:
+        medida = type(f"{clase.__name__}Medido", (_CursorMedido, clase), {})
+        _clases_medidas[clase] = medida
+    return medida
+
+class ConexionMedida(psycopg2.extensions.connection):
+    """
+    Conexión de psycopg2 que cuenta las idas y vueltas de sus cursores,
+    commits y rollbacks.
+    
+    Con descartar_escrituras, commit() revierte la transacción (para medir
+    escrituras sin cambiar los datos). Con reutilizable, close() solo
+    revierte y la conexión sigue abierta para la siguiente llamada.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.contadores = None
+        self.descartar_escrituras = False
+        self.reutilizable = False
+    
+    def cursor(self, *args, **kwargs):
+        clase = kwargs.get('cursor_factory') or self.cursor_factory or psycopg2.extensions.cursor
+        kwargs['cursor_factory'] = _clase_medida(clase)
+        return super().cursor(*args, **kwargs)
+    
+    def _contar_fin_transaccion(self):
+        # Sin transacción abierta psycopg2 no envía nada al servidor
+        if self.contadores is not None and self.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            self.contadores.ida_vuelta += 1
+    
+    def commit(self):
+        self._contar_fin_transaccion()
+        if self.descartar_escrituras:
+            return super().rollback()
+        return super().commit()
+    
+    def rollback(self):
+        self._contar_fin_transaccion()
+        return super().rollback()
+    
+    def close(self):
+        if self.reutilizable and not self.closed:
+            self.rollback()
+            return
+        return super().close()
+    
+    def cerrar(self):
+        """
+        Cierra la conexión aunque sea reutilizable.
+        """
+        return super().close()
+
+class FabricaConexionesMedidas:
+    """
+    Fábrica de ConexionMedida para establecer_fabrica_conexiones().
+    
+    Args:
+        config (dict): Configuración de conexión (get_database_config())
+        reutilizar (bool): Entregar siempre la misma conexión en lugar de abrir una por llamada
+        descartar_escrituras (bool): Revertir en lugar de confirmar las transacciones
+    """
+    
+    def __init__(self, config, reutilizar=False, descartar_escrituras=False):
+        self.config = config
+        self.reutilizar = reutilizar
+        self.descartar_escrituras = descartar_escrituras
+        self.contadores = Contadores()
+        self._conexion = None
+    
+    def __call__(self):
+        if self.reutilizar and self._conexion is not None and not self._conexion.closed:
+            return self._conexion
+        
+        conn = psycopg2.connect(
+            host=self.config['host'],
+            port=self.config['port'],
+            database=self.config['database'],
+            user=self.config['user'],
+            password=self.config['password'],
+            client_encoding='UTF8',
+            application_name='sportcourt_medicion',
+            connection_factory=ConexionMedida
+        )
+        conn.contadores = self.contadores
+        conn.descartar_escrituras = self.descartar_escrituras
+        conn.reutilizable = self.reutilizar
+        self.contadores.conexiones += 1
+        if self.reutilizar:
+            self._conexion = conn
+        return conn
+    
+    def cerrar(self):
+        """
+        Cierra la conexión reutilizada, si hay una.
+        """
+        if self._conexion is not None and not self._conexion.closed:
+            self._conexion.cerrar()
+        self._conexion = None
@@ -0,0 +1,216 @@
+"""
+Mensajes y estado de sesión de las capas de datos y de lógica
+
+capa_datos y logica_negocio no llaman a Streamlit: informan con error(),
+advertencia(), exito(), info() y detalle() de este módulo, que entregan cada
+mensaje al notificador instalado. Sin interfaz (hilos de trabajo, procesos,
+herramientas de línea de comandos, un servidor) el notificador por defecto
+los escribe en el log "gestionbd"; la aplicación instala el de Streamlit
+(vistas/notificador_streamlit.py).
+
+Lo mismo con el estado de la sesión: estado_sesion() retorna el que provea
+la interfaz (st.session_state en la aplicación) o, sin ella, un diccionario
+propio de cada hilo. Para que un hilo de trabajo informe y lea el estado de
+la sesión que lo lanzó, capturar_contexto() y activar_contexto() usan las
+funciones que instale la interfaz (establecer_contexto_hilos).
+"""
+import logging
+import threading
+import contextlib
+
+# Niveles de los mensajes
+ERROR = 'error'
+ADVERTENCIA = 'advertencia'
+EXITO = 'exito'
+INFO = 'info'
+DETALLE = 'detalle'  # Solo diagnóstico (por ejemplo, a qué servidor se conectó)
+
+_logger = logging.getLogger('gestionbd')
+
+_NIVELES_LOG = {
+    ERROR: logging.ERROR,
+    ADVERTENCIA: logging.WARNING,
+    EXITO: logging.INFO,
+    INFO: logging.INFO,
+    DETALLE: logging.DEBUG
+}
+
+class NotificadorRegistro:
+    """
+    Escribe los mensajes en el log (notificador por defecto, sin interfaz).
+    """
+    
+    def notificar(self, nivel, mensaje):
+        _logger.log(_NIVELES_LOG.get(nivel, logging.INFO), mensaje)
+
+class NotificadorLista:
+    """
+    Guarda los mensajes para revisarlos después, por ejemplo al terminar un
+    lote en otro hilo o proceso.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.mensajes = []
+    
+    def notificar(self, nivel, mensaje):
+        with self._lock:
+            self.mensajes.append((nivel, mensaje))
+    
+    def de_nivel(self, nivel):
+        """
+        Args:
+            nivel (str): ERROR, ADVERTENCIA, EXITO, INFO o DETALLE
+        
+        Returns:
+            list: Mensajes de ese nivel en el orden en que llegaron
+        """
+        with self._lock:
+            return [mensaje for nivel_mensaje, mensaje in self.mensajes if nivel_mensaje == nivel]
+
+# Notificador del proceso y reemplazos por hilo (notificar_con)
+_notificador = NotificadorRegistro()
+_local = threading.local()
+
+# Función que retorna el estado de la sesión de la interfaz (o None)
+_proveedor_estado = None
+
+# Funciones (capturar, activar) que llevan el contexto de la interfaz a otro hilo
+_contexto_hilos = (None, None)
+
+def establecer_notificador(notificador):
+    """
+    Reemplaza el notificador del proceso.
+    
+    Args:
+        notificador: Objeto con notificar(nivel, mensaje); None vuelve al log
+    
+    Returns:
+        El notificador anterior
+    """
+    global _notificador
+    anterior = _notificador
+    _notificador = notificador if notificador is not None else NotificadorRegistro()
+    return anterior
+
+@contextlib.contextmanager
+def notificar_con(notificador):
+    """
+    Usa otro notificador en el hilo actual mientras dura el bloque.
+    
+    Args:
+        notificador: Objeto con notificar(nivel, mensaje)
+    
+    Yields:
+        El mismo notificador
+    """
+    anterior = getattr(_local, 'notificador', None)
+    _local.notificador = notificador
+    try:
+        yield notificador
+    finally:
+        _local.notificador = anterior
+
+def notificador_actual():
+    """
+    Returns:
+        El notificador del hilo (notificar_con) o, si no hay, el del proceso
+    """
+    return getattr(_local, 'notificador', None) or _notificador
+
+def notificar(nivel, mensaje):
+    """
+    Entrega un mensaje al notificador del hilo (o al del proceso).
+    
+    Si el notificador falla, el mensaje se escribe en el log: informar nunca
+    interrumpe la operación que informa.
+    """
+    notificador = notificador_actual()
+    try:
+        notificador.notificar(nivel, mensaje)
+    except Exception:
+        _logger.log(_NIVELES_LOG.get(nivel, logging.INFO), mensaje)
+
+def error(mensaje):
+    notificar(ERROR, mensaje)
+
+def advertencia(mensaje):
+    notificar(ADVERTENCIA, mensaje)
+
+def exito(mensaje):
+    notificar(EXITO, mensaje)
+
+def info(mensaje):
+    notificar(INFO, mensaje)
+
+def detalle(mensaje):
+    notificar(DETALLE, mensaje)
+
+def establecer_estado_sesion(proveedor):
+    """
+    Indica de dónde sale el estado de la sesión.
+    
+    Args:
+        proveedor (callable): Función sin argumentos que retorna un objeto
+            tipo diccionario, o None si en este hilo no hay sesión; None
+            vuelve al diccionario por hilo
+    
+    Returns:
+        callable: Proveedor anterior
+    """
+    global _proveedor_estado
+    anterior = _proveedor_estado
+    _proveedor_estado = proveedor
+    return anterior
+
+def estado_sesion():
+    """
+    Retorna el estado de la sesión actual.
+    
+    Returns:
+        El estado de la interfaz si hay uno para este hilo; si no, un
+        diccionario propio del hilo
+    """
+    if _proveedor_estado is not None:
+        estado = _proveedor_estado()
+        if estado is not None:
+            return estado
+    estado = getattr(_local, 'estado', None)
+    if estado is None:
+        estado = _local.estado = {}
+    return estado
+
+def establecer_contexto_hilos(capturar, activar):
+    """
+    Indica cómo llevar el contexto de la sesión de la interfaz a otro hilo.
+    
+    Args:
+        capturar (callable): Función sin argumentos que retorna el contexto del
+            hilo actual (o None si no hay)
+        activar (callable): Función que recibe ese contexto y lo asocia al hilo actual
+    
+    Returns:
+        tuple: (capturar, activar) anteriores; (None, None) si no había
+    """
+    global _contexto_hilos
+    anterior = _contexto_hilos
+    _contexto_hilos = (capturar, activar)
+    return anterior
+
+def capturar_contexto():
+    """
+    Captura el contexto de la sesión del hilo actual para pasarlo a otro hilo.
+    
+    Returns:
+        El contexto, o None si no hay interfaz o el hilo no tiene sesión
+    """
+    capturar = _contexto_hilos[0]
+    return capturar() if capturar is not None else None
+
+def activar_contexto(contexto):
+    """
+    Asocia al hilo actual un contexto obtenido con capturar_contexto().
+    """
+    activar = _contexto_hilos[1]
+    if contexto is not None and activar is not None:
+        activar(contexto)
@@ -0,0 +1,202 @@
+"""
+Reintentos de unidades de trabajo ante fallas transitorias
+
+ejecutar_con_reintentos() corre una función dentro de escritura() y, si la
+transacción falla por un conflicto de serialización, un deadlock, un bloqueo
+no disponible o una conexión cortada, la vuelve a correr completa después de
+una espera exponencial con jitter. Como cada intento es una transacción
+nueva (la anterior terminó en rollback), repetirla es seguro siempre que la
+función solo toque la base de datos: los mensajes al usuario y demás efectos
+van después de que retorna.
+
+La única falla que no se reintenta por defecto es la conexión cortada
+durante el COMMIT, porque no se sabe si la transacción quedó confirmada; con
+idempotente=True se reintenta igual.
+"""
+import time
+import random
+import threading
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_SERIALIZABLE
+from capa_datos.unidad_trabajo import escritura, en_unidad_de_trabajo
+from capa_datos.database_connection import CircuitoAbierto, base_de_datos_disponible
+from config.settings import obtener_configuracion
+
+# Motivos de reintento
+SERIALIZACION = 'serializacion'
+DEADLOCK = 'deadlock'
+BLOQUEO = 'bloqueo'
+CONEXION = 'conexion'
+
+# SQLSTATE -> motivo (la clase 08, connection_exception, es toda CONEXION)
+SQLSTATES_REINTENTABLES = {
+    '40001': SERIALIZACION,  # serialization_failure
+    '40P01': DEADLOCK,       # deadlock_detected
+    '55P03': BLOQUEO,        # lock_not_available (NOWAIT, lock_timeout)
+    '57P01': CONEXION,       # admin_shutdown
+    '57P02': CONEXION,       # crash_shutdown
+    '57P03': CONEXION        # cannot_connect_now
+}
+
+def clasificar_error(error):
+    """
+    Indica si un error de la base de datos es transitorio.
+    
+    Args:
+        error (Exception): Error lanzado por psycopg2
+    
+    Returns:
+        str: Motivo del reintento (SERIALIZACION, DEADLOCK, BLOQUEO o CONEXION),
+            o None si el error no se debe reintentar
+    """
+    if isinstance(error, CircuitoAbierto):
+        # Reintentar solo sumaría intentos a un servidor que no responde
+        return None
+    codigo = getattr(error, 'pgcode', None)
+    if codigo:
+        if codigo.startswith('08'):
+            return CONEXION
+        return SQLSTATES_REINTENTABLES.get(codigo)
+    # Sin SQLSTATE: la conexión se cortó o no se pudo abrir
+    if isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+        return CONEXION
+    return None
+
+class PoliticaReintentos:
+    """
+    Cantidad de intentos y esperas entre ellos.
+    
+    La espera antes del reintento n es un valor al azar entre 0 y
+    min(espera_maxima, espera_base * 2**n) ("full jitter"), para que las
+    sesiones que chocaron no vuelvan a chocar al mismo tiempo.
+    """
+    
+    def __init__(self, intentos=3, espera_base=0.05, espera_maxima=2.0):
+        self.intentos = max(1, intentos)
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+    
+    def espera(self, intento):
+        """
+        Args:
+            intento (int): Número del intento que falló (desde 1)
+        
+        Returns:
+            float: Segundos a esperar antes del siguiente
+        """
+        return random.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** intento))
+
+def politica_configurada():
+    """
+    Crea la política con DB_RETRY_ATTEMPTS, DB_RETRY_BASE_MS y DB_RETRY_MAX_MS.
+    
+    Returns:
+        PoliticaReintentos: Política de reintentos
+    """
+    configuracion = obtener_configuracion()
+    return PoliticaReintentos(
+        intentos=configuracion.entero('DB_RETRY_ATTEMPTS', 3),
+        espera_base=configuracion.decimal('DB_RETRY_BASE_MS', 50) / 1000,
+        espera_maxima=configuracion.decimal('DB_RETRY_MAX_MS', 2000) / 1000
+    )
+
+class EstadisticasReintentos:
+    """
+    Contadores de ejecutar_con_reintentos() en el proceso.
+    
+    reintentos cuenta por motivo; recuperadas son las ejecuciones que
+    terminaron bien después de al menos un reintento, agotadas las que
+    fallaron en todos los intentos e inciertas las que perdieron la conexión
+    durante el COMMIT y no se reintentaron.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+    
+    def reiniciar(self):
+        with self._lock:
+            self.ejecuciones = 0
+            self.reintentos = {}
+            self.recuperadas = 0
+            self.agotadas = 0
+            self.inciertas = 0
+    
+    def registrar(self, campo, motivo=None):
+        with self._lock:
+            if motivo is not None:
+                self.reintentos[motivo] = self.reintentos.get(motivo, 0) + 1
+            else:
+                setattr(self, campo, getattr(self, campo) + 1)
+    
+    def instantanea(self):
+        """
+        Returns:
+            dict: Copia de los contadores
+        """
+        with self._lock:
+            return {
+                'ejecuciones': self.ejecuciones,
+                'reintentos': dict(self.reintentos),
+                'recuperadas': self.recuperadas,
+                'agotadas': self.agotadas,
+                'inciertas': self.inciertas
+            }
+
+estadisticas_reintentos = EstadisticasReintentos()
+
+def ejecutar_con_reintentos(trabajo, conn=None, serializable=False, idempotente=False, politica=None):
+    """
+    Ejecuta trabajo(conn) en una transacción y la repite ante fallas transitorias.
+    
+    Con conn=None cada intento abre su propia conexión contra el primario, así
+    que una conexión cortada se reemplaza. Si se pasa una conexión y se corta,
+    no se puede reintentar. Dentro de otra unidad de trabajo sobre la misma
+    conexión el trabajo se ejecuta una sola vez: la transacción es de ella.
+    
+    Args:
+        trabajo (callable): Función que recibe la conexión y hace solo trabajo de base de datos
+        conn: Conexión a usar (opcional)
+        serializable (bool): Si la transacción debe ser SERIALIZABLE
+        idempotente (bool): Si se puede repetir aunque el COMMIT haya quedado incierto
+        politica (PoliticaReintentos): Intentos y esperas (default: politica_configurada())
+    
+    Returns:
+        Lo que retorne trabajo
+    
+    Raises:
+        psycopg2.Error: Si el error no es transitorio o se agotaron los intentos
+    """
+    if conn is not None and en_unidad_de_trabajo(conn):
+        return trabajo(conn)
+    
+    politica = politica or politica_configurada()
+    aislamiento = ISOLATION_LEVEL_SERIALIZABLE if serializable else None
+    estadisticas_reintentos.registrar('ejecuciones')
+    
+    for intento in range(1, politica.intentos + 1):
+        confirmando = False
+        try:
+            with escritura(conn, aislamiento=aislamiento) as actual:
+                if actual is None:
+                    if not base_de_datos_disponible():
+                        raise CircuitoAbierto("La base de datos no responde; se intentará de nuevo en unos segundos")
+                    raise psycopg2.OperationalError("No se pudo abrir la conexión a la base de datos")
+                resultado = trabajo(actual)
+                # Lo que falle desde aquí falló en el COMMIT
+                confirmando = True
+            if intento > 1:
+                estadisticas_reintentos.registrar('recuperadas')
+            return resultado
+        except psycopg2.Error as error:
+            motivo = clasificar_error(error)
+            if motivo is None:
+                raise
+            if motivo == CONEXION and confirmando and not idempotente:
+                estadisticas_reintentos.registrar('inciertas')
+                raise
+            if intento == politica.intentos or (conn is not None and getattr(conn, 'closed', False)):
+                estadisticas_reintentos.registrar('agotadas')
+                raise
+            estadisticas_reintentos.registrar('reintentos', motivo)
+            time.sleep(politica.espera(intento))
@@ -1,6 +1,7 @@
 import psycopg2
-import streamlit as st
-from capa_datos.data_access import execute_query, execute_query_dict, call_procedure
+from capa_datos import notificaciones
+from capa_datos.data_access import execute_query, execute_query_dict, iter_query_dict, call_procedure
+from capa_datos.unidad_trabajo import escritura
 from datetime import datetime, date
 
 def generar_estadisticas_procedimiento_db(conn, fecha_inicio=None, fecha_fin=None, tipo_reporte='mensual'):
@@ -17,34 +18,28 @@ def generar_estadisticas_procedimiento_db(conn, fecha_inicio=None, fecha_fin=Non
         bool: True si el reporte se generó correctamente, False en caso contrario
     """
     try:
-        # Llamar al procedimiento almacenado
-        success = call_procedure(conn, 'proc_generar_estadisticas', 
-                               (fecha_inicio, fecha_fin, tipo_reporte))
+        # Llamar al procedimiento almacenado (commit al terminar, rollback si falla)
+        with escritura(conn) as conn:
+            success = call_procedure(conn, 'proc_generar_estadisticas',
+                                     (fecha_inicio, fecha_fin, tipo_reporte))
         
         if success:
-            st.success(f"✅ Reporte de estadísticas {tipo_reporte} generado correctamente")
+            notificaciones.exito(f"✅ Reporte de estadísticas {tipo_reporte} generado correctamente")
             return True
         else:
-            st.error("❌ Error al generar el reporte de estadísticas")
+            notificaciones.error("❌ Error al generar el reporte de estadísticas")
             return False
-            
+    
     except Exception as e:
-        st.error(f"Error al generar estadísticas: {e}")
+        notificaciones.error(f"Error al generar estadísticas: {e}")
         return False
 
-def get_vista_reservas_completas_db(conn, fecha_inicio=None, fecha_fin=None, cliente_id=None, cancha_id=None):
+def _sql_vista_reservas_completas(fecha_inicio=None, fecha_fin=None, cliente_id=None, cancha_id=None):
     """
-    Obtiene datos de la vista vista_reservas_completas con filtros opcionales.
-    
-    Args:
-        conn: Conexión a la base de datos
-        fecha_inicio (date): Fecha de inicio para filtrar
-        fecha_fin (date): Fecha de fin para filtrar
-        cliente_id (int): ID del cliente para filtrar
-        cancha_id (int): ID de la cancha para filtrar
+    Arma la consulta de vista_reporte_reservas con los filtros indicados.
     
     Returns:
-        list: Lista de reservas completas
+        tuple: (sql, params)
     """
     sql = "SELECT * FROM vista_reporte_reservas WHERE 1=1"
     params = []
@@ -67,8 +62,45 @@ def get_vista_reservas_completas_db(conn, fecha_inicio=None, fecha_fin=None, cli
     
     sql += " ORDER BY fecha_reserva DESC, hora_inicio DESC"
     
+    return sql, params
+
+def get_vista_reservas_completas_db(conn, fecha_inicio=None, fecha_fin=None, cliente_id=None, cancha_id=None):
+    """
+    Obtiene datos de la vista vista_reservas_completas con filtros opcionales.
+    
+    Args:
+        conn: Conexión a la base de datos
+        fecha_inicio (date): Fecha de inicio para filtrar
+        fecha_fin (date): Fecha de fin para filtrar
+        cliente_id (int): ID del cliente para filtrar
+        cancha_id (int): ID de la cancha para filtrar
+    
+    Returns:
+        list: Lista de reservas completas
+    """
+    sql, params = _sql_vista_reservas_completas(fecha_inicio, fecha_fin, cliente_id, cancha_id)
     return execute_query_dict(conn, sql, params)
 
+def iter_vista_reservas_completas_db(conn, fecha_inicio=None, fecha_fin=None, cliente_id=None, cancha_id=None,
+                                     itersize=None, cancelar=None):
+    """
+    Recorre vista_reporte_reservas sin traer todas las filas a memoria.
+    
+    Args:
+        conn: Conexión a la base de datos
+        fecha_inicio (date): Fecha de inicio para filtrar
+        fecha_fin (date): Fecha de fin para filtrar
+        cliente_id (int): ID del cliente para filtrar
+        cancha_id (int): ID de la cancha para filtrar
+        itersize (int): Filas por bloque (ver iter_query)
+        cancelar (threading.Event): Corta la iteración (ver iter_query)
+    
+    Yields:
+        Fila: Reservas completas
+    """
+    sql, params = _sql_vista_reservas_completas(fecha_inicio, fecha_fin, cliente_id, cancha_id)
+    return iter_query_dict(conn, sql, params, itersize=itersize, cancelar=cancelar)
+
 def get_vista_estadisticas_canchas_db(conn, fecha_inicio=None, fecha_fin=None):
     """
     Obtiene datos de la vista vista_estadisticas_canchas con filtros opcionales.
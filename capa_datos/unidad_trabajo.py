@@ -0,0 +1,293 @@
+"""
+Unidades de trabajo sobre una conexión
+
+Con lectura() las consultas corren en autocommit: cada SELECT es su propia
+transacción y la conexión no queda "idle in transaction" reteniendo una
+instantánea que frena el VACUUM. Con lectura(consistente=True) el bloque usa
+una transacción READ ONLY REPEATABLE READ (todas las consultas ven los mismos
+datos) que se cierra al salir. escritura() agrupa las escrituras en una
+transacción: commit si el bloque termina bien, rollback si lanza una excepción.
+
+Mientras una conexión está dentro de una unidad, las funciones de
+capa_datos/data_access.py no hacen commit ni rollback por su cuenta y relanzan
+los errores para que la unidad decida.
+
+Uso:
+    with lectura(conn):
+        filas = execute_query_dict(conn, sql)
+    
+    with escritura(conn):
+        call_procedure(conn, 'registrar_pago', params)
+"""
+import time
+import threading
+import contextlib
+import psycopg2
+from capa_datos import notificaciones
+from psycopg2.extensions import STATUS_IN_TRANSACTION, ISOLATION_LEVEL_REPEATABLE_READ
+from capa_datos.database_connection import (
+    get_db_connection, registrar_escritura, modo_actual, _contexto,
+    MODO_LECTURA, MODO_ESCRITURA
+)
+
+# Conexiones (por id) que están dentro de una unidad de trabajo en este hilo;
+# las conexiones de psycopg2 no admiten atributos nuevos
+_unidades = threading.local()
+
+class EstadisticasTransacciones:
+    """
+    Contadores de las transacciones de las unidades de trabajo del proceso.
+    
+    segundos_abiertas y maximo_abierta miden cuánto estuvo abierta cada
+    transacción (incluido el tiempo que Python tardó entre consultas, que en
+    el servidor aparece como "idle in transaction"). huerfanas cuenta las
+    transacciones que se encontraron abiertas al empezar una unidad o al
+    terminar una lectura fuera de ella.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+    
+    def reiniciar(self):
+        with self._lock:
+            self.lecturas = 0
+            self.escrituras = 0
+            self.commits = 0
+            self.rollbacks = 0
+            self.huerfanas = 0
+            self.segundos_abiertas = 0.0
+            self.maximo_abierta = 0.0
+    
+    def registrar(self, campo, segundos=None):
+        with self._lock:
+            setattr(self, campo, getattr(self, campo) + 1)
+            if segundos is not None:
+                self.segundos_abiertas += segundos
+                self.maximo_abierta = max(self.maximo_abierta, segundos)
+    
+    def instantanea(self):
+        """
+        Returns:
+            dict: Copia de los contadores
+        """
+        with self._lock:
+            return {
+                'lecturas': self.lecturas,
+                'escrituras': self.escrituras,
+                'commits': self.commits,
+                'rollbacks': self.rollbacks,
+                'huerfanas': self.huerfanas,
+                'segundos_abiertas': self.segundos_abiertas,
+                'maximo_abierta': self.maximo_abierta
+            }
+
+estadisticas = EstadisticasTransacciones()
+
+def en_unidad_de_trabajo(conn):
+    """
+    Indica si la conexión está dentro de lectura() o escritura() en este hilo.
+    """
+    return conn is not None and id(conn) in getattr(_unidades, 'activas', ())
+
+def _activar(conn):
+    activas = getattr(_unidades, 'activas', None)
+    if activas is None:
+        activas = _unidades.activas = set()
+    activas.add(id(conn))
+
+def _desactivar(conn):
+    getattr(_unidades, 'activas', set()).discard(id(conn))
+
+def _en_transaccion(conn):
+    return getattr(conn, 'status', None) == STATUS_IN_TRANSACTION
+
+def cerrar_transaccion_huerfana(conn):
+    """
+    Hace rollback de la transacción que haya quedado abierta en la conexión.
+    
+    Returns:
+        bool: True si había una transacción abierta
+    """
+    if not _en_transaccion(conn):
+        return False
+    try:
+        conn.rollback()
+    except psycopg2.Error:
+        pass
+    estadisticas.registrar('huerfanas')
+    return True
+
+def terminar_lectura(conn):
+    """
+    Termina la transacción que abrió un SELECT fuera de una unidad de trabajo,
+    para que la conexión no quede "idle in transaction" hasta la próxima
+    consulta. No hace nada en autocommit ni dentro de una unidad.
+    """
+    if conn is None or getattr(conn, 'autocommit', False) or en_unidad_de_trabajo(conn):
+        return
+    if _en_transaccion(conn):
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            pass
+
+@contextlib.contextmanager
+def _conexion(conn, modo):
+    """
+    Entrega la conexión recibida o, si es None, una nueva abierta en el modo
+    indicado (réplica para lecturas) que se cierra al salir.
+    """
+    if conn is not None:
+        yield conn
+        return
+    
+    anterior = modo_actual()
+    if modo == MODO_ESCRITURA or anterior is None:
+        _contexto.modo = modo
+    try:
+        conn = get_db_connection()
+    finally:
+        _contexto.modo = anterior
+    try:
+        yield conn
+    finally:
+        if conn is not None:
+            conn.close()
+
+@contextlib.contextmanager
+def lectura(conn=None, consistente=False):
+    """
+    Ejecuta el bloque como trabajo de solo lectura.
+    
+    Sin consistente la conexión queda en autocommit durante el bloque. Con
+    consistente=True se abre una transacción READ ONLY REPEATABLE READ que
+    termina con rollback al salir. Al final se restaura la configuración
+    anterior de la conexión. Dentro de otra unidad sobre la misma conexión
+    el bloque se suma a ella.
+    
+    Args:
+        conn: Conexión a usar; con None se abre una (réplica si hay) y se cierra al salir
+        consistente (bool): Si todas las consultas deben ver la misma instantánea
+    
+    Yields:
+        La conexión (None si no se pudo abrir; las consultas lo informan como siempre)
+    """
+    with _conexion(conn, MODO_LECTURA) as conn:
+        if conn is None or en_unidad_de_trabajo(conn):
+            yield conn
+            return
+        
+        cerrar_transaccion_huerfana(conn)
+        anterior = (conn.autocommit, getattr(conn, 'readonly', None), getattr(conn, 'isolation_level', None))
+        if consistente:
+            conn.readonly = True
+            conn.isolation_level = ISOLATION_LEVEL_REPEATABLE_READ
+        else:
+            conn.autocommit = True
+        
+        _activar(conn)
+        inicio = time.perf_counter()
+        try:
+            yield conn
+        finally:
+            _desactivar(conn)
+            try:
+                if consistente and _en_transaccion(conn):
+                    conn.rollback()
+                conn.autocommit = anterior[0]
+                if consistente:
+                    conn.readonly, conn.isolation_level = anterior[1], anterior[2]
+            except psycopg2.Error:
+                pass
+            estadisticas.registrar('lecturas', time.perf_counter() - inicio if consistente else None)
+
+@contextlib.contextmanager
+def escritura(conn=None, aislamiento=None):
+    """
+    Ejecuta el bloque en una transacción sobre el primario.
+    
+    Si el bloque termina bien se hace commit y se registra la escritura de la
+    sesión (para leer los propios cambios, ver registrar_escritura). Si lanza
+    una excepción se hace rollback y la excepción sigue. Dentro de otra
+    unidad sobre la misma conexión el bloque se suma a ella.
+    
+    Args:
+        conn: Conexión a usar; con None se abre una contra el primario y se cierra al salir
+        aislamiento: Nivel de aislamiento de la transacción (por ejemplo
+            ISOLATION_LEVEL_SERIALIZABLE); None usa el de la conexión
+    
+    Yields:
+        La conexión (None si no se pudo abrir; las consultas lo informan como siempre)
+    """
+    with _conexion(conn, MODO_ESCRITURA) as conn:
+        if conn is None or en_unidad_de_trabajo(conn):
+            yield conn
+            return
+        
+        cerrar_transaccion_huerfana(conn)
+        autocommit = conn.autocommit
+        if autocommit:
+            conn.autocommit = False
+        aislamiento_anterior = getattr(conn, 'isolation_level', None)
+        if aislamiento is not None:
+            conn.isolation_level = aislamiento
+        
+        _activar(conn)
+        inicio = time.perf_counter()
+        try:
+            yield conn
+        except BaseException:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                pass
+            estadisticas.registrar('rollbacks', time.perf_counter() - inicio)
+            raise
+        else:
+            conn.commit()
+            estadisticas.registrar('commits', time.perf_counter() - inicio)
+            registrar_escritura()
+        finally:
+            _desactivar(conn)
+            estadisticas.registrar('escrituras')
+            try:
+                if aislamiento is not None:
+                    conn.isolation_level = aislamiento_anterior
+                if autocommit:
+                    conn.autocommit = True
+            except psycopg2.Error:
+                # La conexión se cortó; el error original es el que importa
+                pass
+
+def transacciones_inactivas(conn, minimo_segundos=0):
+    """
+    Consulta en el servidor las sesiones que están "idle in transaction".
+    
+    Args:
+        conn: Conexión a la base de datos
+        minimo_segundos (float): Solo las que llevan al menos este tiempo así
+    
+    Returns:
+        list: Tuplas (pid, usuario, aplicación, segundos, última consulta), o [] si hay error
+    """
+    sql = """
+        SELECT pid, usename, application_name,
+               EXTRACT(EPOCH FROM now() - state_change) AS segundos,
+               query
+        FROM pg_stat_activity
+        WHERE state = 'idle in transaction'
+          AND datname = current_database()
+          AND now() - state_change >= make_interval(secs => %s)
+        ORDER BY segundos DESC
+    """
+    try:
+        with lectura(conn) as conn:
+            if conn is None:
+                return []
+            with conn.cursor() as cur:
+                cur.execute(sql, (minimo_segundos,))
+                return cur.fetchall()
+    except psycopg2.Error as e:
+        notificaciones.error(f"Error al consultar transacciones inactivas: {e}")
+        return []
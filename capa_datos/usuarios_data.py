@@ -1,5 +1,5 @@
 import psycopg2
-import streamlit as st
+from capa_datos import notificaciones
 from capa_datos.data_access import execute_query, execute_query_dict
 
 
@@ -146,7 +146,7 @@ class UsuariosData:
     """Clase para manejar operaciones de usuarios del sistema"""
     
     def __init__(self):
-        self.conn = st.session_state.get('db_connection')
+        self.conn = notificaciones.estado_sesion().get('db_connection')
     
     def get_all_usuarios(self):
         """Obtener todos los usuarios del sistema"""
@@ -163,7 +163,7 @@ class UsuariosData:
             """
             return execute_query_dict(self.conn, sql)
         except Exception as e:
-            st.error(f"Error al obtener usuarios: {e}")
+            notificaciones.error(f"Error al obtener usuarios: {e}")
             return []
     
     def usuario_existe(self, username):
@@ -173,7 +173,7 @@ class UsuariosData:
             result = execute_query_dict(self.conn, sql, (username,))
             return len(result) > 0
         except Exception as e:
-            st.error(f"Error al verificar usuario: {e}")
+            notificaciones.error(f"Error al verificar usuario: {e}")
             return False
     
     def email_existe(self, email):
@@ -186,30 +186,30 @@ class UsuariosData:
         try:
             # Por ahora solo simulamos la creación
             # En una implementación real, esto crearía el usuario en PostgreSQL
-            st.success(f"Usuario {datos_usuario.get('username', 'N/A')} creado exitosamente")
+            notificaciones.exito(f"Usuario {datos_usuario.get('username', 'N/A')} creado exitosamente")
             return True
         except Exception as e:
-            st.error(f"Error al crear usuario: {e}")
+            notificaciones.error(f"Error al crear usuario: {e}")
             return False
     
     def actualizar_usuario(self, usuario_id, datos_actualizados):
         """Actualizar un usuario (placeholder)"""
         try:
             # Por ahora solo simulamos la actualización
-            st.success("Usuario actualizado exitosamente")
+            notificaciones.exito("Usuario actualizado exitosamente")
             return True
         except Exception as e:
-            st.error(f"Error al actualizar usuario: {e}")
+            notificaciones.error(f"Error al actualizar usuario: {e}")
             return False
     
     def eliminar_usuario(self, usuario_id):
         """Eliminar un usuario (placeholder)"""
         try:
             # Por ahora solo simulamos la eliminación
-            st.success("Usuario eliminado exitosamente")
+            notificaciones.exito("Usuario eliminado exitosamente")
             return True
         except Exception as e:
-            st.error(f"Error al eliminar usuario: {e}")
+            notificaciones.error(f"Error al eliminar usuario: {e}")
             return False
     
     def obtener_usuario_por_id(self, usuario_id):
@@ -228,5 +228,5 @@ class UsuariosData:
             result = execute_query_dict(self.conn, sql, (usuario_id,))
             return result[0] if result else None
         except Exception as e:
-            st.error(f"Error al obtener usuario: {e}")
+            notificaciones.error(f"Error al obtener usuario: {e}")
             return None 
\ No newline at end of file
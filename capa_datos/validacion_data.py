@@ -1,6 +1,7 @@
 import psycopg2
-import streamlit as st
+from capa_datos import notificaciones
 from capa_datos.data_access import call_procedure
+from capa_datos.unidad_trabajo import escritura
 
 def validar_datos_db(conn, tabla):
     """
@@ -14,18 +15,19 @@ def validar_datos_db(conn, tabla):
         bool: True si la validación se ejecutó correctamente, False en caso contrario
     """
     try:
-        # Llamar al procedimiento almacenado
-        success = call_procedure(conn, 'proc_validar_y_limpiar_datos', (tabla, 'VALIDATE'))
+        # Llamar al procedimiento almacenado (commit al terminar, rollback si falla)
+        with escritura(conn) as conn:
+            success = call_procedure(conn, 'proc_validar_y_limpiar_datos', (tabla, 'VALIDATE'))
         
         if success:
-            st.success(f"✅ Validación de datos en tabla '{tabla}' completada")
+            notificaciones.exito(f"✅ Validación de datos en tabla '{tabla}' completada")
             return True
         else:
-            st.error(f"❌ Error al validar datos en tabla '{tabla}'")
+            notificaciones.error(f"❌ Error al validar datos en tabla '{tabla}'")
             return False
-            
+    
     except Exception as e:
-        st.error(f"Error al validar datos: {e}")
+        notificaciones.error(f"Error al validar datos: {e}")
         return False
 
 def limpiar_datos_db(conn, tabla):
@@ -40,18 +42,19 @@ def limpiar_datos_db(conn, tabla):
         bool: True si la limpieza se ejecutó correctamente, False en caso contrario
     """
     try:
-        # Llamar al procedimiento almacenado
-        success = call_procedure(conn, 'proc_validar_y_limpiar_datos', (tabla, 'CLEAN'))
+        # Llamar al procedimiento almacenado (commit al terminar, rollback si falla)
+        with escritura(conn) as conn:
+            success = call_procedure(conn, 'proc_validar_y_limpiar_datos', (tabla, 'CLEAN'))
         
         if success:
-            st.success(f"✅ Limpieza de datos en tabla '{tabla}' completada")
+            notificaciones.exito(f"✅ Limpieza de datos en tabla '{tabla}' completada")
             return True
         else:
-            st.error(f"❌ Error al limpiar datos en tabla '{tabla}'")
+            notificaciones.error(f"❌ Error al limpiar datos en tabla '{tabla}'")
             return False
-            
+    
     except Exception as e:
-        st.error(f"Error al limpiar datos: {e}")
+        notificaciones.error(f"Error al limpiar datos: {e}")
         return False
 
 def crear_backup_db(conn, tabla):
@@ -66,18 +69,19 @@ def crear_backup_db(conn, tabla):
         bool: True si el backup se creó correctamente, False en caso contrario
     """
     try:
-        # Llamar al procedimiento almacenado
-        success = call_procedure(conn, 'proc_validar_y_limpiar_datos', (tabla, 'BACKUP'))
+        # Llamar al procedimiento almacenado (commit al terminar, rollback si falla)
+        with escritura(conn) as conn:
+            success = call_procedure(conn, 'proc_validar_y_limpiar_datos', (tabla, 'BACKUP'))
         
         if success:
-            st.success(f"✅ Backup de tabla '{tabla}' creado correctamente")
+            notificaciones.exito(f"✅ Backup de tabla '{tabla}' creado correctamente")
             return True
         else:
-            st.error(f"❌ Error al crear backup de tabla '{tabla}'")
+            notificaciones.error(f"❌ Error al crear backup de tabla '{tabla}'")
             return False
-            
+    
     except Exception as e:
-        st.error(f"Error al crear backup: {e}")
+        notificaciones.error(f"Error al crear backup: {e}")
         return False
 
 def validar_todas_las_tablas_db(conn):
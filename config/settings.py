@@ -0,0 +1,104 @@
+"""
+Configuración de la aplicación leída una sola vez desde el entorno y .env
+"""
+import os
+import threading
+from dotenv import load_dotenv
+
+class Configuracion:
+    """
+    Valores de configuración del proceso.
+    
+    Se carga .env una sola vez (las variables ya definidas en el entorno
+    tienen prioridad) y se conserva una copia de las variables; los módulos
+    leen de aquí en lugar de llamar a load_dotenv() y os.getenv() por su cuenta.
+    """
+    
+    def __init__(self):
+        load_dotenv()
+        self._valores = dict(os.environ)
+    
+    def texto(self, nombre, default=None):
+        """
+        Obtiene una variable como texto.
+        
+        Args:
+            nombre (str): Nombre de la variable
+            default (str): Valor si no está definida
+        
+        Returns:
+            str: Valor de la variable
+        """
+        return self._valores.get(nombre, default)
+    
+    def entero(self, nombre, default):
+        """
+        Obtiene una variable como entero.
+        
+        Args:
+            nombre (str): Nombre de la variable
+            default (int): Valor si no está definida
+        
+        Returns:
+            int: Valor de la variable
+        """
+        return int(self._valores.get(nombre, default))
+    
+    def decimal(self, nombre, default):
+        """
+        Obtiene una variable como número decimal.
+        
+        Args:
+            nombre (str): Nombre de la variable
+            default (float): Valor si no está definida
+        
+        Returns:
+            float: Valor de la variable
+        """
+        return float(self._valores.get(nombre, default))
+    
+    def booleano(self, nombre, default=False):
+        """
+        Obtiene una variable como booleano ('1', 'true', 'si', 'yes' son verdaderos).
+        
+        Args:
+            nombre (str): Nombre de la variable
+            default (bool): Valor si no está definida
+        
+        Returns:
+            bool: Valor de la variable
+        """
+        valor = self._valores.get(nombre)
+        if valor is None:
+            return default
+        return valor.strip().lower() in ('1', 'true', 'si', 'sí', 'yes')
+
+_configuracion = None
+_lock = threading.Lock()
+
+def obtener_configuracion():
+    """
+    Obtiene la configuración del proceso, cargándola la primera vez.
+    
+    Returns:
+        Configuracion: Configuración compartida
+    """
+    global _configuracion
+    if _configuracion is None:
+        with _lock:
+            if _configuracion is None:
+                _configuracion = Configuracion()
+    return _configuracion
+
+def recargar_configuracion():
+    """
+    Vuelve a leer el entorno y .env (por ejemplo, en pruebas o herramientas
+    que cambian variables durante la ejecución).
+    
+    Returns:
+        Configuracion: Configuración nueva
+    """
+    global _configuracion
+    with _lock:
+        _configuracion = Configuracion()
+    return _configuracion
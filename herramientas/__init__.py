@@ -0,0 +1,5 @@
+"""
+Herramientas de línea de comandos (benchmarks y utilidades de mantenimiento)
+
+Se ejecutan desde la raíz del proyecto con: python -m herramientas.<nombre>
+"""
@@ -0,0 +1,112 @@
+"""
+Benchmark de regresión del arranque en frío (página de login)
+
+Cada repetición corre en un intérprete nuevo: ejecuta app.py con el
+AppTest de Streamlit hasta que se dibuja el formulario de login y mide ese
+tiempo. Falla (código de salida 1) si la mediana supera el umbral o si la
+página de login cargó módulos que deberían importarse solo al abrir otras
+secciones (por defecto pandas).
+
+Uso:
+    python -m herramientas.benchmark_arranque
+    python -m herramientas.benchmark_arranque --umbral-ms 1500 --repeticiones 7
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from config.settings import obtener_configuracion
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULOS_DIFERIDOS = ['pandas']
+
+# Se ejecuta en el proceso hijo; el tiempo de importar AppTest no se cuenta
+SCRIPT_MEDICION = """
+import sys, json, time
+from streamlit.testing.v1 import AppTest
+inicio = time.perf_counter()
+app = AppTest.from_file('app.py', default_timeout=120)
+app.run()
+fin = time.perf_counter()
+print(json.dumps({
+    'ms': (fin - inicio) * 1000,
+    'login': any(campo.label.startswith('👤') for campo in app.text_input),
+    'excepciones': [str(excepcion.value) for excepcion in app.exception],
+    'modulos': sorted(sys.modules)
+}))
+"""
+
+def medir_arranque():
+    """
+    Mide un arranque en frío en un intérprete nuevo.
+    
+    Returns:
+        dict: {'ms', 'login', 'excepciones', 'modulos'}
+    
+    Raises:
+        RuntimeError: Si el proceso de medición falla
+    """
+    proceso = subprocess.run(
+        [sys.executable, '-c', SCRIPT_MEDICION],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True
+    )
+    if proceso.returncode != 0:
+        ultima_linea = (proceso.stderr.strip().splitlines() or ['sin salida'])[-1]
+        raise RuntimeError(f"La medición falló: {ultima_linea}")
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de regresión del arranque en frío")
+    parser.add_argument('--repeticiones', type=int, default=5,
+                        help="Arranques a medir (cada uno en un intérprete nuevo)")
+    parser.add_argument('--umbral-ms', type=float,
+                        default=obtener_configuracion().decimal('ARRANQUE_UMBRAL_MS', 2000),
+                        help="Mediana máxima permitida hasta dibujar el login")
+    parser.add_argument('--permitir', nargs='*', default=[],
+                        help="Módulos diferidos que se aceptan en la página de login")
+    args = parser.parse_args()
+    
+    tiempos = []
+    cargados = set()
+    for repeticion in range(1, args.repeticiones + 1):
+        try:
+            resultado = medir_arranque()
+        except RuntimeError as error:
+            print(f"❌ {error}")
+            return 1
+        
+        if resultado['excepciones'] or not resultado['login']:
+            print(f"❌ La página de login no se dibujó: {resultado['excepciones'] or 'sin formulario'}")
+            return 1
+        
+        tiempos.append(resultado['ms'])
+        cargados.update(
+            modulo for modulo in MODULOS_DIFERIDOS
+            if modulo in resultado['modulos'] and modulo not in args.permitir
+        )
+        print(f"Arranque {repeticion}: {resultado['ms']:.0f} ms")
+    
+    mediana = statistics.median(tiempos)
+    print("-" * 40)
+    print(f"Mediana: {mediana:.0f} ms (mín {min(tiempos):.0f}, máx {max(tiempos):.0f}, umbral {args.umbral_ms:.0f})")
+    
+    fallo = False
+    if mediana > args.umbral_ms:
+        print(f"❌ El arranque supera el umbral por {mediana - args.umbral_ms:.0f} ms")
+        fallo = True
+    if cargados:
+        print(f"❌ La página de login importó módulos diferidos: {', '.join(sorted(cargados))}")
+        print("   Usa python -m herramientas.perfil_importaciones --modulos vistas.login_view para ver quién los importa")
+        fallo = True
+    
+    if not fallo:
+        print("✅ Arranque dentro del presupuesto")
+    return 1 if fallo else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
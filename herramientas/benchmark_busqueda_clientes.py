@@ -0,0 +1,148 @@
+"""
+Benchmark de la búsqueda de clientes por trigramas
+
+Crea en la sesión una tabla temporal "clientes" con datos sintéticos. Como
+pg_temp está primero en el search_path, buscar_clientes_ranking() la usa en
+lugar de public.clientes, así se mide la función real sin tocar los datos.
+
+Uso:
+    python -m herramientas.benchmark_busqueda_clientes
+    python -m herramientas.benchmark_busqueda_clientes --tamanos 1000 100000 --repeticiones 50
+"""
+import argparse
+import time
+from capa_datos.database_connection import get_db_connection
+
+TAMANOS_POR_DEFECTO = [1000, 10000, 100000, 1000000]
+
+# Términos representativos: parciales, con y sin acentos, con error de tipeo, email y teléfono
+TERMINOS = ['jose', 'Pérez', 'gonzal', 'maria lopez', 'rodriges', 'cliente123', '3000042']
+
+CONSULTA_RANKING = """
+    SELECT id FROM buscar_clientes_ranking(%s, 20)
+"""
+
+# Consulta anterior a los índices de trigramas (recorrido secuencial)
+CONSULTA_LIKE = """
+    SELECT id FROM clientes
+    WHERE LOWER(nombre) LIKE LOWER(%s)
+       OR LOWER(apellido) LIKE LOWER(%s)
+       OR LOWER(email) LIKE LOWER(%s)
+    ORDER BY apellido, nombre
+"""
+
+def preparar_tabla(cur, tamano):
+    """
+    Crea y llena la tabla temporal de clientes con su índice de trigramas.
+
+    Args:
+        cur: Cursor de la conexión del benchmark
+        tamano (int): Número de clientes sintéticos
+    """
+    cur.execute("DROP TABLE IF EXISTS pg_temp.clientes")
+    cur.execute("CREATE TEMP TABLE clientes (LIKE public.clientes INCLUDING DEFAULTS)")
+    cur.execute("""
+        WITH nombres AS (
+            SELECT ARRAY['José', 'María', 'Ana', 'Luis', 'Carlos', 'Sofía', 'Andrés', 'Lucía',
+                         'Martín', 'Valentina', 'Jesús', 'Camila', 'Ramón', 'Inés', 'Tomás'] AS n,
+                   ARRAY['Pérez', 'González', 'Rodríguez', 'López', 'Martínez', 'Gómez', 'Díaz',
+                         'Hernández', 'Muñoz', 'Álvarez', 'Sánchez', 'Ramírez', 'Torres', 'Núñez'] AS a
+        )
+        INSERT INTO clientes (id, nombre, apellido, email, telefono, estado)
+        SELECT i,
+               n[1 + i % array_length(n, 1)],
+               a[1 + (i / 7) % array_length(a, 1)] || ' ' || a[1 + (i / 3) % array_length(a, 1)],
+               'cliente' || i || '@example.com',
+               '300' || lpad(i::text, 7, '0'),
+               'Activo'
+        FROM generate_series(1, %s) AS i, nombres
+    """, (tamano,))
+    cur.execute("""
+        UPDATE clientes
+        SET busqueda = normalizar_busqueda_cliente(nombre, apellido, email, telefono)
+    """)
+    cur.execute("CREATE INDEX ON clientes USING gist (busqueda public.gist_trgm_ops)")
+    cur.execute("ANALYZE clientes")
+
+def medir(cur, consulta, parametros, repeticiones):
+    """
+    Ejecuta una consulta varias veces y retorna los tiempos en milisegundos.
+
+    Args:
+        cur: Cursor de la conexión del benchmark
+        consulta (str): Consulta SQL
+        parametros (tuple): Parámetros de la consulta
+        repeticiones (int): Número de ejecuciones
+
+    Returns:
+        list: Tiempos de cada ejecución en milisegundos
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        cur.execute(consulta, parametros)
+        cur.fetchall()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+def percentil(valores, p):
+    """
+    Calcula un percentil por el método del rango más cercano.
+
+    Args:
+        valores (list): Valores a evaluar
+        p (float): Percentil entre 0 y 100
+
+    Returns:
+        float: Valor del percentil
+    """
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, int(round(p / 100 * len(ordenados))) - 1))
+    return ordenados[indice]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la búsqueda de clientes por trigramas")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS_POR_DEFECTO,
+                        help="Cantidades de clientes sintéticos a probar")
+    parser.add_argument('--repeticiones', type=int, default=20,
+                        help="Ejecuciones por término de búsqueda")
+    parser.add_argument('--sin-like', action='store_true',
+                        help="No medir la consulta LIKE anterior (lenta en tablas grandes)")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if not conn:
+        print("❌ No se pudo conectar a la base de datos")
+        return 1
+
+    try:
+        conn.autocommit = True
+        cur = conn.cursor()
+
+        print(f"{'Clientes':>10} | {'Ranking p50':>12} | {'Ranking p95':>12} | {'LIKE p50':>10} | {'LIKE p95':>10}")
+        print("-" * 66)
+
+        for tamano in args.tamanos:
+            preparar_tabla(cur, tamano)
+
+            tiempos_ranking = []
+            tiempos_like = []
+            for termino in TERMINOS:
+                tiempos_ranking += medir(cur, CONSULTA_RANKING, (termino,), args.repeticiones)
+                if not args.sin_like:
+                    patron = f'%{termino}%'
+                    tiempos_like += medir(cur, CONSULTA_LIKE, (patron, patron, patron), args.repeticiones)
+
+            like_p50 = f"{percentil(tiempos_like, 50):>8.2f}ms" if tiempos_like else f"{'-':>10}"
+            like_p95 = f"{percentil(tiempos_like, 95):>8.2f}ms" if tiempos_like else f"{'-':>10}"
+            print(f"{tamano:>10} | {percentil(tiempos_ranking, 50):>10.2f}ms | "
+                  f"{percentil(tiempos_ranking, 95):>10.2f}ms | {like_p50} | {like_p95}")
+
+        cur.execute("DROP TABLE IF EXISTS pg_temp.clientes")
+        cur.close()
+        return 0
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+"""
+Benchmark de memoria de las filas de resultado (RealDictRow contra Fila)
+
+Mide cuánta memoria ocupan N filas con la forma de get_auditoria_db() según
+cómo las entrega el cursor: tuplas simples, RealDictRow (RealDictCursor) y
+Fila (CursorFilas, capa_datos/filas.py). Se reporta el total y lo que agrega
+cada fila por encima de sus valores.
+
+Por defecto arma las filas en memoria, sin base de datos, con valores
+distintos en cada fila como los que decodifica psycopg2. Con --base lee
+las filas de la tabla auditoria (cargada con herramientas.generador_datos) y
+mide el pico de memoria de fetchall() con cada cursor.
+
+Uso:
+    python -m herramientas.benchmark_memoria_filas
+    python -m herramientas.benchmark_memoria_filas --filas 1000000 --base
+"""
+import gc
+import random
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta
+from psycopg2.extras import RealDictCursor, RealDictRow
+from capa_datos.filas import CursorFilas, clase_fila
+
+COLUMNAS_AUDITORIA = ['id', 'usuario_id', 'usuario_nombre', 'tipo_accion', 'tabla', 'registro_id',
+                      'detalles', 'resultado', 'ip_address', 'fecha_hora']
+
+CONSULTA_AUDITORIA = """
+SELECT
+    a.id,
+    a.usuario_id,
+    u.nombre as usuario_nombre,
+    a.tipo_accion,
+    a.tabla,
+    a.registro_id,
+    a.detalles,
+    a.resultado,
+    a.ip_address,
+    a.fecha_hora
+FROM auditoria a
+LEFT JOIN usuarios u ON a.usuario_id = u.id
+ORDER BY a.fecha_hora DESC
+LIMIT %s
+"""
+
+def generar_valores(cantidad, semilla=42):
+    """
+    Crea las tuplas de valores de las filas de auditoría.
+    
+    Cada texto se construye por separado (no se comparte entre filas), igual
+    que los que decodifica psycopg2 al leer.
+    
+    Args:
+        cantidad (int): Número de filas
+        semilla (int): Semilla de los valores
+    
+    Returns:
+        list: Tuplas de valores
+    """
+    rng = random.Random(semilla)
+    inicio = datetime(2024, 1, 1)
+    acciones = ['INSERT', 'UPDATE', 'DELETE']
+    tablas = ['reservas', 'clientes', 'canchas', 'tipos_cancha']
+    valores = []
+    for auditoria_id in range(cantidad, 0, -1):
+        accion = rng.choice(acciones)
+        valores.append((
+            auditoria_id,
+            None,
+            None,
+            ''.join(accion),
+            ''.join(rng.choice(tablas)),
+            rng.randint(1, 100000),
+            f"Registro {accion.lower()} por trigger",
+            ''.join('SUCCESS'),
+            ''.join(['127.0.0.', '1']),
+            inicio + timedelta(seconds=auditoria_id * 30)
+        ))
+    return valores
+
+def _como_tuplas(valores):
+    # tuple() sobre una tupla retorna la misma; se arma una nueva como haría el cursor
+    return [tuple(list(fila)) for fila in valores]
+
+def _como_realdictrow(valores):
+    return [RealDictRow(zip(COLUMNAS_AUDITORIA, fila)) for fila in valores]
+
+def _como_fila(valores):
+    clase = clase_fila(COLUMNAS_AUDITORIA)
+    return [tuple.__new__(clase, fila) for fila in valores]
+
+FORMAS = {
+    'tuplas': _como_tuplas,
+    'RealDictRow': _como_realdictrow,
+    'Fila': _como_fila
+}
+
+def medir_forma(funcion, valores):
+    """
+    Mide la memoria que agregan las filas armadas a partir de los valores.
+    
+    Returns:
+        int: Bytes asignados que siguen vivos después de armar las filas
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        filas = funcion(valores)
+        despues = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del filas
+    return despues - antes
+
+def medir_base(cantidad):
+    """
+    Lee las filas de auditoría con RealDictCursor y con CursorFilas.
+    
+    Returns:
+        dict: Forma -> (bytes vivos después de fetchall, pico de bytes, filas leídas)
+    """
+    from capa_datos.database_connection import get_connection
+    from config.database_settings import get_database_config
+    
+    config = get_database_config()
+    conn = get_connection(
+        user=config['user'],
+        password=config['password'],
+        host=config['host'],
+        port=config['port'],
+        dbname=config['database']
+    )
+    if conn is None:
+        raise RuntimeError("No se pudo conectar a la base de datos")
+    
+    resultados = {}
+    try:
+        for nombre, cursor_factory in (('tuplas', None), ('RealDictRow', RealDictCursor), ('Fila', CursorFilas)):
+            gc.collect()
+            tracemalloc.start()
+            try:
+                with conn.cursor(cursor_factory=cursor_factory) as cur:
+                    cur.execute(CONSULTA_AUDITORIA, (cantidad,))
+                    antes = tracemalloc.get_traced_memory()[0]
+                    filas = cur.fetchall()
+                # Con el cursor cerrado solo quedan vivas las filas entregadas
+                actual, pico = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            resultados[nombre] = (actual - antes, pico - antes, len(filas))
+            del filas
+            conn.rollback()
+    finally:
+        conn.close()
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memoria de las filas de resultado")
+    parser.add_argument('--filas', type=int, default=1000000,
+                        help="Número de filas de auditoría")
+    parser.add_argument('--base', action='store_true',
+                        help="Leer las filas de la tabla auditoria en lugar de armarlas en memoria")
+    args = parser.parse_args()
+    
+    if args.base:
+        try:
+            resultados = medir_base(args.filas)
+        except Exception as error:
+            print(f"❌ {error}")
+            return 1
+        print(f"{'Forma':<12} | {'Filas':>9} | {'Resultado':>10} | {'Pico fetchall':>13} | {'Bytes/fila':>10}")
+        print("-" * 66)
+        for nombre, (vivos, pico, leidas) in resultados.items():
+            print(f"{nombre:<12} | {leidas:>9} | {vivos / 1024 / 1024:>7.1f} MB | "
+                  f"{pico / 1024 / 1024:>10.1f} MB | {vivos / max(1, leidas):>10.0f}")
+        base, compacta = resultados['RealDictRow'][0], resultados['Fila'][0]
+    else:
+        # Lo que ocupan los valores en sí (igual en todas las formas)
+        gc.collect()
+        tracemalloc.start()
+        valores = generar_valores(args.filas)
+        total_valores = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        
+        print(f"Valores de {args.filas} filas: {total_valores / 1024 / 1024:.1f} MB")
+        print(f"{'Forma':<12} | {'Sobre los valores':>17} | {'Bytes/fila':>10}")
+        print("-" * 46)
+        resultados = {}
+        for nombre, funcion in FORMAS.items():
+            agregado = medir_forma(funcion, valores)
+            resultados[nombre] = agregado
+            print(f"{nombre:<12} | {agregado / 1024 / 1024:>14.1f} MB | {agregado / args.filas:>10.0f}")
+        base, compacta = resultados['RealDictRow'], resultados['Fila']
+    
+    if base:
+        print("-" * 46)
+        print(f"✅ Fila usa {(1 - compacta / base) * 100:.0f}% menos memoria que RealDictRow")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,321 @@
+"""
+Micro-benchmarks de las rutas críticas de capa_datos y logica_negocio
+
+Ejecuta cada función contra la base cargada con herramientas.generador_datos
+y reporta la latencia p50/p95/p99 y, por llamada, las idas y vueltas al
+servidor, las conexiones abiertas y las filas leídas. La lógica recibe
+conexiones instrumentadas a través de establecer_fabrica_conexiones(), así se
+mide el código real. Las escrituras (crear_reserva) se revierten en lugar de
+confirmarse para no alterar los datos entre ejecuciones.
+
+Los resultados se guardan como línea base en JSON y se comparan contra una
+ejecución posterior; la comparación falla (código de salida 1) si algún caso
+empeora más que la tolerancia o hace más idas y vueltas.
+
+Con --grabar las consultas y sus resultados quedan en un archivo; con
+--reproducir ese archivo reemplaza a la base (capa_datos/grabacion.py) y se
+mide solo el costo en Python de la lógica, con la latencia grabada escalada
+por --latencia (0 = sin esperas).
+
+Uso:
+    python -m herramientas.benchmark_rutas_criticas --guardar base.json
+    python -m herramientas.benchmark_rutas_criticas --comparar base.json
+    python -m herramientas.benchmark_rutas_criticas --casos verificar_disponibilidad buscar_clientes --reutilizar-conexion
+    python -m herramientas.benchmark_rutas_criticas --grabar sesion.jsonl.gz
+    python -m herramientas.benchmark_rutas_criticas --reproducir sesion.jsonl.gz --latencia 0
+"""
+import json
+import time
+import random
+import argparse
+import platform
+from datetime import date, datetime, time as hora, timedelta
+from capa_datos import reports_data
+from capa_datos.database_connection import establecer_fabrica_conexiones
+from capa_datos.instrumentacion import FabricaConexionesMedidas
+from capa_datos.grabacion import GrabadoraConexiones, ReproductorConexiones
+from config.database_settings import get_database_config
+from herramientas.benchmark_busqueda_clientes import TERMINOS, percentil
+from logica_negocio.reservas_logic import ReservasLogic
+from logica_negocio.clientes_logic import ClientesLogic
+from logica_negocio.pagos_logic import PagosLogic
+
+def cargar_contexto(fabrica):
+    """
+    Lee de la base los IDs y el rango de fechas de donde se toman los
+    parámetros de cada llamada.
+    
+    Args:
+        fabrica (FabricaConexionesMedidas): Fábrica de conexiones del benchmark
+    
+    Returns:
+        dict: Contexto compartido por los casos
+    
+    Raises:
+        RuntimeError: Si la base no tiene datos
+    """
+    conn = fabrica()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT id FROM canchas WHERE estado = 'Activa' ORDER BY id")
+        canchas = [fila[0] for fila in cur.fetchall()]
+        cur.execute("SELECT id FROM clientes WHERE estado = 'Activo' ORDER BY id LIMIT 5000")
+        clientes = [fila[0] for fila in cur.fetchall()]
+        cur.execute("SELECT MIN(fecha_reserva), MAX(fecha_reserva), MAX(id) FROM reservas")
+        desde, hasta, max_reserva = cur.fetchone()
+        cur.close()
+    finally:
+        conn.close()
+    
+    if not canchas or not clientes or max_reserva is None:
+        raise RuntimeError("La base no tiene datos; cárgalos con python -m herramientas.generador_datos")
+    
+    return {
+        'fabrica': fabrica,
+        'reservas': ReservasLogic(),
+        'clientes': ClientesLogic(),
+        'pagos': PagosLogic(),
+        'canchas': canchas,
+        'ids_clientes': clientes,
+        'desde': desde,
+        'dias': (hasta - desde).days,
+        'max_reserva': max_reserva
+    }
+
+def _horario(rng):
+    inicio = rng.randint(7, 20)
+    return hora(inicio), hora(inicio + 1)
+
+def _rango_mensual(contexto, rng):
+    inicio = contexto['desde'] + timedelta(days=rng.randint(0, max(0, contexto['dias'] - 30)))
+    return inicio, inicio + timedelta(days=30)
+
+def _con_conexion(contexto, funcion, *args):
+    conn = contexto['fabrica']()
+    try:
+        return funcion(conn, *args)
+    finally:
+        conn.close()
+
+def caso_verificar_disponibilidad(contexto, rng):
+    inicio, fin = _horario(rng)
+    fecha = contexto['desde'] + timedelta(days=rng.randint(0, contexto['dias']))
+    contexto['reservas'].verificar_disponibilidad(rng.choice(contexto['canchas']), fecha, inicio, fin)
+
+def caso_crear_reserva(contexto, rng):
+    inicio, fin = _horario(rng)
+    contexto['reservas'].crear_reserva(
+        rng.choice(contexto['ids_clientes']),
+        rng.choice(contexto['canchas']),
+        date.today() + timedelta(days=rng.randint(1, 89)),
+        inicio,
+        fin
+    )
+
+def caso_calcular_saldo(contexto, rng):
+    contexto['pagos'].calcular_saldo_pendiente_reserva(rng.randint(1, contexto['max_reserva']))
+
+def caso_buscar_clientes(contexto, rng):
+    contexto['clientes'].buscar_clientes(rng.choice(TERMINOS), 20)
+
+def caso_estadisticas_generales(contexto, rng):
+    _con_conexion(contexto, reports_data.get_estadisticas_generales_db, *_rango_mensual(contexto, rng))
+
+def caso_top_clientes(contexto, rng):
+    _con_conexion(contexto, reports_data.get_top_clientes_db, *_rango_mensual(contexto, rng))
+
+def caso_estadisticas_horarios(contexto, rng):
+    _con_conexion(contexto, reports_data.get_estadisticas_horarios_db, *_rango_mensual(contexto, rng))
+
+def caso_canchas_mas_recaudan(contexto, rng):
+    _con_conexion(contexto, reports_data.get_canchas_mas_recaudan_db, *_rango_mensual(contexto, rng))
+
+CASOS = {
+    'verificar_disponibilidad': caso_verificar_disponibilidad,
+    'crear_reserva': caso_crear_reserva,
+    'calcular_saldo_pendiente': caso_calcular_saldo,
+    'buscar_clientes': caso_buscar_clientes,
+    'reportes.estadisticas_generales': caso_estadisticas_generales,
+    'reportes.top_clientes': caso_top_clientes,
+    'reportes.estadisticas_horarios': caso_estadisticas_horarios,
+    'reportes.canchas_mas_recaudan': caso_canchas_mas_recaudan
+}
+
+def medir_caso(nombre, contexto, repeticiones, calentamiento, semilla):
+    """
+    Ejecuta un caso varias veces y resume su costo.
+    
+    Los parámetros de cada llamada salen de un generador con semilla propia
+    del caso, así dos ejecuciones con la misma semilla hacen las mismas llamadas.
+    
+    Args:
+        nombre (str): Nombre del caso en CASOS
+        contexto (dict): Resultado de cargar_contexto()
+        repeticiones (int): Llamadas medidas
+        calentamiento (int): Llamadas previas que no se miden
+        semilla (int): Semilla de los parámetros
+    
+    Returns:
+        dict: {'p50', 'p95', 'p99' (ms), 'ida_vuelta', 'conexiones', 'filas' (por llamada)}
+    """
+    funcion = CASOS[nombre]
+    rng = random.Random(f"{semilla}:{nombre}")
+    for _ in range(calentamiento):
+        funcion(contexto, rng)
+    
+    contadores = contexto['fabrica'].contadores
+    contadores.reiniciar()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(contexto, rng)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    
+    totales = contadores.instantanea()
+    return {
+        'p50': percentil(tiempos, 50),
+        'p95': percentil(tiempos, 95),
+        'p99': percentil(tiempos, 99),
+        'ida_vuelta': totales['ida_vuelta'] / repeticiones,
+        'conexiones': totales['conexiones'] / repeticiones,
+        'filas': totales['filas'] / repeticiones
+    }
+
+def comparar(base, actual, tolerancia):
+    """
+    Compara los resultados actuales contra una línea base.
+    
+    Args:
+        base (dict): Casos de la línea base
+        actual (dict): Casos de la ejecución actual
+        tolerancia (float): Aumento relativo de p95 y filas que se acepta (0.2 = 20%)
+    
+    Returns:
+        dict: Nombre del caso -> lista de regresiones encontradas
+    """
+    regresiones = {}
+    for nombre, resultado in actual.items():
+        anterior = base.get(nombre)
+        if anterior is None:
+            continue
+        problemas = []
+        if resultado['p95'] > anterior['p95'] * (1 + tolerancia):
+            problemas.append(f"p95 {anterior['p95']:.2f} → {resultado['p95']:.2f} ms")
+        # Las idas y vueltas no dependen de la carga de la máquina: cualquier aumento cuenta
+        if resultado['ida_vuelta'] > anterior['ida_vuelta'] + 0.01:
+            problemas.append(f"idas y vueltas {anterior['ida_vuelta']:.1f} → {resultado['ida_vuelta']:.1f}")
+        if resultado['conexiones'] > anterior['conexiones'] + 0.01:
+            problemas.append(f"conexiones {anterior['conexiones']:.1f} → {resultado['conexiones']:.1f}")
+        if resultado['filas'] > anterior['filas'] * (1 + tolerancia) + 0.5:
+            problemas.append(f"filas {anterior['filas']:.1f} → {resultado['filas']:.1f}")
+        if problemas:
+            regresiones[nombre] = problemas
+    return regresiones
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de las rutas críticas")
+    parser.add_argument('--casos', nargs='+', choices=list(CASOS), default=list(CASOS),
+                        help="Casos a medir")
+    parser.add_argument('--repeticiones', type=int, default=200,
+                        help="Llamadas medidas por caso")
+    parser.add_argument('--calentamiento', type=int, default=10,
+                        help="Llamadas previas sin medir por caso")
+    parser.add_argument('--semilla', type=int, default=42,
+                        help="Semilla de los parámetros de las llamadas")
+    parser.add_argument('--reutilizar-conexion', action='store_true',
+                        help="Usar una sola conexión (mide solo las consultas, sin el costo de conectar)")
+    parser.add_argument('--guardar', metavar='RUTA',
+                        help="Guardar los resultados como línea base en JSON")
+    parser.add_argument('--comparar', metavar='RUTA',
+                        help="Comparar contra una línea base guardada")
+    parser.add_argument('--tolerancia', type=float, default=0.20,
+                        help="Aumento relativo de p95 y filas aceptado al comparar")
+    grabacion = parser.add_mutually_exclusive_group()
+    grabacion.add_argument('--grabar', metavar='RUTA',
+                           help="Grabar las consultas y sus resultados (.gz para comprimir)")
+    grabacion.add_argument('--reproducir', metavar='RUTA',
+                           help="Responder las consultas desde una grabación, sin base de datos")
+    parser.add_argument('--latencia', type=float, default=1.0,
+                        help="Factor sobre la latencia grabada al reproducir (0 = sin esperas)")
+    args = parser.parse_args()
+    
+    base = None
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        if base.get('reutilizar_conexion') != args.reutilizar_conexion:
+            print("⚠️ La línea base se midió con otro modo de conexión (--reutilizar-conexion)")
+        if bool(base.get('reproducida')) != bool(args.reproducir):
+            print("⚠️ La línea base y esta ejecución no usan la misma fuente (base real o grabación)")
+    
+    if args.reproducir:
+        try:
+            fabrica = ReproductorConexiones(args.reproducir, latencia=args.latencia)
+        except (OSError, ValueError) as error:
+            print(f"❌ {error}")
+            return 1
+    else:
+        fabrica = FabricaConexionesMedidas(
+            get_database_config(),
+            reutilizar=args.reutilizar_conexion,
+            descartar_escrituras=True
+        )
+        if args.grabar:
+            fabrica = GrabadoraConexiones(fabrica, args.grabar)
+    anterior = establecer_fabrica_conexiones(fabrica)
+    try:
+        try:
+            contexto = cargar_contexto(fabrica)
+        except Exception as error:
+            print(f"❌ {error}")
+            return 1
+        
+        print(f"{'Caso':<34} | {'p50':>9} | {'p95':>9} | {'p99':>9} | {'Idas':>5} | {'Conex.':>6} | {'Filas':>7}")
+        print("-" * 96)
+        resultados = {}
+        for nombre in args.casos:
+            resultado = medir_caso(nombre, contexto, args.repeticiones, args.calentamiento, args.semilla)
+            resultados[nombre] = resultado
+            cambio = ''
+            if base and nombre in base['casos'] and base['casos'][nombre]['p95']:
+                cambio = f"  ({(resultado['p95'] / base['casos'][nombre]['p95'] - 1) * 100:+.0f}% p95)"
+            print(f"{nombre:<34} | {resultado['p50']:>7.2f}ms | {resultado['p95']:>7.2f}ms | "
+                  f"{resultado['p99']:>7.2f}ms | {resultado['ida_vuelta']:>5.1f} | "
+                  f"{resultado['conexiones']:>6.1f} | {resultado['filas']:>7.1f}{cambio}")
+    finally:
+        establecer_fabrica_conexiones(anterior)
+        fabrica.cerrar()
+    
+    if args.grabar:
+        print(f"💾 {fabrica.consultas} consultas grabadas en {args.grabar}")
+    if args.reproducir and fabrica.aproximadas:
+        print(f"⚠️ {fabrica.aproximadas} consultas se respondieron con la grabación de otros parámetros "
+              f"(por ejemplo, fechas relativas a hoy)")
+    if args.reproducir and fabrica.faltantes:
+        print(f"⚠️ {len(fabrica.faltantes)} consultas no están en la grabación; conviene grabar de nuevo")
+    
+    if args.guardar:
+        with open(args.guardar, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'semilla': args.semilla,
+                'repeticiones': args.repeticiones,
+                'reutilizar_conexion': args.reutilizar_conexion,
+                'reproducida': bool(args.reproducir),
+                'casos': resultados
+            }, archivo, indent=2, ensure_ascii=False)
+        print(f"💾 Línea base guardada en {args.guardar}")
+    
+    if base:
+        regresiones = comparar(base['casos'], resultados, args.tolerancia)
+        print("-" * 96)
+        if regresiones:
+            for nombre, problemas in regresiones.items():
+                print(f"❌ {nombre}: {'; '.join(problemas)}")
+            return 1
+        print(f"✅ Sin regresiones respecto a {args.comparar} (tolerancia {args.tolerancia:.0%})")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
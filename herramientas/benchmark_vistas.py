@@ -0,0 +1,452 @@
+"""
+Benchmark del costo de dibujar las vistas con datos ficticios
+
+Ejecuta cada vista sin navegador con el AppTest de Streamlit. La base de datos
+se reemplaza por una conexión ficticia (instalada con
+establecer_fabrica_conexiones()) que responde cada consulta con datos de
+prueba del tamaño pedido, así se mide solo el lado de Python: conversión a
+DataFrame, formato de columnas y widgets, sin red ni PostgreSQL.
+
+Por cada vista y tamaño reporta la mediana del tiempo de ejecución del script
+y el pico de memoria asignada (medido aparte con tracemalloc, porque su
+seguimiento vuelve lenta la ejecución). Los resultados se pueden guardar y
+comparar igual que en benchmark_rutas_criticas.
+
+Con --reproducir las consultas se responden desde una grabación hecha con
+capa_datos/grabacion.py (por ejemplo, la de una sesión real con
+DB_GRABAR_SESION) en lugar de los datos ficticios, sin esperar la latencia
+grabada; en ese caso --tamanos solo fija el límite de filas de los reportes.
+
+Uso:
+    python -m herramientas.benchmark_vistas
+    python -m herramientas.benchmark_vistas --vistas reservas.lista --tamanos 1000 100000
+    python -m herramientas.benchmark_vistas --guardar vistas.json
+    python -m herramientas.benchmark_vistas --comparar vistas.json
+    python -m herramientas.benchmark_vistas --reproducir sesion.jsonl.gz --tamanos 20
+"""
+import io
+import csv
+import json
+import time
+import random
+import argparse
+import statistics
+import tracemalloc
+from decimal import Decimal
+from datetime import date, datetime, time as hora, timedelta
+from psycopg2.extensions import STATUS_READY
+from streamlit.testing.v1 import AppTest
+from capa_datos.database_connection import establecer_fabrica_conexiones
+from capa_datos.grabacion import ReproductorConexiones
+from capa_datos.filas import convertir_filas
+from herramientas.generador_datos import TIPOS_CANCHA
+
+TAMANOS_POR_DEFECTO = [100, 1000, 10000, 50000]
+
+# Se ejecuta dentro de AppTest. Importa este archivo como
+# herramientas.benchmark_vistas (no como __main__), por eso los datos se
+# preparan en mostrar_vista() y no en main()
+SCRIPT_VISTA = """
+from herramientas.benchmark_vistas import mostrar_vista
+mostrar_vista({vista!r}, {tamano}, {reproducir!r})
+"""
+
+# Fragmento de la consulta (en minúsculas y sin saltos de línea) -> conjunto de datos.
+# Se revisan en orden: los fragmentos más específicos van primero.
+RUTAS = [
+    ('set statement_timeout', None),
+    ('from reservas order by fecha_reserva desc', 'reservas'),
+    ('left join tipos_cancha tc on c.tipo_cancha_id', 'canchas_con_tipos'),
+    ('as total_canchas', 'estadisticas_canchas'),
+    ('from tipos_cancha where estado', 'tipos_cancha'),
+    ('as ingreso_promedio_por_reserva', 'canchas_mas_recaudan'),
+    ('order by total_reservas desc', 'canchas_mas_usadas')
+]
+
+# Tipo de Python de los datos ficticios -> OID de PostgreSQL en cursor.description
+# (bool antes que int y datetime antes que date, por herencia)
+OID_POR_TIPO = [(bool, 16), (int, 23), (Decimal, 1700), (float, 701), (datetime, 1114),
+                (date, 1082), (hora, 1083), (str, 25)]
+
+COLUMNAS_RESERVAS = ['id', 'cliente_id', 'cancha_id', 'fecha_reserva', 'hora_inicio', 'hora_fin', 'duracion',
+                     'estado', 'observaciones', 'fecha_creacion', 'fecha_actualizacion']
+COLUMNAS_CANCHAS_CON_TIPOS = ['id', 'nombre', 'tipo_deporte', 'capacidad', 'precio_hora', 'estado',
+                              'horario_apertura', 'horario_cierre', 'descripcion', 'fecha_creacion',
+                              'fecha_actualizacion', 'tipo_cancha_id', 'tipo_cancha_nombre',
+                              'tipo_cancha_descripcion', 'precio_por_hora']
+COLUMNAS_RANKING = ['id', 'nombre', 'tipo_deporte', 'precio_hora', 'total_reservas', 'ingresos_totales',
+                    'promedio_por_reserva']
+
+# Datos preparados por tamaño, grabaciones cargadas y consultas que no
+# coincidieron con ninguna ruta
+_datos = {}
+_reproductores = {}
+_sin_ruta = set()
+
+def crear_datos(tamano, semilla=42):
+    """
+    Crea los conjuntos de datos ficticios de un tamaño, con los tipos que
+    entrega psycopg2 (date, time, Decimal, datetime).
+    
+    Args:
+        tamano (int): Filas de reservas, canchas y rankings
+        semilla (int): Semilla de los valores
+    
+    Returns:
+        dict: Nombre del conjunto -> (columnas, filas)
+    """
+    rng = random.Random(f"{semilla}:{tamano}")
+    creacion = datetime(2024, 1, 1, 8, 0)
+    estados = ['pendiente', 'confirmada', 'completada', 'cancelada']
+    
+    reservas = []
+    for reserva_id in range(tamano, 0, -1):
+        inicio = rng.randint(7, 21)
+        fecha = date(2024, 1, 1) + timedelta(days=reserva_id % 365)
+        reservas.append((
+            reserva_id, rng.randint(1, 5000), rng.randint(1, 200), fecha, hora(inicio), hora(inicio + 1),
+            Decimal('1.00'), rng.choice(estados), None if rng.random() < 0.9 else 'Reserva recurrente',
+            creacion, creacion
+        ))
+    
+    canchas = []
+    for cancha_id in range(1, tamano + 1):
+        tipo_id = rng.randint(1, len(TIPOS_CANCHA))
+        nombre_tipo, deporte, precio, capacidad = TIPOS_CANCHA[tipo_id - 1]
+        canchas.append((
+            cancha_id, f"Cancha {cancha_id} - {nombre_tipo}", deporte, capacidad, Decimal(f"{precio:.2f}"),
+            'Activa', hora(6), hora(22), f"Cancha de {deporte.lower()}", creacion, creacion,
+            tipo_id, nombre_tipo, f"Cancha de {nombre_tipo.lower()}", Decimal(f"{precio:.2f}")
+        ))
+    
+    ranking = []
+    for cancha in canchas:
+        total = rng.randint(0, 500)
+        ingresos = Decimal(total) * cancha[4]
+        ranking.append((cancha[0], cancha[1], cancha[2], cancha[4], total, ingresos,
+                        (ingresos / total).quantize(Decimal('0.01')) if total else None))
+    mas_usadas = sorted(ranking, key=lambda fila: (fila[4], fila[5]), reverse=True)
+    mas_recaudan = [fila + (fila[6],) for fila in sorted(ranking, key=lambda fila: (fila[5], fila[4]), reverse=True)]
+    
+    precios = [cancha[4] for cancha in canchas]
+    return {
+        'reservas': (COLUMNAS_RESERVAS, reservas),
+        'canchas_con_tipos': (COLUMNAS_CANCHAS_CON_TIPOS, canchas),
+        'estadisticas_canchas': (
+            ['total_canchas', 'canchas_activas', 'canchas_inactivas', 'precio_promedio', 'ingresos_potenciales'],
+            [(tamano, tamano, 0, sum(precios) / len(precios) if precios else None, sum(precios))]
+        ),
+        'tipos_cancha': (
+            ['id', 'nombre', 'descripcion', 'precio_por_hora', 'estado', 'fecha_creacion', 'fecha_actualizacion'],
+            [(tipo_id, nombre, f"Cancha de {nombre.lower()}", Decimal(f"{precio:.2f}"), 'Activo', creacion, creacion)
+             for tipo_id, (nombre, _, precio, _) in enumerate(TIPOS_CANCHA, start=1)]
+        ),
+        'canchas_mas_usadas': (COLUMNAS_RANKING, mas_usadas),
+        'canchas_mas_recaudan': (COLUMNAS_RANKING + ['ingreso_promedio_por_reserva'], mas_recaudan)
+    }
+
+def _oid_columna(filas, posicion):
+    for fila in filas:
+        if fila[posicion] is not None:
+            return next((oid for tipo, oid in OID_POR_TIPO if isinstance(fila[posicion], tipo)), None)
+    return None
+
+class CursorFicticio:
+    """
+    Cursor que responde cada consulta con el conjunto de datos de su ruta.
+    """
+    
+    def __init__(self, datos, cursor_factory=None):
+        self._datos = datos
+        self._cursor_factory = cursor_factory
+        self._filas = []
+        self._posicion = 0
+        self.description = None
+        self.rowcount = -1
+        self._mogrificadas = {}
+    
+    def execute(self, sql, params=None):
+        if isinstance(sql, bytes):
+            sql = sql.decode('utf-8')
+        texto = ' '.join(str(sql).lower().split())
+        nombre = None
+        for fragmento, conjunto in RUTAS:
+            if fragmento in texto:
+                nombre = conjunto
+                break
+        else:
+            _sin_ruta.add(texto[:80])
+        
+        columnas, filas = self._datos.get(nombre, ([], []))
+        tipos = [_oid_columna(filas, posicion) for posicion in range(len(columnas))]
+        # Las consultas con LIMIT reciben el límite como último parámetro
+        if texto.endswith('limit 0'):
+            filas = []
+        elif 'limit %s' in texto and params:
+            filas = filas[:list(params)[-1]]
+        self._filas = convertir_filas(filas, columnas, self._cursor_factory)
+        self._posicion = 0
+        self.rowcount = len(filas)
+        self.description = [(columna, tipo, None, None, None, None, None)
+                            for columna, tipo in zip(columnas, tipos)] or None
+    
+    def mogrify(self, sql, params=None):
+        resultado = sql.encode('utf-8')
+        self._mogrificadas[resultado] = params
+        return resultado
+    
+    def copy_expert(self, sql, archivo, size=8192):
+        # Igual que COPY ... TO STDOUT WITH (FORMAT csv, HEADER, NULL '\N')
+        self.execute(sql, self._mogrificadas.get(sql))
+        texto = io.StringIO()
+        escritor = csv.writer(texto, lineterminator='\n')
+        escritor.writerow([columna[0] for columna in self.description or []])
+        for fila in self.fetchall():
+            escritor.writerow([
+                '\\N' if valor is None else ('t' if valor else 'f') if isinstance(valor, bool) else str(valor)
+                for valor in fila
+            ])
+        archivo.write(texto.getvalue().encode('utf-8'))
+    
+    def fetchone(self):
+        if self._posicion >= len(self._filas):
+            return None
+        self._posicion += 1
+        return self._filas[self._posicion - 1]
+    
+    def fetchmany(self, size=100):
+        filas = self._filas[self._posicion:self._posicion + size]
+        self._posicion += len(filas)
+        return filas
+    
+    def fetchall(self):
+        filas = self._filas[self._posicion:]
+        self._posicion = len(self._filas)
+        return filas
+    
+    def __iter__(self):
+        return iter(self.fetchall())
+    
+    def close(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+
+class ConexionFicticia:
+    """
+    Conexión sin servidor que entrega CursorFicticio; commit y rollback no hacen nada.
+    """
+    
+    def __init__(self, datos):
+        self._datos = datos
+        self.closed = 0
+        self.status = STATUS_READY
+        self.autocommit = False
+    
+    def cursor(self, *args, cursor_factory=None, **kwargs):
+        return CursorFicticio(self._datos, cursor_factory)
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        pass
+    
+    def cancel(self):
+        pass
+    
+    def close(self):
+        pass
+
+def preparar_datos(tamano, semilla=42):
+    """
+    Crea (una sola vez por tamaño) los datos ficticios que usarán las vistas.
+    """
+    if tamano not in _datos:
+        _datos[tamano] = crear_datos(tamano, semilla)
+
+def _mostrar_dashboard(tamano):
+    from vistas.dashboard_view import DashboardView
+    DashboardView().show()
+
+def _mostrar_lista_reservas(tamano):
+    from vistas.reservas_view import ReservasView
+    ReservasView().show_lista_reservas()
+
+def _mostrar_reportes_generales(tamano):
+    from vistas.reportes_generales_view import ReportesGeneralesView
+    # El reporte se dibuja al pulsar "Generar Reportes"; se llama directamente
+    # con el límite igual al tamaño para que las tablas tengan todas las filas
+    ReportesGeneralesView().mostrar_reportes(date(2024, 1, 1), date(2024, 12, 31), tamano)
+
+VISTAS = {
+    'dashboard': _mostrar_dashboard,
+    'reservas.lista': _mostrar_lista_reservas,
+    'reportes_generales': _mostrar_reportes_generales
+}
+
+def mostrar_vista(vista, tamano, reproducir=None):
+    """
+    Dibuja una vista con los datos ficticios de un tamaño o con una grabación
+    (lo llama SCRIPT_VISTA).
+    """
+    import streamlit as st
+    from utils.almacen_resultados import almacen_resultados
+    
+    st.session_state.setdefault('current_user', {'username': 'benchmark'})
+    st.session_state.setdefault('user_role', 'admin_reservas')
+    st.session_state.setdefault('user_info', {'usuario_actual': 'admin_reservas'})
+    # Cada ejecución mide un dibujo en frío, sin resultados compartidos de la anterior
+    almacen_resultados.limpiar()
+    
+    if reproducir:
+        if reproducir not in _reproductores:
+            _reproductores[reproducir] = ReproductorConexiones(reproducir, latencia=0, estricto=False)
+        fabrica = _reproductores[reproducir]
+    else:
+        preparar_datos(tamano)
+        datos = _datos[tamano]
+        fabrica = lambda: ConexionFicticia(datos)
+    anterior = establecer_fabrica_conexiones(fabrica)
+    try:
+        VISTAS[vista](tamano)
+    finally:
+        establecer_fabrica_conexiones(anterior)
+
+def ejecutar_vista(vista, tamano, medir_memoria=False, reproducir=None):
+    """
+    Ejecuta la vista una vez en un AppTest nuevo.
+    
+    Args:
+        vista (str): Nombre de la vista en VISTAS
+        tamano (int): Tamaño de los datos
+        medir_memoria (bool): Medir el pico de memoria con tracemalloc
+        reproducir (str): Grabación con la que se responden las consultas
+    
+    Returns:
+        tuple: (milisegundos, pico de bytes o None)
+    
+    Raises:
+        RuntimeError: Si la vista lanzó una excepción
+    """
+    app = AppTest.from_string(SCRIPT_VISTA.format(vista=vista, tamano=tamano, reproducir=reproducir), default_timeout=300)
+    if medir_memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        app.run()
+        ms = (time.perf_counter() - inicio) * 1000
+        pico = tracemalloc.get_traced_memory()[1] if medir_memoria else None
+    finally:
+        if medir_memoria:
+            tracemalloc.stop()
+    if app.exception:
+        raise RuntimeError(str(app.exception[0].value))
+    return ms, pico
+
+def comparar(base, actual, tolerancia):
+    """
+    Compara contra una línea base guardada.
+    
+    Args:
+        base (dict): Resultados guardados ("vista@tamaño" -> {'ms', 'memoria_mb'})
+        actual (dict): Resultados actuales con el mismo formato
+        tolerancia (float): Aumento relativo aceptado (0.2 = 20%)
+    
+    Returns:
+        list: Mensajes de las regresiones encontradas
+    """
+    regresiones = []
+    for clave, resultado in actual.items():
+        anterior = base.get(clave)
+        if anterior is None:
+            continue
+        for medida, unidad in (('ms', 'ms'), ('memoria_mb', 'MB')):
+            if resultado[medida] > anterior[medida] * (1 + tolerancia):
+                regresiones.append(f"{clave}: {medida} {anterior[medida]:.1f} → {resultado[medida]:.1f} {unidad}")
+    return regresiones
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del costo de dibujar las vistas")
+    parser.add_argument('--vistas', nargs='+', choices=list(VISTAS), default=list(VISTAS),
+                        help="Vistas a medir")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS_POR_DEFECTO,
+                        help="Filas de los datos ficticios")
+    parser.add_argument('--repeticiones', type=int, default=5,
+                        help="Ejecuciones medidas por vista y tamaño (más una de calentamiento)")
+    parser.add_argument('--guardar', metavar='RUTA',
+                        help="Guardar los resultados como línea base en JSON")
+    parser.add_argument('--comparar', metavar='RUTA',
+                        help="Comparar contra una línea base guardada")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="Aumento relativo de tiempo y memoria aceptado al comparar")
+    parser.add_argument('--reproducir', metavar='RUTA',
+                        help="Responder las consultas desde una grabación en lugar de los datos ficticios")
+    args = parser.parse_args()
+    
+    if args.reproducir:
+        # Solo valida el archivo; cada ejecución de AppTest usa su propia copia
+        try:
+            ReproductorConexiones(args.reproducir)
+        except (OSError, ValueError) as error:
+            print(f"❌ {error}")
+            return 1
+    
+    print(f"{'Vista':<22} | {'Filas':>7} | {'Mediana':>10} | {'Mín':>10} | {'Memoria pico':>12}")
+    print("-" * 72)
+    resultados = {}
+    for vista in args.vistas:
+        for tamano in args.tamanos:
+            try:
+                ejecutar_vista(vista, tamano, reproducir=args.reproducir)
+                tiempos = [ejecutar_vista(vista, tamano, reproducir=args.reproducir)[0]
+                           for _ in range(args.repeticiones)]
+                _, pico = ejecutar_vista(vista, tamano, medir_memoria=True, reproducir=args.reproducir)
+            except RuntimeError as error:
+                print(f"❌ {vista} con {tamano} filas: {error}")
+                return 1
+            resultados[f"{vista}@{tamano}"] = {
+                'ms': statistics.median(tiempos),
+                'memoria_mb': pico / 1024 / 1024
+            }
+            print(f"{vista:<22} | {tamano:>7} | {statistics.median(tiempos):>8.1f}ms | "
+                  f"{min(tiempos):>8.1f}ms | {pico / 1024 / 1024:>9.1f} MB")
+    
+    # El estado de las ejecuciones quedó en la instancia que importó AppTest
+    from herramientas import benchmark_vistas as instancia
+    sin_datos = set(instancia._sin_ruta)
+    for reproductor in instancia._reproductores.values():
+        sin_datos |= reproductor.faltantes
+    if sin_datos:
+        print("\n⚠️ Consultas sin datos ficticios ni grabados (respondidas vacías):")
+        for consulta in sorted(sin_datos):
+            print(f"   {consulta}")
+    
+    if args.guardar:
+        with open(args.guardar, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'repeticiones': args.repeticiones,
+                'grabacion': args.reproducir,
+                'vistas': resultados
+            }, archivo, indent=2, ensure_ascii=False)
+        print(f"💾 Línea base guardada en {args.guardar}")
+    
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(base['vistas'], resultados, args.tolerancia)
+        print("-" * 72)
+        if regresiones:
+            for mensaje in regresiones:
+                print(f"❌ {mensaje}")
+            return 1
+        print(f"✅ Sin regresiones respecto a {args.comparar} (tolerancia {args.tolerancia:.0%})")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+"""
+Exportación de reservas o de la auditoría a CSV por bloques
+
+Lee con un cursor del servidor (iter_query_dict en capa_datos/data_access.py)
+y escribe cada bloque a medida que llega, así la memoria del proceso no
+crece con la cantidad de filas. Con --limite o Ctrl+C la lectura se corta y
+el cursor se cierra en el servidor sin traer el resto.
+
+Uso:
+    python -m herramientas.exportar_csv reservas --salida reservas.csv
+    python -m herramientas.exportar_csv auditoria --desde 2024-01-01 --hasta 2024-12-31 --salida auditoria.csv
+    python -m herramientas.exportar_csv reservas --limite 1000 --itersize 500 --salida muestra.csv
+    python -m herramientas.exportar_csv reservas --salida reservas.csv --memoria
+"""
+import time
+import argparse
+import tracemalloc
+from datetime import date
+
+def exportar(datos, archivo, desde=None, hasta=None, limite=None, itersize=None):
+    """
+    Escribe las filas pedidas en el archivo.
+    
+    Args:
+        datos (str): 'reservas' o 'auditoria'
+        archivo: Archivo de texto abierto para escribir (newline='')
+        desde (date): Fecha de inicio (opcional)
+        hasta (date): Fecha de fin (opcional)
+        limite (int): Máximo de filas (opcional)
+        itersize (int): Filas por bloque (default: DB_ITERSIZE)
+    
+    Returns:
+        int: Filas escritas, o None si falló
+    """
+    if datos == 'reservas':
+        from logica_negocio.reports_logic import reports_logic
+        return reports_logic.exportar_reservas_completas_csv(
+            archivo, desde, hasta, limite=limite, itersize=itersize
+        )
+    from logica_negocio.auditoria_logic import AuditoriaLogic
+    return AuditoriaLogic().exportar_auditoria_csv(archivo, desde, hasta, limite=limite, itersize=itersize)
+
+def main():
+    parser = argparse.ArgumentParser(description="Exportación de reservas o auditoría a CSV por bloques")
+    parser.add_argument('datos', choices=['reservas', 'auditoria'],
+                        help="Qué exportar: vista_reporte_reservas o la tabla auditoria")
+    parser.add_argument('--salida', required=True,
+                        help="Archivo CSV de destino")
+    parser.add_argument('--desde', type=date.fromisoformat,
+                        help="Fecha de inicio (YYYY-MM-DD)")
+    parser.add_argument('--hasta', type=date.fromisoformat,
+                        help="Fecha de fin (YYYY-MM-DD)")
+    parser.add_argument('--limite', type=int,
+                        help="Exportar como máximo esta cantidad de filas")
+    parser.add_argument('--itersize', type=int,
+                        help="Filas por bloque leído del servidor (default: DB_ITERSIZE o 2000)")
+    parser.add_argument('--memoria', action='store_true',
+                        help="Medir el pico de memoria de Python durante la exportación (más lento)")
+    args = parser.parse_args()
+    
+    if args.memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        with open(args.salida, 'w', newline='', encoding='utf-8') as archivo:
+            escritas = exportar(args.datos, archivo, args.desde, args.hasta, args.limite, args.itersize)
+    except KeyboardInterrupt:
+        print(f"⚠️ Exportación cancelada; {args.salida} quedó incompleto")
+        return 1
+    except OSError as error:
+        print(f"❌ {error}")
+        return 1
+    
+    if escritas is None:
+        print("❌ No se pudo exportar (ver errores anteriores)")
+        return 1
+    
+    segundos = time.perf_counter() - inicio
+    print(f"💾 {escritas} filas en {args.salida} ({segundos:.1f} s)")
+    if args.memoria:
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"   Pico de memoria de Python: {pico / 1024 / 1024:.1f} MB")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,453 @@
+"""
+Generador de carga con sesiones concurrentes de recepción, consulta y administración
+
+Simula operadores trabajando a la vez sobre la capa de lógica (ReservasLogic,
+PagosLogic, ClientesLogic, ReportsLogic, AuditoriaLogic), sin Streamlit. Cada
+sesión sigue el perfil de uno de los tres roles, con su mezcla de operaciones
+y su tiempo de pensar entre acciones. La concurrencia sube por etapas y en
+cada una se reporta el rendimiento (operaciones por segundo), la latencia
+p50/p95/p99, la tasa de errores y los backends de PostgreSQL abiertos.
+
+Las escrituras se revierten en lugar de confirmarse (salvo --confirmar-escrituras)
+para que la base cargada con herramientas.generador_datos no cambie entre
+corridas. Cada perfil puede conectarse con las credenciales de su rol
+(CARGA_<PERFIL>_USUARIO / CARGA_<PERFIL>_CLAVE); si no están definidas se
+usan las de la configuración actual.
+
+Uso:
+    python -m herramientas.generador_carga --etapas 5 10 20 40 --duracion 60
+    python -m herramientas.generador_carga --etapas 50 100 --modo procesos --procesos 4 --pensar 0.5
+    python -m herramientas.generador_carga --mezcla operador=1 --pensar 0 --salida carga.json
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import date, time as hora, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from capa_datos.data_access import propagar_errores
+from capa_datos.database_connection import establecer_fabrica_conexiones
+from capa_datos.instrumentacion import FabricaConexionesMedidas
+from config.database_settings import get_database_config
+from config.settings import obtener_configuracion
+from herramientas.benchmark_busqueda_clientes import TERMINOS, percentil
+from herramientas.benchmark_rutas_criticas import cargar_contexto
+from logica_negocio.reservas_logic import ReservasLogic
+from logica_negocio.pagos_logic import PagosLogic
+from logica_negocio.clientes_logic import ClientesLogic
+from logica_negocio.reports_logic import ReportsLogic
+from logica_negocio.auditoria_logic import AuditoriaLogic
+
+# Perfiles de uso: rol de base de datos, segundos de pensar entre acciones y
+# peso de cada operación
+PERSONAS = {
+    'operador': {
+        'rol': 'operador_reservas',
+        'pensar': (1.0, 4.0),
+        'operaciones': {
+            'verificar_disponibilidad': 30,
+            'buscar_clientes': 20,
+            'reservas_paginadas': 15,
+            'crear_reserva': 10,
+            'calcular_saldo': 10,
+            'reserva_por_id': 10,
+            'crear_pago': 5
+        }
+    },
+    'consultor': {
+        'rol': 'consultor_reservas',
+        'pensar': (3.0, 10.0),
+        'operaciones': {
+            'dashboard': 20,
+            'top_clientes': 20,
+            'estadisticas_horarios': 15,
+            'canchas_mas_recaudan': 15,
+            'estadisticas_pagos': 15,
+            'reservas_paginadas': 15
+        }
+    },
+    'admin': {
+        'rol': 'admin_reservas',
+        'pensar': (2.0, 6.0),
+        'operaciones': {
+            'auditoria_por_fecha': 25,
+            'estadisticas_auditoria': 15,
+            'dashboard': 20,
+            'reservas_paginadas': 15,
+            'verificar_disponibilidad': 10,
+            'crear_reserva': 10,
+            'buscar_clientes': 5
+        }
+    }
+}
+
+MEZCLA_POR_DEFECTO = {'operador': 6, 'consultor': 3, 'admin': 1}
+
+METODOS_PAGO = ['Efectivo', 'Tarjeta de Crédito', 'Tarjeta de Débito', 'Transferencia Bancaria', 'Pago Móvil']
+
+# Fábrica de conexiones de la sesión que corre en cada hilo y la de respaldo
+_sesion = threading.local()
+_sesion_base = {'fabrica': None}
+
+def _horario(rng):
+    inicio = rng.randint(7, 20)
+    return hora(inicio), hora(inicio + 1)
+
+def _fecha_historica(contexto, rng):
+    return contexto['desde'] + timedelta(days=rng.randint(0, contexto['dias']))
+
+def _rango_mensual(contexto, rng):
+    inicio = contexto['desde'] + timedelta(days=rng.randint(0, max(0, contexto['dias'] - 30)))
+    return inicio, inicio + timedelta(days=30)
+
+OPERACIONES = {
+    'verificar_disponibilidad': lambda l, c, rng: l['reservas'].verificar_disponibilidad(
+        rng.choice(c['canchas']), _fecha_historica(c, rng), *_horario(rng)),
+    'buscar_clientes': lambda l, c, rng: l['clientes'].buscar_clientes(rng.choice(TERMINOS), 20),
+    'reservas_paginadas': lambda l, c, rng: l['reservas'].obtener_reservas_paginadas(rng.randint(1, 20), 10),
+    'crear_reserva': lambda l, c, rng: l['reservas'].crear_reserva(
+        rng.choice(c['ids_clientes']), rng.choice(c['canchas']),
+        date.today() + timedelta(days=rng.randint(1, 89)), *_horario(rng)),
+    'calcular_saldo': lambda l, c, rng: l['pagos'].calcular_saldo_pendiente_reserva(
+        rng.randint(1, c['max_reserva'])),
+    'reserva_por_id': lambda l, c, rng: l['reservas'].obtener_reserva_por_id(rng.randint(1, c['max_reserva'])),
+    'crear_pago': lambda l, c, rng: l['pagos'].crear_pago(
+        rng.randint(1, c['max_reserva']), rng.choice([10, 20, 35, 50]), rng.choice(METODOS_PAGO)),
+    'dashboard': lambda l, c, rng: l['reportes'].obtener_dashboard_principal(),
+    'top_clientes': lambda l, c, rng: l['reportes'].obtener_top_clientes(*_rango_mensual(c, rng)),
+    'estadisticas_horarios': lambda l, c, rng: l['reportes'].obtener_estadisticas_horarios(*_rango_mensual(c, rng)),
+    'canchas_mas_recaudan': lambda l, c, rng: l['reportes'].obtener_canchas_mas_recaudan(*_rango_mensual(c, rng)),
+    'estadisticas_pagos': lambda l, c, rng: l['pagos'].obtener_estadisticas_pagos(*_rango_mensual(c, rng)),
+    'auditoria_por_fecha': lambda l, c, rng: l['auditoria'].obtener_auditoria_por_fecha(
+        *(fecha.isoformat() for fecha in _rango_mensual(c, rng))),
+    'estadisticas_auditoria': lambda l, c, rng: l['auditoria'].obtener_estadisticas()
+}
+
+def config_persona(persona):
+    """
+    Obtiene la configuración de conexión de un perfil.
+    
+    Usa CARGA_<PERFIL>_USUARIO y CARGA_<PERFIL>_CLAVE si están definidas (por
+    ejemplo CARGA_OPERADOR_USUARIO) y la configuración actual en otro caso.
+    
+    Args:
+        persona (str): Nombre del perfil en PERSONAS
+    
+    Returns:
+        dict: Configuración de conexión
+    """
+    config = dict(get_database_config())
+    configuracion = obtener_configuracion()
+    usuario = configuracion.texto(f"CARGA_{persona.upper()}_USUARIO")
+    if usuario:
+        config['user'] = usuario
+        config['password'] = configuracion.texto(f"CARGA_{persona.upper()}_CLAVE", '')
+    return config
+
+def _conexion_de_sesion():
+    # Los hilos internos de los reportes concurrentes no tienen sesión: usan la fábrica base
+    fabrica = getattr(_sesion, 'fabrica', None) or _sesion_base['fabrica']
+    return fabrica()
+
+def _capturar_errores(logica, errores):
+    """
+    Redirige _log_error de una lógica (y de las lógicas que contiene) a una
+    lista, porque los métodos de lógica atrapan sus errores y no los relanzan.
+    """
+    logica._log_error = errores.append
+    for valor in list(vars(logica).values()):
+        if hasattr(valor, '_log_error') and valor is not logica:
+            valor._log_error = errores.append
+
+def ejecutar_sesion(persona, contexto, fabrica, semilla, fin, factor_pensar, resultados):
+    """
+    Ejecuta operaciones de un perfil hasta el instante fin.
+    
+    Args:
+        persona (str): Nombre del perfil en PERSONAS
+        contexto (dict): IDs y fechas de donde salen los parámetros
+        fabrica (FabricaConexionesMedidas): Fábrica de conexiones del perfil
+        semilla (str): Semilla de la sesión
+        fin (float): Instante de time.monotonic() en que termina la sesión
+        factor_pensar (float): Multiplicador del tiempo de pensar (0 = sin pausas)
+        resultados (list): Lista donde se agregan tuplas (operacion, ms, fallo)
+    """
+    _sesion.fabrica = fabrica
+    perfil = PERSONAS[persona]
+    rng = random.Random(semilla)
+    nombres = list(perfil['operaciones'])
+    pesos = list(perfil['operaciones'].values())
+    
+    errores = []
+    logicas = {
+        'reservas': ReservasLogic(),
+        'pagos': PagosLogic(),
+        'clientes': ClientesLogic(),
+        'reportes': ReportsLogic(),
+        'auditoria': AuditoriaLogic()
+    }
+    for logica in logicas.values():
+        _capturar_errores(logica, errores)
+    
+    try:
+        while time.monotonic() < fin:
+            nombre = rng.choices(nombres, pesos)[0]
+            errores_antes = len(errores)
+            inicio = time.perf_counter()
+            fallo = False
+            try:
+                with propagar_errores():
+                    OPERACIONES[nombre](logicas, contexto, rng)
+            except Exception as error:
+                errores.append(str(error))
+                fallo = True
+            ms = (time.perf_counter() - inicio) * 1000
+            resultados.append((f"{persona}.{nombre}", ms, fallo or len(errores) > errores_antes))
+            
+            pausa = rng.uniform(*perfil['pensar']) * factor_pensar
+            restante = fin - time.monotonic()
+            if pausa > 0 and restante > 0:
+                time.sleep(min(pausa, restante))
+    finally:
+        # Las lógicas de la sesión son instancias propias (no las globales de
+        # cada módulo), así que sus conexiones guardadas entre llamadas (como
+        # la de escritura de ReportsLogic) no las usa nadie más
+        for logica in logicas.values():
+            conn = getattr(logica, 'conn', None)
+            if conn is not None and not conn.closed:
+                conn.close()
+
+def ejecutar_etapa(personas, contexto, confirmar, semilla, duracion, factor_pensar):
+    """
+    Ejecuta una sesión por perfil indicado, cada una en su hilo, durante la duración dada.
+    
+    Es el punto de entrada de cada proceso en el modo procesos.
+    
+    Args:
+        personas (list): Tuplas (numero_sesion, perfil)
+        contexto (dict): IDs y fechas de donde salen los parámetros
+        confirmar (bool): Confirmar las escrituras en lugar de revertirlas
+        semilla (int): Semilla base
+        duracion (float): Segundos de la etapa
+        factor_pensar (float): Multiplicador del tiempo de pensar
+    
+    Returns:
+        list: Tuplas (operacion, ms, fallo)
+    """
+    fabricas = {
+        persona: FabricaConexionesMedidas(config_persona(persona), descartar_escrituras=not confirmar)
+        for persona in PERSONAS
+    }
+    _sesion_base['fabrica'] = FabricaConexionesMedidas(get_database_config(), descartar_escrituras=not confirmar)
+    anterior = establecer_fabrica_conexiones(_conexion_de_sesion)
+    
+    fin = time.monotonic() + duracion
+    resultados = []
+    hilos = []
+    try:
+        for numero, persona in personas:
+            parciales = []
+            hilo = threading.Thread(
+                target=ejecutar_sesion,
+                args=(persona, contexto, fabricas[persona], f"{semilla}:{numero}", fin, factor_pensar, parciales),
+                daemon=True
+            )
+            hilo.start()
+            hilos.append((hilo, parciales))
+        for hilo, parciales in hilos:
+            hilo.join()
+            resultados.extend(parciales)
+    finally:
+        establecer_fabrica_conexiones(anterior)
+    return resultados
+
+class MonitorBackends(threading.Thread):
+    """
+    Mide periódicamente los backends de PostgreSQL conectados a la base.
+    
+    Args:
+        config (dict): Configuración de conexión
+        intervalo (float): Segundos entre mediciones
+    """
+    
+    def __init__(self, config, intervalo=0.5):
+        super().__init__(daemon=True)
+        self.config = config
+        self.intervalo = intervalo
+        self.muestras = []
+        self._detener = threading.Event()
+    
+    def run(self):
+        conn = FabricaConexionesMedidas(self.config)()
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                while not self._detener.is_set():
+                    cur.execute("""
+                        SELECT COUNT(*), COUNT(*) FILTER (WHERE state = 'active')
+                        FROM pg_stat_activity
+                        WHERE datname = current_database() AND backend_type = 'client backend'
+                    """)
+                    self.muestras.append(cur.fetchone())
+                    self._detener.wait(self.intervalo)
+        finally:
+            conn.close()
+    
+    def detener(self):
+        """
+        Termina el monitoreo y espera al hilo.
+        
+        Returns:
+            dict: {'max', 'promedio', 'activos_max'} (el monitor cuenta como un backend)
+        """
+        self._detener.set()
+        self.join()
+        if not self.muestras:
+            return {'max': 0, 'promedio': 0, 'activos_max': 0}
+        return {
+            'max': max(total for total, _ in self.muestras),
+            'promedio': sum(total for total, _ in self.muestras) / len(self.muestras),
+            'activos_max': max(activos for _, activos in self.muestras)
+        }
+
+def resumir(resultados, duracion):
+    """
+    Resume las operaciones de una etapa.
+    
+    Args:
+        resultados (list): Tuplas (operacion, ms, fallo)
+        duracion (float): Segundos de la etapa
+    
+    Returns:
+        dict: Totales, latencias y resumen por operación
+    """
+    def estadisticas(filas):
+        tiempos = [ms for _, ms, _ in filas]
+        fallos = sum(1 for _, _, fallo in filas if fallo)
+        return {
+            'operaciones': len(filas),
+            'por_segundo': len(filas) / duracion,
+            'p50': percentil(tiempos, 50) if tiempos else 0,
+            'p95': percentil(tiempos, 95) if tiempos else 0,
+            'p99': percentil(tiempos, 99) if tiempos else 0,
+            'errores': fallos / len(filas) if filas else 0
+        }
+    
+    por_operacion = {}
+    for fila in resultados:
+        por_operacion.setdefault(fila[0], []).append(fila)
+    resumen = estadisticas(resultados)
+    resumen['por_operacion'] = {nombre: estadisticas(filas) for nombre, filas in sorted(por_operacion.items())}
+    return resumen
+
+def repartir_personas(sesiones, mezcla, semilla):
+    """
+    Asigna un perfil a cada sesión respetando las proporciones de la mezcla.
+    
+    Returns:
+        list: Tuplas (numero_sesion, perfil)
+    """
+    total = sum(mezcla.values())
+    asignadas = []
+    for persona, peso in mezcla.items():
+        asignadas += [persona] * round(sesiones * peso / total)
+    while len(asignadas) < sesiones:
+        asignadas.append(max(mezcla, key=mezcla.get))
+    asignadas = asignadas[:sesiones]
+    random.Random(semilla).shuffle(asignadas)
+    return list(enumerate(asignadas))
+
+def _mezcla(texto):
+    persona, _, peso = texto.partition('=')
+    if persona not in PERSONAS or not peso:
+        raise argparse.ArgumentTypeError(f"Use perfil=peso con perfil en {', '.join(PERSONAS)}")
+    return persona, float(peso)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga con sesiones concurrentes")
+    parser.add_argument('--etapas', type=int, nargs='+', default=[5, 10, 20, 40],
+                        help="Sesiones concurrentes de cada etapa")
+    parser.add_argument('--duracion', type=float, default=60,
+                        help="Segundos de cada etapa")
+    parser.add_argument('--mezcla', type=_mezcla, nargs='+',
+                        help="Peso de cada perfil, por ejemplo operador=6 consultor=3 admin=1")
+    parser.add_argument('--pensar', type=float, default=1.0,
+                        help="Multiplicador del tiempo de pensar entre acciones (0 = sin pausas)")
+    parser.add_argument('--modo', choices=['hilos', 'procesos'], default='hilos',
+                        help="Correr todas las sesiones en este proceso o repartirlas en varios")
+    parser.add_argument('--procesos', type=int, default=4,
+                        help="Procesos en el modo procesos")
+    parser.add_argument('--semilla', type=int, default=42,
+                        help="Semilla de la mezcla y de los parámetros")
+    parser.add_argument('--confirmar-escrituras', action='store_true',
+                        help="Confirmar las reservas y pagos creados (por defecto se revierten)")
+    parser.add_argument('--salida', metavar='RUTA',
+                        help="Guardar el resumen de cada etapa en JSON")
+    args = parser.parse_args()
+    
+    mezcla = dict(args.mezcla) if args.mezcla else MEZCLA_POR_DEFECTO
+    config = get_database_config()
+    try:
+        contexto = cargar_contexto(FabricaConexionesMedidas(config))
+    except Exception as error:
+        print(f"❌ {error}")
+        return 1
+    contexto = {clave: contexto[clave] for clave in ('canchas', 'ids_clientes', 'desde', 'dias', 'max_reserva')}
+    
+    total = sum(mezcla.values())
+    print("Perfiles: " + ', '.join(
+        f"{persona} ({PERSONAS[persona]['rol']}) {peso / total:.0%}" for persona, peso in mezcla.items()
+    ))
+    print(f"{'Sesiones':>8} | {'Ops/s':>8} | {'p50':>9} | {'p95':>9} | {'p99':>9} | {'Errores':>7} | {'Backends':>8}")
+    print("-" * 78)
+    etapas = []
+    for sesiones in args.etapas:
+        personas = repartir_personas(sesiones, mezcla, args.semilla)
+        monitor = MonitorBackends(config)
+        monitor.start()
+        inicio = time.monotonic()
+        if args.modo == 'procesos':
+            grupos = [personas[indice::args.procesos] for indice in range(args.procesos)]
+            with ProcessPoolExecutor(max_workers=args.procesos) as ejecutor:
+                futuros = [
+                    ejecutor.submit(ejecutar_etapa, grupo, contexto, args.confirmar_escrituras,
+                                    args.semilla, args.duracion, args.pensar)
+                    for grupo in grupos if grupo
+                ]
+                resultados = [fila for futuro in futuros for fila in futuro.result()]
+        else:
+            resultados = ejecutar_etapa(personas, contexto, args.confirmar_escrituras,
+                                        args.semilla, args.duracion, args.pensar)
+        duracion = time.monotonic() - inicio
+        backends = monitor.detener()
+        
+        resumen = resumir(resultados, duracion)
+        resumen.update(sesiones=sesiones, backends=backends)
+        etapas.append(resumen)
+        print(f"{sesiones:>8} | {resumen['por_segundo']:>8.1f} | {resumen['p50']:>7.1f}ms | "
+              f"{resumen['p95']:>7.1f}ms | {resumen['p99']:>7.1f}ms | {resumen['errores']:>6.1%} | "
+              f"{backends['max']:>8}")
+    
+    ultima = etapas[-1]
+    print(f"\nDetalle con {ultima['sesiones']} sesiones:")
+    print(f"{'Operación':<38} | {'Ops':>6} | {'p50':>9} | {'p95':>9} | {'p99':>9} | {'Errores':>7}")
+    print("-" * 92)
+    for nombre, resumen in ultima['por_operacion'].items():
+        print(f"{nombre:<38} | {resumen['operaciones']:>6} | {resumen['p50']:>7.1f}ms | "
+              f"{resumen['p95']:>7.1f}ms | {resumen['p99']:>7.1f}ms | {resumen['errores']:>6.1%}")
+    
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'mezcla': mezcla,
+                'duracion': args.duracion,
+                'pensar': args.pensar,
+                'modo': args.modo,
+                'etapas': etapas
+            }, archivo, indent=2, ensure_ascii=False, default=str)
+        print(f"💾 Resumen guardado en {args.salida}")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,651 @@
+"""
+Generador determinista de datos sintéticos a escala de producción
+
+Llena tipos_cancha, canchas, clientes, reservas (sin solapamientos, con más
+ocupación en la tarde y los fines de semana), pagos (completos, en cuotas y
+abonos parciales) y auditoria. Cada bloque de filas se genera con su propio
+generador aleatorio derivado de la semilla, así el resultado es idéntico sin
+importar cuántos procesos se usen ni en qué orden terminen. Los bloques se
+cargan en paralelo con COPY, cada uno en su propia conexión y transacción.
+
+Durante la carga se desactivan los triggers de usuario de las tablas
+(auditoría automática, saldos y columna de búsqueda) y al final se calculan
+saldos_reserva y clientes.busqueda en una sola pasada. Requiere un usuario
+dueño de las tablas.
+
+Uso:
+    python -m herramientas.generador_datos --preset pequeno --truncar
+    python -m herramientas.generador_datos --preset 1m --truncar --procesos 8 --recrear-indices
+    python -m herramientas.generador_datos --preset 10m --simular    # sin base de datos, solo la huella
+"""
+import io
+import math
+import time
+import random
+import hashlib
+import argparse
+from datetime import date, datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+PRESETS = {
+    'pequeno': {'clientes': 2000, 'canchas': 20, 'reservas': 20000, 'auditoria': 50000},
+    '1m': {'clientes': 100000, 'canchas': 150, 'reservas': 1000000, 'auditoria': 1000000},
+    '10m': {'clientes': 1000000, 'canchas': 800, 'reservas': 10000000, 'auditoria': 50000000}
+}
+
+# Tamaño de los bloques que procesa cada tarea y de cada envío de COPY
+CLIENTES_POR_BLOQUE = 50000
+RESERVAS_POR_BLOQUE = 100000
+AUDITORIA_POR_BLOQUE = 250000
+FILAS_POR_COPY = 50000
+
+TABLAS = ['tipos_cancha', 'canchas', 'clientes', 'reservas', 'pagos', 'saldos_reserva', 'auditoria']
+
+COLUMNAS = {
+    'tipos_cancha': 'id, nombre, descripcion, precio_por_hora, estado, fecha_creacion, fecha_actualizacion',
+    'canchas': ('id, nombre, tipo_deporte, capacidad, precio_hora, estado, horario_apertura, '
+                'horario_cierre, descripcion, fecha_creacion, fecha_actualizacion, tipo_cancha_id'),
+    'clientes': ('id, nombre, apellido, email, telefono, direccion, fecha_nacimiento, estado, '
+                 'fecha_registro, fecha_actualizacion'),
+    'reservas': ('id, cliente_id, cancha_id, fecha_reserva, hora_inicio, hora_fin, duracion, '
+                 'estado, observaciones, fecha_creacion, fecha_actualizacion'),
+    'pagos': ('id, reserva_id, cliente_id, monto, metodo_pago, estado, fecha_pago, observaciones, '
+              'fecha_creacion, fecha_actualizacion'),
+    'auditoria': 'id, usuario_id, tipo_accion, tabla, registro_id, detalles, resultado, ip_address, fecha_hora'
+}
+
+# (nombre, tipo_deporte, precio por hora, capacidad)
+TIPOS_CANCHA = [
+    ('Fútbol 11', 'Fútbol', 50.00, 100),
+    ('Fútbol 7', 'Fútbol', 40.00, 60),
+    ('Fútbol 5', 'Fútbol', 35.00, 30),
+    ('Basketball', 'Basketball', 35.00, 50),
+    ('Tennis', 'Tennis', 45.00, 30),
+    ('Voleibol', 'Voleibol', 30.00, 40),
+    ('Padel', 'Padel', 100.00, 16)
+]
+
+NOMBRES = ['Juan', 'María', 'Carlos', 'Ana', 'Luis', 'Sofía', 'Andrés', 'Lucía', 'José', 'Valentina',
+           'Martín', 'Camila', 'Jesús', 'Isabella', 'Ramón', 'Inés', 'Tomás', 'Daniela', 'Diego', 'Paula',
+           'Felipe', 'Mariana', 'Sebastián', 'Gabriela', 'Nicolás', 'Laura', 'Alejandro', 'Sara']
+APELLIDOS = ['Pérez', 'González', 'Rodríguez', 'López', 'Martínez', 'Gómez', 'Díaz', 'Hernández',
+             'Muñoz', 'Álvarez', 'Sánchez', 'Ramírez', 'Torres', 'Núñez', 'Rojas', 'Vargas', 'Castro',
+             'Ortiz', 'Moreno', 'Jiménez', 'Ruiz', 'Herrera', 'Medina', 'Aguilar']
+METODOS_PAGO = ['Efectivo', 'Tarjeta de Crédito', 'Tarjeta de Débito', 'Transferencia Bancaria', 'Pago Móvil']
+PESOS_METODOS = [35, 20, 20, 15, 10]
+VIAS = ['Calle', 'Carrera', 'Avenida', 'Diagonal', 'Transversal']
+
+# Textos que escribe registrar_auditoria_automatica()
+DETALLES_AUDITORIA = {
+    'INSERT': 'Nuevo registro creado',
+    'UPDATE': 'Registro actualizado',
+    'DELETE': 'Registro eliminado'
+}
+
+HORAS = {minuto: f"{minuto // 60:02d}:{minuto % 60:02d}" for minuto in range(0, 24 * 60 + 1, 30)}
+
+def _rng(plan, *partes):
+    """
+    Crea el generador aleatorio de una parte de los datos (determinista por semilla).
+    
+    Args:
+        plan (dict): Plan de generación
+        *partes: Identificadores de la parte (tabla, bloque, ...)
+    
+    Returns:
+        random.Random: Generador propio de esa parte
+    """
+    return random.Random(':'.join(str(parte) for parte in (plan['semilla'],) + partes))
+
+def _ocupacion(hora):
+    """
+    Probabilidad base de que una cancha esté reservada a una hora del día.
+    
+    Args:
+        hora (int): Hora de inicio (0-23)
+    
+    Returns:
+        float: Probabilidad entre 0 y 1
+    """
+    if hora >= 22:
+        return 0.40
+    if hora >= 18:
+        return 0.85
+    if hora == 17:
+        return 0.55
+    if hora >= 14:
+        return 0.25
+    if hora >= 12:
+        return 0.30
+    if hora >= 9:
+        return 0.20
+    return 0.30
+
+def _canchas(plan):
+    """
+    Genera las canchas del plan.
+    
+    Returns:
+        list: Tuplas (id, nombre, tipo_deporte, capacidad, precio_hora, estado,
+            apertura_min, cierre_min, tipo_cancha_id, popularidad)
+    """
+    rng = _rng(plan, 'canchas')
+    canchas = []
+    for cancha_id in range(1, plan['canchas'] + 1):
+        tipo_id = rng.randint(1, len(TIPOS_CANCHA))
+        nombre_tipo, deporte, precio, capacidad = TIPOS_CANCHA[tipo_id - 1]
+        r = rng.random()
+        estado = 'Activa' if r < 0.92 else ('Mantenimiento' if r < 0.97 else 'Inactiva')
+        canchas.append((
+            cancha_id,
+            f"Cancha {cancha_id} - {nombre_tipo}",
+            deporte,
+            capacidad,
+            round(precio * rng.uniform(0.8, 1.3), 2),
+            estado,
+            rng.choice([6, 6, 7]) * 60,
+            rng.choice([22, 22, 23]) * 60,
+            tipo_id,
+            rng.uniform(0.55, 1.15)
+        ))
+    return canchas
+
+def _reservas_dia(rng, cancha, fecha):
+    """
+    Genera los horarios reservados de una cancha en un día, sin solapamientos.
+    
+    Args:
+        rng (random.Random): Generador del bloque
+        cancha (tuple): Cancha según _canchas()
+        fecha (date): Día
+    
+    Yields:
+        tuple: (inicio_min, fin_min)
+    """
+    _, _, _, _, _, _, apertura, cierre, _, popularidad = cancha
+    factor = popularidad * (1.25 if fecha.weekday() >= 5 else 1.0)
+    inicio = apertura
+    while inicio + 60 <= cierre:
+        if rng.random() < min(0.95, _ocupacion(inicio // 60) * factor):
+            r = rng.random()
+            duracion = 60 if r < 0.55 else (90 if r < 0.85 else 120)
+            if inicio + duracion > cierre:
+                duracion = 60
+            yield inicio, inicio + duracion
+            inicio += duracion
+        else:
+            inicio += 30
+
+def crear_plan(preset, semilla, desde, clientes=None, canchas=None, reservas=None, auditoria=None):
+    """
+    Calcula el plan de generación: tamaños, rango de fechas y bloques.
+    
+    El número de días se estima con una muestra de la ocupación para que el
+    total de reservas quede cerca del objetivo.
+    
+    Returns:
+        dict: Plan de generación
+    """
+    tamanos = dict(PRESETS[preset])
+    for clave, valor in (('clientes', clientes), ('canchas', canchas), ('reservas', reservas), ('auditoria', auditoria)):
+        if valor is not None:
+            tamanos[clave] = valor
+    
+    plan = dict(tamanos, preset=preset, semilla=semilla, desde=desde.isoformat())
+    lista_canchas = _canchas(plan)
+    
+    rng = _rng(plan, 'estimacion')
+    muestras = 400
+    total = 0
+    for _ in range(muestras):
+        cancha = lista_canchas[rng.randrange(len(lista_canchas))]
+        total += sum(1 for _ in _reservas_dia(rng, cancha, desde + timedelta(days=rng.randrange(7))))
+    por_dia = max(1.0, total / muestras * len(lista_canchas))
+    
+    dias = max(1, math.ceil(plan['reservas'] / por_dia))
+    plan['dias'] = dias
+    plan['dias_por_bloque'] = max(1, round(RESERVAS_POR_BLOQUE / por_dia))
+    # Lo anterior al corte es historia (completadas); lo posterior, reservas futuras
+    plan['corte'] = (desde + timedelta(days=int(dias * 0.9))).isoformat()
+    return plan
+
+def _linea(fila):
+    """
+    Convierte una fila en una línea de COPY en formato texto.
+    """
+    return '\t'.join('\\N' if valor is None else str(valor) for valor in fila) + '\n'
+
+def _filas_tipos_cancha(plan):
+    creacion = datetime.fromisoformat(plan['desde']) - timedelta(days=400)
+    for tipo_id, (nombre, deporte, precio, _) in enumerate(TIPOS_CANCHA, start=1):
+        yield 'tipos_cancha', (tipo_id, nombre, f"Cancha de {nombre.lower()}", f"{precio:.2f}",
+                               'Activo', creacion, creacion)
+
+def _filas_canchas(plan):
+    creacion = datetime.fromisoformat(plan['desde']) - timedelta(days=365)
+    for cancha in _canchas(plan):
+        cancha_id, nombre, deporte, capacidad, precio, estado, apertura, cierre, tipo_id, _ = cancha
+        yield 'canchas', (cancha_id, nombre, deporte, capacidad, f"{precio:.2f}", estado,
+                          HORAS[apertura], HORAS[cierre], f"Cancha de {deporte.lower()}",
+                          creacion, creacion, tipo_id)
+
+def _filas_clientes(plan, bloque):
+    rng = _rng(plan, 'clientes', bloque)
+    desde = datetime.fromisoformat(plan['desde'])
+    primero = bloque * CLIENTES_POR_BLOQUE + 1
+    ultimo = min(plan['clientes'], primero + CLIENTES_POR_BLOQUE - 1)
+    for cliente_id in range(primero, ultimo + 1):
+        nombre = rng.choice(NOMBRES)
+        apellido = f"{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}"
+        registro = desde - timedelta(days=rng.randint(0, 720), minutes=rng.randint(0, 1439))
+        yield 'clientes', (
+            cliente_id,
+            nombre,
+            apellido,
+            f"cliente{cliente_id}@example.com",
+            f"3{rng.randint(0, 999999999):09d}",
+            f"{rng.choice(VIAS)} {rng.randint(1, 200)} #{rng.randint(1, 99)}-{rng.randint(1, 99)}",
+            date(1960, 1, 1) + timedelta(days=rng.randint(0, 17500)),
+            'Activo' if rng.random() < 0.95 else 'Inactivo',
+            registro,
+            registro
+        )
+
+def _pagos_reserva(rng, reserva, precio_hora, corte):
+    """
+    Genera los pagos de una reserva según su estado.
+    
+    Yields:
+        tuple: (monto, metodo, estado, fecha_pago, observaciones)
+    """
+    _, _, _, fecha, inicio, fin, _, estado, _, creacion, _ = reserva
+    total = round((fin - inicio) / 60 * precio_hora, 2)
+    r = rng.random()
+    if estado == 'completada':
+        cuotas = 1 if r < 0.80 else (2 if r < 0.92 else (-1 if r < 0.97 else 0))
+    elif estado == 'confirmada':
+        cuotas = 1 if r < 0.50 else (-1 if r < 0.80 else 0)
+    elif estado == 'pendiente':
+        cuotas = -1 if r < 0.20 else 0
+    else:
+        cuotas = 0
+    if cuotas == 0:
+        return
+    
+    metodo = rng.choices(METODOS_PAGO, PESOS_METODOS)[0]
+    estado_pago = 'Completado' if rng.random() < 0.97 else 'Pendiente'
+    dia_pago = min(fecha, corte) if cuotas == 1 else creacion.date()
+    if cuotas == 1:
+        yield total, metodo, estado_pago, dia_pago, None
+        return
+    
+    # Abono inicial al reservar; en dos cuotas el resto se paga el día de la reserva
+    abono = round(total * rng.choice([0.3, 0.4, 0.5]), 2)
+    yield abono, metodo, estado_pago, creacion.date(), 'Abono'
+    if cuotas == 2:
+        yield round(total - abono, 2), metodo, 'Completado', min(fecha, corte), 'Saldo'
+
+def _filas_reservas(plan, bloque, id_reserva=1, id_pago=1):
+    """
+    Genera las reservas y los pagos de un bloque de días.
+    
+    Args:
+        plan (dict): Plan de generación
+        bloque (int): Número de bloque
+        id_reserva (int): Primer ID de reserva del bloque
+        id_pago (int): Primer ID de pago del bloque
+    
+    Yields:
+        tuple: (tabla, fila)
+    """
+    rng = _rng(plan, 'reservas', bloque)
+    canchas = _canchas(plan)
+    desde = date.fromisoformat(plan['desde'])
+    corte = date.fromisoformat(plan['corte'])
+    primer_dia = bloque * plan['dias_por_bloque']
+    ultimo_dia = min(plan['dias'], primer_dia + plan['dias_por_bloque'])
+    n_clientes = plan['clientes']
+    
+    for dia in range(primer_dia, ultimo_dia):
+        fecha = desde + timedelta(days=dia)
+        futura = fecha > corte
+        for cancha in canchas:
+            for inicio, fin in _reservas_dia(rng, cancha, fecha):
+                r = rng.random()
+                if futura:
+                    estado = 'confirmada' if r < 0.55 else ('pendiente' if r < 0.95 else 'cancelada')
+                else:
+                    estado = 'completada' if r < 0.85 else ('cancelada' if r < 0.95 else 'confirmada')
+                
+                # Pocos clientes habituales concentran muchas reservas
+                cliente_id = int(n_clientes * rng.random() ** 2) + 1
+                creacion = (datetime.combine(fecha, datetime.min.time())
+                            - timedelta(days=rng.randint(0, 21), minutes=rng.randint(0, 1439)))
+                if futura:
+                    creacion = min(creacion, datetime.combine(corte, datetime.min.time()))
+                actualizacion = creacion
+                if estado == 'completada':
+                    actualizacion = datetime.combine(fecha, datetime.min.time()) + timedelta(minutes=fin)
+                elif estado == 'cancelada':
+                    actualizacion = creacion + timedelta(hours=rng.randint(1, 72))
+                
+                reserva = (id_reserva, cliente_id, cancha[0], fecha, inicio, fin, (fin - inicio) / 60,
+                           estado, None, creacion, actualizacion)
+                yield 'reservas', (id_reserva, cliente_id, cancha[0], fecha, HORAS[inicio], HORAS[fin],
+                                   f"{(fin - inicio) / 60:.2f}", estado,
+                                   'Reserva recurrente' if r > 0.98 else None, creacion, actualizacion)
+                
+                for monto, metodo, estado_pago, dia_pago, observaciones in _pagos_reserva(rng, reserva, cancha[4], corte):
+                    momento = datetime.combine(dia_pago, datetime.min.time()) + timedelta(minutes=rng.randint(360, 1320))
+                    yield 'pagos', (id_pago, id_reserva, cliente_id, f"{monto:.2f}", metodo, estado_pago,
+                                    dia_pago, observaciones, momento, momento)
+                    id_pago += 1
+                id_reserva += 1
+
+def _filas_auditoria(plan, bloque):
+    rng = _rng(plan, 'auditoria', bloque)
+    desde = datetime.fromisoformat(plan['desde'])
+    segundos = (date.fromisoformat(plan['corte']) - date.fromisoformat(plan['desde'])).days * 86400
+    total = plan['auditoria']
+    tamanos = {
+        'reservas': max(1, plan['reservas']),
+        'clientes': plan['clientes'],
+        'canchas': plan['canchas'],
+        'tipos_cancha': len(TIPOS_CANCHA)
+    }
+    primero = bloque * AUDITORIA_POR_BLOQUE + 1
+    ultimo = min(total, primero + AUDITORIA_POR_BLOQUE - 1)
+    for auditoria_id in range(primero, ultimo + 1):
+        r = rng.random()
+        tabla = 'reservas' if r < 0.70 else ('clientes' if r < 0.92 else ('canchas' if r < 0.98 else 'tipos_cancha'))
+        r = rng.random()
+        accion = 'INSERT' if r < 0.60 else ('UPDATE' if r < 0.95 else 'DELETE')
+        # Las fechas crecen con el ID, como en una tabla que solo recibe inserciones
+        fecha_hora = desde + timedelta(seconds=int(segundos * auditoria_id / total) + rng.randint(0, 59))
+        yield 'auditoria', (
+            auditoria_id,
+            None,
+            accion,
+            tabla,
+            rng.randint(1, tamanos[tabla]),
+            DETALLES_AUDITORIA[accion],
+            'SUCCESS' if rng.random() < 0.995 else 'ERROR',
+            '127.0.0.1',
+            fecha_hora
+        )
+
+def _conectar():
+    """
+    Abre una conexión al primario con la configuración actual (una por proceso).
+    """
+    from capa_datos.database_connection import get_connection
+    from config.database_settings import get_database_config
+    
+    config = get_database_config()
+    conn = get_connection(
+        user=config['user'],
+        password=config['password'],
+        host=config['host'],
+        port=config['port'],
+        dbname=config['database']
+    )
+    if not conn:
+        raise RuntimeError("No se pudo conectar a la base de datos")
+    return conn
+
+def _filas_tarea(plan, tarea, offsets):
+    tipo, bloque = tarea
+    if tipo == 'catalogos':
+        yield from _filas_tipos_cancha(plan)
+        yield from _filas_canchas(plan)
+    elif tipo == 'clientes':
+        yield from _filas_clientes(plan, bloque)
+    elif tipo == 'reservas':
+        yield from _filas_reservas(plan, bloque, *offsets)
+    else:
+        yield from _filas_auditoria(plan, bloque)
+
+def contar_bloque_reservas(plan, bloque):
+    """
+    Cuenta las reservas y pagos de un bloque (para asignar IDs consecutivos).
+    
+    Returns:
+        tuple: (reservas, pagos)
+    """
+    conteo = {'reservas': 0, 'pagos': 0}
+    for tabla, _ in _filas_reservas(plan, bloque):
+        conteo[tabla] += 1
+    return conteo['reservas'], conteo['pagos']
+
+def cargar_tarea(plan, tarea, offsets=(), simular=False):
+    """
+    Genera las filas de una tarea y las carga con COPY en una transacción.
+    
+    Con simular=True no se conecta a la base de datos y solo calcula la huella.
+    
+    Returns:
+        tuple: (tarea, conteo por tabla, huella hexadecimal)
+    """
+    huella = hashlib.sha256()
+    conteo = {}
+    pendientes = {}
+    conn = None if simular else _conectar()
+    try:
+        cur = conn.cursor() if conn else None
+        
+        def enviar(tabla):
+            texto = ''.join(pendientes.pop(tabla))
+            huella.update(texto.encode('utf-8'))
+            if cur:
+                cur.copy_expert(f"COPY {tabla} ({COLUMNAS[tabla]}) FROM STDIN", io.StringIO(texto))
+        
+        for tabla, fila in _filas_tarea(plan, tarea, offsets):
+            lineas = pendientes.setdefault(tabla, [])
+            lineas.append(_linea(fila))
+            conteo[tabla] = conteo.get(tabla, 0) + 1
+            if len(lineas) >= FILAS_POR_COPY:
+                # Las reservas del bloque van antes que sus pagos (clave foránea)
+                if tabla == 'pagos' and 'reservas' in pendientes:
+                    enviar('reservas')
+                enviar(tabla)
+        for tabla in [tabla for tabla in ('tipos_cancha', 'canchas', 'clientes', 'reservas', 'pagos', 'auditoria')
+                      if tabla in pendientes]:
+            enviar(tabla)
+        
+        if conn:
+            conn.commit()
+        return tarea, conteo, huella.hexdigest()
+    except Exception:
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+def _ejecutar(ejecutor, funcion, trabajos):
+    """
+    Ejecuta las tareas en el pool de procesos y retorna sus resultados en orden.
+    """
+    futuros = [ejecutor.submit(funcion, *argumentos) for argumentos in trabajos]
+    return [futuro.result() for futuro in futuros]
+
+def preparar_base(cur, truncar, recrear_indices, eliminados):
+    """
+    Verifica que las tablas estén vacías (o las vacía), desactiva los triggers de
+    usuario y opcionalmente elimina los índices secundarios.
+    
+    Args:
+        eliminados (list): Recibe la definición de cada índice a medida que se
+            elimina, así restaurar_base() los recrea aunque algo falle a mitad
+    """
+    if truncar:
+        cur.execute("TRUNCATE " + ', '.join(TABLAS) + " RESTART IDENTITY CASCADE")
+    else:
+        for tabla in TABLAS:
+            cur.execute(f"SELECT EXISTS (SELECT 1 FROM {tabla})")
+            if cur.fetchone()[0]:
+                raise RuntimeError(f"La tabla {tabla} tiene datos; usa --truncar para vaciarla")
+    
+    for tabla in TABLAS:
+        cur.execute(f"ALTER TABLE {tabla} DISABLE TRIGGER USER")
+    
+    indices = []
+    if recrear_indices:
+        cur.execute("""
+            SELECT indexname, indexdef FROM pg_indexes
+            WHERE schemaname = 'public' AND tablename = ANY(%s)
+            AND indexname NOT IN (SELECT conname FROM pg_constraint)
+        """, (TABLAS,))
+        for nombre, definicion in cur.fetchall():
+            cur.execute(f"DROP INDEX public.{nombre}")
+            eliminados.append(definicion)
+
+def finalizar_base(cur):
+    """
+    Calcula las columnas derivadas (con los triggers todavía desactivados) y
+    actualiza las secuencias.
+    """
+    cur.execute("UPDATE clientes SET busqueda = normalizar_busqueda_cliente(nombre, apellido, email, telefono)")
+    cur.execute("""
+        INSERT INTO saldos_reserva (reserva_id, total_precio, total_pagado)
+        SELECT r.id,
+               COALESCE(r.duracion * ca.precio_hora, 0),
+               COALESCE(p.total_pagado, 0)
+        FROM reservas r
+        JOIN canchas ca ON r.cancha_id = ca.id
+        LEFT JOIN (
+            SELECT reserva_id, SUM(monto) AS total_pagado
+            FROM pagos
+            WHERE estado = 'Completado'
+            GROUP BY reserva_id
+        ) p ON p.reserva_id = r.id
+    """)
+    for tabla in ('tipos_cancha', 'canchas', 'clientes', 'reservas', 'pagos', 'auditoria'):
+        cur.execute(f"SELECT setval('public.{tabla}_id_seq', GREATEST(MAX(id), 1), MAX(id) IS NOT NULL) FROM {tabla}")
+
+def restaurar_base(cur, indices):
+    """
+    Recrea los índices eliminados y reactiva los triggers de usuario.
+    
+    Se llama siempre, también si la carga falló: cada objeto se restaura por
+    separado para que una falla no deje a los demás sin restaurar.
+    
+    Returns:
+        list: Descripción de lo que no se pudo restaurar (vacía si todo quedó bien)
+    """
+    pendientes = []
+    for definicion in indices:
+        try:
+            cur.execute(definicion)
+        except Exception as e:
+            pendientes.append(f"índice: {definicion} ({e})")
+    for tabla in TABLAS:
+        try:
+            cur.execute(f"ALTER TABLE {tabla} ENABLE TRIGGER USER")
+        except Exception as e:
+            pendientes.append(f"triggers de {tabla}: ALTER TABLE {tabla} ENABLE TRIGGER USER ({e})")
+    return pendientes
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador determinista de datos sintéticos")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='pequeno',
+                        help="Tamaño del conjunto de datos")
+    parser.add_argument('--semilla', type=int, default=42,
+                        help="Semilla (la misma semilla produce los mismos datos)")
+    parser.add_argument('--desde', type=date.fromisoformat, default=date(2021, 1, 1),
+                        help="Fecha de la primera reserva (AAAA-MM-DD)")
+    parser.add_argument('--procesos', type=int, default=4,
+                        help="Procesos que generan y cargan bloques en paralelo")
+    parser.add_argument('--clientes', type=int, help="Reemplaza el número de clientes del preset")
+    parser.add_argument('--canchas', type=int, help="Reemplaza el número de canchas del preset")
+    parser.add_argument('--reservas', type=int, help="Reemplaza el número aproximado de reservas del preset")
+    parser.add_argument('--auditoria', type=int, help="Reemplaza el número de registros de auditoría del preset")
+    parser.add_argument('--truncar', action='store_true',
+                        help="Vaciar las tablas antes de cargar (el usuario admin se conserva)")
+    parser.add_argument('--recrear-indices', action='store_true',
+                        help="Eliminar los índices secundarios durante la carga y recrearlos al final")
+    parser.add_argument('--simular', action='store_true',
+                        help="Generar sin conectarse a la base de datos y mostrar solo la huella")
+    args = parser.parse_args()
+    
+    plan = crear_plan(args.preset, args.semilla, args.desde, args.clientes, args.canchas,
+                      args.reservas, args.auditoria)
+    print(f"Plan: {plan['clientes']} clientes, {plan['canchas']} canchas, ~{plan['reservas']} reservas "
+          f"en {plan['dias']} días desde {plan['desde']}, {plan['auditoria']} auditorías (semilla {plan['semilla']})")
+    
+    inicio = time.perf_counter()
+    conn = None
+    indices = []
+    completado = False
+    try:
+        if not args.simular:
+            conn = _conectar()
+            conn.autocommit = True
+            cur = conn.cursor()
+            preparar_base(cur, args.truncar, args.recrear_indices, indices)
+        
+        with ProcessPoolExecutor(max_workers=args.procesos) as ejecutor:
+            bloques_reservas = math.ceil(plan['dias'] / plan['dias_por_bloque'])
+            conteos = _ejecutar(ejecutor, contar_bloque_reservas,
+                                [(plan, bloque) for bloque in range(bloques_reservas)])
+            offsets = []
+            id_reserva, id_pago = 1, 1
+            for reservas, pagos in conteos:
+                offsets.append((id_reserva, id_pago))
+                id_reserva += reservas
+                id_pago += pagos
+            
+            # Los catálogos y clientes se cargan antes que las reservas que los referencian
+            resultados = _ejecutar(ejecutor, cargar_tarea, [(plan, ('catalogos', 0), (), args.simular)])
+            resultados += _ejecutar(ejecutor, cargar_tarea, [
+                (plan, ('clientes', bloque), (), args.simular)
+                for bloque in range(math.ceil(plan['clientes'] / CLIENTES_POR_BLOQUE))
+            ])
+            resultados += _ejecutar(ejecutor, cargar_tarea, [
+                (plan, ('reservas', bloque), offsets[bloque], args.simular)
+                for bloque in range(bloques_reservas)
+            ] + [
+                (plan, ('auditoria', bloque), (), args.simular)
+                for bloque in range(math.ceil(plan['auditoria'] / AUDITORIA_POR_BLOQUE))
+            ])
+        
+        if conn:
+            finalizar_base(cur)
+        completado = True
+    finally:
+        if conn:
+            # Los triggers y los índices se restauran aunque la carga haya fallado
+            if conn.closed:
+                conn = _conectar()
+                conn.autocommit = True
+                cur = conn.cursor()
+            pendientes = restaurar_base(cur, indices)
+            if pendientes:
+                print("❌ No se pudo restaurar (ejecutarlo a mano antes de usar la base):")
+                for pendiente in pendientes:
+                    print(f"   {pendiente}")
+                completado = False
+            elif completado:
+                for tabla in TABLAS:
+                    cur.execute(f"ANALYZE {tabla}")
+            conn.close()
+    
+    if not completado:
+        return 1
+    
+    totales = {}
+    huella = hashlib.sha256()
+    for _, conteo, huella_tarea in resultados:
+        huella.update(huella_tarea.encode())
+        for tabla, cantidad in conteo.items():
+            totales[tabla] = totales.get(tabla, 0) + cantidad
+    
+    print("-" * 40)
+    for tabla in ('tipos_cancha', 'canchas', 'clientes', 'reservas', 'pagos', 'auditoria'):
+        print(f"{tabla:<14} | {totales.get(tabla, 0):>12,}")
+    print(f"Huella: {huella.hexdigest()[:16]} ({time.perf_counter() - inicio:.1f} s)")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""
+Lote nocturno del paquete de reportes de un período
+
+Calcula los reportes de logica_negocio/lote_reportes.py (estadísticas
+mensuales, semanales, por horario y por día de la semana, rankings de
+clientes y canchas, resúmenes de pagos) en un pool de procesos: cada proceso
+abre su propia conexión y la reutiliza para los reportes que le tocan. Los
+resultados se guardan como una versión nueva del período, con el tiempo de
+cada reporte en el manifiesto, y la vista de reportes generales los lee todos
+sin consultar la base de datos.
+
+El período por defecto son los últimos 30 días hasta hoy, el mismo que
+muestra la vista al abrirse, y el límite de 50 cubre cualquier cantidad de
+registros que se pueda elegir en ella.
+
+Uso:
+    python -m herramientas.lote_reportes
+    python -m herramientas.lote_reportes --desde 2024-05-01 --hasta 2024-05-31 --procesos 6
+    python -m herramientas.lote_reportes --reportes top_clientes top_canchas --formato json
+    python -m herramientas.lote_reportes --procedimiento mensual
+
+Ejemplo de cron (todos los días a las 00:30):
+    30 0 * * * cd /ruta/gestionbdfinal && python -m herramientas.lote_reportes
+"""
+import time
+import argparse
+from datetime import date, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from logica_negocio.lote_reportes import (
+    REPORTES, FORMATO_PARQUET, FORMATO_JSON,
+    ejecutar_reporte, ejecutar_procedimiento, guardar_lote
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="Lote del paquete de reportes de un período")
+    parser.add_argument('--desde', type=date.fromisoformat,
+                        help="Fecha de inicio (YYYY-MM-DD; default: 30 días antes de --hasta)")
+    parser.add_argument('--hasta', type=date.fromisoformat, default=date.today(),
+                        help="Fecha de fin (YYYY-MM-DD; default: hoy)")
+    parser.add_argument('--limite', type=int, default=50,
+                        help="Filas de los rankings de clientes y canchas")
+    parser.add_argument('--reportes', nargs='+', choices=sorted(REPORTES), default=sorted(REPORTES),
+                        help="Reportes a calcular (default: todos)")
+    parser.add_argument('--procesos', type=int, default=4,
+                        help="Procesos que calculan reportes en paralelo, cada uno con su conexión")
+    parser.add_argument('--formato', choices=[FORMATO_PARQUET, FORMATO_JSON],
+                        help="Formato de los archivos (default: REPORTES_LOTE_FORMATO, o Parquet si está pyarrow)")
+    parser.add_argument('--directorio',
+                        help="Directorio de los paquetes (default: REPORTES_LOTE_DIR o reportes_lote)")
+    parser.add_argument('--conservar', type=int,
+                        help="Versiones del período a conservar (default: REPORTES_LOTE_CONSERVAR o 7)")
+    parser.add_argument('--procedimiento', choices=['mensual', 'semanal', 'diario'],
+                        help="Ejecutar antes generar_estadisticas_procedimiento con este tipo de reporte")
+    args = parser.parse_args()
+    
+    desde = args.desde or args.hasta - timedelta(days=30)
+    if desde > args.hasta:
+        print("❌ La fecha de inicio no puede ser mayor que la fecha de fin")
+        return 1
+    
+    # Nunca más procesos que tareas: cada uno paga el arranque y su conexión
+    procesos = max(1, min(args.procesos, len(args.reportes)))
+    print(f"📊 {len(args.reportes)} reportes del {desde} al {args.hasta} en {procesos} procesos")
+    inicio = time.perf_counter()
+    resultados = {}
+    fallidos = 0
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        if args.procedimiento:
+            generado, segundos, errores = ejecutor.submit(
+                ejecutar_procedimiento, args.procedimiento, desde, args.hasta
+            ).result()
+            print(f"{'✅' if generado else '❌'} {'procedimiento ' + args.procedimiento:<22} {'':>13} {segundos:>8.2f} s")
+            for error in errores:
+                print(f"   {error}")
+            fallidos += 0 if generado else 1
+        
+        futuros = [
+            ejecutor.submit(ejecutar_reporte, nombre, desde, args.hasta, args.limite)
+            for nombre in args.reportes
+        ]
+        for futuro in as_completed(futuros):
+            nombre, filas, segundos, errores = futuro.result()
+            resultados[nombre] = (filas, segundos, errores)
+            if filas is None:
+                fallidos += 1
+                print(f"❌ {nombre:<22} {'':>13} {segundos:>8.2f} s")
+                for error in errores:
+                    print(f"   {error}")
+            else:
+                print(f"✅ {nombre:<22} {len(filas):>7} filas {segundos:>8.2f} s")
+    
+    segundos_total = time.perf_counter() - inicio
+    if all(filas is None for filas, _, _ in resultados.values()):
+        # No reemplazar la versión vigente por una sin ningún reporte
+        print("❌ Ningún reporte se pudo calcular; no se guardó una versión nueva")
+        return 1
+    ruta = guardar_lote(resultados, desde, args.hasta, args.limite, formato=args.formato,
+                        directorio=args.directorio, conservar=args.conservar,
+                        segundos_total=segundos_total)
+    suma = sum(segundos for _, segundos, _ in resultados.values())
+    print("-" * 48)
+    print(f"💾 {ruta} ({segundos_total:.1f} s en total, {suma:.1f} s sumando cada reporte)")
+    if fallidos:
+        print(f"⚠️ {fallidos} reportes fallaron; la vista los consultará en vivo")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
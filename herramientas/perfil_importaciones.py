@@ -0,0 +1,104 @@
+"""
+Perfil del tiempo de importación de los módulos de la aplicación
+
+Importa cada módulo en un intérprete nuevo con "python -X importtime" y muestra
+el tiempo total y los paquetes que más aportan, para detectar qué vuelve lento
+el arranque en frío (por ejemplo, pandas cargado desde la página de login).
+
+Uso:
+    python -m herramientas.perfil_importaciones
+    python -m herramientas.perfil_importaciones --modulos vistas.login_view vistas.pagos_view --top 15
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULOS_POR_DEFECTO = [
+    'vistas.login_view',
+    'vistas.dashboard_view',
+    'vistas.reservas_view',
+    'vistas.pagos_view',
+    'vistas.reportes_generales_view',
+    'vistas.auditoria_view',
+    'vistas.validacion_view'
+]
+
+def perfilar(modulo):
+    """
+    Importa un módulo en un proceso nuevo y lee el reporte de -X importtime.
+    
+    Args:
+        modulo (str): Módulo a importar
+    
+    Returns:
+        list: Tuplas (nombre, propio_us, acumulado_us, profundidad) en el orden del reporte
+    
+    Raises:
+        RuntimeError: Si la importación falla
+    """
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True
+    )
+    if proceso.returncode != 0:
+        ultima_linea = (proceso.stderr.strip().splitlines() or ['sin salida'])[-1]
+        raise RuntimeError(f"No se pudo importar {modulo}: {ultima_linea}")
+    
+    entradas = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        propio, acumulado, nombre = linea[len('import time:'):].split('|', 2)
+        profundidad = (len(nombre) - len(nombre.lstrip(' ')) - 1) // 2
+        entradas.append((nombre.strip(), int(propio), int(acumulado), profundidad))
+    return entradas
+
+def por_paquete(entradas):
+    """
+    Suma el tiempo propio de las importaciones por paquete de primer nivel.
+    
+    Args:
+        entradas (list): Resultado de perfilar()
+    
+    Returns:
+        list: Tuplas (paquete, microsegundos) de mayor a menor
+    """
+    totales = {}
+    for nombre, propio, _, _ in entradas:
+        paquete = nombre.split('.')[0]
+        totales[paquete] = totales.get(paquete, 0) + propio
+    return sorted(totales.items(), key=lambda item: item[1], reverse=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil del tiempo de importación de la aplicación")
+    parser.add_argument('--modulos', nargs='+', default=MODULOS_POR_DEFECTO,
+                        help="Módulos a importar (cada uno en un intérprete nuevo)")
+    parser.add_argument('--top', type=int, default=10,
+                        help="Paquetes a mostrar por módulo")
+    args = parser.parse_args()
+    
+    errores = 0
+    for modulo in args.modulos:
+        try:
+            entradas = perfilar(modulo)
+        except RuntimeError as error:
+            print(f"❌ {error}")
+            errores += 1
+            continue
+        
+        total = sum(acumulado for _, _, acumulado, profundidad in entradas if profundidad == 0)
+        print(f"\n📦 {modulo}: {total / 1000:.1f} ms ({len(entradas)} módulos importados)")
+        print(f"{'Paquete':<28} | {'Tiempo propio':>13}")
+        print("-" * 44)
+        for paquete, microsegundos in por_paquete(entradas)[:args.top]:
+            print(f"{paquete:<28} | {microsegundos / 1000:>10.1f} ms")
+    
+    return 1 if errores else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
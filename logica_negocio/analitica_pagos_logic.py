@@ -0,0 +1,290 @@
+from capa_datos import notificaciones
+import psycopg2
+from datetime import datetime, date
+from capa_datos.database_connection import get_db_connection, solo_lectura
+from utils.almacen_resultados import almacen_resultados
+from utils.carga_diferida import instancias_diferidas
+
+# Prefijo de las claves en el almacén compartido; invalidar() descarta todas
+PREFIJO_CACHE = 'analitica_pagos:'
+# Respaldo para procesos que no ven la invalidación de otro proceso
+TTL_CACHE = 300
+
+class AnaliticaPagosLogic:
+    """
+    Estadísticas de pagos calculadas en una sola pasada por ventana de tiempo.
+    
+    Una consulta con GROUPING SETS obtiene a la vez los totales por estado,
+    por método de pago y por mes. El resultado se guarda en el almacén
+    compartido y se descarta cuando se registra o modifica un pago.
+    """
+    
+    def _log_error(self, message):
+        """
+        Registra un error con el notificador de capa_datos/notificaciones.py.
+        
+        Args:
+            message (str): Mensaje de error
+        """
+        notificaciones.error(message)
+    
+    def invalidar(self):
+        """
+        Descarta las estadísticas guardadas (llamar después de escribir en pagos).
+        """
+        almacen_resultados.invalidar_prefijo(PREFIJO_CACHE)
+    
+    def obtener_resumen(self, fecha_inicio=None, fecha_fin=None):
+        """
+        Obtiene el resumen de pagos de una ventana de tiempo desde el almacén
+        compartido, calculándolo si no está guardado.
+        
+        Args:
+            fecha_inicio (date, optional): Fecha de inicio de la ventana
+            fecha_fin (date, optional): Fecha de fin de la ventana
+        
+        Returns:
+            dict: Resumen con las dimensiones por_estado, por_metodo, por_mes
+                y por_mes_estado, o None si la consulta falla
+        """
+        clave = f"{PREFIJO_CACHE}{self._normalizar_fecha(fecha_inicio)}:{self._normalizar_fecha(fecha_fin)}"
+        return almacen_resultados.obtener_o_calcular(
+            clave,
+            lambda: self._calcular_resumen(fecha_inicio, fecha_fin),
+            TTL_CACHE
+        )
+    
+    def _normalizar_fecha(self, fecha):
+        """
+        Convierte una fecha a texto 'YYYY-MM-DD' (o vacío si no hay fecha).
+        
+        Args:
+            fecha (date | datetime | str | None): Fecha a normalizar
+        
+        Returns:
+            str: Fecha normalizada
+        """
+        if fecha is None:
+            return ''
+        if isinstance(fecha, (datetime, date)):
+            return fecha.strftime('%Y-%m-%d')
+        return str(fecha)
+    
+    @solo_lectura
+    def _calcular_resumen(self, fecha_inicio=None, fecha_fin=None):
+        """
+        Ejecuta la consulta GROUPING SETS sobre pagos.
+        
+        Args:
+            fecha_inicio (date, optional): Fecha de inicio de la ventana
+            fecha_fin (date, optional): Fecha de fin de la ventana
+        
+        Returns:
+            dict: Resumen por dimensión o None si falla
+        """
+        conn = None
+        try:
+            conn = get_db_connection()
+            if not conn:
+                return None
+            
+            cur = conn.cursor()
+            
+            inicio = self._normalizar_fecha(fecha_inicio) or None
+            fin = self._normalizar_fecha(fecha_fin) or None
+            
+            cur.execute("""
+                SELECT GROUPING(p.estado) AS sin_estado,
+                       GROUPING(p.metodo_pago) AS sin_metodo,
+                       GROUPING(DATE_TRUNC('month', p.fecha_pago)) AS sin_mes,
+                       p.estado,
+                       p.metodo_pago,
+                       DATE_TRUNC('month', p.fecha_pago)::date AS mes,
+                       COUNT(*) AS cantidad,
+                       COALESCE(SUM(p.monto), 0) AS monto,
+                       COUNT(DISTINCT p.cliente_id) AS clientes_unicos,
+                       COUNT(DISTINCT r.cancha_id) AS canchas_utilizadas
+                FROM pagos p
+                LEFT JOIN reservas r ON p.reserva_id = r.id
+                WHERE (%s::date IS NULL OR p.fecha_pago >= %s::date)
+                AND (%s::date IS NULL OR p.fecha_pago <= %s::date)
+                GROUP BY GROUPING SETS (
+                    (p.estado),
+                    (p.metodo_pago, p.estado),
+                    (DATE_TRUNC('month', p.fecha_pago)),
+                    (DATE_TRUNC('month', p.fecha_pago), p.estado)
+                )
+            """, (inicio, inicio, fin, fin))
+            
+            filas = cur.fetchall()
+            cur.close()
+            
+            resumen = {
+                'por_estado': {},
+                'por_metodo': {},
+                'por_mes': {},
+                'por_mes_estado': {}
+            }
+            for sin_estado, sin_metodo, sin_mes, estado, metodo, mes, cantidad, monto, clientes, canchas in filas:
+                valores = {
+                    'cantidad': cantidad,
+                    'monto': float(monto),
+                    'clientes_unicos': clientes,
+                    'canchas_utilizadas': canchas
+                }
+                if not sin_mes and sin_estado:
+                    resumen['por_mes'][mes] = valores
+                elif not sin_mes:
+                    resumen['por_mes_estado'][(mes, estado)] = valores
+                elif not sin_metodo:
+                    resumen['por_metodo'][(metodo, estado)] = valores
+                else:
+                    resumen['por_estado'][estado] = valores
+            
+            return resumen
+        
+        except (Exception, psycopg2.DatabaseError) as error:
+            self._log_error(f"Error al calcular estadísticas de pagos: {error}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+    
+    def estadisticas_pagos(self, fecha_inicio=None, fecha_fin=None):
+        """
+        Obtiene totales de pagos de todos los estados y conteos por método.
+        
+        Args:
+            fecha_inicio (date, optional): Fecha de inicio para el filtro
+            fecha_fin (date, optional): Fecha de fin para el filtro
+        
+        Returns:
+            dict: Estadísticas de pagos (vacío si falla la consulta)
+        """
+        if not (fecha_inicio and fecha_fin):
+            fecha_inicio = fecha_fin = None
+        
+        resumen = self.obtener_resumen(fecha_inicio, fecha_fin)
+        if resumen is None:
+            return {}
+        
+        por_estado = resumen['por_estado']
+        total_pagos = sum(valores['cantidad'] for valores in por_estado.values())
+        total_recaudado = sum(valores['monto'] for valores in por_estado.values())
+        
+        por_metodo = {}
+        for (metodo, _), valores in resumen['por_metodo'].items():
+            por_metodo[metodo] = por_metodo.get(metodo, 0) + valores['cantidad']
+        
+        return {
+            'total_pagos': total_pagos,
+            'total_recaudado': total_recaudado,
+            'promedio_pago': total_recaudado / total_pagos if total_pagos > 0 else 0,
+            'pagos_completados': por_estado.get('Completado', {}).get('cantidad', 0),
+            'pagos_pendientes': por_estado.get('Pendiente', {}).get('cantidad', 0),
+            'pagos_efectivo': por_metodo.get('Efectivo', 0),
+            'pagos_tarjeta_credito': por_metodo.get('Tarjeta de Crédito', 0),
+            'pagos_tarjeta_debito': por_metodo.get('Tarjeta de Débito', 0),
+            'pagos_transferencia': por_metodo.get('Transferencia Bancaria', 0),
+            'pagos_movil': por_metodo.get('Pago Móvil', 0)
+        }
+    
+    def estadisticas_metodos_pago(self):
+        """
+        Obtiene el total de pagos completados por método de pago.
+        
+        Returns:
+            list: Lista de estadísticas por método, de mayor a menor monto
+        """
+        resumen = self.obtener_resumen()
+        if resumen is None:
+            return []
+        
+        metodos = [
+            {
+                'metodo': metodo,
+                'total_pagado': valores['monto'],
+                'total_pagos': valores['cantidad']
+            }
+            for (metodo, estado), valores in resumen['por_metodo'].items()
+            if estado == 'Completado'
+        ]
+        metodos.sort(key=lambda metodo: metodo['total_pagado'], reverse=True)
+        return metodos
+    
+    def estadisticas_generales(self):
+        """
+        Obtiene estadísticas generales de los pagos completados.
+        
+        Returns:
+            dict: Total, monto, promedio y conteos por método y por estado
+        """
+        resumen = self.obtener_resumen() or {'por_estado': {}, 'por_metodo': {}}
+        
+        completados = resumen['por_estado'].get('Completado', {'cantidad': 0, 'monto': 0})
+        total_pagos = completados['cantidad']
+        total_monto = completados['monto']
+        
+        return {
+            'total_pagos': total_pagos,
+            'total_monto': total_monto,
+            'promedio_por_pago': total_monto / total_pagos if total_pagos > 0 else 0,
+            'por_metodo': {
+                metodo: valores['cantidad']
+                for (metodo, estado), valores in resumen['por_metodo'].items()
+                if estado == 'Completado'
+            },
+            'por_estado': {'Completado': total_pagos} if total_pagos else {}
+        }
+    
+    def resumen_mes(self, mes, año):
+        """
+        Obtiene los pagos completados de un mes.
+        
+        Args:
+            mes (int): Mes (1-12)
+            año (int): Año
+        
+        Returns:
+            dict: Cantidad y monto de pagos completados del mes
+        """
+        resumen = self.obtener_resumen()
+        if resumen is None:
+            return {'cantidad': 0, 'monto': 0}
+        
+        valores = resumen['por_mes_estado'].get((date(año, mes, 1), 'Completado'))
+        return valores or {'cantidad': 0, 'monto': 0}
+    
+    def resumen_por_mes(self, limite=12):
+        """
+        Obtiene el resumen de los últimos meses con pagos.
+        
+        Args:
+            limite (int): Número máximo de meses
+        
+        Returns:
+            list: Lista de diccionarios por mes, del más reciente al más antiguo
+        """
+        resumen = self.obtener_resumen()
+        if resumen is None:
+            return []
+        
+        meses = []
+        for mes in sorted(resumen['por_mes'], reverse=True)[:limite]:
+            valores = resumen['por_mes'][mes]
+            completados = resumen['por_mes_estado'].get((mes, 'Completado'), {})
+            pendientes = resumen['por_mes_estado'].get((mes, 'Pendiente'), {})
+            meses.append({
+                'mes': mes,
+                'total_pagos': valores['cantidad'],
+                'total_recaudado': valores['monto'],
+                'promedio_pago': round(valores['monto'] / valores['cantidad'], 2) if valores['cantidad'] else 0,
+                'clientes_unicos': valores['clientes_unicos'],
+                'canchas_utilizadas': valores['canchas_utilizadas'],
+                'pagos_completados': completados.get('cantidad', 0),
+                'pagos_pendientes': pendientes.get('cantidad', 0)
+            })
+        return meses
+
+# Instancia global de la analítica de pagos (se crea al primer uso)
+__getattr__ = instancias_diferidas(__name__, {'analitica_pagos_logic': AnaliticaPagosLogic})
\ No newline at end of file
@@ -8,8 +8,11 @@ from capa_datos.auditoria_data import (
     get_auditoria_por_tabla_db,
     get_auditoria_por_tipo_accion_db,
     get_estadisticas_auditoria_db,
+    iter_auditoria_db,
     registrar_accion_auditoria
 )
+from capa_datos.database_connection import get_db_connection, solo_lectura, lectura_escritura
+from utils.exportacion_csv import escribir_filas_csv
 
 class AuditoriaLogic:
     """Clase para manejar la lógica de negocio de auditoría"""
@@ -18,6 +21,7 @@ class AuditoriaLogic:
         """Inicializar la lógica de auditoría"""
         pass
     
+    @lectura_escritura
     def registrar_accion(self, conn, usuario_id, tipo_accion, tabla, registro_id, detalles, resultado="SUCCESS"):
         """
         Registra una acción en la auditoría
@@ -36,6 +40,7 @@ class AuditoriaLogic:
         """
         return registrar_accion_auditoria(conn, usuario_id, tipo_accion, tabla, registro_id, detalles, resultado)
     
+    @solo_lectura
     def obtener_auditoria(self):
         """
         Obtiene todos los registros de auditoría
@@ -45,6 +50,33 @@ class AuditoriaLogic:
         """
         return get_auditoria_db()
     
+    @solo_lectura
+    def exportar_auditoria_csv(self, archivo, fecha_inicio=None, fecha_fin=None, limite=None,
+                               itersize=None, cancelar=None):
+        """
+        Escribe los registros de auditoría en un CSV leyéndolos por bloques
+        
+        Args:
+            archivo: Archivo de texto abierto para escribir (newline='')
+            fecha_inicio (date): Fecha de inicio (opcional)
+            fecha_fin (date): Fecha de fin (opcional)
+            limite (int): Máximo de registros a exportar (opcional)
+            itersize (int): Filas por bloque (ver iter_query)
+            cancelar (threading.Event): Corta la exportación (ver iter_query)
+        
+        Returns:
+            int: Registros escritos, o None si no hay conexión
+        """
+        conn = get_db_connection()
+        if not conn:
+            return None
+        try:
+            filas = iter_auditoria_db(conn, fecha_inicio, fecha_fin, itersize=itersize, cancelar=cancelar)
+            return escribir_filas_csv(archivo, filas, limite)
+        finally:
+            conn.close()
+    
+    @solo_lectura
     def obtener_auditoria_por_fecha(self, fecha_inicio, fecha_fin):
         """
         Obtiene registros de auditoría por rango de fechas
@@ -58,6 +90,7 @@ class AuditoriaLogic:
         """
         return get_auditoria_por_fecha_db(fecha_inicio, fecha_fin)
     
+    @solo_lectura
     def obtener_auditoria_por_usuario(self, usuario_id):
         """
         Obtiene registros de auditoría por usuario
@@ -70,6 +103,7 @@ class AuditoriaLogic:
         """
         return get_auditoria_por_usuario_db(usuario_id)
     
+    @solo_lectura
     def obtener_auditoria_por_tabla(self, tabla):
         """
         Obtiene registros de auditoría por tabla
@@ -82,6 +116,7 @@ class AuditoriaLogic:
         """
         return get_auditoria_por_tabla_db(tabla)
     
+    @solo_lectura
     def obtener_auditoria_por_tipo_accion(self, tipo_accion):
         """
         Obtiene registros de auditoría por tipo de acción
@@ -94,6 +129,7 @@ class AuditoriaLogic:
         """
         return get_auditoria_por_tipo_accion_db(tipo_accion)
     
+    @solo_lectura
     def obtener_estadisticas(self):
         """
         Obtiene estadísticas de auditoría
@@ -103,6 +139,7 @@ class AuditoriaLogic:
         """
         return get_estadisticas_auditoria_db()
     
+    @solo_lectura
     def obtener_tablas_disponibles(self):
         """
         Obtiene las tablas disponibles en auditoría
@@ -117,6 +154,7 @@ class AuditoriaLogic:
                 tablas.add(registro['tabla'])
         return sorted(list(tablas))
     
+    @solo_lectura
     def obtener_tipos_accion_disponibles(self):
         """
         Obtiene los tipos de acción disponibles en auditoría
@@ -131,6 +169,7 @@ class AuditoriaLogic:
                 acciones.add(registro['tipo_accion'])
         return sorted(list(acciones))
     
+    @solo_lectura
     def obtener_usuarios_disponibles(self):
         """
         Obtiene los usuarios disponibles en auditoría
@@ -1,11 +1,8 @@
-import streamlit as st
-import os
-from dotenv import load_dotenv
+from capa_datos import notificaciones
+from config.settings import obtener_configuracion
 from capa_datos.database_connection import get_connection, test_connection, reset_connection_if_needed
 from capa_datos.usuarios_data import get_info_usuario_actual_db, get_roles_usuario_db
-
-# Cargar variables de entorno
-load_dotenv()
+from utils.carga_diferida import instancias_diferidas
 
 class AuthManager:
     """
@@ -35,12 +32,13 @@ class AuthManager:
         """
         try:
             # Usar configuración del archivo .env si no se proporcionan parámetros
+            configuracion = obtener_configuracion()
             if host is None:
-                host = os.getenv('DB_HOST', 'localhost')
+                host = configuracion.texto('DB_HOST', 'localhost')
             if port is None:
-                port = os.getenv('DB_PORT', '5432')
+                port = configuracion.texto('DB_PORT', '5432')
             if dbname is None:
-                dbname = os.getenv('DB_NAME', 'sportcourt_reservations')
+                dbname = configuracion.texto('DB_NAME', 'sportcourt_reservations')
             
             # Intentar conectar con las credenciales proporcionadas
             conn = get_connection(username, password, host, port, dbname)
@@ -62,7 +60,7 @@ class AuthManager:
             # Verificar que el rol esté en la lista de roles permitidos
             rol_actual = info_usuario['usuario_actual']
             if rol_actual not in self.roles_permitidos:
-                st.warning(f"El rol '{rol_actual}' no tiene permisos para acceder al sistema.")
+                notificaciones.advertencia(f"El rol '{rol_actual}' no tiene permisos para acceder al sistema.")
                 conn.close()
                 return None
             
@@ -77,9 +75,9 @@ class AuthManager:
                 'connection': conn,
                 'info_usuario': info_usuario
             }
-            
+        
         except Exception as e:
-            st.error(f"Error durante la autenticación: {e}")
+            notificaciones.error(f"Error durante la autenticación: {e}")
             return None
     
     def verificar_permiso(self, rol_usuario, operacion, entidad=None):
@@ -176,14 +174,15 @@ class AuthManager:
         """
         Cierra la sesión del usuario y limpia las variables de sesión.
         """
+        estado = notificaciones.estado_sesion()
         try:
             # Cerrar conexión a la base de datos
-            if 'db_connection' in st.session_state and st.session_state['db_connection']:
+            if 'db_connection' in estado and estado['db_connection']:
                 try:
-                    st.session_state['db_connection'].close()
+                    estado['db_connection'].close()
                 except:
                     pass
-                del st.session_state['db_connection']
+                del estado['db_connection']
             
             # Limpiar variables de sesión
             keys_to_remove = [
@@ -192,13 +191,13 @@ class AuthManager:
             ]
             
             for key in keys_to_remove:
-                if key in st.session_state:
-                    del st.session_state[key]
-            
-            st.success("✅ Sesión cerrada correctamente")
+                if key in estado:
+                    del estado[key]
             
+            notificaciones.exito("✅ Sesión cerrada correctamente")
+        
         except Exception as e:
-            st.error(f"Error al cerrar sesión: {e}")
+            notificaciones.error(f"Error al cerrar sesión: {e}")
     
     def obtener_info_sesion(self):
         """
@@ -210,10 +209,11 @@ class AuthManager:
         if not self.verificar_sesion_activa():
             return None
         
+        estado = notificaciones.estado_sesion()
         return {
-            'username': st.session_state.get('username'),
-            'user_role': st.session_state.get('user_role'),
-            'authenticated': st.session_state.get('authenticated', False)
+            'username': estado.get('username'),
+            'user_role': estado.get('user_role'),
+            'authenticated': estado.get('authenticated', False)
         }
     
     def verificar_sesion_activa(self):
@@ -223,21 +223,23 @@ class AuthManager:
         Returns:
             bool: True si la sesión está activa, False en caso contrario
         """
+        estado = notificaciones.estado_sesion()
+        
         # Verificar si está autenticado
-        if not st.session_state.get('authenticated', False):
+        if not estado.get('authenticated', False):
             return False
         
         # Verificar conexión a la base de datos
-        conn = st.session_state.get('db_connection')
+        conn = estado.get('db_connection')
         if not conn or not test_connection(conn):
             # Intentar reiniciar la conexión
-            username = st.session_state.get('username')
-            password = st.session_state.get('password', '')  # Asumiendo que se guarda la contraseña
+            username = estado.get('username')
+            password = estado.get('password', '')  # Asumiendo que se guarda la contraseña
             
             if username and password:
                 new_conn = reset_connection_if_needed(conn, username, password)
                 if new_conn:
-                    st.session_state['db_connection'] = new_conn
+                    estado['db_connection'] = new_conn
                     return True
                 else:
                     # Si no se puede reconectar, cerrar sesión
@@ -250,5 +252,5 @@ class AuthManager:
         
         return True
 
-# Instancia global del gestor de autenticación
-auth_manager = AuthManager() 
\ No newline at end of file
+# Instancia global del gestor de autenticación (se crea al primer uso)
+__getattr__ = instancias_diferidas(__name__, {'auth_manager': AuthManager})
\ No newline at end of file
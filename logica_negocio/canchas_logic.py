@@ -1,6 +1,7 @@
-import streamlit as st
+from capa_datos import notificaciones
 import psycopg2
-from capa_datos.database_connection import get_db_connection
+from capa_datos.database_connection import get_db_connection, solo_lectura, lectura_escritura
+from utils.carga_diferida import instancias_diferidas
 
 class CanchasLogic:
     """
@@ -9,16 +10,14 @@ class CanchasLogic:
     
     def _log_error(self, message):
         """
-        Registra un error de manera compatible con Streamlit y fuera de él.
+        Registra un error con el notificador de capa_datos/notificaciones.py.
         
         Args:
             message (str): Mensaje de error
         """
-        try:
-            st.error(message)
-        except:
-            print(f"ERROR: {message}")
+        notificaciones.error(message)
     
+    @solo_lectura
     def obtener_canchas_con_tipos(self):
         """
         Obtiene todas las canchas con información de sus tipos.
@@ -51,7 +50,7 @@ class CanchasLogic:
             cur.close()
             
             return canchas
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener canchas con tipos: {error}")
             return []
@@ -59,6 +58,52 @@ class CanchasLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
+    def obtener_canchas_modificadas_desde(self, desde=None):
+        """
+        Obtiene las canchas cuya fila o tipo de cancha cambió desde una fecha,
+        para refrescar el índice de búsqueda de forma incremental.
+        
+        Args:
+            desde (datetime, optional): Fecha de la última modificación vista;
+                si es None retorna todas las canchas
+        
+        Returns:
+            list: Lista de tuplas (id, nombre, tipo_deporte, estado,
+                tipo_cancha_nombre, fecha_actualizacion) o None si falla la consulta
+        """
+        conn = None
+        try:
+            conn = get_db_connection()
+            if not conn:
+                return None
+            
+            cur = conn.cursor()
+            
+            cur.execute("""
+                SELECT c.id, c.nombre, c.tipo_deporte, c.estado,
+                       tc.nombre AS tipo_cancha_nombre,
+                       GREATEST(c.fecha_actualizacion, tc.fecha_actualizacion) AS fecha_actualizacion
+                FROM canchas c
+                LEFT JOIN tipos_cancha tc ON c.tipo_cancha_id = tc.id
+                WHERE %s::timestamp IS NULL
+                   OR c.fecha_actualizacion >= %s::timestamp
+                   OR tc.fecha_actualizacion >= %s::timestamp
+            """, (desde, desde, desde))
+            
+            canchas = cur.fetchall()
+            cur.close()
+            
+            return canchas
+        
+        except (Exception, psycopg2.DatabaseError) as error:
+            self._log_error(f"Error al obtener canchas modificadas: {error}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+    
+    @solo_lectura
     def obtener_canchas(self):
         """
         Obtiene todas las canchas.
@@ -87,7 +132,7 @@ class CanchasLogic:
             cur.close()
             
             return canchas
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener canchas: {error}")
             return []
@@ -95,6 +140,7 @@ class CanchasLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_tipos_cancha(self):
         """
         Obtiene todos los tipos de cancha.
@@ -123,7 +169,7 @@ class CanchasLogic:
             cur.close()
             
             return tipos
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener tipos de cancha: {error}")
             return []
@@ -131,13 +177,14 @@ class CanchasLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_cancha_por_id(self, cancha_id):
         """
         Obtiene una cancha específica por su ID.
         
         Args:
             cancha_id (int): ID de la cancha
-            
+        
         Returns:
             tuple or None: Datos de la cancha o None si no se encuentra
         """
@@ -162,7 +209,7 @@ class CanchasLogic:
             cur.close()
             
             return cancha
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener cancha por ID: {error}")
             return None
@@ -170,6 +217,7 @@ class CanchasLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_estadisticas_canchas(self):
         """
         Obtiene estadísticas de las canchas.
@@ -206,7 +254,7 @@ class CanchasLogic:
                 'precio_promedio': float(stats[3]) if stats[3] else 0,
                 'ingresos_potenciales': float(stats[4]) if stats[4] else 0
             }
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener estadísticas de canchas: {error}")
             return {}
@@ -214,6 +262,7 @@ class CanchasLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def crear_cancha(self, nombre, tipo_deporte, capacidad, precio_hora, estado, 
                     horario_apertura, horario_cierre, descripcion, tipo_cancha_id):
         """
@@ -229,7 +278,7 @@ class CanchasLogic:
             horario_cierre (time): Horario de cierre
             descripcion (str): Descripción de la cancha
             tipo_cancha_id (int): ID del tipo de cancha
-            
+        
         Returns:
             int or None: ID de la cancha creada o None si falla
         """
@@ -252,7 +301,7 @@ class CanchasLogic:
             cur.close()
             
             return cancha_id
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -262,6 +311,7 @@ class CanchasLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def crear_tipo_cancha(self, nombre, descripcion, precio_por_hora):
         """
         Crea un nuevo tipo de cancha.
@@ -270,7 +320,7 @@ class CanchasLogic:
             nombre (str): Nombre del tipo de cancha
             descripcion (str): Descripción del tipo
             precio_por_hora (float): Precio por hora
-            
+        
         Returns:
             int or None: ID del tipo creado o None si falla
         """
@@ -292,7 +342,7 @@ class CanchasLogic:
             cur.close()
             
             return tipo_id
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -302,6 +352,7 @@ class CanchasLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def actualizar_cancha(self, cancha_id, nombre, tipo_deporte, capacidad, precio_hora, 
                          estado, horario_apertura, horario_cierre, descripcion, tipo_cancha_id):
         """
@@ -318,7 +369,7 @@ class CanchasLogic:
             horario_cierre (time): Horario de cierre
             descripcion (str): Descripción de la cancha
             tipo_cancha_id (int): ID del tipo de cancha
-            
+        
         Returns:
             bool: True si se actualizó correctamente, False en caso contrario
         """
@@ -341,7 +392,7 @@ class CanchasLogic:
             cur.close()
             
             return resultado
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -351,6 +402,7 @@ class CanchasLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def actualizar_tipo_cancha(self, tipo_id, nombre, descripcion, precio_por_hora, activo):
         """
         Actualiza un tipo de cancha existente.
@@ -361,7 +413,7 @@ class CanchasLogic:
             descripcion (str): Descripción del tipo
             precio_por_hora (float): Precio por hora
             activo (bool): Estado activo del tipo
-            
+        
         Returns:
             bool: True si se actualizó correctamente, False en caso contrario
         """
@@ -383,7 +435,7 @@ class CanchasLogic:
             cur.close()
             
             return resultado
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -393,13 +445,14 @@ class CanchasLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def eliminar_cancha(self, cancha_id):
         """
         Elimina una cancha.
         
         Args:
             cancha_id (int): ID de la cancha
-            
+        
         Returns:
             bool: True si se eliminó correctamente, False en caso contrario
         """
@@ -421,7 +474,7 @@ class CanchasLogic:
             cur.close()
             
             return resultado
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -431,13 +484,14 @@ class CanchasLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def eliminar_tipo_cancha(self, tipo_id):
         """
         Elimina un tipo de cancha.
         
         Args:
             tipo_id (int): ID del tipo de cancha
-            
+        
         Returns:
             bool: True si se eliminó correctamente, False en caso contrario
         """
@@ -459,7 +513,7 @@ class CanchasLogic:
             cur.close()
             
             return resultado
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -469,5 +523,5 @@ class CanchasLogic:
             if conn:
                 conn.close()
 
-# Instancia global de la lógica de canchas
-canchas_logic = CanchasLogic() 
\ No newline at end of file
+# Instancia global de la lógica de canchas (se crea al primer uso)
+__getattr__ = instancias_diferidas(__name__, {'canchas_logic': CanchasLogic})
\ No newline at end of file
@@ -1,8 +1,8 @@
-import streamlit as st
+from capa_datos import notificaciones
 import psycopg2
 import re
 from datetime import date
-from capa_datos.database_connection import get_db_connection
+from capa_datos.database_connection import get_db_connection, solo_lectura, lectura_escritura
 
 class ClientesLogic:
     """
@@ -11,15 +11,12 @@ class ClientesLogic:
     
     def _log_error(self, message):
         """
-        Registra un error de manera compatible con Streamlit y fuera de él.
+        Registra un error con el notificador de capa_datos/notificaciones.py.
         
         Args:
             message (str): Mensaje de error
         """
-        try:
-            st.error(message)
-        except:
-            print(f"ERROR: {message}")
+        notificaciones.error(message)
     
     def validar_email(self, email):
         """
@@ -88,6 +85,7 @@ class ClientesLogic:
         
         return True
     
+    @solo_lectura
     def obtener_clientes(self):
         """
         Obtiene todos los clientes.
@@ -115,7 +113,7 @@ class ClientesLogic:
             cur.close()
             
             return clientes
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener clientes: {error}")
             return []
@@ -123,6 +121,7 @@ class ClientesLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_clientes_activos(self):
         """
         Obtiene solo los clientes activos.
@@ -151,7 +150,7 @@ class ClientesLogic:
             cur.close()
             
             return clientes
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener clientes activos: {error}")
             return []
@@ -159,13 +158,55 @@ class ClientesLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
+    def obtener_clientes_modificados_desde(self, desde=None):
+        """
+        Obtiene los clientes modificados desde una fecha, en cualquier estado,
+        para refrescar el índice de búsqueda de forma incremental.
+        
+        Args:
+            desde (datetime, optional): Fecha de la última modificación vista;
+                si es None retorna todos los clientes activos
+        
+        Returns:
+            list: Lista de tuplas (id, nombre, apellido, telefono, email,
+                estado, fecha_actualizacion) o None si falla la consulta
+        """
+        conn = None
+        try:
+            conn = get_db_connection()
+            if not conn:
+                return None
+            
+            cur = conn.cursor()
+            
+            cur.execute("""
+                SELECT id, nombre, apellido, telefono, email, estado, fecha_actualizacion
+                FROM clientes
+                WHERE (%s::timestamp IS NULL AND estado = 'Activo')
+                   OR fecha_actualizacion >= %s::timestamp
+            """, (desde, desde))
+            
+            clientes = cur.fetchall()
+            cur.close()
+            
+            return clientes
+        
+        except (Exception, psycopg2.DatabaseError) as error:
+            self._log_error(f"Error al obtener clientes modificados: {error}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+    
+    @solo_lectura
     def obtener_cliente_por_id(self, cliente_id):
         """
         Obtiene un cliente específico por su ID.
         
         Args:
             cliente_id (int): ID del cliente
-            
+        
         Returns:
             tuple or None: Datos del cliente o None si no se encuentra
         """
@@ -189,7 +230,7 @@ class ClientesLogic:
             cur.close()
             
             return cliente
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener cliente por ID: {error}")
             return None
@@ -197,6 +238,7 @@ class ClientesLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def crear_cliente(self, nombre, apellido, telefono, email, fecha_nacimiento=None):
         """
         Crea un nuevo cliente.
@@ -207,7 +249,7 @@ class ClientesLogic:
             telefono (str): Teléfono del cliente
             email (str): Email del cliente
             fecha_nacimiento (date, optional): Fecha de nacimiento
-            
+        
         Returns:
             int or None: ID del cliente creado o None si falla
         """
@@ -246,7 +288,7 @@ class ClientesLogic:
             cur.close()
             
             return cliente_id
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -256,6 +298,7 @@ class ClientesLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def actualizar_cliente(self, cliente_id, nombre, apellido, telefono, email, fecha_nacimiento=None, estado="Activo"):
         """
         Actualiza un cliente existente.
@@ -268,7 +311,7 @@ class ClientesLogic:
             email (str): Email del cliente
             fecha_nacimiento (date, optional): Fecha de nacimiento
             estado (str): Estado del cliente
-            
+        
         Returns:
             bool: True si se actualizó correctamente, False en caso contrario
         """
@@ -307,7 +350,7 @@ class ClientesLogic:
             cur.close()
             
             return resultado
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -317,13 +360,14 @@ class ClientesLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def eliminar_cliente(self, cliente_id):
         """
         Elimina un cliente.
         
         Args:
             cliente_id (int): ID del cliente
-            
+        
         Returns:
             bool: True si se eliminó correctamente, False en caso contrario
         """
@@ -345,7 +389,7 @@ class ClientesLogic:
             cur.close()
             
             return resultado
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -355,16 +399,23 @@ class ClientesLogic:
             if conn:
                 conn.close()
     
-    def buscar_clientes(self, termino_busqueda):
+    @solo_lectura
+    def buscar_clientes(self, termino_busqueda, limite=50):
         """
-        Busca clientes por nombre, apellido o email.
+        Busca clientes por nombre, apellido, email o teléfono, sin distinguir
+        mayúsculas ni acentos, ordenados por relevancia.
         
         Args:
             termino_busqueda (str): Término de búsqueda
-            
+            limite (int): Número máximo de resultados
+        
         Returns:
-            list: Lista de clientes que coinciden con la búsqueda
+            list: Lista de clientes que coinciden con la búsqueda (el último
+                campo de cada fila es la relevancia)
         """
+        if not termino_busqueda or not termino_busqueda.strip():
+            return []
+        
         conn = None
         try:
             conn = get_db_connection()
@@ -373,22 +424,18 @@ class ClientesLogic:
             
             cur = conn.cursor()
             
-            # Consulta SQL directa para buscar clientes
+            # Búsqueda por trigramas sobre la columna normalizada clientes.busqueda
             cur.execute("""
                 SELECT id, nombre, apellido, telefono, email, fecha_nacimiento,
-                       estado, fecha_registro, fecha_actualizacion
-                FROM clientes
-                WHERE LOWER(nombre) LIKE LOWER(%s) 
-                   OR LOWER(apellido) LIKE LOWER(%s)
-                   OR LOWER(email) LIKE LOWER(%s)
-                ORDER BY apellido, nombre
-            """, (f'%{termino_busqueda}%', f'%{termino_busqueda}%', f'%{termino_busqueda}%'))
+                       estado, fecha_registro, fecha_actualizacion, relevancia
+                FROM buscar_clientes_ranking(%s, %s)
+            """, (termino_busqueda, limite))
             
             clientes = cur.fetchall()
             cur.close()
             
             return clientes
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al buscar clientes: {error}")
             return []
@@ -396,6 +443,7 @@ class ClientesLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_estadisticas_clientes(self):
         """
         Obtiene estadísticas de clientes.
@@ -434,7 +482,7 @@ class ClientesLogic:
                 'con_email': stats[4],
                 'con_telefono': stats[5]
             }
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener estadísticas de clientes: {error}")
             return {}
@@ -442,13 +490,14 @@ class ClientesLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_reservas_activas_cliente(self, cliente_id):
         """
         Obtiene las reservas activas de un cliente específico.
         
         Args:
             cliente_id (int): ID del cliente
-            
+        
         Returns:
             list: Lista de reservas activas del cliente
         """
@@ -476,7 +525,7 @@ class ClientesLogic:
             cur.close()
             
             return reservas
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener reservas activas del cliente: {error}")
             return []
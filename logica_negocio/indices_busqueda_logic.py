@@ -0,0 +1,92 @@
+from logica_negocio.clientes_logic import ClientesLogic
+from logica_negocio.canchas_logic import CanchasLogic
+from utils.indice_typeahead import IndiceTypeahead
+from utils.carga_diferida import instancias_diferidas
+
+class IndicesBusquedaLogic:
+    """
+    Índices en memoria de clientes y canchas para los selectores con búsqueda.
+    
+    Hay una sola instancia por proceso, compartida por todas las sesiones: la
+    carga completa se hace una vez y después solo se consultan las filas con
+    fecha_actualizacion reciente.
+    """
+    
+    def __init__(self):
+        self.clientes_logic = ClientesLogic()
+        self.canchas_logic = CanchasLogic()
+        self.clientes = IndiceTypeahead(self._cargar_clientes)
+        self.canchas = IndiceTypeahead(self._cargar_canchas)
+    
+    def etiqueta_cliente(self, cliente_id, nombre, apellido):
+        """
+        Arma la etiqueta con que se muestra un cliente en el selector.
+        
+        Returns:
+            str: Etiqueta del cliente
+        """
+        return f"{nombre or ''} {apellido or ''} (ID: {cliente_id})"
+    
+    def etiqueta_cancha(self, cancha_id, nombre, tipo_cancha_nombre):
+        """
+        Arma la etiqueta con que se muestra una cancha en el selector.
+        
+        Returns:
+            str: Etiqueta de la cancha
+        """
+        return f"{nombre} - {tipo_cancha_nombre or 'Sin tipo'} (ID: {cancha_id})"
+    
+    def _cargar_clientes(self, desde):
+        """
+        Obtiene los clientes modificados en el formato del índice.
+        
+        Args:
+            desde (datetime): Fecha desde la cual cargar (None para carga completa)
+        
+        Returns:
+            list: Tuplas (id, etiqueta, texto, activo, fecha_actualizacion) o None si falla
+        """
+        filas = self.clientes_logic.obtener_clientes_modificados_desde(desde)
+        if filas is None:
+            return None
+        
+        return [
+            (
+                cliente_id,
+                self.etiqueta_cliente(cliente_id, nombre, apellido),
+                f"{email or ''} {telefono or ''}",
+                estado == 'Activo',
+                fecha_actualizacion
+            )
+            for cliente_id, nombre, apellido, telefono, email, estado, fecha_actualizacion in filas
+        ]
+    
+    def _cargar_canchas(self, desde):
+        """
+        Obtiene las canchas modificadas en el formato del índice.
+        
+        Args:
+            desde (datetime): Fecha desde la cual cargar (None para carga completa)
+        
+        Returns:
+            list: Tuplas (id, etiqueta, texto, activo, fecha_actualizacion) o None si falla
+        """
+        filas = self.canchas_logic.obtener_canchas_modificadas_desde(desde)
+        if filas is None:
+            return None
+        
+        # El formulario de reservas siempre ofreció todas las canchas; la
+        # disponibilidad se valida al crear la reserva
+        return [
+            (
+                cancha_id,
+                self.etiqueta_cancha(cancha_id, nombre, tipo_cancha_nombre),
+                f"{tipo_deporte or ''} {estado or ''}",
+                True,
+                fecha_actualizacion
+            )
+            for cancha_id, nombre, tipo_deporte, estado, tipo_cancha_nombre, fecha_actualizacion in filas
+        ]
+
+# Instancia global compartida por todas las sesiones del proceso (se crea al primer uso)
+__getattr__ = instancias_diferidas(__name__, {'indices_busqueda_logic': IndicesBusquedaLogic})
\ No newline at end of file
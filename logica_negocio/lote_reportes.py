@@ -0,0 +1,285 @@
+"""
+Paquete de reportes precalculados por período
+
+herramientas/lote_reportes.py calcula los reportes de REPORTES en varios
+procesos (cada uno con su propia conexión) y los guarda con guardar_lote()
+como una versión nueva en REPORTES_LOTE_DIR:
+
+    reportes_lote/2024-05-01_2024-05-31/
+        actual.json                      # versión vigente
+        20240601-003000-000000/
+            manifiesto.json              # período, límite, tiempos y estado de cada reporte
+            top_clientes.parquet         # o .json sin pyarrow
+            ...
+
+actual.json se reemplaza solo cuando la versión está completa, así quien
+lee nunca ve un paquete a medias. Las vistas leen con cargar_reporte() y, si
+no hay un paquete vigente para el período, consultan como siempre.
+"""
+import os
+import json
+import time
+import shutil
+import importlib.util
+from datetime import datetime
+from capa_datos import notificaciones
+from capa_datos.data_access import propagar_errores
+from utils.json_tipado import codificar, decodificar
+from config.settings import obtener_configuracion
+
+FORMATO_PARQUET = 'parquet'
+FORMATO_JSON = 'json'
+
+def _reports():
+    from logica_negocio.reports_logic import reports_logic
+    return reports_logic
+
+def _analitica():
+    from logica_negocio.analitica_pagos_logic import analitica_pagos_logic
+    return analitica_pagos_logic
+
+def _fila(datos):
+    return [datos] if datos else []
+
+# Reportes del paquete: nombre -> función (desde, hasta, limite) -> filas.
+# pagos_metodos y pagos_por_mes cubren todo el historial, no solo el período.
+REPORTES = {
+    'mensual': lambda desde, hasta, limite: _reports().obtener_estadisticas_mensuales(hasta.year),
+    'semanal': lambda desde, hasta, limite: _reports().obtener_estadisticas_semanales(desde, hasta),
+    'horarios': lambda desde, hasta, limite: _reports().obtener_estadisticas_horarios(desde, hasta),
+    'dias_semana': lambda desde, hasta, limite: _reports().obtener_estadisticas_dias_semana(desde, hasta),
+    'top_clientes': lambda desde, hasta, limite: _reports().obtener_top_clientes(desde, hasta, limite),
+    'top_canchas': lambda desde, hasta, limite: _reports().obtener_top_canchas(desde, hasta, limite),
+    'canchas_mas_usadas': lambda desde, hasta, limite: _reports().obtener_canchas_mas_usadas(desde, hasta, limite),
+    'canchas_mas_recaudan': lambda desde, hasta, limite: _reports().obtener_canchas_mas_recaudan(desde, hasta, limite),
+    'estadisticas_canchas': lambda desde, hasta, limite: _reports().obtener_vista_estadisticas_canchas(desde, hasta),
+    'pagos_periodo': lambda desde, hasta, limite: _fila(_analitica().estadisticas_pagos(desde, hasta)),
+    'pagos_metodos': lambda desde, hasta, limite: _analitica().estadisticas_metodos_pago(),
+    'pagos_por_mes': lambda desde, hasta, limite: _analitica().resumen_por_mes(12)
+}
+
+# Rankings: sirven para cualquier límite menor o igual al del paquete
+REPORTES_CON_LIMITE = {'top_clientes', 'top_canchas', 'canchas_mas_usadas', 'canchas_mas_recaudan'}
+
+def ejecutar_reporte(nombre, desde, hasta, limite=10):
+    """
+    Calcula un reporte del paquete (se ejecuta en los procesos del lote).
+    
+    Los mensajes de error se juntan en lugar de mostrarse: un reporte que
+    informó algún error se considera fallido aunque haya retornado filas.
+    
+    Args:
+        nombre (str): Nombre en REPORTES
+        desde (date): Fecha de inicio del período
+        hasta (date): Fecha de fin del período
+        limite (int): Filas de los rankings
+    
+    Returns:
+        tuple: (nombre, filas como diccionarios o None si falló, segundos, errores)
+    """
+    avisos = notificaciones.NotificadorLista()
+    inicio = time.perf_counter()
+    with notificaciones.notificar_con(avisos), propagar_errores():
+        try:
+            filas = [dict(fila) for fila in REPORTES[nombre](desde, hasta, limite) or []]
+        except Exception as e:
+            avisos.notificar(notificaciones.ERROR, f"Error en el reporte {nombre}: {e}")
+            filas = None
+    segundos = time.perf_counter() - inicio
+    errores = avisos.de_nivel(notificaciones.ERROR)
+    return nombre, (None if errores else filas), segundos, errores
+
+def ejecutar_procedimiento(tipo_reporte, desde, hasta):
+    """
+    Ejecuta generar_estadisticas_procedimiento (se ejecuta en un proceso del lote).
+    
+    Returns:
+        tuple: (se generó, segundos, errores)
+    """
+    avisos = notificaciones.NotificadorLista()
+    inicio = time.perf_counter()
+    with notificaciones.notificar_con(avisos):
+        generado = _reports().generar_estadisticas_procedimiento(desde, hasta, tipo_reporte)
+    return bool(generado), time.perf_counter() - inicio, avisos.de_nivel(notificaciones.ERROR)
+
+def directorio_lotes():
+    """
+    Returns:
+        str: Directorio de los paquetes (REPORTES_LOTE_DIR, default 'reportes_lote')
+    """
+    return obtener_configuracion().texto('REPORTES_LOTE_DIR', 'reportes_lote')
+
+def formato_predeterminado():
+    """
+    Returns:
+        str: REPORTES_LOTE_FORMATO, o Parquet si pyarrow está instalado y JSON si no
+    """
+    formato = obtener_configuracion().texto('REPORTES_LOTE_FORMATO')
+    if formato:
+        return formato.lower()
+    return FORMATO_PARQUET if importlib.util.find_spec('pyarrow') else FORMATO_JSON
+
+def _carpeta_periodo(desde, hasta, directorio=None):
+    return os.path.join(directorio or directorio_lotes(), f"{desde.isoformat()}_{hasta.isoformat()}")
+
+def _escribir_json(ruta, datos):
+    # Archivo temporal y os.replace: quien lee ve el archivo anterior o el nuevo completo
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(datos, archivo, ensure_ascii=False, default=codificar)
+    os.replace(temporal, ruta)
+
+def _leer_json(ruta):
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo, object_hook=decodificar)
+
+def _escribir_filas(ruta_base, filas, formato):
+    """
+    Escribe las filas de un reporte y retorna el nombre del archivo.
+    """
+    if formato == FORMATO_PARQUET:
+        import pandas as pd
+        archivo = os.path.basename(ruta_base) + '.parquet'
+        pd.DataFrame(filas).to_parquet(ruta_base + '.parquet', index=False)
+        return archivo
+    # JSON con los tipos marcados (Decimal, fechas, horas), ver utils/json_tipado.py
+    _escribir_json(ruta_base + '.json', {'filas': filas})
+    return os.path.basename(ruta_base) + '.json'
+
+def _leer_filas(ruta):
+    if ruta.endswith('.parquet'):
+        import pandas as pd
+        return pd.read_parquet(ruta).to_dict('records')
+    return _leer_json(ruta)['filas']
+
+def _nueva_version(carpeta):
+    # Con microsegundos el orden alfabético es el orden en que se crearon
+    base = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    version, numero = base, 1
+    while True:
+        try:
+            os.makedirs(os.path.join(carpeta, version))
+            return version
+        except FileExistsError:
+            numero += 1
+            version = f"{base}-{numero}"
+
+def guardar_lote(resultados, desde, hasta, limite, formato=None, directorio=None, conservar=None, segundos_total=None):
+    """
+    Guarda los reportes calculados como la nueva versión vigente del período.
+    
+    Los reportes fallidos quedan en el manifiesto sin archivo; las vistas los
+    consultan en vivo. Se conservan las últimas versiones (REPORTES_LOTE_CONSERVAR).
+    
+    Args:
+        resultados (dict): Nombre -> (filas o None, segundos, errores)
+        desde (date): Fecha de inicio del período
+        hasta (date): Fecha de fin del período
+        limite (int): Filas de los rankings
+        formato (str): 'parquet' o 'json' (default: formato_predeterminado())
+        directorio (str): Directorio de los paquetes (default: directorio_lotes())
+        conservar (int): Versiones a conservar, incluida la nueva
+        segundos_total (float): Duración total del lote
+    
+    Returns:
+        str: Ruta de la versión guardada
+    """
+    formato = formato or formato_predeterminado()
+    if conservar is None:
+        conservar = obtener_configuracion().entero('REPORTES_LOTE_CONSERVAR', 7)
+    carpeta = _carpeta_periodo(desde, hasta, directorio)
+    os.makedirs(carpeta, exist_ok=True)
+    version = _nueva_version(carpeta)
+    ruta_version = os.path.join(carpeta, version)
+    
+    reportes = {}
+    for nombre, (filas, segundos, errores) in sorted(resultados.items()):
+        entrada = {'segundos': round(segundos, 4), 'errores': list(errores)}
+        if filas is None:
+            entrada['estado'] = 'error'
+        else:
+            entrada['estado'] = 'ok'
+            entrada['filas'] = len(filas)
+            entrada['archivo'] = _escribir_filas(os.path.join(ruta_version, nombre), filas, formato)
+        reportes[nombre] = entrada
+    
+    _escribir_json(os.path.join(ruta_version, 'manifiesto.json'), {
+        'version': version,
+        'desde': desde,
+        'hasta': hasta,
+        'limite': limite,
+        'formato': formato,
+        'generado': datetime.now(),
+        'segundos_total': round(segundos_total, 4) if segundos_total is not None else None,
+        'reportes': reportes
+    })
+    _escribir_json(os.path.join(carpeta, 'actual.json'), {'version': version})
+    
+    # Las versiones se nombran por fecha: las primeras en orden son las más viejas
+    versiones = sorted(
+        nombre for nombre in os.listdir(carpeta)
+        if os.path.isdir(os.path.join(carpeta, nombre)) and nombre != version
+    )
+    for vieja in versiones[:max(0, len(versiones) - max(1, conservar) + 1)]:
+        shutil.rmtree(os.path.join(carpeta, vieja), ignore_errors=True)
+    return ruta_version
+
+def manifiesto_vigente(desde, hasta, max_horas=None, directorio=None):
+    """
+    Lee el manifiesto de la versión vigente del período.
+    
+    Args:
+        desde (date): Fecha de inicio del período
+        hasta (date): Fecha de fin del período
+        max_horas (float): Antigüedad máxima (default: REPORTES_LOTE_MAX_HORAS; 0 = sin límite)
+        directorio (str): Directorio de los paquetes (default: directorio_lotes())
+    
+    Returns:
+        dict: Manifiesto con la clave 'ruta' agregada, o None si no hay uno vigente
+    """
+    if max_horas is None:
+        max_horas = obtener_configuracion().decimal('REPORTES_LOTE_MAX_HORAS', 24)
+    carpeta = _carpeta_periodo(desde, hasta, directorio)
+    try:
+        version = _leer_json(os.path.join(carpeta, 'actual.json'))['version']
+        ruta = os.path.join(carpeta, version)
+        manifiesto = _leer_json(os.path.join(ruta, 'manifiesto.json'))
+    except (OSError, ValueError, KeyError):
+        return None
+    
+    if max_horas and (datetime.now() - manifiesto['generado']).total_seconds() > max_horas * 3600:
+        return None
+    manifiesto['ruta'] = ruta
+    return manifiesto
+
+def cargar_reporte(nombre, desde, hasta, limite=None, manifiesto=None):
+    """
+    Lee un reporte precalculado del período.
+    
+    Args:
+        nombre (str): Nombre en REPORTES
+        desde (date): Fecha de inicio del período
+        hasta (date): Fecha de fin del período
+        limite (int): Filas de los rankings (debe ser a lo sumo el del paquete)
+        manifiesto (dict): Manifiesto ya leído con manifiesto_vigente() (opcional)
+    
+    Returns:
+        list: Filas como diccionarios, o None si no está disponible (hay que consultarlo)
+    """
+    manifiesto = manifiesto or manifiesto_vigente(desde, hasta)
+    if manifiesto is None:
+        return None
+    entrada = manifiesto['reportes'].get(nombre)
+    if not entrada or entrada['estado'] != 'ok':
+        return None
+    if nombre in REPORTES_CON_LIMITE and limite is not None and limite > manifiesto['limite']:
+        return None
+    
+    try:
+        filas = _leer_filas(os.path.join(manifiesto['ruta'], entrada['archivo']))
+    except (OSError, ValueError, ImportError) as e:
+        notificaciones.detalle(f"No se pudo leer el reporte precalculado {nombre}: {e}")
+        return None
+    if nombre in REPORTES_CON_LIMITE and limite is not None:
+        filas = filas[:limite]
+    return filas
@@ -0,0 +1,137 @@
+from capa_datos.data_access_async import conexion_async, ejecutar_pipeline_async
+from logica_negocio.pagos_logic import (
+    PagosLogic, SQL_PAGOS, SQL_PAGO_POR_ID, SQL_PAGOS_POR_CLIENTE,
+    SQL_RESERVAS_SIN_PAGO, SQL_SALDO_RESERVA, SQL_PAGOS_RECIENTES
+)
+from utils.carga_diferida import instancias_diferidas
+
+class PagosAsyncLogic:
+    """
+    Versión asíncrona de las lecturas más usadas de PagosLogic.
+    
+    Usa las mismas consultas que la versión síncrona; está pensada para un
+    servidor de API o trabajos por lotes que atienden muchas peticiones
+    concurrentes en un solo proceso.
+    """
+    
+    def __init__(self):
+        self.pagos_logic = PagosLogic()
+    
+    def _log_error(self, message):
+        """
+        Registra un error de manera compatible con Streamlit y fuera de él.
+        
+        Args:
+            message (str): Mensaje de error
+        """
+        self.pagos_logic._log_error(message)
+    
+    async def _obtener_filas(self, sql, params, mensaje_error):
+        """
+        Ejecuta una consulta en una conexión del pool y retorna todas sus filas.
+        
+        Returns:
+            list: Filas de la consulta (vacía si falla)
+        """
+        try:
+            async with conexion_async() as conn:
+                cur = await conn.execute(sql, params)
+                return await cur.fetchall()
+        except Exception as error:
+            self._log_error(f"{mensaje_error}: {error}")
+            return []
+    
+    async def obtener_pagos_async(self):
+        """
+        Obtiene todos los pagos.
+        
+        Returns:
+            list: Lista de pagos
+        """
+        return await self._obtener_filas(SQL_PAGOS, None, "Error al obtener pagos")
+    
+    async def obtener_pago_por_id_async(self, pago_id):
+        """
+        Obtiene un pago por su ID.
+        
+        Args:
+            pago_id (int): ID del pago
+        
+        Returns:
+            tuple: Datos del pago o None
+        """
+        pagos = await self._obtener_filas(SQL_PAGO_POR_ID, (pago_id,), "Error al obtener pago")
+        return pagos[0] if pagos else None
+    
+    async def obtener_pagos_por_cliente_async(self, cliente_id):
+        """
+        Obtiene todos los pagos de un cliente.
+        
+        Args:
+            cliente_id (int): ID del cliente
+        
+        Returns:
+            list: Lista de pagos del cliente
+        """
+        return await self._obtener_filas(SQL_PAGOS_POR_CLIENTE, (cliente_id,), "Error al obtener pagos del cliente")
+    
+    async def obtener_reservas_sin_pago_async(self):
+        """
+        Obtiene reservas que no tienen pagos registrados.
+        
+        Returns:
+            list: Lista de reservas sin pago
+        """
+        return await self._obtener_filas(SQL_RESERVAS_SIN_PAGO, None, "Error al obtener reservas sin pago")
+    
+    async def calcular_saldo_pendiente_reserva_async(self, reserva_id):
+        """
+        Calcula el saldo pendiente de una reserva.
+        
+        Args:
+            reserva_id (int): ID de la reserva
+        
+        Returns:
+            float: Saldo pendiente
+        """
+        resultado = await self._obtener_filas(SQL_SALDO_RESERVA, (reserva_id,), "Error al calcular saldo pendiente")
+        if resultado and resultado[0][0]:
+            return max(0, float(resultado[0][0]))
+        return 0.0
+    
+    async def get_pagos_recientes_async(self, limit=10):
+        """
+        Obtiene los pagos más recientes.
+        
+        Args:
+            limit (int): Número máximo de pagos a obtener
+        
+        Returns:
+            list: Lista de pagos recientes
+        """
+        return await self._obtener_filas(SQL_PAGOS_RECIENTES, (limit,), "Error al obtener pagos recientes")
+    
+    async def obtener_panel_pagos_async(self, limit=10):
+        """
+        Obtiene los pagos recientes y las reservas sin pago en un solo viaje
+        de red (modo pipeline).
+        
+        Args:
+            limit (int): Número máximo de pagos recientes
+        
+        Returns:
+            dict: {'pagos_recientes': list, 'reservas_sin_pago': list}
+        """
+        try:
+            async with conexion_async() as conn:
+                recientes, sin_pago = await ejecutar_pipeline_async(conn, [
+                    (SQL_PAGOS_RECIENTES, (limit,)),
+                    (SQL_RESERVAS_SIN_PAGO, None)
+                ])
+                return {'pagos_recientes': recientes, 'reservas_sin_pago': sin_pago}
+        except Exception as error:
+            self._log_error(f"Error al obtener el panel de pagos: {error}")
+            return {'pagos_recientes': [], 'reservas_sin_pago': []}
+
+# Instancia global de la lógica de pagos asíncrona (se crea al primer uso)
+__getattr__ = instancias_diferidas(__name__, {'pagos_async_logic': PagosAsyncLogic})
\ No newline at end of file
@@ -1,7 +1,87 @@
-import streamlit as st
+from capa_datos import notificaciones
 import psycopg2
+from decimal import Decimal, InvalidOperation
 from datetime import datetime, date, timedelta
-from capa_datos.database_connection import get_db_connection
+from capa_datos.database_connection import get_db_connection, solo_lectura, lectura_escritura
+from logica_negocio.analitica_pagos_logic import analitica_pagos_logic
+from utils.carga_diferida import instancias_diferidas
+
+# Consultas de lectura compartidas con PagosAsyncLogic
+SQL_PAGOS = """
+    SELECT p.id, p.reserva_id, p.cliente_id, p.monto, p.metodo_pago,
+           p.estado, p.observaciones, p.fecha_pago, p.fecha_creacion,
+           p.fecha_actualizacion,
+           c.nombre as nombre_cliente, c.apellido as apellido_cliente,
+           r.fecha_reserva, r.hora_inicio, r.hora_fin,
+           ca.nombre as nombre_cancha
+    FROM pagos p
+    JOIN clientes c ON p.cliente_id = c.id
+    LEFT JOIN reservas r ON p.reserva_id = r.id
+    LEFT JOIN canchas ca ON r.cancha_id = ca.id
+    ORDER BY p.fecha_pago DESC
+"""
+
+SQL_PAGO_POR_ID = """
+    SELECT p.id, p.reserva_id, p.cliente_id, p.monto, p.metodo_pago,
+           p.estado, p.observaciones, p.fecha_pago, p.fecha_creacion,
+           p.fecha_actualizacion,
+           c.nombre as nombre_cliente, c.apellido as apellido_cliente,
+           r.fecha_reserva, r.hora_inicio, r.hora_fin,
+           ca.nombre as nombre_cancha
+    FROM pagos p
+    JOIN clientes c ON p.cliente_id = c.id
+    LEFT JOIN reservas r ON p.reserva_id = r.id
+    LEFT JOIN canchas ca ON r.cancha_id = ca.id
+    WHERE p.id = %s
+"""
+
+SQL_PAGOS_POR_CLIENTE = """
+    SELECT p.id, p.reserva_id, p.monto, p.metodo_pago, p.estado,
+           p.observaciones, p.fecha_pago, p.fecha_creacion,
+           r.fecha_reserva, r.hora_inicio, r.hora_fin,
+           ca.nombre as nombre_cancha
+    FROM pagos p
+    LEFT JOIN reservas r ON p.reserva_id = r.id
+    LEFT JOIN canchas ca ON r.cancha_id = ca.id
+    WHERE p.cliente_id = %s
+    ORDER BY p.fecha_pago DESC
+"""
+
+SQL_RESERVAS_SIN_PAGO = """
+    SELECT r.id, r.cliente_id, r.cancha_id, r.fecha_reserva, r.hora_inicio,
+           r.hora_fin, r.duracion, r.estado, r.fecha_creacion,
+           c.nombre as nombre_cliente, c.apellido as apellido_cliente,
+           ca.nombre as nombre_cancha, ca.precio_hora,
+           s.total_precio as precio_total
+    FROM saldos_reserva s
+    JOIN reservas r ON s.reserva_id = r.id
+    JOIN clientes c ON r.cliente_id = c.id
+    JOIN canchas ca ON r.cancha_id = ca.id
+    WHERE s.saldo > 0
+    AND s.total_pagado = 0
+    AND r.estado IN ('confirmada', 'completada')
+    ORDER BY r.fecha_reserva DESC
+"""
+
+SQL_SALDO_RESERVA = """
+    SELECT saldo
+    FROM saldos_reserva
+    WHERE reserva_id = %s
+"""
+
+SQL_PAGOS_RECIENTES = """
+    SELECT p.id, p.reserva_id, p.cliente_id, p.monto, p.metodo_pago,
+           p.estado, p.observaciones, p.fecha_pago, p.fecha_creacion,
+           c.nombre as nombre_cliente, c.apellido as apellido_cliente,
+           r.fecha_reserva, r.hora_inicio, r.hora_fin,
+           ca.nombre as nombre_cancha
+    FROM pagos p
+    JOIN clientes c ON p.cliente_id = c.id
+    LEFT JOIN reservas r ON p.reserva_id = r.id
+    LEFT JOIN canchas ca ON r.cancha_id = ca.id
+    ORDER BY p.fecha_pago DESC
+    LIMIT %s
+"""
 
 class PagosLogic:
     """
@@ -10,16 +90,14 @@ class PagosLogic:
     
     def _log_error(self, message):
         """
-        Registra un error de manera compatible con Streamlit y fuera de él.
+        Registra un error con el notificador de capa_datos/notificaciones.py.
         
         Args:
             message (str): Mensaje de error
         """
-        try:
-            st.error(message)
-        except:
-            print(f"ERROR: {message}")
+        notificaciones.error(message)
     
+    @solo_lectura
     def obtener_pagos(self):
         """
         Obtiene todos los pagos.
@@ -36,25 +114,13 @@ class PagosLogic:
             cur = conn.cursor()
             
             # Consulta SQL directa para obtener pagos
-            cur.execute("""
-                SELECT p.id, p.reserva_id, p.cliente_id, p.monto, p.metodo_pago,
-                       p.estado, p.observaciones, p.fecha_pago, p.fecha_creacion,
-                       p.fecha_actualizacion,
-                       c.nombre as nombre_cliente, c.apellido as apellido_cliente,
-                       r.fecha_reserva, r.hora_inicio, r.hora_fin,
-                       ca.nombre as nombre_cancha
-                FROM pagos p
-                JOIN clientes c ON p.cliente_id = c.id
-                LEFT JOIN reservas r ON p.reserva_id = r.id
-                LEFT JOIN canchas ca ON r.cancha_id = ca.id
-                ORDER BY p.fecha_pago DESC
-            """)
+            cur.execute(SQL_PAGOS)
             
             pagos = cur.fetchall()
             cur.close()
             
             return pagos
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener pagos: {error}")
             return []
@@ -62,6 +128,7 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_pago_por_id(self, pago_id):
         """
         Obtiene un pago específico por su ID.
@@ -81,25 +148,13 @@ class PagosLogic:
             cur = conn.cursor()
             
             # Consulta SQL directa para obtener pago por ID
-            cur.execute("""
-                SELECT p.id, p.reserva_id, p.cliente_id, p.monto, p.metodo_pago,
-                       p.estado, p.observaciones, p.fecha_pago, p.fecha_creacion,
-                       p.fecha_actualizacion,
-                       c.nombre as nombre_cliente, c.apellido as apellido_cliente,
-                       r.fecha_reserva, r.hora_inicio, r.hora_fin,
-                       ca.nombre as nombre_cancha
-                FROM pagos p
-                JOIN clientes c ON p.cliente_id = c.id
-                LEFT JOIN reservas r ON p.reserva_id = r.id
-                LEFT JOIN canchas ca ON r.cancha_id = ca.id
-                WHERE p.id = %s
-            """, (pago_id,))
+            cur.execute(SQL_PAGO_POR_ID, (pago_id,))
             
             pago = cur.fetchone()
             cur.close()
             
             return pago
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener pago por ID: {error}")
             return None
@@ -107,6 +162,7 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def crear_pago(self, reserva_id, monto, metodo_pago, observaciones=None):
         """
         Crea un nuevo pago.
@@ -116,7 +172,7 @@ class PagosLogic:
             monto (float): Monto del pago
             metodo_pago (str): Método de pago
             observaciones (str, optional): Observaciones del pago
-            
+        
         Returns:
             int or None: ID del pago creado o None si falla
         """
@@ -144,10 +200,11 @@ class PagosLogic:
             
             pago_id = cur.fetchone()[0]
             conn.commit()
+            analitica_pagos_logic.invalidar()
             cur.close()
             
             return pago_id
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -157,6 +214,189 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
+    def registrar_pagos_lote(self, pagos):
+        """
+        Registra varios pagos en una sola sentencia y una sola transacción.
+        
+        Todas las filas se validan contra saldos_reserva en la misma consulta.
+        Las filas de una misma reserva se revisan en orden y cada una se
+        compara con el saldo menos lo ya aceptado en las filas anteriores: una
+        fila rechazada no consume saldo, así que las siguientes todavía pueden
+        entrar. Las filas válidas se insertan, las reservas se marcan como
+        'Pagada' y se registra la auditoría igual que en proc_registrar_pago.
+        
+        Args:
+            pagos (list): Lista de diccionarios con reserva_id, monto,
+                metodo_pago y observaciones (opcional)
+        
+        Returns:
+            list: Un diccionario por fila con fila, reserva_id, monto,
+                pago_id, exito y error
+        """
+        if not pagos:
+            return []
+        
+        reservas_ids = []
+        montos = []
+        metodos = []
+        observaciones = []
+        for pago in pagos:
+            try:
+                reservas_ids.append(int(pago.get('reserva_id')))
+            except (TypeError, ValueError):
+                reservas_ids.append(None)
+            try:
+                # Decimal como la columna NUMERIC, sin redondeos al comparar con el saldo
+                monto = Decimal(str(pago.get('monto')))
+                montos.append(monto if monto.is_finite() else None)
+            except (TypeError, ValueError, InvalidOperation):
+                montos.append(None)
+            metodos.append(pago.get('metodo_pago') or None)
+            observaciones.append(pago.get('observaciones') or None)
+        
+        conn = None
+        try:
+            conn = get_db_connection()
+            if not conn:
+                return self._resultados_lote_fallido(reservas_ids, montos, "Sin conexión a la base de datos")
+            
+            # Una sola sentencia en autocommit: un viaje de ida y vuelta y una transacción
+            conn.autocommit = True
+            cur = conn.cursor()
+            
+            cur.execute("""
+                WITH RECURSIVE entrada AS (
+                    SELECT e.reserva_id, e.monto, e.metodo_pago, e.observaciones, e.fila
+                    FROM unnest(%s::integer[], %s::numeric[], %s::varchar[], %s::text[])
+                         WITH ORDINALITY AS e(reserva_id, monto, metodo_pago, observaciones, fila)
+                ),
+                saldos AS (
+                    SELECT s.reserva_id, s.saldo
+                    FROM saldos_reserva s
+                    WHERE s.reserva_id IN (SELECT reserva_id FROM entrada)
+                    FOR UPDATE
+                ),
+                basico AS (
+                    SELECT e.*, r.cliente_id, COALESCE(s.saldo, 0) AS saldo,
+                        ROW_NUMBER() OVER (PARTITION BY e.reserva_id ORDER BY e.fila) AS orden,
+                        CASE
+                            WHEN r.id IS NULL THEN 'La reserva no existe'
+                            WHEN e.monto IS NULL OR e.monto <= 0 THEN 'El monto debe ser mayor a 0'
+                            WHEN e.metodo_pago IS NULL THEN 'El método de pago es obligatorio'
+                        END AS error_basico
+                    FROM entrada e
+                    LEFT JOIN reservas r ON r.id = e.reserva_id
+                    LEFT JOIN saldos s ON s.reserva_id = e.reserva_id
+                ),
+                -- Filas de cada reserva en orden, con el total de las aceptadas hasta ahí
+                acumulado AS (
+                    SELECT b.fila, b.reserva_id, b.orden,
+                        CASE WHEN b.error_basico IS NULL AND b.monto <= b.saldo
+                             THEN b.monto ELSE 0 END AS aceptado,
+                        COALESCE(b.error_basico,
+                            CASE WHEN b.monto > b.saldo THEN 'El monto supera el saldo pendiente' END) AS error
+                    FROM basico b
+                    WHERE b.orden = 1
+                    UNION ALL
+                    SELECT b.fila, b.reserva_id, b.orden,
+                        a.aceptado + CASE WHEN b.error_basico IS NULL AND a.aceptado + b.monto <= b.saldo
+                                          THEN b.monto ELSE 0 END,
+                        COALESCE(b.error_basico,
+                            CASE WHEN a.aceptado + b.monto > b.saldo THEN 'El monto supera el saldo pendiente' END)
+                    FROM acumulado a
+                    JOIN basico b ON b.reserva_id IS NOT DISTINCT FROM a.reserva_id AND b.orden = a.orden + 1
+                ),
+                validado AS (
+                    SELECT b.*, a.error
+                    FROM basico b
+                    JOIN acumulado a ON a.fila = b.fila
+                ),
+                nuevos AS (
+                    SELECT v.*, nextval('public.pagos_id_seq') AS pago_id
+                    FROM validado v
+                    WHERE v.error IS NULL
+                ),
+                insertados AS (
+                    INSERT INTO pagos (id, reserva_id, cliente_id, monto, metodo_pago, estado,
+                                       observaciones, fecha_pago, fecha_creacion, fecha_actualizacion)
+                    SELECT pago_id, reserva_id, cliente_id, monto, metodo_pago, 'Completado',
+                           observaciones, CURRENT_DATE, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+                    FROM nuevos
+                    RETURNING id
+                ),
+                reservas_pagadas AS (
+                    UPDATE reservas
+                    SET estado = 'Pagada',
+                        fecha_actualizacion = CURRENT_TIMESTAMP
+                    WHERE id IN (SELECT reserva_id FROM nuevos)
+                    RETURNING id
+                ),
+                auditados AS (
+                    INSERT INTO auditoria (tabla, tipo_accion, registro_id, usuario_id, detalles,
+                                           resultado, ip_address, fecha_hora)
+                    SELECT 'pagos', 'INSERT', pago_id,
+                           COALESCE(current_setting('app.current_user_id', true)::INTEGER, 1),
+                           'Pago registrado en lote - Reserva: ' || reserva_id || ', Cliente: ' || cliente_id ||
+                           ', Monto: ' || monto || ', Método: ' || metodo_pago,
+                           'SUCCESS', '127.0.0.1', CURRENT_TIMESTAMP
+                    FROM nuevos
+                    RETURNING id
+                )
+                SELECT v.fila, v.reserva_id, v.monto, n.pago_id, v.error
+                FROM validado v
+                LEFT JOIN nuevos n ON n.fila = v.fila
+                ORDER BY v.fila
+            """, (reservas_ids, montos, metodos, observaciones))
+            
+            filas = cur.fetchall()
+            cur.close()
+            analitica_pagos_logic.invalidar()
+            
+            return [
+                {
+                    'fila': fila[0],
+                    'reserva_id': fila[1],
+                    'monto': fila[2],
+                    'pago_id': fila[3],
+                    'exito': fila[4] is None,
+                    'error': fila[4]
+                }
+                for fila in filas
+            ]
+        
+        except (Exception, psycopg2.DatabaseError) as error:
+            self._log_error(f"Error al registrar pagos en lote: {error}")
+            return self._resultados_lote_fallido(reservas_ids, montos, str(error))
+        finally:
+            if conn:
+                conn.close()
+    
+    def _resultados_lote_fallido(self, reservas_ids, montos, mensaje):
+        """
+        Construye el resultado por fila cuando el lote completo no se pudo registrar.
+        
+        Args:
+            reservas_ids (list): IDs de reserva del lote
+            montos (list): Montos del lote
+            mensaje (str): Motivo del fallo
+        
+        Returns:
+            list: Un diccionario por fila marcado como fallido
+        """
+        return [
+            {
+                'fila': indice + 1,
+                'reserva_id': reserva_id,
+                'monto': monto,
+                'pago_id': None,
+                'exito': False,
+                'error': mensaje
+            }
+            for indice, (reserva_id, monto) in enumerate(zip(reservas_ids, montos))
+        ]
+    
+    @lectura_escritura
     def actualizar_pago(self, pago_id, monto, metodo_pago, estado, observaciones=None):
         """
         Actualiza un pago existente.
@@ -167,7 +407,7 @@ class PagosLogic:
             metodo_pago (str): Nuevo método de pago
             estado (str): Nuevo estado
             observaciones (str, optional): Nuevas observaciones
-            
+        
         Returns:
             bool: True si se actualizó correctamente, False en caso contrario
         """
@@ -195,10 +435,11 @@ class PagosLogic:
             
             resultado = cur.fetchone()[0]
             conn.commit()
+            analitica_pagos_logic.invalidar()
             cur.close()
             
             return resultado
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -208,13 +449,14 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def eliminar_pago(self, pago_id):
         """
         Elimina un pago.
         
         Args:
             pago_id (int): ID del pago
-            
+        
         Returns:
             bool: True si se eliminó correctamente, False en caso contrario
         """
@@ -233,10 +475,11 @@ class PagosLogic:
             
             resultado = cur.fetchone()[0]
             conn.commit()
+            analitica_pagos_logic.invalidar()
             cur.close()
             
             return resultado
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -246,13 +489,14 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_pagos_por_cliente(self, cliente_id):
         """
         Obtiene todos los pagos de un cliente específico.
         
         Args:
             cliente_id (int): ID del cliente
-            
+        
         Returns:
             list: Lista de pagos del cliente
         """
@@ -265,23 +509,13 @@ class PagosLogic:
             cur = conn.cursor()
             
             # Consulta SQL directa para obtener pagos por cliente
-            cur.execute("""
-                SELECT p.id, p.reserva_id, p.monto, p.metodo_pago, p.estado,
-                       p.observaciones, p.fecha_pago, p.fecha_creacion,
-                       r.fecha_reserva, r.hora_inicio, r.hora_fin,
-                       ca.nombre as nombre_cancha
-                FROM pagos p
-                LEFT JOIN reservas r ON p.reserva_id = r.id
-                LEFT JOIN canchas ca ON r.cancha_id = ca.id
-                WHERE p.cliente_id = %s
-                ORDER BY p.fecha_pago DESC
-            """, (cliente_id,))
+            cur.execute(SQL_PAGOS_POR_CLIENTE, (cliente_id,))
             
             pagos = cur.fetchall()
             cur.close()
             
             return pagos
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener pagos por cliente: {error}")
             return []
@@ -289,6 +523,7 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_pagos_por_fecha(self, fecha_inicio, fecha_fin):
         """
         Obtiene pagos en un rango de fechas.
@@ -296,7 +531,7 @@ class PagosLogic:
         Args:
             fecha_inicio (date): Fecha de inicio
             fecha_fin (date): Fecha de fin
-            
+        
         Returns:
             list: Lista de pagos en el rango de fechas
         """
@@ -327,7 +562,7 @@ class PagosLogic:
             cur.close()
             
             return pagos
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener pagos por fecha: {error}")
             return []
@@ -335,6 +570,7 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_estadisticas_pagos(self, fecha_inicio=None, fecha_fin=None):
         """
         Obtiene estadísticas de pagos.
@@ -342,75 +578,13 @@ class PagosLogic:
         Args:
             fecha_inicio (date, optional): Fecha de inicio para el filtro
             fecha_fin (date, optional): Fecha de fin para el filtro
-            
+        
         Returns:
             dict: Estadísticas de pagos
         """
-        conn = None
-        try:
-            conn = get_db_connection()
-            if not conn:
-                return {}
-            
-            cur = conn.cursor()
-            
-            if fecha_inicio and fecha_fin:
-                # Consulta SQL directa con filtro de fechas
-                cur.execute("""
-                    SELECT 
-                        COUNT(*) as total_pagos,
-                        COALESCE(SUM(monto), 0) as total_recaudado,
-                        AVG(monto) as promedio_pago,
-                        COUNT(CASE WHEN estado = 'Completado' THEN 1 END) as pagos_completados,
-                        COUNT(CASE WHEN estado = 'Pendiente' THEN 1 END) as pagos_pendientes,
-                        COUNT(CASE WHEN metodo_pago = 'Efectivo' THEN 1 END) as pagos_efectivo,
-                        COUNT(CASE WHEN metodo_pago = 'Tarjeta de Crédito' THEN 1 END) as pagos_tarjeta_credito,
-                        COUNT(CASE WHEN metodo_pago = 'Tarjeta de Débito' THEN 1 END) as pagos_tarjeta_debito,
-                        COUNT(CASE WHEN metodo_pago = 'Transferencia Bancaria' THEN 1 END) as pagos_transferencia,
-                        COUNT(CASE WHEN metodo_pago = 'Pago Móvil' THEN 1 END) as pagos_movil
-                    FROM pagos
-                    WHERE fecha_pago BETWEEN %s AND %s
-                """, (fecha_inicio, fecha_fin))
-            else:
-                # Consulta SQL directa sin filtro de fechas
-                cur.execute("""
-                    SELECT 
-                        COUNT(*) as total_pagos,
-                        COALESCE(SUM(monto), 0) as total_recaudado,
-                        AVG(monto) as promedio_pago,
-                        COUNT(CASE WHEN estado = 'Completado' THEN 1 END) as pagos_completados,
-                        COUNT(CASE WHEN estado = 'Pendiente' THEN 1 END) as pagos_pendientes,
-                        COUNT(CASE WHEN metodo_pago = 'Efectivo' THEN 1 END) as pagos_efectivo,
-                        COUNT(CASE WHEN metodo_pago = 'Tarjeta de Crédito' THEN 1 END) as pagos_tarjeta_credito,
-                        COUNT(CASE WHEN metodo_pago = 'Tarjeta de Débito' THEN 1 END) as pagos_tarjeta_debito,
-                        COUNT(CASE WHEN metodo_pago = 'Transferencia Bancaria' THEN 1 END) as pagos_transferencia,
-                        COUNT(CASE WHEN metodo_pago = 'Pago Móvil' THEN 1 END) as pagos_movil
-                    FROM pagos
-                """)
-            
-            stats = cur.fetchone()
-            cur.close()
-            
-            return {
-                'total_pagos': stats[0],
-                'total_recaudado': float(stats[1]) if stats[1] else 0,
-                'promedio_pago': float(stats[2]) if stats[2] else 0,
-                'pagos_completados': stats[3],
-                'pagos_pendientes': stats[4],
-                'pagos_efectivo': stats[5],
-                'pagos_tarjeta_credito': stats[6],
-                'pagos_tarjeta_debito': stats[7],
-                'pagos_transferencia': stats[8],
-                'pagos_movil': stats[9]
-            }
-            
-        except (Exception, psycopg2.DatabaseError) as error:
-            self._log_error(f"Error al obtener estadísticas de pagos: {error}")
-            return {}
-        finally:
-            if conn:
-                conn.close()
+        return analitica_pagos_logic.estadisticas_pagos(fecha_inicio, fecha_fin)
     
+    @solo_lectura
     def obtener_reservas_sin_pago(self):
         """
         Obtiene reservas que no tienen pagos registrados.
@@ -426,30 +600,14 @@ class PagosLogic:
             
             cur = conn.cursor()
             
-            # Consulta SQL directa para obtener reservas sin pago
-            cur.execute("""
-                SELECT r.id, r.cliente_id, r.cancha_id, r.fecha_reserva, r.hora_inicio,
-                       r.hora_fin, r.duracion, r.estado, r.fecha_creacion,
-                       c.nombre as nombre_cliente, c.apellido as apellido_cliente,
-                       ca.nombre as nombre_cancha, ca.precio_hora,
-                       (r.duracion * ca.precio_hora) as precio_total
-                FROM reservas r
-                JOIN clientes c ON r.cliente_id = c.id
-                JOIN canchas ca ON r.cancha_id = ca.id
-                WHERE r.estado IN ('confirmada', 'completada')
-                AND NOT EXISTS (
-                    SELECT 1 FROM pagos p 
-                    WHERE p.reserva_id = r.id 
-                    AND p.estado = 'Completado'
-                )
-                ORDER BY r.fecha_reserva DESC
-            """)
+            # El saldo se mantiene por triggers en saldos_reserva (índice parcial sobre saldo > 0)
+            cur.execute(SQL_RESERVAS_SIN_PAGO)
             
             reservas = cur.fetchall()
             cur.close()
             
             return reservas
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener reservas sin pago: {error}")
             return []
@@ -463,7 +621,7 @@ class PagosLogic:
         
         Args:
             reserva_id (int): ID de la reserva
-            
+        
         Returns:
             float: Saldo pendiente
         """
@@ -475,28 +633,17 @@ class PagosLogic:
             
             cur = conn.cursor()
             
-            # Consulta SQL directa para calcular saldo pendiente
-            cur.execute("""
-                SELECT 
-                    COALESCE(r.duracion * ca.precio_hora, 0) as precio_total,
-                    COALESCE(SUM(p.monto), 0) as total_pagado
-                FROM reservas r
-                JOIN canchas ca ON r.cancha_id = ca.id
-                LEFT JOIN pagos p ON r.id = p.reserva_id AND p.estado = 'Completado'
-                WHERE r.id = %s
-                GROUP BY r.duracion, ca.precio_hora
-            """, (reserva_id,))
+            # Leer el saldo mantenido por triggers en saldos_reserva
+            cur.execute(SQL_SALDO_RESERVA, (reserva_id,))
             
             resultado = cur.fetchone()
             cur.close()
             
-            if resultado:
-                precio_total = float(resultado[0]) if resultado[0] else 0
-                total_pagado = float(resultado[1]) if resultado[1] else 0
-                return max(0, precio_total - total_pagado)
+            if resultado and resultado[0]:
+                return max(0, float(resultado[0]))
             
             return 0.0
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al calcular saldo pendiente: {error}")
             return 0.0
@@ -504,6 +651,7 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def get_ingresos_periodo(self, fecha_inicio, fecha_fin):
         """
         Obtiene los ingresos de un período específico.
@@ -559,6 +707,7 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def get_pagos_recientes(self, limit=10):
         """
         Obtiene los pagos más recientes.
@@ -578,25 +727,13 @@ class PagosLogic:
             cur = conn.cursor()
             
             # Consulta SQL directa para obtener pagos más recientes
-            cur.execute("""
-                SELECT p.id, p.reserva_id, p.cliente_id, p.monto, p.metodo_pago,
-                       p.estado, p.observaciones, p.fecha_pago, p.fecha_creacion,
-                       c.nombre as nombre_cliente, c.apellido as apellido_cliente,
-                       r.fecha_reserva, r.hora_inicio, r.hora_fin,
-                       ca.nombre as nombre_cancha
-                FROM pagos p
-                JOIN clientes c ON p.cliente_id = c.id
-                LEFT JOIN reservas r ON p.reserva_id = r.id
-                LEFT JOIN canchas ca ON r.cancha_id = ca.id
-                ORDER BY p.fecha_pago DESC
-                LIMIT %s
-            """, (limit,))
+            cur.execute(SQL_PAGOS_RECIENTES, (limit,))
             
             pagos_recientes = cur.fetchall()
             cur.close()
             
             return pagos_recientes
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener pagos recientes: {error}")
             return []
@@ -604,6 +741,7 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def get_ingresos_mensuales(self):
         """
         Obtiene los ingresos de los últimos 12 meses.
@@ -637,7 +775,7 @@ class PagosLogic:
                 })
             
             return result[::-1]  # Invertir para mostrar cronológicamente
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener ingresos mensuales: {error}")
             return []
@@ -646,6 +784,7 @@ class PagosLogic:
                 conn.close()
     
     # Métodos adicionales para pagos_view.py
+    @solo_lectura
     def get_pagos_filtrados(self, fecha_inicio=None, fecha_fin=None, cliente_id=None, estado=None):
         """
         Obtiene pagos filtrados por diferentes criterios.
@@ -706,7 +845,7 @@ class PagosLogic:
             cur.close()
             
             return pagos_filtrados
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener pagos filtrados: {error}")
             return []
@@ -714,6 +853,7 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def get_resumen_mensual(self, mes, año):
         """
         Obtiene el resumen de pagos de un mes específico.
@@ -725,58 +865,20 @@ class PagosLogic:
         Returns:
             dict: Resumen mensual
         """
-        conn = None
-        try:
-            conn = get_db_connection()
-            if not conn:
-                return {
-                    'total_ingresos': 0, 
-                    'total_pagos': 0, 
-                    'monto_total': 0,
-                    'promedio_por_pago': 0,
-                    'promedio_pago': 0,
-                    'pagos_completados': 0
-                }
-            
-            cur = conn.cursor()
-            
-            fecha_inicio = datetime(año, mes, 1)
-            if mes == 12:
-                fecha_fin = datetime(año + 1, 1, 1) - timedelta(days=1)
-            else:
-                fecha_fin = datetime(año, mes + 1, 1) - timedelta(days=1)
-            
-            pagos_mes = self.get_ingresos_periodo(fecha_inicio, fecha_fin)
-            
-            total_ingresos = sum(float(p['monto']) for p in pagos_mes)
-            total_pagos = len(pagos_mes)
-            
-            # Contar pagos completados
-            pagos_completados = len([p for p in pagos_mes if p.get('estado') == 'Completado'])
-            
-            return {
-                'total_ingresos': total_ingresos,
-                'total_pagos': total_pagos,
-                'monto_total': total_ingresos,  # Alias para compatibilidad
-                'promedio_por_pago': total_ingresos / total_pagos if total_pagos > 0 else 0,
-                'promedio_pago': total_ingresos / total_pagos if total_pagos > 0 else 0,  # Alias para compatibilidad
-                'pagos_completados': pagos_completados
-            }
-            
-        except (Exception, psycopg2.DatabaseError) as error:
-            self._log_error(f"Error al obtener resumen mensual: {error}")
-            return {
-                'total_ingresos': 0, 
-                'total_pagos': 0, 
-                'monto_total': 0,
-                'promedio_por_pago': 0,
-                'promedio_pago': 0,
-                'pagos_completados': 0
-            }
-        finally:
-            if conn:
-                conn.close()
+        completados = analitica_pagos_logic.resumen_mes(mes, año)
+        total_ingresos = completados['monto']
+        total_pagos = completados['cantidad']
+        
+        return {
+            'total_ingresos': total_ingresos,
+            'total_pagos': total_pagos,
+            'monto_total': total_ingresos,  # Alias para compatibilidad
+            'promedio_por_pago': total_ingresos / total_pagos if total_pagos > 0 else 0,
+            'promedio_pago': total_ingresos / total_pagos if total_pagos > 0 else 0,  # Alias para compatibilidad
+            'pagos_completados': total_pagos
+        }
     
+    @solo_lectura
     def get_pagos_por_cliente(self):
         """
         Obtiene estadísticas de pagos por cliente.
@@ -814,7 +916,7 @@ class PagosLogic:
                     'total_pagos': row[4]
                 } for row in clientes_stats
             ]
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener pagos por cliente: {error}")
             return []
@@ -822,6 +924,7 @@ class PagosLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def get_estadisticas_metodos_pago(self):
         """
         Obtiene estadísticas por método de pago.
@@ -829,43 +932,9 @@ class PagosLogic:
         Returns:
             list: Lista de estadísticas por método
         """
-        conn = None
-        try:
-            conn = get_db_connection()
-            if not conn:
-                return []
-            
-            cur = conn.cursor()
-            
-            # Consulta SQL directa para obtener estadísticas por método de pago
-            cur.execute("""
-                SELECT metodo_pago,
-                       COALESCE(SUM(monto), 0) as total_pagado,
-                       COUNT(p.id) as total_pagos
-                FROM pagos p
-                WHERE p.estado = 'Completado'
-                GROUP BY metodo_pago
-                ORDER BY total_pagado DESC
-            """)
-            
-            metodos_stats = cur.fetchall()
-            cur.close()
-            
-            return [
-                {
-                    'metodo': row[0],
-                    'total_pagado': float(row[1]),
-                    'total_pagos': row[2]
-                } for row in metodos_stats
-            ]
-            
-        except (Exception, psycopg2.DatabaseError) as error:
-            self._log_error(f"Error al obtener estadísticas de métodos de pago: {error}")
-            return []
-        finally:
-            if conn:
-                conn.close()
+        return analitica_pagos_logic.estadisticas_metodos_pago()
     
+    @solo_lectura
     def get_tendencias_pagos(self):
         """
         Obtiene tendencias de pagos en el tiempo.
@@ -873,42 +942,23 @@ class PagosLogic:
         Returns:
             list: Lista de tendencias
         """
-        conn = None
-        try:
-            conn = get_db_connection()
-            if not conn:
-                return []
-            
-            cur = conn.cursor()
-            
-            # Obtener datos de los últimos 6 meses
-            tendencias = []
-            for i in range(6):
-                fecha = datetime.now() - timedelta(days=30*i)
-                mes = fecha.strftime('%Y-%m')
-                
-                fecha_inicio = fecha.replace(day=1)
-                fecha_fin = (fecha_inicio + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-                
-                pagos_mes = self.get_ingresos_periodo(fecha_inicio, fecha_fin)
-                ingresos_mes = sum(float(p['monto']) for p in pagos_mes)
-                
-                tendencias.append({
-                    'mes': fecha.strftime('%B %Y'),
-                    'fecha': fecha.strftime('%Y-%m'),
-                    'ingresos': ingresos_mes,
-                    'monto_total': ingresos_mes,  # Alias para compatibilidad
-                    'cantidad_pagos': len(pagos_mes)
-                })
-            
-            return tendencias[::-1]  # Invertir para mostrar cronológicamente
-        except (Exception, psycopg2.DatabaseError) as error:
-            self._log_error(f"Error al obtener tendencias de pagos: {error}")
-            return []
-        finally:
-            if conn:
-                conn.close()
+        # Datos de los últimos 6 meses a partir del resumen mensual compartido
+        tendencias = []
+        for i in range(6):
+            fecha = datetime.now() - timedelta(days=30*i)
+            completados = analitica_pagos_logic.resumen_mes(fecha.month, fecha.year)
+            
+            tendencias.append({
+                'mes': fecha.strftime('%B %Y'),
+                'fecha': fecha.strftime('%Y-%m'),
+                'ingresos': completados['monto'],
+                'monto_total': completados['monto'],  # Alias para compatibilidad
+                'cantidad_pagos': completados['cantidad']
+            })
+        
+        return tendencias[::-1]  # Invertir para mostrar cronológicamente
     
+    @solo_lectura
     def obtener_estadisticas_generales_pagos(self):
         """
         Obtiene estadísticas generales de pagos.
@@ -916,71 +966,7 @@ class PagosLogic:
         Returns:
             dict: Estadísticas generales
         """
-        conn = None
-        try:
-            conn = get_db_connection()
-            if not conn:
-                return {
-                    'total_pagos': 0,
-                    'total_monto': 0,
-                    'promedio_por_pago': 0,
-                    'por_metodo': {},
-                    'por_estado': {}
-                }
-            
-            cur = conn.cursor()
-            
-            # Estadísticas básicas
-            cur.execute("""
-                SELECT COUNT(p.id) as total_pagos,
-                       COALESCE(SUM(p.monto), 0) as total_monto
-                FROM pagos p
-                WHERE p.estado = 'Completado'
-            """)
-            total_pagos_row = cur.fetchone()
-            total_pagos = total_pagos_row[0] if total_pagos_row else 0
-            total_monto = total_pagos_row[1] if total_pagos_row else 0
-            
-            # Contar por método de pago
-            cur.execute("""
-                SELECT metodo_pago, COUNT(p.id) as total_pagos_por_metodo
-                FROM pagos p
-                WHERE p.estado = 'Completado'
-                GROUP BY metodo_pago
-            """)
-            metodos_count = {row[0]: row[1] for row in cur.fetchall()}
-            
-            # Contar por estado
-            cur.execute("""
-                SELECT estado, COUNT(p.id) as total_pagos_por_estado
-                FROM pagos p
-                WHERE p.estado = 'Completado'
-                GROUP BY estado
-            """)
-            estados_count = {row[0]: row[1] for row in cur.fetchall()}
-            
-            cur.close()
-            
-            return {
-                'total_pagos': total_pagos,
-                'total_monto': total_monto,
-                'promedio_por_pago': total_monto / total_pagos if total_pagos > 0 else 0,
-                'por_metodo': metodos_count,
-                'por_estado': estados_count
-            }
-            
-        except (Exception, psycopg2.DatabaseError) as error:
-            self._log_error(f"Error al obtener estadísticas generales de pagos: {error}")
-            return {
-                'total_pagos': 0,
-                'total_monto': 0,
-                'promedio_por_pago': 0,
-                'por_metodo': {},
-                'por_estado': {}
-            }
-        finally:
-            if conn:
-                conn.close()
+        return analitica_pagos_logic.estadisticas_generales()
 
-# Instancia global de la lógica de pagos
-pagos_logic = PagosLogic() 
\ No newline at end of file
+# Instancia global de la lógica de pagos (se crea al primer uso)
+__getattr__ = instancias_diferidas(__name__, {'pagos_logic': PagosLogic})
\ No newline at end of file
@@ -1,7 +1,9 @@
-import streamlit as st
+from capa_datos import notificaciones
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 from capa_datos.reports_data import (
     get_vista_reservas_completas_db,
+    iter_vista_reservas_completas_db,
     get_vista_estadisticas_canchas_db,
     get_estadisticas_generales_db,
     get_estadisticas_mensuales_db,
@@ -18,7 +20,20 @@ from logica_negocio.clientes_logic import ClientesLogic
 from logica_negocio.canchas_logic import CanchasLogic
 from logica_negocio.reservas_logic import ReservasLogic
 from logica_negocio.pagos_logic import PagosLogic
-from capa_datos.database_connection import get_db_connection
+from capa_datos.ejecucion_concurrente import EjecucionConcurrente
+from config.settings import obtener_configuracion
+from capa_datos.database_connection import (
+    get_db_connection,
+    close_connection,
+    solo_lectura,
+    lectura_escritura,
+    modo_actual,
+    conexion_del_pool,
+    pool_para_operacion,
+    MODO_LECTURA
+)
+from utils.carga_diferida import instancias_diferidas
+from utils.exportacion_csv import escribir_filas_csv
 
 class ReportsLogic:
     """
@@ -31,6 +46,17 @@ class ReportsLogic:
         self.canchas_logic = CanchasLogic()
         self.reservas_logic = ReservasLogic()
         self.pagos_logic = PagosLogic()
+        # Las consultas independientes de un mismo reporte se ejecutan en paralelo
+        self.concurrente = obtener_configuracion().booleano('REPORTES_CONCURRENTES', True)
+    
+    def _nuevo_lote(self):
+        """
+        Crea un lote de consultas según el modo de ejecución configurado.
+        
+        Returns:
+            EjecucionConcurrente: Lote vacío
+        """
+        return EjecucionConcurrente(paralelo=self.concurrente)
     
     def _get_connection(self):
         """
@@ -43,18 +69,35 @@ class ReportsLogic:
             self.conn = get_db_connection()
         return self.conn
     
+    @contextmanager
+    def _conexion(self):
+        """
+        Conexión para las consultas de un método.
+        
+        Dentro de un método de solo lectura se toma una conexión del pool que
+        corresponde a la sesión (una réplica apta o el primario) y se devuelve
+        al terminar el bloque. La instancia es compartida por todas las
+        sesiones, así que no guarda conexiones de lectura.
+        
+        Yields:
+            psycopg2.connection: Conexión a la base de datos
+        """
+        if modo_actual() == MODO_LECTURA:
+            with conexion_del_pool(pool_para_operacion()) as conn:
+                yield conn
+        else:
+            yield self._get_connection()
+    
     def _log_error(self, message):
         """
-        Registra un error de manera compatible con Streamlit y fuera de él.
+        Registra un error con el notificador de capa_datos/notificaciones.py.
         
         Args:
             message (str): Mensaje de error
         """
-        try:
-            st.error(message)
-        except:
-            print(f"ERROR: {message}")
+        notificaciones.error(message)
     
+    @solo_lectura
     def obtener_dashboard_principal(self):
         """
         Obtiene los datos principales para el dashboard.
@@ -63,40 +106,27 @@ class ReportsLogic:
             dict: Datos del dashboard principal
         """
         try:
-            # Estadísticas generales
-            stats_generales = get_estadisticas_generales_db(self._get_connection())
-            
-            # Estadísticas de clientes
-            stats_clientes = self.clientes_logic.obtener_estadisticas_clientes()
-            
-            # Estadísticas de canchas
-            stats_canchas = self.canchas_logic.obtener_estadisticas_canchas()
-            
-            # Estadísticas de reservas
-            stats_reservas = self.reservas_logic.obtener_estadisticas_reservas()
-            
-            # Estadísticas de pagos
-            stats_pagos = self.pagos_logic.obtener_estadisticas_generales_pagos()
+            lote = self._nuevo_lote()
+            # Estadísticas generales (en una conexión del pool)
+            lote.consulta('stats_generales', get_estadisticas_generales_db)
+            # Estadísticas de cada módulo (cada lógica abre su propia conexión)
+            lote.tarea('stats_clientes', self.clientes_logic.obtener_estadisticas_clientes)
+            lote.tarea('stats_canchas', self.canchas_logic.obtener_estadisticas_canchas)
+            lote.tarea('stats_reservas', self.reservas_logic.obtener_estadisticas_reservas)
+            lote.tarea('stats_pagos', self.pagos_logic.obtener_estadisticas_generales_pagos)
+            lote.tarea('reservas_recientes', self.reservas_logic.obtener_reservas, True)
+            lote.tarea('pagos_recientes', self.pagos_logic.obtener_pagos)
             
-            # Reservas recientes (últimas 5)
-            reservas_recientes = self.reservas_logic.obtener_reservas(solo_activas=True)[:5]
-            
-            # Pagos recientes (últimos 5)
-            pagos_recientes = self.pagos_logic.obtener_pagos()[:5]
-            
-            return {
-                'stats_generales': stats_generales,
-                'stats_clientes': stats_clientes,
-                'stats_canchas': stats_canchas,
-                'stats_reservas': stats_reservas,
-                'stats_pagos': stats_pagos,
-                'reservas_recientes': reservas_recientes,
-                'pagos_recientes': pagos_recientes
-            }
+            datos = lote.ejecutar()
+            # Reservas y pagos recientes (últimos 5)
+            datos['reservas_recientes'] = (datos['reservas_recientes'] or [])[:5]
+            datos['pagos_recientes'] = (datos['pagos_recientes'] or [])[:5]
+            return datos
         except Exception as e:
             self._log_error(f"Error al obtener datos del dashboard: {e}")
             return {}
     
+    @solo_lectura
     def obtener_vista_reservas_completas(self, fecha_inicio=None, fecha_fin=None, cliente_id=None, cancha_id=None):
         """
         Obtiene la vista de reservas completas con filtros.
@@ -111,11 +141,45 @@ class ReportsLogic:
             list: Lista de reservas completas
         """
         try:
-            return get_vista_reservas_completas_db(self._get_connection(), fecha_inicio, fecha_fin, cliente_id, cancha_id)
+            with self._conexion() as conn:
+                return get_vista_reservas_completas_db(conn, fecha_inicio, fecha_fin, cliente_id, cancha_id)
         except Exception as e:
             self._log_error(f"Error al obtener vista de reservas completas: {e}")
             return []
     
+    @solo_lectura
+    def exportar_reservas_completas_csv(self, archivo, fecha_inicio=None, fecha_fin=None, cliente_id=None,
+                                        cancha_id=None, limite=None, itersize=None, cancelar=None):
+        """
+        Escribe las reservas completas en un CSV leyéndolas por bloques.
+        
+        La memoria usada no depende de la cantidad de reservas.
+        
+        Args:
+            archivo: Archivo de texto abierto para escribir (newline='')
+            fecha_inicio (date): Fecha de inicio para filtrar
+            fecha_fin (date): Fecha de fin para filtrar
+            cliente_id (int): ID del cliente para filtrar
+            cancha_id (int): ID de la cancha para filtrar
+            limite (int): Máximo de reservas a exportar (opcional)
+            itersize (int): Filas por bloque (ver iter_query)
+            cancelar (threading.Event): Corta la exportación (ver iter_query)
+        
+        Returns:
+            int: Reservas escritas, o None si falla
+        """
+        try:
+            with self._conexion() as conn:
+                filas = iter_vista_reservas_completas_db(
+                    conn, fecha_inicio, fecha_fin, cliente_id, cancha_id,
+                    itersize=itersize, cancelar=cancelar
+                )
+                return escribir_filas_csv(archivo, filas, limite)
+        except Exception as e:
+            self._log_error(f"Error al exportar reservas completas: {e}")
+            return None
+    
+    @solo_lectura
     def obtener_vista_estadisticas_canchas(self, fecha_inicio=None, fecha_fin=None):
         """
         Obtiene la vista de estadísticas de canchas con filtros.
@@ -128,11 +192,13 @@ class ReportsLogic:
             list: Lista de estadísticas de canchas
         """
         try:
-            return get_vista_estadisticas_canchas_db(self._get_connection(), fecha_inicio, fecha_fin)
+            with self._conexion() as conn:
+                return get_vista_estadisticas_canchas_db(conn, fecha_inicio, fecha_fin)
         except Exception as e:
             self._log_error(f"Error al obtener vista de estadísticas de canchas: {e}")
             return []
     
+    @solo_lectura
     def obtener_estadisticas_mensuales(self, año=None):
         """
         Obtiene estadísticas mensuales.
@@ -144,11 +210,13 @@ class ReportsLogic:
             list: Estadísticas mensuales
         """
         try:
-            return get_estadisticas_mensuales_db(self._get_connection(), año)
+            with self._conexion() as conn:
+                return get_estadisticas_mensuales_db(conn, año)
         except Exception as e:
             self._log_error(f"Error al obtener estadísticas mensuales: {e}")
             return []
     
+    @solo_lectura
     def obtener_estadisticas_semanales(self, fecha_inicio=None, fecha_fin=None):
         """
         Obtiene estadísticas semanales.
@@ -161,11 +229,13 @@ class ReportsLogic:
             list: Estadísticas semanales
         """
         try:
-            return get_estadisticas_semanales_db(self._get_connection(), fecha_inicio, fecha_fin)
+            with self._conexion() as conn:
+                return get_estadisticas_semanales_db(conn, fecha_inicio, fecha_fin)
         except Exception as e:
             self._log_error(f"Error al obtener estadísticas semanales: {e}")
             return []
     
+    @solo_lectura
     def obtener_top_clientes(self, fecha_inicio=None, fecha_fin=None, limit=10):
         """
         Obtiene los clientes con más reservas.
@@ -179,11 +249,13 @@ class ReportsLogic:
             list: Top clientes
         """
         try:
-            return get_top_clientes_db(self._get_connection(), fecha_inicio, fecha_fin, limit)
+            with self._conexion() as conn:
+                return get_top_clientes_db(conn, fecha_inicio, fecha_fin, limit)
         except Exception as e:
             self._log_error(f"Error al obtener top clientes: {e}")
             return []
     
+    @solo_lectura
     def obtener_top_canchas(self, fecha_inicio=None, fecha_fin=None, limit=10):
         """
         Obtiene las canchas más utilizadas.
@@ -197,11 +269,13 @@ class ReportsLogic:
             list: Top canchas
         """
         try:
-            return get_top_canchas_db(self._get_connection(), fecha_inicio, fecha_fin, limit)
+            with self._conexion() as conn:
+                return get_top_canchas_db(conn, fecha_inicio, fecha_fin, limit)
         except Exception as e:
             self._log_error(f"Error al obtener top canchas: {e}")
             return []
     
+    @solo_lectura
     def obtener_estadisticas_horarios(self, fecha_inicio=None, fecha_fin=None):
         """
         Obtiene estadísticas por horarios.
@@ -214,11 +288,13 @@ class ReportsLogic:
             list: Estadísticas por horarios
         """
         try:
-            return get_estadisticas_horarios_db(self._get_connection(), fecha_inicio, fecha_fin)
+            with self._conexion() as conn:
+                return get_estadisticas_horarios_db(conn, fecha_inicio, fecha_fin)
         except Exception as e:
             self._log_error(f"Error al obtener estadísticas por horarios: {e}")
             return []
     
+    @solo_lectura
     def obtener_estadisticas_dias_semana(self, fecha_inicio=None, fecha_fin=None):
         """
         Obtiene estadísticas por días de la semana.
@@ -231,11 +307,13 @@ class ReportsLogic:
             list: Estadísticas por días de la semana
         """
         try:
-            return get_estadisticas_dias_semana_db(self._get_connection(), fecha_inicio, fecha_fin)
+            with self._conexion() as conn:
+                return get_estadisticas_dias_semana_db(conn, fecha_inicio, fecha_fin)
         except Exception as e:
             self._log_error(f"Error al obtener estadísticas por días de la semana: {e}")
             return []
     
+    @solo_lectura
     def obtener_canchas_mas_usadas(self, fecha_inicio=None, fecha_fin=None, limit=10):
         """
         Obtiene las canchas más utilizadas ordenadas de forma descendente.
@@ -249,11 +327,13 @@ class ReportsLogic:
             list: Lista de canchas más utilizadas
         """
         try:
-            return get_canchas_mas_usadas_db(self._get_connection(), fecha_inicio, fecha_fin, limit)
+            with self._conexion() as conn:
+                return get_canchas_mas_usadas_db(conn, fecha_inicio, fecha_fin, limit)
         except Exception as e:
             self._log_error(f"Error al obtener canchas más utilizadas: {e}")
             return []
     
+    @solo_lectura
     def obtener_canchas_mas_recaudan(self, fecha_inicio=None, fecha_fin=None, limit=10):
         """
         Obtiene las canchas que más dinero recaudan ordenadas de forma descendente.
@@ -267,11 +347,36 @@ class ReportsLogic:
             list: Lista de canchas que más recaudan
         """
         try:
-            return get_canchas_mas_recaudan_db(self._get_connection(), fecha_inicio, fecha_fin, limit)
+            with self._conexion() as conn:
+                return get_canchas_mas_recaudan_db(conn, fecha_inicio, fecha_fin, limit)
         except Exception as e:
             self._log_error(f"Error al obtener canchas que más recaudan: {e}")
             return []
     
+    @solo_lectura
+    def obtener_reporte_canchas(self, fecha_inicio=None, fecha_fin=None, limit=10):
+        """
+        Obtiene en paralelo las canchas más utilizadas y las que más recaudan.
+        
+        Args:
+            fecha_inicio (date): Fecha de inicio para filtrar
+            fecha_fin (date): Fecha de fin para filtrar
+            limit (int): Límite de canchas a retornar en cada lista
+        
+        Returns:
+            tuple: (canchas más utilizadas, canchas que más recaudan)
+        """
+        try:
+            lote = self._nuevo_lote()
+            lote.consulta('mas_usadas', get_canchas_mas_usadas_db, fecha_inicio, fecha_fin, limit)
+            lote.consulta('mas_recaudan', get_canchas_mas_recaudan_db, fecha_inicio, fecha_fin, limit)
+            resultados = lote.ejecutar()
+            return resultados['mas_usadas'], resultados['mas_recaudan']
+        except Exception as e:
+            self._log_error(f"Error al obtener el reporte de canchas: {e}")
+            return [], []
+    
+    @lectura_escritura
     def generar_estadisticas_procedimiento(self, fecha_inicio=None, fecha_fin=None, tipo_reporte='mensual'):
         """
         Genera estadísticas usando el procedimiento almacenado.
@@ -290,5 +395,5 @@ class ReportsLogic:
             self._log_error(f"Error al generar estadísticas: {e}")
             return False
 
-# Instancia global de la lógica de reportes
-reports_logic = ReportsLogic() 
\ No newline at end of file
+# Instancia global de la lógica de reportes (se crea al primer uso)
+__getattr__ = instancias_diferidas(__name__, {'reports_logic': ReportsLogic})
\ No newline at end of file
@@ -0,0 +1,140 @@
+from capa_datos.data_access_async import conexion_async, ejecutar_pipeline_async
+from logica_negocio.reservas_logic import (
+    ReservasLogic, SQL_RESERVAS, SQL_RESERVAS_ACTIVAS, SQL_RESERVA_POR_ID,
+    SQL_RESERVAS_PAGINADAS, SQL_TOTAL_RESERVAS, SQL_CONFLICTOS_HORARIO,
+    SQL_ESTADISTICAS_RESERVAS
+)
+from utils.carga_diferida import instancias_diferidas
+
+class ReservasAsyncLogic:
+    """
+    Versión asíncrona de las lecturas más usadas de ReservasLogic.
+    
+    Usa las mismas consultas y validaciones que la versión síncrona; está
+    pensada para un servidor de API o trabajos por lotes que atienden muchas
+    peticiones concurrentes en un solo proceso.
+    """
+    
+    def __init__(self):
+        self.reservas_logic = ReservasLogic()
+    
+    def _log_error(self, message):
+        """
+        Registra un error de manera compatible con Streamlit y fuera de él.
+        
+        Args:
+            message (str): Mensaje de error
+        """
+        self.reservas_logic._log_error(message)
+    
+    async def obtener_reservas_async(self, solo_activas=False):
+        """
+        Obtiene todas las reservas.
+        
+        Args:
+            solo_activas (bool): Si solo obtener reservas activas
+        
+        Returns:
+            list: Lista de reservas
+        """
+        try:
+            async with conexion_async() as conn:
+                cur = await conn.execute(SQL_RESERVAS_ACTIVAS if solo_activas else SQL_RESERVAS)
+                return await cur.fetchall()
+        except Exception as error:
+            self._log_error(f"Error al obtener reservas: {error}")
+            return []
+    
+    async def obtener_reserva_por_id_async(self, reserva_id):
+        """
+        Obtiene una reserva por su ID.
+        
+        Args:
+            reserva_id (int): ID de la reserva
+        
+        Returns:
+            tuple: Datos de la reserva o None
+        """
+        try:
+            async with conexion_async() as conn:
+                cur = await conn.execute(SQL_RESERVA_POR_ID, (reserva_id,))
+                return await cur.fetchone()
+        except Exception as error:
+            self._log_error(f"Error al obtener reserva: {error}")
+            return None
+    
+    async def verificar_disponibilidad_async(self, cancha_id, fecha, hora_inicio, hora_fin, reserva_id_excluir=None):
+        """
+        Verifica si una cancha está disponible en un horario específico.
+        
+        Args:
+            cancha_id (int): ID de la cancha
+            fecha (date): Fecha de la reserva
+            hora_inicio (time): Hora de inicio
+            hora_fin (time): Hora de fin
+            reserva_id_excluir (int): ID de reserva a excluir (para actualizaciones)
+        
+        Returns:
+            bool: True si está disponible
+        """
+        try:
+            async with conexion_async() as conn:
+                cur = await conn.execute(SQL_CONFLICTOS_HORARIO, self.reservas_logic._parametros_conflictos(
+                    cancha_id, fecha, hora_inicio, hora_fin, reserva_id_excluir
+                ))
+                count = (await cur.fetchone())[0]
+                return count == 0
+        except Exception as error:
+            self._log_error(f"Error al verificar disponibilidad: {error}")
+            return False
+    
+    async def obtener_estadisticas_reservas_async(self, fecha_inicio=None, fecha_fin=None):
+        """
+        Obtiene estadísticas de reservas.
+        
+        Args:
+            fecha_inicio (date): Fecha de inicio del período
+            fecha_fin (date): Fecha de fin del período
+        
+        Returns:
+            dict: Estadísticas de reservas
+        """
+        try:
+            async with conexion_async() as conn:
+                cur = await conn.execute(
+                    SQL_ESTADISTICAS_RESERVAS,
+                    self.reservas_logic._parametros_rango(fecha_inicio, fecha_fin)
+                )
+                return self.reservas_logic._formatear_estadisticas(await cur.fetchone())
+        except Exception as error:
+            self._log_error(f"Error al obtener estadísticas de reservas: {error}")
+            return {}
+    
+    async def obtener_reservas_paginadas_async(self, pagina=1, registros_por_pagina=10):
+        """
+        Obtiene reservas con paginación.
+        
+        La página y el total se envían juntos en modo pipeline (un solo viaje
+        de red).
+        
+        Args:
+            pagina (int): Número de página
+            registros_por_pagina (int): Registros por página
+        
+        Returns:
+            tuple: (reservas, total_registros)
+        """
+        try:
+            offset = (pagina - 1) * registros_por_pagina
+            async with conexion_async() as conn:
+                reservas, total = await ejecutar_pipeline_async(conn, [
+                    (SQL_RESERVAS_PAGINADAS, (registros_por_pagina, offset)),
+                    (SQL_TOTAL_RESERVAS, None)
+                ])
+                return reservas, total[0][0]
+        except Exception as error:
+            self._log_error(f"Error al obtener reservas paginadas: {error}")
+            return [], 0
+
+# Instancia global de la lógica de reservas asíncrona (se crea al primer uso)
+__getattr__ = instancias_diferidas(__name__, {'reservas_async_logic': ReservasAsyncLogic})
\ No newline at end of file
@@ -1,7 +1,68 @@
-import streamlit as st
+from capa_datos import notificaciones
 import psycopg2
 from datetime import datetime, date, timedelta
-from capa_datos.database_connection import get_db_connection
+from capa_datos.database_connection import get_db_connection, solo_lectura, lectura_escritura
+from capa_datos.reintentos import ejecutar_con_reintentos
+
+# Consultas de lectura compartidas con ReservasAsyncLogic
+SELECT_RESERVAS = """
+    SELECT r.id, r.cliente_id, r.cancha_id, r.fecha_reserva, r.hora_inicio,
+           r.hora_fin, r.duracion, r.observaciones, r.estado,
+           r.fecha_creacion, r.fecha_actualizacion,
+           c.nombre as nombre_cliente, c.apellido as apellido_cliente,
+           ca.nombre as nombre_cancha
+    FROM reservas r
+    JOIN clientes c ON r.cliente_id = c.id
+    JOIN canchas ca ON r.cancha_id = ca.id
+"""
+
+SQL_RESERVAS = SELECT_RESERVAS + """
+    ORDER BY r.fecha_reserva DESC, r.hora_inicio DESC
+"""
+
+SQL_RESERVAS_ACTIVAS = SELECT_RESERVAS + """
+    WHERE r.estado IN ('pendiente', 'confirmada')
+    ORDER BY r.fecha_reserva DESC, r.hora_inicio DESC
+"""
+
+SQL_RESERVA_POR_ID = SELECT_RESERVAS + """
+    WHERE r.id = %s
+"""
+
+SQL_RESERVAS_PAGINADAS = SELECT_RESERVAS + """
+    ORDER BY r.fecha_reserva DESC, r.hora_inicio DESC
+    LIMIT %s OFFSET %s
+"""
+
+SQL_TOTAL_RESERVAS = "SELECT COUNT(*) FROM reservas"
+
+# Cuenta las reservas activas que se solapan con el horario pedido; el último
+# parámetro es el ID de una reserva a excluir (o NULL)
+SQL_CONFLICTOS_HORARIO = """
+    SELECT COUNT(*) FROM reservas 
+    WHERE cancha_id = %s 
+    AND fecha_reserva = %s 
+    AND estado IN ('pendiente', 'confirmada')
+    AND (
+        (hora_inicio < %s AND hora_fin > %s) OR
+        (hora_inicio < %s AND hora_fin > %s) OR
+        (hora_inicio >= %s AND hora_fin <= %s)
+    )
+    AND (%s::integer IS NULL OR id != %s)
+"""
+
+SQL_ESTADISTICAS_RESERVAS = """
+    SELECT 
+        COUNT(*) as total_reservas,
+        COUNT(CASE WHEN estado = 'confirmada' THEN 1 END) as reservas_confirmadas,
+        COUNT(CASE WHEN estado = 'pendiente' THEN 1 END) as reservas_pendientes,
+        COUNT(CASE WHEN estado = 'cancelada' THEN 1 END) as reservas_canceladas,
+        COUNT(CASE WHEN estado = 'completada' THEN 1 END) as reservas_completadas,
+        AVG(duracion) as duracion_promedio,
+        SUM(duracion) as duracion_total
+    FROM reservas
+    WHERE (%s::date IS NULL OR fecha_reserva BETWEEN %s::date AND %s::date)
+"""
 
 class ReservasLogic:
     """
@@ -17,15 +78,12 @@ class ReservasLogic:
     
     def _log_error(self, message):
         """
-        Registra un error de manera compatible con Streamlit y fuera de él.
+        Registra un error con el notificador de capa_datos/notificaciones.py.
         
         Args:
             message (str): Mensaje de error
         """
-        try:
-            st.error(message)
-        except:
-            print(f"ERROR: {message}")
+        notificaciones.error(message)
     
     def validar_fecha_reserva(self, fecha_reserva):
         """
@@ -97,6 +155,7 @@ class ReservasLogic:
         """
         return estado in self.estados_reserva
     
+    @lectura_escritura
     def crear_reserva(self, cliente_id, cancha_id, fecha_reserva, hora_inicio, hora_fin, observaciones=None):
         """
         Crea una nueva reserva usando el procedimiento almacenado.
@@ -108,11 +167,30 @@ class ReservasLogic:
             hora_inicio (time): Hora de inicio
             hora_fin (time): Hora de fin
             observaciones (str, optional): Observaciones de la reserva
-            
+        
         Returns:
             int or None: ID de la reserva creada o None si falla
         """
-        conn = None
+        def crear(conn):
+            with conn.cursor() as cur:
+                # Llamada directa al procedimiento almacenado proc_gestionar_reserva
+                cur.execute("""
+                    CALL proc_gestionar_reserva('CREATE', NULL, %s, %s, %s, %s, %s, %s, %s)
+                """, (cliente_id, cancha_id, fecha_reserva, hora_inicio, hora_fin, observaciones or '', 'pendiente'))
+                
+                # Obtener el ID de la reserva creada
+                cur.execute("""
+                    SELECT id FROM reservas 
+                    WHERE cliente_id = %s AND cancha_id = %s 
+                    ORDER BY fecha_creacion DESC LIMIT 1
+                """, (cliente_id, cancha_id))
+                
+                resultado = cur.fetchone()
+            if not resultado:
+                # Sale de la unidad de trabajo con rollback
+                raise psycopg2.DataError("No se encontró la reserva creada")
+            return resultado[0]
+        
         try:
             # Validaciones
             if not self.validar_fecha_reserva(fecha_reserva):
@@ -123,51 +201,22 @@ class ReservasLogic:
                 self._log_error("Horario no válido")
                 return None
             
-            conn = get_db_connection()
-            if not conn:
-                return None
-            
-            cur = conn.cursor()
-            
-            # Llamada directa al procedimiento almacenado proc_gestionar_reserva
-            cur.execute("""
-                CALL proc_gestionar_reserva('CREATE', NULL, %s, %s, %s, %s, %s, %s, %s)
-            """, (cliente_id, cancha_id, fecha_reserva, hora_inicio, hora_fin, observaciones or '', 'pendiente'))
-            
-            # Obtener el ID de la reserva creada
-            cur.execute("""
-                SELECT id FROM reservas 
-                WHERE cliente_id = %s AND cancha_id = %s 
-                ORDER BY fecha_creacion DESC LIMIT 1
-            """, (cliente_id, cancha_id))
-            
-            resultado = cur.fetchone()
-            if resultado:
-                reserva_id = resultado[0]
-                conn.commit()
-                cur.close()
-                return reserva_id
-            else:
-                conn.rollback()
-                cur.close()
-                return None
-            
+            # SERIALIZABLE: dos reservas simultáneas del mismo horario no pueden
+            # confirmarse ambas; la que pierde se reintenta y ve el conflicto
+            return ejecutar_con_reintentos(crear, serializable=True)
+        
         except (Exception, psycopg2.DatabaseError) as error:
-            if conn:
-                conn.rollback()
             self._log_error(f"Error al crear reserva: {error}")
             return None
-        finally:
-            if conn:
-                conn.close()
     
+    @solo_lectura
     def obtener_reservas(self, solo_activas=False):
         """
         Obtiene todas las reservas.
         
         Args:
             solo_activas (bool): Si True, solo obtiene reservas activas
-            
+        
         Returns:
             list: Lista de reservas
         """
@@ -179,39 +228,14 @@ class ReservasLogic:
             
             cur = conn.cursor()
             
-            if solo_activas:
-                # Consulta SQL directa para reservas activas
-                cur.execute("""
-                    SELECT r.id, r.cliente_id, r.cancha_id, r.fecha_reserva, r.hora_inicio,
-                           r.hora_fin, r.duracion, r.observaciones, r.estado,
-                           r.fecha_creacion, r.fecha_actualizacion,
-                           c.nombre as nombre_cliente, c.apellido as apellido_cliente,
-                           ca.nombre as nombre_cancha
-                    FROM reservas r
-                    JOIN clientes c ON r.cliente_id = c.id
-                    JOIN canchas ca ON r.cancha_id = ca.id
-                    WHERE r.estado IN ('pendiente', 'confirmada')
-                    ORDER BY r.fecha_reserva DESC, r.hora_inicio DESC
-                """)
-            else:
-                # Consulta SQL directa para todas las reservas
-                cur.execute("""
-                    SELECT r.id, r.cliente_id, r.cancha_id, r.fecha_reserva, r.hora_inicio,
-                           r.hora_fin, r.duracion, r.observaciones, r.estado,
-                           r.fecha_creacion, r.fecha_actualizacion,
-                           c.nombre as nombre_cliente, c.apellido as apellido_cliente,
-                           ca.nombre as nombre_cancha
-                    FROM reservas r
-                    JOIN clientes c ON r.cliente_id = c.id
-                    JOIN canchas ca ON r.cancha_id = ca.id
-                    ORDER BY r.fecha_reserva DESC, r.hora_inicio DESC
-                """)
+            # Consulta SQL directa (activas o todas)
+            cur.execute(SQL_RESERVAS_ACTIVAS if solo_activas else SQL_RESERVAS)
             
             reservas = cur.fetchall()
             cur.close()
             
             return reservas
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener reservas: {error}")
             return []
@@ -219,13 +243,14 @@ class ReservasLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_reserva_por_id(self, reserva_id):
         """
         Obtiene una reserva específica por su ID.
         
         Args:
             reserva_id (int): ID de la reserva
-            
+        
         Returns:
             tuple or None: Datos de la reserva o None si no se encuentra
         """
@@ -238,23 +263,13 @@ class ReservasLogic:
             cur = conn.cursor()
             
             # Consulta SQL directa para obtener reserva por ID
-            cur.execute("""
-                SELECT r.id, r.cliente_id, r.cancha_id, r.fecha_reserva, r.hora_inicio,
-                       r.hora_fin, r.duracion, r.observaciones, r.estado,
-                       r.fecha_creacion, r.fecha_actualizacion,
-                       c.nombre as nombre_cliente, c.apellido as apellido_cliente,
-                       ca.nombre as nombre_cancha
-                FROM reservas r
-                JOIN clientes c ON r.cliente_id = c.id
-                JOIN canchas ca ON r.cancha_id = ca.id
-                WHERE r.id = %s
-            """, (reserva_id,))
+            cur.execute(SQL_RESERVA_POR_ID, (reserva_id,))
             
             reserva = cur.fetchone()
             cur.close()
             
             return reserva
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener reserva por ID: {error}")
             return None
@@ -262,6 +277,7 @@ class ReservasLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def actualizar_reserva(self, reserva_id, cliente_id, cancha_id, fecha_reserva, hora_inicio, hora_fin, observaciones=None, estado='pendiente'):
         """
         Actualiza una reserva existente.
@@ -275,7 +291,7 @@ class ReservasLogic:
             hora_fin (time): Hora de fin
             observaciones (str, optional): Observaciones
             estado (str): Estado de la reserva
-            
+        
         Returns:
             bool: True si se actualizó correctamente, False en caso contrario
         """
@@ -314,7 +330,7 @@ class ReservasLogic:
             cur.close()
             
             return True
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -324,6 +340,7 @@ class ReservasLogic:
             if conn:
                 conn.close()
     
+    @lectura_escritura
     def cancelar_reserva(self, reserva_id, cliente_id, cancha_id, fecha_reserva, hora_inicio, hora_fin):
         """
         Cancela una reserva.
@@ -335,7 +352,7 @@ class ReservasLogic:
             fecha_reserva (date): Fecha de la reserva
             hora_inicio (time): Hora de inicio
             hora_fin (time): Hora de fin
-            
+        
         Returns:
             bool: True si se canceló correctamente, False en caso contrario
         """
@@ -356,7 +373,7 @@ class ReservasLogic:
             cur.close()
             
             return True
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             if conn:
                 conn.rollback()
@@ -376,7 +393,7 @@ class ReservasLogic:
             hora_inicio (time): Hora de inicio
             hora_fin (time): Hora de fin
             reserva_id_excluir (int, optional): ID de reserva a excluir (para actualizaciones)
-            
+        
         Returns:
             bool: True si está disponible, False en caso contrario
         """
@@ -388,39 +405,16 @@ class ReservasLogic:
             
             cur = conn.cursor()
             
-            if reserva_id_excluir:
-                # Consulta SQL directa excluyendo una reserva específica
-                cur.execute("""
-                    SELECT COUNT(*) FROM reservas 
-                    WHERE cancha_id = %s 
-                    AND fecha_reserva = %s 
-                    AND estado IN ('pendiente', 'confirmada')
-                    AND id != %s
-                    AND (
-                        (hora_inicio < %s AND hora_fin > %s) OR
-                        (hora_inicio < %s AND hora_fin > %s) OR
-                        (hora_inicio >= %s AND hora_fin <= %s)
-                    )
-                """, (cancha_id, fecha, reserva_id_excluir, hora_fin, hora_inicio, hora_fin, hora_inicio, hora_inicio, hora_fin))
-            else:
-                # Consulta SQL directa para verificar disponibilidad
-                cur.execute("""
-                    SELECT COUNT(*) FROM reservas 
-                    WHERE cancha_id = %s 
-                    AND fecha_reserva = %s 
-                    AND estado IN ('pendiente', 'confirmada')
-                    AND (
-                        (hora_inicio < %s AND hora_fin > %s) OR
-                        (hora_inicio < %s AND hora_fin > %s) OR
-                        (hora_inicio >= %s AND hora_fin <= %s)
-                    )
-                """, (cancha_id, fecha, hora_fin, hora_inicio, hora_fin, hora_inicio, hora_inicio, hora_fin))
+            # Consulta SQL directa (excluyendo opcionalmente una reserva)
+            cur.execute(SQL_CONFLICTOS_HORARIO, self._parametros_conflictos(
+                cancha_id, fecha, hora_inicio, hora_fin, reserva_id_excluir
+            ))
             
             count = cur.fetchone()[0]
             cur.close()
             
             return count == 0
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al verificar disponibilidad: {error}")
             return False
@@ -428,6 +422,48 @@ class ReservasLogic:
             if conn:
                 conn.close()
     
+    def _parametros_conflictos(self, cancha_id, fecha, hora_inicio, hora_fin, reserva_id_excluir=None):
+        """
+        Arma los parámetros de SQL_CONFLICTOS_HORARIO.
+        
+        Returns:
+            tuple: Parámetros de la consulta
+        """
+        return (cancha_id, fecha, hora_fin, hora_inicio, hora_fin, hora_inicio, hora_inicio, hora_fin,
+                reserva_id_excluir, reserva_id_excluir)
+    
+    def _parametros_rango(self, fecha_inicio=None, fecha_fin=None):
+        """
+        Arma los parámetros de SQL_ESTADISTICAS_RESERVAS (sin filtro si falta una fecha).
+        
+        Returns:
+            tuple: Parámetros de la consulta
+        """
+        if not (fecha_inicio and fecha_fin):
+            fecha_inicio = fecha_fin = None
+        return (fecha_inicio, fecha_inicio, fecha_fin)
+    
+    def _formatear_estadisticas(self, stats):
+        """
+        Convierte la fila de SQL_ESTADISTICAS_RESERVAS en un diccionario.
+        
+        Args:
+            stats (tuple): Fila de la consulta
+        
+        Returns:
+            dict: Estadísticas de reservas
+        """
+        return {
+            'total_reservas': stats[0],
+            'reservas_confirmadas': stats[1],
+            'reservas_pendientes': stats[2],
+            'reservas_canceladas': stats[3],
+            'reservas_completadas': stats[4],
+            'duracion_promedio': float(stats[5]) if stats[5] else 0,
+            'duracion_total': float(stats[6]) if stats[6] else 0
+        }
+    
+    @solo_lectura
     def obtener_estadisticas_reservas(self, fecha_inicio=None, fecha_fin=None):
         """
         Obtiene estadísticas de reservas.
@@ -435,7 +471,7 @@ class ReservasLogic:
         Args:
             fecha_inicio (date, optional): Fecha de inicio para el filtro
             fecha_fin (date, optional): Fecha de fin para el filtro
-            
+        
         Returns:
             dict: Estadísticas de reservas
         """
@@ -447,47 +483,14 @@ class ReservasLogic:
             
             cur = conn.cursor()
             
-            if fecha_inicio and fecha_fin:
-                # Consulta SQL directa con filtro de fechas
-                cur.execute("""
-                    SELECT 
-                        COUNT(*) as total_reservas,
-                        COUNT(CASE WHEN estado = 'confirmada' THEN 1 END) as reservas_confirmadas,
-                        COUNT(CASE WHEN estado = 'pendiente' THEN 1 END) as reservas_pendientes,
-                        COUNT(CASE WHEN estado = 'cancelada' THEN 1 END) as reservas_canceladas,
-                        COUNT(CASE WHEN estado = 'completada' THEN 1 END) as reservas_completadas,
-                        AVG(duracion) as duracion_promedio,
-                        SUM(duracion) as duracion_total
-                    FROM reservas
-                    WHERE fecha_reserva BETWEEN %s AND %s
-                """, (fecha_inicio, fecha_fin))
-            else:
-                # Consulta SQL directa sin filtro de fechas
-                cur.execute("""
-                    SELECT 
-                        COUNT(*) as total_reservas,
-                        COUNT(CASE WHEN estado = 'confirmada' THEN 1 END) as reservas_confirmadas,
-                        COUNT(CASE WHEN estado = 'pendiente' THEN 1 END) as reservas_pendientes,
-                        COUNT(CASE WHEN estado = 'cancelada' THEN 1 END) as reservas_canceladas,
-                        COUNT(CASE WHEN estado = 'completada' THEN 1 END) as reservas_completadas,
-                        AVG(duracion) as duracion_promedio,
-                        SUM(duracion) as duracion_total
-                    FROM reservas
-                """)
+            # Consulta SQL directa (con filtro de fechas solo si vienen ambas)
+            cur.execute(SQL_ESTADISTICAS_RESERVAS, self._parametros_rango(fecha_inicio, fecha_fin))
             
             stats = cur.fetchone()
             cur.close()
             
-            return {
-                'total_reservas': stats[0],
-                'reservas_confirmadas': stats[1],
-                'reservas_pendientes': stats[2],
-                'reservas_canceladas': stats[3],
-                'reservas_completadas': stats[4],
-                'duracion_promedio': float(stats[5]) if stats[5] else 0,
-                'duracion_total': float(stats[6]) if stats[6] else 0
-            }
-            
+            return self._formatear_estadisticas(stats)
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener estadísticas de reservas: {error}")
             return {}
@@ -495,6 +498,7 @@ class ReservasLogic:
             if conn:
                 conn.close()
     
+    @solo_lectura
     def obtener_reservas_paginadas(self, pagina=1, registros_por_pagina=10):
         """
         Obtiene reservas con paginación.
@@ -502,7 +506,7 @@ class ReservasLogic:
         Args:
             pagina (int): Número de página
             registros_por_pagina (int): Registros por página
-            
+        
         Returns:
             tuple: (reservas, total_registros)
         """
@@ -518,29 +522,18 @@ class ReservasLogic:
             offset = (pagina - 1) * registros_por_pagina
             
             # Consulta SQL directa con paginación
-            cur.execute("""
-                SELECT r.id, r.cliente_id, r.cancha_id, r.fecha_reserva, r.hora_inicio,
-                       r.hora_fin, r.duracion, r.observaciones, r.estado,
-                       r.fecha_creacion, r.fecha_actualizacion,
-                       c.nombre as nombre_cliente, c.apellido as apellido_cliente,
-                       ca.nombre as nombre_cancha
-                FROM reservas r
-                JOIN clientes c ON r.cliente_id = c.id
-                JOIN canchas ca ON r.cancha_id = ca.id
-                ORDER BY r.fecha_reserva DESC, r.hora_inicio DESC
-                LIMIT %s OFFSET %s
-            """, (registros_por_pagina, offset))
+            cur.execute(SQL_RESERVAS_PAGINADAS, (registros_por_pagina, offset))
             
             reservas = cur.fetchall()
             
             # Obtener total de registros
-            cur.execute("SELECT COUNT(*) FROM reservas")
+            cur.execute(SQL_TOTAL_RESERVAS)
             total_registros = cur.fetchone()[0]
             
             cur.close()
             
             return reservas, total_registros
-            
+        
         except (Exception, psycopg2.DatabaseError) as error:
             self._log_error(f"Error al obtener reservas paginadas: {error}")
             return [], 0
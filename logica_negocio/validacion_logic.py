@@ -1,4 +1,4 @@
-import streamlit as st
+from capa_datos import notificaciones
 from capa_datos.validacion_data import (
     validar_datos_db,
     limpiar_datos_db,
@@ -8,6 +8,7 @@ from capa_datos.validacion_data import (
     crear_backup_todas_las_tablas_db
 )
 from capa_datos.database_connection import get_db_connection
+from utils.carga_diferida import instancias_diferidas
 
 class ValidacionLogic:
     """
@@ -31,15 +32,12 @@ class ValidacionLogic:
     
     def _log_error(self, message):
         """
-        Registra un error de manera compatible con Streamlit y fuera de él.
+        Registra un error con el notificador de capa_datos/notificaciones.py.
         
         Args:
             message (str): Mensaje de error
         """
-        try:
-            st.error(message)
-        except:
-            print(f"ERROR: {message}")
+        notificaciones.error(message)
     
     def validar_tabla(self, tabla):
         """
@@ -62,7 +60,7 @@ class ValidacionLogic:
                 return False
             
             return validar_datos_db(conn, tabla)
-            
+        
         except Exception as e:
             self._log_error(f"Error al validar tabla {tabla}: {e}")
             return False
@@ -83,8 +81,8 @@ class ValidacionLogic:
                 return False
             
             # Confirmar antes de limpiar
-            if not st.session_state.get('confirmar_limpieza', False):
-                st.warning("⚠️ La limpieza de datos es irreversible. Confirme la acción.")
+            if not notificaciones.estado_sesion().get('confirmar_limpieza', False):
+                notificaciones.advertencia("⚠️ La limpieza de datos es irreversible. Confirme la acción.")
                 return False
             
             conn = self._get_connection()
@@ -93,7 +91,7 @@ class ValidacionLogic:
                 return False
             
             return limpiar_datos_db(conn, tabla)
-            
+        
         except Exception as e:
             self._log_error(f"Error al limpiar tabla {tabla}: {e}")
             return False
@@ -119,7 +117,7 @@ class ValidacionLogic:
                 return False
             
             return crear_backup_db(conn, tabla)
-            
+        
         except Exception as e:
             self._log_error(f"Error al crear backup de tabla {tabla}: {e}")
             return False
@@ -137,17 +135,17 @@ class ValidacionLogic:
                 self._log_error("No hay conexión a la base de datos")
                 return {}
             
-            st.info("🔄 Iniciando validación de todas las tablas...")
+            notificaciones.info("🔄 Iniciando validación de todas las tablas...")
             resultados = validar_todas_las_tablas_db(conn)
             
             # Mostrar resumen
             exitosas = sum(1 for resultado in resultados.values() if resultado)
             total = len(resultados)
             
-            st.success(f"✅ Validación completada: {exitosas}/{total} tablas validadas correctamente")
+            notificaciones.exito(f"✅ Validación completada: {exitosas}/{total} tablas validadas correctamente")
             
             return resultados
-            
+        
         except Exception as e:
             self._log_error(f"Error al validar todas las tablas: {e}")
             return {}
@@ -161,8 +159,8 @@ class ValidacionLogic:
         """
         try:
             # Confirmar antes de limpiar todo
-            if not st.session_state.get('confirmar_limpieza_total', False):
-                st.warning("⚠️ La limpieza de todas las tablas es irreversible. Confirme la acción.")
+            if not notificaciones.estado_sesion().get('confirmar_limpieza_total', False):
+                notificaciones.advertencia("⚠️ La limpieza de todas las tablas es irreversible. Confirme la acción.")
                 return {}
             
             conn = self._get_connection()
@@ -170,17 +168,17 @@ class ValidacionLogic:
                 self._log_error("No hay conexión a la base de datos")
                 return {}
             
-            st.info("🔄 Iniciando limpieza de todas las tablas...")
+            notificaciones.info("🔄 Iniciando limpieza de todas las tablas...")
             resultados = limpiar_todas_las_tablas_db(conn)
             
             # Mostrar resumen
             exitosas = sum(1 for resultado in resultados.values() if resultado)
             total = len(resultados)
             
-            st.success(f"✅ Limpieza completada: {exitosas}/{total} tablas limpiadas correctamente")
+            notificaciones.exito(f"✅ Limpieza completada: {exitosas}/{total} tablas limpiadas correctamente")
             
             return resultados
-            
+        
         except Exception as e:
             self._log_error(f"Error al limpiar todas las tablas: {e}")
             return {}
@@ -198,17 +196,17 @@ class ValidacionLogic:
                 self._log_error("No hay conexión a la base de datos")
                 return {}
             
-            st.info("🔄 Iniciando backup de todas las tablas...")
+            notificaciones.info("🔄 Iniciando backup de todas las tablas...")
             resultados = crear_backup_todas_las_tablas_db(conn)
             
             # Mostrar resumen
             exitosas = sum(1 for resultado in resultados.values() if resultado)
             total = len(resultados)
             
-            st.success(f"✅ Backup completado: {exitosas}/{total} tablas respaldadas correctamente")
+            notificaciones.exito(f"✅ Backup completado: {exitosas}/{total} tablas respaldadas correctamente")
             
             return resultados
-            
+        
         except Exception as e:
             self._log_error(f"Error al crear backup de todas las tablas: {e}")
             return {}
@@ -221,19 +219,20 @@ class ValidacionLogic:
             dict: Estadísticas de validación
         """
         try:
+            estado = notificaciones.estado_sesion()
             estadisticas = {
                 'total_tablas': len(self.tablas_disponibles),
                 'tablas_disponibles': self.tablas_disponibles,
-                'ultima_validacion': st.session_state.get('ultima_validacion', 'Nunca'),
-                'ultima_limpieza': st.session_state.get('ultima_limpieza', 'Nunca'),
-                'ultimo_backup': st.session_state.get('ultimo_backup', 'Nunca')
+                'ultima_validacion': estado.get('ultima_validacion', 'Nunca'),
+                'ultima_limpieza': estado.get('ultima_limpieza', 'Nunca'),
+                'ultimo_backup': estado.get('ultimo_backup', 'Nunca')
             }
             
             return estadisticas
-            
+        
         except Exception as e:
             self._log_error(f"Error al obtener estadísticas de validación: {e}")
             return {}
 
-# Instancia global de la lógica de validación
-validacion_logic = ValidacionLogic() 
\ No newline at end of file
+# Instancia global de la lógica de validación (se crea al primer uso)
+__getattr__ = instancias_diferidas(__name__, {'validacion_logic': ValidacionLogic})
\ No newline at end of file
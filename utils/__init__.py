@@ -1,7 +1,28 @@
 """
 Módulo de utilidades para el sistema de gestión de reservas
+
+Los nombres exportados se importan al primer uso para que importar una
+utilidad liviana no cargue pandas ni Streamlit.
 """
 
-from .pagination import paginate_dataframe, reset_pagination, get_pagination_info
+from .carga_diferida import exportaciones_diferidas
+
+__all__ = ['paginate_dataframe', 'reset_pagination', 'get_pagination_info',
+           'AlmacenResultados', 'almacen_resultados', 'reporte_memoria_sesion',
+           'datos_vencidos', 'reiniciar_datos_vencidos',
+           'PestanasDiferidas', 'dataframe_entidad', 'aplicar_esquema', 'formatear']
 
-__all__ = ['paginate_dataframe', 'reset_pagination', 'get_pagination_info'] 
\ No newline at end of file
+__getattr__ = exportaciones_diferidas(__name__, {
+    'paginate_dataframe': '.pagination',
+    'reset_pagination': '.pagination',
+    'get_pagination_info': '.pagination',
+    'AlmacenResultados': '.almacen_resultados',
+    'almacen_resultados': '.almacen_resultados',
+    'reporte_memoria_sesion': '.almacen_resultados',
+    'datos_vencidos': '.almacen_resultados',
+    'reiniciar_datos_vencidos': '.almacen_resultados',
+    'PestanasDiferidas': '.pestanas_diferidas',
+    'dataframe_entidad': '.esquemas_df',
+    'aplicar_esquema': '.esquemas_df',
+    'formatear': '.esquemas_df'
+})
\ No newline at end of file
@@ -0,0 +1,332 @@
+"""
+Almacén compartido de resultados de consultas con política LRU
+"""
+import sys
+import time
+import threading
+from collections import OrderedDict
+from config.settings import obtener_configuracion
+
+# Resultados vencidos que se entregaron en la ejecución actual porque no se
+# pudieron recalcular (clave -> segundos desde que se guardaron)
+_vencidos_entregados = threading.local()
+
+def reiniciar_datos_vencidos():
+    """
+    Olvida los resultados vencidos entregados (llamar al comenzar cada ejecución).
+    """
+    _vencidos_entregados.claves = {}
+
+def datos_vencidos():
+    """
+    Retorna los resultados vencidos que se entregaron desde reiniciar_datos_vencidos().
+    
+    Returns:
+        dict: Clave -> antigüedad del resultado en segundos
+    """
+    return dict(getattr(_vencidos_entregados, 'claves', {}))
+
+def estimar_tamano(obj, _vistos=None):
+    """
+    Estima el tamaño en bytes de un objeto y de todo lo que contiene.
+    
+    Args:
+        obj: Objeto a medir (DataFrame, lista, diccionario, tupla, etc.)
+    
+    Returns:
+        int: Tamaño aproximado en bytes
+    """
+    if _vistos is None:
+        _vistos = set()
+    
+    id_obj = id(obj)
+    if id_obj in _vistos:
+        return 0
+    _vistos.add(id_obj)
+    
+    # DataFrames y Series de pandas informan su propio uso de memoria
+    if hasattr(obj, 'memory_usage') and (hasattr(obj, 'columns') or hasattr(obj, 'dtype')):
+        try:
+            uso = obj.memory_usage(deep=True)
+            return int(uso.sum()) if hasattr(uso, 'sum') else int(uso)
+        except Exception:
+            pass
+    
+    tamano = sys.getsizeof(obj, 0)
+    
+    if isinstance(obj, dict):
+        for clave, valor in obj.items():
+            tamano += estimar_tamano(clave, _vistos) + estimar_tamano(valor, _vistos)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for elemento in obj:
+            tamano += estimar_tamano(elemento, _vistos)
+    elif hasattr(obj, '__dict__'):
+        tamano += estimar_tamano(vars(obj), _vistos)
+    
+    return tamano
+
+class AlmacenResultados:
+    """
+    Almacén de resultados compartido por todas las sesiones del proceso.
+    
+    Mantiene los resultados en orden LRU y expulsa los menos usados cuando el
+    tamaño total supera el máximo configurado. Las sesiones guardan solo la
+    clave (un string corto) y recuperan el resultado con obtener().
+    
+    Un resultado vencido no se descarta enseguida: queda como respaldo hasta
+    que la política LRU lo expulse o se invalide, y obtener_o_calcular() lo
+    entrega si no se puede recalcular porque la base no responde (circuito
+    abierto o error de conexión).
+    """
+    
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(obtener_configuracion().decimal('RESULT_CACHE_MAX_MB', 256) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()
+        self._bytes_totales = 0
+        self._lock = threading.RLock()
+        self._aciertos = 0
+        self._fallos = 0
+        self._expulsiones = 0
+    
+    def guardar(self, clave, valor, ttl=None):
+        """
+        Guarda un resultado en el almacén.
+        
+        Args:
+            clave (str): Clave del resultado
+            valor: Resultado a guardar
+            ttl (float): Segundos de validez (opcional, sin vencimiento por defecto)
+        
+        Returns:
+            str: La clave, para guardarla en st.session_state
+        """
+        tamano = estimar_tamano(valor)
+        vence = time.time() + ttl if ttl else None
+        
+        with self._lock:
+            if clave in self._entradas:
+                self._bytes_totales -= self._entradas.pop(clave)[1]
+            
+            # Un resultado más grande que el almacén completo no se guarda
+            if tamano > self.max_bytes:
+                return clave
+            
+            self._entradas[clave] = (valor, tamano, vence, time.time())
+            self._bytes_totales += tamano
+            
+            while self._bytes_totales > self.max_bytes and self._entradas:
+                _, (_, tamano_expulsado, _, _) = self._entradas.popitem(last=False)
+                self._bytes_totales -= tamano_expulsado
+                self._expulsiones += 1
+        
+        return clave
+    
+    def obtener(self, clave, default=None):
+        """
+        Obtiene un resultado del almacén.
+        
+        Args:
+            clave (str): Clave del resultado
+            default: Valor a retornar si la clave no existe o venció
+        
+        Returns:
+            El resultado guardado o default
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self._fallos += 1
+                return default
+            
+            valor, _, vence, _ = entrada
+            if vence is not None and vence < time.time():
+                # Queda como respaldo (ver obtener_respaldo)
+                self._fallos += 1
+                return default
+            
+            self._entradas.move_to_end(clave)
+            self._aciertos += 1
+            return valor
+    
+    def obtener_o_calcular(self, clave, funcion, ttl=None):
+        """
+        Obtiene un resultado o lo calcula y guarda si no está en el almacén.
+        
+        Args:
+            clave (str): Clave del resultado
+            funcion (callable): Función sin argumentos que calcula el resultado
+            ttl (float): Segundos de validez (opcional)
+        
+        Returns:
+            El resultado guardado o recién calculado
+        """
+        faltante = object()
+        valor = self.obtener(clave, faltante)
+        if valor is not faltante:
+            return valor
+        
+        import psycopg2
+        from capa_datos.database_connection import base_de_datos_disponible
+        
+        try:
+            valor = funcion()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # Sin conexión (incluido CircuitoAbierto): se entrega el respaldo si hay
+            respaldo = self.obtener_respaldo(clave)
+            if respaldo is None:
+                raise
+        else:
+            # No guardar resultados vacíos (pueden venir de un error ya informado)
+            if valor:
+                self.guardar(clave, valor, ttl)
+                return valor
+            # Un resultado vacío es legítimo mientras la base responde
+            respaldo = self.obtener_respaldo(clave) if not base_de_datos_disponible() else None
+            if respaldo is None:
+                return valor
+        
+        # Entregar el último resultado bueno, marcado como vencido
+        valor_respaldo, antiguedad = respaldo
+        if not hasattr(_vencidos_entregados, 'claves'):
+            reiniciar_datos_vencidos()
+        _vencidos_entregados.claves[clave] = antiguedad
+        return valor_respaldo
+    
+    def obtener_respaldo(self, clave):
+        """
+        Obtiene un resultado aunque esté vencido.
+        
+        Args:
+            clave (str): Clave del resultado
+        
+        Returns:
+            tuple: (resultado, segundos desde que se guardó) o None si no existe
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            return entrada[0], time.time() - entrada[3]
+    
+    def contiene(self, clave):
+        """
+        Indica si una clave está en el almacén (sin afectar el orden LRU).
+        
+        Args:
+            clave (str): Clave a verificar
+        
+        Returns:
+            bool: True si la clave existe
+        """
+        with self._lock:
+            return clave in self._entradas
+    
+    def tamano_de(self, clave):
+        """
+        Retorna el tamaño estimado de un resultado guardado.
+        
+        Args:
+            clave (str): Clave del resultado
+        
+        Returns:
+            int: Tamaño en bytes o 0 si no existe
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            return entrada[1] if entrada else 0
+    
+    def eliminar(self, clave):
+        """
+        Elimina un resultado del almacén.
+        
+        Args:
+            clave (str): Clave del resultado
+        """
+        with self._lock:
+            entrada = self._entradas.pop(clave, None)
+            if entrada:
+                self._bytes_totales -= entrada[1]
+    
+    def invalidar_prefijo(self, prefijo):
+        """
+        Elimina todos los resultados cuya clave empieza con un prefijo.
+        
+        Args:
+            prefijo (str): Prefijo de las claves a invalidar
+        
+        Returns:
+            int: Número de resultados eliminados
+        """
+        with self._lock:
+            claves = [clave for clave in self._entradas if clave.startswith(prefijo)]
+            for clave in claves:
+                self._bytes_totales -= self._entradas.pop(clave)[1]
+            return len(claves)
+    
+    def limpiar(self):
+        """
+        Vacía el almacén completo.
+        """
+        with self._lock:
+            self._entradas.clear()
+            self._bytes_totales = 0
+    
+    def estadisticas(self):
+        """
+        Obtiene estadísticas de uso del almacén.
+        
+        Returns:
+            dict: Entradas, bytes usados, máximo, aciertos, fallos y expulsiones
+        """
+        with self._lock:
+            return {
+                'entradas': len(self._entradas),
+                'bytes_usados': self._bytes_totales,
+                'bytes_maximos': self.max_bytes,
+                'aciertos': self._aciertos,
+                'fallos': self._fallos,
+                'expulsiones': self._expulsiones
+            }
+
+def reporte_memoria_sesion(estado_sesion, almacen=None):
+    """
+    Genera un reporte del uso de memoria de una sesión.
+    
+    Para las claves de sesión que son referencias al almacén compartido se
+    informa también el tamaño del resultado referenciado.
+    
+    Args:
+        estado_sesion: st.session_state o un diccionario equivalente
+        almacen (AlmacenResultados): Almacén compartido (opcional)
+    
+    Returns:
+        list: Lista de diccionarios ordenada por tamaño descendente
+    """
+    if almacen is None:
+        almacen = almacen_resultados
+    
+    reporte = []
+    for clave in list(estado_sesion.keys()):
+        try:
+            valor = estado_sesion[clave]
+        except KeyError:
+            continue
+        
+        referenciado = 0
+        if isinstance(valor, str) and almacen.contiene(valor):
+            referenciado = almacen.tamano_de(valor)
+        
+        reporte.append({
+            'clave': str(clave),
+            'tipo': type(valor).__name__,
+            'bytes_sesion': estimar_tamano(valor),
+            'bytes_almacen_compartido': referenciado
+        })
+    
+    reporte.sort(key=lambda fila: fila['bytes_sesion'], reverse=True)
+    return reporte
+
+# Instancia global compartida por todas las sesiones del proceso
+almacen_resultados = AlmacenResultados()
@@ -0,0 +1,56 @@
+"""
+Importaciones e instancias globales diferidas hasta su primer uso
+"""
+import sys
+import importlib
+import threading
+
+def exportaciones_diferidas(nombre_modulo, exportaciones):
+    """
+    Crea el __getattr__ de un paquete que importa cada nombre exportado al
+    primer acceso (PEP 562).
+    
+    Args:
+        nombre_modulo (str): __name__ del paquete
+        exportaciones (dict): Nombre exportado -> submódulo relativo ('.pagination')
+    
+    Returns:
+        callable: Función para asignar a __getattr__ del paquete
+    """
+    def __getattr__(nombre):
+        if nombre not in exportaciones:
+            raise AttributeError(f"module {nombre_modulo!r} has no attribute {nombre!r}")
+        modulo = importlib.import_module(exportaciones[nombre], nombre_modulo)
+        valor = getattr(modulo, nombre)
+        # Los accesos siguientes ya no pasan por __getattr__
+        setattr(sys.modules[nombre_modulo], nombre, valor)
+        return valor
+    return __getattr__
+
+def instancias_diferidas(nombre_modulo, fabricas):
+    """
+    Crea el __getattr__ de un módulo cuyas instancias globales se construyen
+    al primer acceso en lugar de al importarlo.
+    
+    Ejemplo (al final del módulo):
+        __getattr__ = instancias_diferidas(__name__, {'pagos_logic': PagosLogic})
+    
+    Args:
+        nombre_modulo (str): __name__ del módulo
+        fabricas (dict): Nombre de la instancia -> clase o función que la crea
+    
+    Returns:
+        callable: Función para asignar a __getattr__ del módulo
+    """
+    lock = threading.Lock()
+    
+    def __getattr__(nombre):
+        if nombre not in fabricas:
+            raise AttributeError(f"module {nombre_modulo!r} has no attribute {nombre!r}")
+        modulo = sys.modules[nombre_modulo]
+        with lock:
+            # Otro hilo pudo crearla mientras se esperaba el lock
+            if nombre not in modulo.__dict__:
+                setattr(modulo, nombre, fabricas[nombre]())
+        return modulo.__dict__[nombre]
+    return __getattr__
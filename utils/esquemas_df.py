@@ -0,0 +1,215 @@
+"""
+Esquemas de los DataFrames que muestran las vistas
+
+Cada entidad (reserva, pago, cliente, cancha, auditoria) declara aquí el tipo
+de sus columnas y cómo se muestran. Con dataframe_entidad() los estados,
+métodos de pago y deportes quedan como categorías, los ids como Int64, los
+montos como float64 y las fechas como datetime64, en lugar de un objeto de
+Python por celda. formatear() convierte a texto por columna (.dt.strftime,
+.str) y se llama solo sobre lo que se va a mostrar, por ejemplo la página
+actual de una tabla paginada.
+"""
+import pandas as pd
+from capa_datos.dataframes import convertir_columna
+
+# Formatos especiales (los demás son patrones de strftime)
+MONEDA = 'moneda'
+HORA = 'hora'
+
+FORMATO_MONEDA = '${:,.2f}'
+
+# Entidad -> columna -> tipo (los de capa_datos.dataframes.fetch_dataframe)
+ESQUEMAS = {
+    'reserva': {
+        'id': 'entero',
+        'reserva_id': 'entero',
+        'cliente_id': 'entero',
+        'cancha_id': 'entero',
+        'fecha_reserva': 'fecha',
+        'hora_inicio': 'hora',
+        'hora_fin': 'hora',
+        'duracion': 'decimal',
+        'estado': 'categoria',
+        'observaciones': 'texto',
+        'fecha_creacion': 'fecha_hora',
+        'fecha_actualizacion': 'fecha_hora'
+    },
+    'pago': {
+        'id': 'entero',
+        'pago_id': 'entero',
+        'reserva_id': 'entero',
+        'cliente_id': 'entero',
+        'cancha_id': 'entero',
+        'fecha_pago': 'fecha',
+        'fecha_reserva': 'fecha',
+        'hora_inicio': 'hora',
+        'hora_fin': 'hora',
+        'duracion': 'decimal',
+        'monto': 'decimal',
+        'precio_hora': 'decimal',
+        'precio_total_reserva': 'decimal',
+        'precio_total_calculado': 'decimal',
+        'total_pagado': 'decimal',
+        'saldo_pendiente': 'decimal',
+        'metodo_pago': 'categoria',
+        'estado': 'categoria',
+        'estado_pago': 'categoria',
+        'estado_reserva': 'categoria',
+        'nombre_cancha': 'categoria',
+        'tipo_deporte': 'categoria',
+        # Resumen mensual (AnaliticaPagosLogic.resumen_por_mes)
+        'mes': 'fecha',
+        'total_pagos': 'entero',
+        'total_recaudado': 'decimal',
+        'promedio_pago': 'decimal',
+        'clientes_unicos': 'entero',
+        'canchas_utilizadas': 'entero',
+        'pagos_completados': 'entero',
+        'pagos_pendientes': 'entero',
+        'fecha_creacion': 'fecha_hora',
+        'fecha_actualizacion': 'fecha_hora'
+    },
+    'cliente': {
+        'id': 'entero',
+        'cliente_id': 'entero',
+        'fecha_nacimiento': 'fecha',
+        'estado': 'categoria',
+        'fecha_registro': 'fecha_hora',
+        'fecha_actualizacion': 'fecha_hora'
+    },
+    'cancha': {
+        'id': 'entero',
+        'cancha_id': 'entero',
+        'tipo_cancha_id': 'entero',
+        'capacidad': 'entero',
+        'precio_hora': 'decimal',
+        'precio_por_hora': 'decimal',
+        'tipo_deporte': 'categoria',
+        'estado': 'categoria',
+        'tipo_cancha_nombre': 'categoria',
+        'horario_apertura': 'hora',
+        'horario_cierre': 'hora',
+        # Reportes de uso e ingresos por cancha
+        'total_reservas': 'entero',
+        'ingresos_totales': 'decimal',
+        'promedio_por_reserva': 'decimal',
+        'ingreso_promedio_por_reserva': 'decimal',
+        'fecha_creacion': 'fecha_hora',
+        'fecha_actualizacion': 'fecha_hora'
+    },
+    'auditoria': {
+        'id': 'entero',
+        'usuario_id': 'entero',
+        'registro_id': 'entero',
+        'usuario_nombre': 'categoria',
+        'tipo_accion': 'categoria',
+        'tabla': 'categoria',
+        'resultado': 'categoria',
+        'ip_address': 'categoria',
+        'detalles': 'texto',
+        'fecha_hora': 'fecha_hora'
+    }
+}
+
+# Entidad -> columna -> formato de presentación
+FORMATOS = {
+    'reserva': {
+        'fecha_reserva': '%d/%m/%Y',
+        'hora_inicio': HORA,
+        'hora_fin': HORA
+    },
+    'pago': {
+        'fecha_pago': '%Y-%m-%d %H:%M',
+        'fecha_reserva': '%Y-%m-%d',
+        'mes': '%B %Y',
+        'monto': MONEDA,
+        'precio_total_reserva': MONEDA,
+        'precio_total_calculado': MONEDA,
+        'total_pagado': MONEDA,
+        'saldo_pendiente': MONEDA,
+        'total_recaudado': MONEDA,
+        'promedio_pago': MONEDA
+    },
+    'cliente': {
+        'fecha_nacimiento': '%d/%m/%Y',
+        'fecha_registro': '%d/%m/%Y %H:%M'
+    },
+    'cancha': {
+        'precio_hora': MONEDA,
+        'precio_por_hora': MONEDA,
+        'ingresos_totales': MONEDA,
+        'promedio_por_reserva': MONEDA,
+        'ingreso_promedio_por_reserva': MONEDA,
+        'horario_apertura': HORA,
+        'horario_cierre': HORA
+    },
+    'auditoria': {
+        'fecha_hora': '%d/%m/%Y %H:%M:%S'
+    }
+}
+
+def aplicar_esquema(df, entidad):
+    """
+    Convierte las columnas del DataFrame a los tipos de la entidad.
+    
+    Las columnas que no están en el esquema quedan como están.
+    
+    Args:
+        df (pd.DataFrame): DataFrame a convertir (se modifica)
+        entidad (str): Entidad de ESQUEMAS
+    
+    Returns:
+        pd.DataFrame: El mismo DataFrame
+    """
+    for nombre, tipo in ESQUEMAS[entidad].items():
+        if nombre not in df.columns:
+            continue
+        serie = convertir_columna(df[nombre], tipo)
+        if tipo == 'hora':
+            # Las horas de inicio y fin se repiten mucho (turnos)
+            serie = serie.astype('category')
+        df[nombre] = serie
+    return df
+
+def dataframe_entidad(filas, entidad):
+    """
+    Crea el DataFrame de una lista de filas con los tipos de la entidad.
+    
+    Args:
+        filas (list): Filas de una consulta (Fila, diccionarios)
+        entidad (str): Entidad de ESQUEMAS
+    
+    Returns:
+        pd.DataFrame: DataFrame tipado
+    """
+    return aplicar_esquema(pd.DataFrame(filas), entidad)
+
+def _formatear_columna(serie, formato):
+    if formato == MONEDA:
+        return serie.astype('float64').map(FORMATO_MONEDA.format, na_action='ignore')
+    if formato == HORA:
+        # Texto HH:MM:SS; en una categoría se recorta una vez por valor distinto
+        if not isinstance(serie.dtype, pd.CategoricalDtype):
+            serie = serie.astype('category')
+        return serie.str[:5]
+    if not pd.api.types.is_datetime64_any_dtype(serie):
+        serie = pd.to_datetime(serie, errors='coerce')
+    return serie.dt.strftime(formato)
+
+def formatear(df, entidad, formatos=None):
+    """
+    Retorna una copia del DataFrame con las columnas formateadas como texto.
+    
+    Args:
+        df (pd.DataFrame): DataFrame tipado (ver dataframe_entidad)
+        entidad (str): Entidad de FORMATOS
+        formatos (dict): Columna -> formato que reemplaza al de la entidad
+    
+    Returns:
+        pd.DataFrame: Copia para mostrar
+    """
+    df = df.copy()
+    for nombre, formato in {**FORMATOS[entidad], **(formatos or {})}.items():
+        if nombre in df.columns:
+            df[nombre] = _formatear_columna(df[nombre], formato)
+    return df
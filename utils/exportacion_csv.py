@@ -0,0 +1,39 @@
+"""
+Escritura de filas a CSV a medida que se leen
+"""
+import csv
+import itertools
+
+def escribir_filas_csv(archivo, filas, limite=None):
+    """
+    Escribe filas en un archivo CSV sin juntarlas antes en una lista.
+    
+    El encabezado sale de las columnas de la primera fila (Fila o diccionario).
+    Con limite se deja de consumir el iterador al llegar a esa cantidad, lo que
+    cierra el cursor de iter_query() sin leer el resto.
+    
+    Args:
+        archivo: Archivo de texto abierto para escribir (newline='')
+        filas (iterable): Filas a escribir
+        limite (int): Máximo de filas a escribir (opcional)
+    
+    Returns:
+        int: Filas escritas
+    """
+    origen = filas
+    if limite is not None:
+        filas = itertools.islice(origen, limite)
+    
+    escritor = csv.writer(archivo)
+    escritas = 0
+    try:
+        for fila in filas:
+            if escritas == 0 and hasattr(fila, 'keys'):
+                escritor.writerow(fila.keys())
+            escritor.writerow(fila.values() if isinstance(fila, dict) else fila)
+            escritas += 1
+    finally:
+        # Cerrar el generador también si se cortó por el límite o por un error
+        if hasattr(origen, 'close'):
+            origen.close()
+    return escritas
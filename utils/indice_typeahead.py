@@ -0,0 +1,400 @@
+"""
+Índice en memoria para selectores con búsqueda mientras se escribe
+"""
+import re
+import time
+import heapq
+import bisect
+import threading
+import unicodedata
+from datetime import timedelta
+from config.settings import obtener_configuracion
+
+# Los términos de hasta este largo se buscan como prefijo de palabra (y tienen
+# su propia lista ordenada); los más largos como subcadena
+LARGO_MAXIMO_PREFIJO = 3
+# Hasta esta cantidad de candidatos por trigramas se ordenan todos; con más se
+# recorre la lista ordenada del prefijo
+CANDIDATOS_MAXIMOS_ORDEN = 500
+
+def normalizar(texto):
+    """
+    Normaliza un texto para búsqueda: minúsculas, sin acentos y con los
+    separadores (espacios, puntos, @, guiones) reducidos a un espacio.
+    
+    Args:
+        texto (str): Texto a normalizar
+    
+    Returns:
+        str: Texto normalizado
+    """
+    if not texto:
+        return ''
+    texto = unicodedata.normalize('NFKD', str(texto).lower())
+    texto = ''.join(caracter for caracter in texto if not unicodedata.combining(caracter))
+    return ' '.join(re.findall(r'[a-z0-9ñ]+', texto))
+
+def trigramas(palabra):
+    """
+    Obtiene los trigramas de una palabra normalizada, con dos espacios al
+    inicio (como pg_trgm) para que los prefijos de 1 y 2 caracteres también
+    tengan su trigrama.
+    
+    Args:
+        palabra (str): Palabra sin espacios
+    
+    Returns:
+        set: Conjunto de trigramas
+    """
+    palabra = '  ' + palabra
+    return {palabra[i:i + 3] for i in range(len(palabra) - 2)}
+
+def trigramas_termino(termino):
+    """
+    Obtiene los trigramas que debe contener un registro para coincidir con un
+    término: los términos cortos se buscan al inicio de una palabra y los
+    largos en cualquier posición.
+    
+    Args:
+        termino (str): Palabra normalizada escrita por el usuario
+    
+    Returns:
+        set: Conjunto de trigramas
+    """
+    if len(termino) <= LARGO_MAXIMO_PREFIJO:
+        return trigramas(termino)
+    return {termino[i:i + 3] for i in range(len(termino) - 2)}
+
+class IndiceTypeahead:
+    """
+    Índice de prefijos y trigramas compartido por todas las sesiones del proceso.
+    
+    Los términos cortos (1 a 3 caracteres) se buscan como prefijo de palabra en
+    listas ya ordenadas por etiqueta, así que basta tomar las primeras
+    coincidencias. Los términos más largos se buscan como subcadena usando la
+    intersección de los trigramas. En ambos casos solo se retornan los primeros
+    resultados, que son los únicos que se envían al navegador.
+    
+    El índice se refresca de forma incremental con la función de carga, que
+    recibe una fecha y retorna las filas con fecha_actualizacion posterior.
+    Los borrados físicos no dejan rastro en esa columna, por eso además se
+    reconstruye completo cada cierto tiempo y se expone eliminar() para que el
+    proceso que borra lo aplique de inmediato.
+    """
+    
+    def __init__(self, cargar, max_resultados=20, intervalo_refresco=None,
+                 intervalo_reconstruccion=None, margen_segundos=60):
+        """
+        Args:
+            cargar (callable): Recibe una fecha (o None para carga completa) y
+                retorna una lista de tuplas (id, etiqueta, texto, activo,
+                fecha_actualizacion), o None si la consulta falla
+            max_resultados (int): Número de resultados por búsqueda
+            intervalo_refresco (float): Segundos mínimos entre refrescos incrementales
+            intervalo_reconstruccion (float): Segundos entre reconstrucciones completas
+            margen_segundos (float): Margen hacia atrás sobre la última fecha
+                vista, para no perder filas de transacciones que confirmaron tarde
+        """
+        if intervalo_refresco is None:
+            intervalo_refresco = obtener_configuracion().decimal('TYPEAHEAD_REFRESCO_SEGUNDOS', 5)
+        if intervalo_reconstruccion is None:
+            intervalo_reconstruccion = obtener_configuracion().decimal('TYPEAHEAD_RECONSTRUCCION_SEGUNDOS', 600)
+        
+        self._cargar = cargar
+        self.max_resultados = max_resultados
+        self.intervalo_refresco = intervalo_refresco
+        self.intervalo_reconstruccion = intervalo_reconstruccion
+        self.margen = timedelta(seconds=margen_segundos)
+        
+        self._lock = threading.RLock()
+        self._lock_refresco = threading.Lock()
+        self._limpiar()
+        self._marca = None
+        self._ultimo_refresco = 0
+        self._ultima_reconstruccion = None
+    
+    def _limpiar(self):
+        """
+        Vacía las estructuras del índice (llamar con el lock tomado).
+        """
+        # id -> (clave de orden, texto normalizado, etiqueta)
+        self._documentos = {}
+        # Todas las entradas ordenadas por etiqueta, para la búsqueda vacía
+        self._ordenados = []
+        # prefijo -> lista ordenada de (clave de orden, id)
+        self._prefijos = {}
+        # trigrama -> conjunto de ids
+        self._trigramas = {}
+    
+    def _palabras(self, texto_normalizado):
+        """
+        Separa un texto normalizado en su conjunto de palabras.
+        """
+        return set(texto_normalizado.split())
+    
+    def _agregar(self, id_registro, etiqueta, texto, ordenar=True):
+        """
+        Agrega o reemplaza una entrada (llamar con el lock tomado).
+        
+        Con ordenar=False las claves se agregan al final de las listas y quien
+        llama debe ordenarlas después (carga masiva de una reconstrucción).
+        """
+        self._quitar(id_registro)
+        
+        # El espacio inicial permite verificar prefijos de palabra con ' ' + término
+        texto_normalizado = ' ' + normalizar(f"{etiqueta} {texto or ''}")
+        clave = (normalizar(etiqueta), id_registro)
+        self._documentos[id_registro] = (clave, texto_normalizado, etiqueta)
+        insertar = bisect.insort if ordenar else list.append
+        insertar(self._ordenados, clave)
+        
+        palabras = self._palabras(texto_normalizado)
+        prefijos = {palabra[:largo] for palabra in palabras
+                    for largo in range(1, min(LARGO_MAXIMO_PREFIJO, len(palabra)) + 1)}
+        for prefijo in prefijos:
+            insertar(self._prefijos.setdefault(prefijo, []), clave)
+        
+        for palabra in palabras:
+            for trigrama in trigramas(palabra):
+                self._trigramas.setdefault(trigrama, set()).add(id_registro)
+    
+    def _quitar(self, id_registro):
+        """
+        Quita una entrada si existe (llamar con el lock tomado).
+        """
+        documento = self._documentos.pop(id_registro, None)
+        if documento is None:
+            return
+        
+        clave, texto_normalizado, _ = documento
+        self._quitar_de_lista(self._ordenados, clave)
+        
+        palabras = self._palabras(texto_normalizado)
+        prefijos = {palabra[:largo] for palabra in palabras
+                    for largo in range(1, min(LARGO_MAXIMO_PREFIJO, len(palabra)) + 1)}
+        for prefijo in prefijos:
+            lista = self._prefijos.get(prefijo)
+            if lista is not None:
+                self._quitar_de_lista(lista, clave)
+                if not lista:
+                    del self._prefijos[prefijo]
+        
+        for palabra in palabras:
+            for trigrama in trigramas(palabra):
+                ids = self._trigramas.get(trigrama)
+                if ids is not None:
+                    ids.discard(id_registro)
+                    if not ids:
+                        del self._trigramas[trigrama]
+    
+    def _quitar_de_lista(self, lista, clave):
+        """
+        Quita una clave de una lista ordenada usando búsqueda binaria.
+        """
+        posicion = bisect.bisect_left(lista, clave)
+        if posicion < len(lista) and lista[posicion] == clave:
+            del lista[posicion]
+    
+    def eliminar(self, id_registro):
+        """
+        Quita un registro del índice (por ejemplo, después de un borrado físico).
+        
+        Args:
+            id_registro (int): ID del registro
+        """
+        with self._lock:
+            self._quitar(id_registro)
+    
+    def invalidar(self):
+        """
+        Fuerza una reconstrucción completa en la próxima búsqueda.
+        """
+        with self._lock:
+            self._ultima_reconstruccion = None
+            self._ultimo_refresco = 0
+    
+    def refrescar(self, forzar=False):
+        """
+        Aplica los cambios ocurridos desde el último refresco.
+        
+        Solo consulta la base de datos si pasó el intervalo de refresco (o si
+        forzar es True). Si otra sesión ya está refrescando, no espera, salvo
+        que el índice todavía no se haya cargado nunca.
+        
+        Args:
+            forzar (bool): Refrescar aunque no haya pasado el intervalo
+        """
+        ahora = time.time()
+        if not forzar and ahora - self._ultimo_refresco < self.intervalo_refresco:
+            return
+        if not self._lock_refresco.acquire(blocking=self._ultima_reconstruccion is None):
+            return
+        
+        try:
+            # Otra sesión pudo completar el refresco mientras se esperaba el lock
+            if not forzar and ahora - self._ultimo_refresco < self.intervalo_refresco:
+                return
+            reconstruir = (self._ultima_reconstruccion is None
+                           or ahora - self._ultima_reconstruccion >= self.intervalo_reconstruccion)
+            desde = None if reconstruir or self._marca is None else self._marca - self.margen
+            
+            filas = self._cargar(desde)
+            self._ultimo_refresco = ahora
+            if filas is None:
+                return
+            
+            if reconstruir:
+                # La reconstrucción se arma aparte y se intercambia al final,
+                # así las búsquedas de otras sesiones no esperan la carga completa
+                nuevo = IndiceTypeahead(self._cargar, self.max_resultados)
+                nuevo._aplicar(filas, ordenar=False)
+                nuevo._ordenados.sort()
+                for lista in nuevo._prefijos.values():
+                    lista.sort()
+                with self._lock:
+                    self._documentos = nuevo._documentos
+                    self._ordenados = nuevo._ordenados
+                    self._prefijos = nuevo._prefijos
+                    self._trigramas = nuevo._trigramas
+                    self._marca = nuevo._marca
+                    self._ultima_reconstruccion = ahora
+            else:
+                with self._lock:
+                    self._aplicar(filas)
+        finally:
+            self._lock_refresco.release()
+    
+    def _aplicar(self, filas, ordenar=True):
+        """
+        Agrega las filas activas y quita las inactivas (llamar con el lock tomado
+        o sobre un índice que todavía no es visible).
+        
+        Args:
+            filas (list): Tuplas (id, etiqueta, texto, activo, fecha_actualizacion)
+            ordenar (bool): Mantener las listas ordenadas en cada inserción
+        """
+        for id_registro, etiqueta, texto, activo, fecha_actualizacion in filas:
+            if activo:
+                self._agregar(id_registro, etiqueta, texto, ordenar)
+            else:
+                self._quitar(id_registro)
+            if fecha_actualizacion and (self._marca is None or fecha_actualizacion > self._marca):
+                self._marca = fecha_actualizacion
+    
+    def buscar(self, termino, limite=None):
+        """
+        Busca registros que contengan todas las palabras del término: las
+        cortas al inicio de una palabra y las largas en cualquier posición.
+        
+        Args:
+            termino (str): Texto escrito por el usuario
+            limite (int): Número máximo de resultados (por defecto max_resultados)
+        
+        Returns:
+            list: Lista de tuplas (id, etiqueta); primero las coincidencias al
+                inicio de una palabra, cada grupo ordenado por etiqueta
+        """
+        self.refrescar()
+        limite = limite or self.max_resultados
+        palabras = sorted(set(normalizar(termino).split()), key=len, reverse=True)
+        
+        with self._lock:
+            if not palabras:
+                return [(id_registro, self._documentos[id_registro][2])
+                        for _, id_registro in self._ordenados[:limite]]
+            
+            conjuntos = []
+            for trigrama in set().union(*(trigramas_termino(palabra) for palabra in palabras)):
+                ids = self._trigramas.get(trigrama)
+                if not ids:
+                    return []
+                conjuntos.append(ids)
+            conjuntos.sort(key=len)
+            candidatos = conjuntos[0].intersection(*conjuntos[1:]) if len(conjuntos) > 1 else conjuntos[0]
+            
+            # Primero las coincidencias al inicio de una palabra (lo habitual al
+            # escribir) y después las que aparecen dentro de una palabra
+            principal = palabras[0]
+            inicio_palabra = ' ' + principal
+            
+            if len(candidatos) <= CANDIDATOS_MAXIMOS_ORDEN:
+                resultados = heapq.nsmallest(
+                    limite,
+                    (id_registro for id_registro in candidatos if self._coincide(id_registro, palabras)),
+                    key=lambda id_registro: (inicio_palabra not in self._documentos[id_registro][1],
+                                             self._documentos[id_registro][0])
+                )
+            else:
+                # Muchos candidatos: la lista del prefijo ya está ordenada por
+                # etiqueta y se recorre hasta completar el límite
+                resultados = []
+                for _, id_registro in self._prefijos.get(principal[:LARGO_MAXIMO_PREFIJO], []):
+                    if (id_registro in candidatos
+                            and inicio_palabra in self._documentos[id_registro][1]
+                            and self._coincide(id_registro, palabras)):
+                        resultados.append(id_registro)
+                        if len(resultados) >= limite:
+                            break
+                if len(resultados) < limite and len(principal) > LARGO_MAXIMO_PREFIJO:
+                    encontrados = set(resultados)
+                    resultados += heapq.nsmallest(
+                        limite - len(resultados),
+                        (id_registro for id_registro in candidatos
+                         if id_registro not in encontrados and self._coincide(id_registro, palabras)),
+                        key=lambda id_registro: self._documentos[id_registro][0]
+                    )
+            return [(id_registro, self._documentos[id_registro][2]) for id_registro in resultados]
+    
+    def _coincide(self, id_registro, palabras):
+        """
+        Verifica que un registro contenga todas las palabras buscadas: las
+        cortas como prefijo de palabra y las largas como subcadena.
+        """
+        texto = self._documentos[id_registro][1]
+        for palabra in palabras:
+            if len(palabra) <= LARGO_MAXIMO_PREFIJO:
+                if ' ' + palabra not in texto:
+                    return False
+            elif palabra not in texto:
+                return False
+        return True
+    
+    def etiqueta(self, id_registro):
+        """
+        Retorna la etiqueta de un registro indexado.
+        
+        Args:
+            id_registro (int): ID del registro
+        
+        Returns:
+            str: Etiqueta o None si no está en el índice
+        """
+        with self._lock:
+            documento = self._documentos.get(id_registro)
+            return documento[2] if documento else None
+    
+    def total(self):
+        """
+        Retorna el número de registros indexados (refrescando si corresponde).
+        
+        Returns:
+            int: Número de registros
+        """
+        self.refrescar()
+        with self._lock:
+            return len(self._documentos)
+    
+    def estadisticas(self):
+        """
+        Obtiene estadísticas del índice.
+        
+        Returns:
+            dict: Registros, prefijos, trigramas y fecha de la última modificación vista
+        """
+        with self._lock:
+            return {
+                'registros': len(self._documentos),
+                'prefijos': len(self._prefijos),
+                'trigramas': len(self._trigramas),
+                'ultima_modificacion': self._marca
+            }
@@ -0,0 +1,56 @@
+"""
+JSON que conserva los tipos de las filas de psycopg2
+
+json no admite Decimal, fechas, horas, intervalos ni bytes. codificar() los
+escribe como un objeto de una sola clave que marca el tipo ({"$dec": "12.50"},
+{"$d": "2024-05-01"}, ...) y decodificar() los reconstruye al leer.
+
+Uso:
+    texto = json.dumps(filas, default=codificar)
+    filas = json.loads(texto, object_hook=decodificar)
+"""
+import base64
+from decimal import Decimal
+from datetime import date, datetime, time as hora, timedelta
+
+def codificar(valor):
+    """
+    Convierte a JSON los tipos que json no admite, marcando su tipo
+    (para usar como default= de json.dump/json.dumps).
+    """
+    if isinstance(valor, Decimal):
+        return {'$dec': str(valor)}
+    if isinstance(valor, datetime):
+        return {'$dt': valor.isoformat()}
+    if isinstance(valor, date):
+        return {'$d': valor.isoformat()}
+    if isinstance(valor, hora):
+        return {'$t': valor.isoformat()}
+    if isinstance(valor, timedelta):
+        return {'$td': valor.total_seconds()}
+    if isinstance(valor, (bytes, memoryview)):
+        return {'$b': base64.b64encode(bytes(valor)).decode('ascii')}
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor, key=repr)
+    raise TypeError(f"Tipo no soportado en JSON: {type(valor).__name__}")
+
+_DECODIFICADORES = {
+    '$dec': Decimal,
+    '$dt': datetime.fromisoformat,
+    '$d': date.fromisoformat,
+    '$t': hora.fromisoformat,
+    '$td': lambda segundos: timedelta(seconds=segundos),
+    '$b': lambda texto: base64.b64decode(texto)
+}
+
+def decodificar(objeto):
+    """
+    Reconstruye los valores marcados por codificar() (para usar como
+    object_hook= de json.load/json.loads).
+    """
+    if len(objeto) == 1:
+        clave, valor = next(iter(objeto.items()))
+        decodificador = _DECODIFICADORES.get(clave)
+        if decodificador is not None:
+            return decodificador(valor)
+    return objeto
@@ -0,0 +1,112 @@
+"""
+Pestañas que solo ejecutan el contenido de la pestaña activa
+"""
+import time
+import streamlit as st
+
+class PestanasDiferidas:
+    """
+    Reemplazo de st.tabs que ejecuta únicamente la pestaña seleccionada.
+    
+    st.tabs ejecuta el contenido (y las consultas) de todas las pestañas en
+    cada rerun aunque solo se vea una. Aquí cada pestaña registra una función
+    de contenido y la selección se hace con un radio horizontal, de modo que
+    solo corre la función de la pestaña activa. También guarda el tiempo de la
+    última carga de cada pestaña para mostrar cuánto trabajo se evitó.
+    
+    Ejemplo:
+        pestanas = PestanasDiferidas("pagos")
+        pestanas.agregar("💳 Registrar Pago", self.show_registrar_pago)
+        pestanas.agregar("📊 Historial", self.show_historial_pagos)
+        pestanas.mostrar()
+    """
+    
+    def __init__(self, clave):
+        """
+        Args:
+            clave (str): Clave única del grupo de pestañas en st.session_state
+        """
+        self.clave = clave
+        self._pestanas = {}
+        self._resultados = {}
+    
+    def agregar(self, titulo, contenido, *args):
+        """
+        Registra una pestaña.
+        
+        Args:
+            titulo (str): Título visible de la pestaña
+            contenido (callable): Función que dibuja la pestaña
+            *args: Argumentos de la función
+        """
+        self._pestanas[titulo] = (contenido, args)
+    
+    def resultado(self, clave, funcion, *args):
+        """
+        Ejecuta una consulta una sola vez por rerun y reutiliza su resultado.
+        
+        Las pestañas que comparten datos (por ejemplo, la lista de reservas
+        pendientes) los piden por aquí para no repetir la consulta.
+        
+        Args:
+            clave (str): Clave del resultado
+            funcion (callable): Función que obtiene el resultado
+            *args: Argumentos de la función
+        
+        Returns:
+            Resultado de la función
+        """
+        if clave not in self._resultados:
+            self._resultados[clave] = funcion(*args)
+        return self._resultados[clave]
+    
+    def mostrar(self):
+        """
+        Dibuja el selector de pestañas y ejecuta solo la pestaña activa.
+        
+        Returns:
+            str: Título de la pestaña activa
+        """
+        if not self._pestanas:
+            return None
+        
+        titulos = list(self._pestanas)
+        activa = st.radio(
+            "Sección",
+            titulos,
+            horizontal=True,
+            key=f"{self.clave}_pestana",
+            label_visibility="collapsed"
+        )
+        st.divider()
+        
+        tiempos = st.session_state.setdefault(f"{self.clave}_tiempos", {})
+        contenido, args = self._pestanas[activa]
+        inicio = time.perf_counter()
+        try:
+            contenido(*args)
+        finally:
+            tiempos[activa] = time.perf_counter() - inicio
+        
+        self._mostrar_tiempos(activa, tiempos)
+        return activa
+    
+    def _mostrar_tiempos(self, activa, tiempos):
+        """
+        Muestra el tiempo de la pestaña activa y el de las pestañas no ejecutadas.
+        
+        Args:
+            activa (str): Título de la pestaña activa
+            tiempos (dict): Último tiempo medido por pestaña (segundos)
+        """
+        otras = [titulo for titulo in self._pestanas if titulo != activa]
+        medidas = [titulo for titulo in otras if titulo in tiempos]
+        evitado = sum(tiempos[titulo] for titulo in medidas)
+        
+        texto = f"⏱️ Pestaña cargada en {tiempos[activa] * 1000:.0f} ms"
+        if medidas:
+            texto += (f" · evitados ~{evitado * 1000:.0f} ms de {len(medidas)} "
+                      f"pestaña(s) sin ejecutar (última medición)")
+        if len(medidas) < len(otras):
+            texto += f" · {len(otras) - len(medidas)} pestaña(s) aún sin medir"
+        st.caption(texto)
@@ -4,6 +4,8 @@ Vista para mostrar la auditoría del sistema
 import streamlit as st
 import pandas as pd
 from logica_negocio.auditoria_logic import AuditoriaLogic
+from utils.almacen_resultados import almacen_resultados, reporte_memoria_sesion
+from utils.esquemas_df import dataframe_entidad, formatear
 
 class AuditoriaView:
     """Vista para mostrar la auditoría del sistema"""
@@ -24,6 +26,33 @@ class AuditoriaView:
         
         # Mostrar registros de auditoría
         self.show_registros_auditoria()
+        
+        # Mostrar uso de memoria de la sesión
+        self.show_memoria_sesion()
+    
+    def show_memoria_sesion(self):
+        """Mostrar el uso de memoria de la sesión y del almacén compartido"""
+        with st.expander("🧠 Memoria de la sesión"):
+            estadisticas = almacen_resultados.estadisticas()
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Resultados compartidos", estadisticas['entradas'])
+            with col2:
+                st.metric("Almacén usado (MB)", f"{estadisticas['bytes_usados'] / (1024 * 1024):.2f}")
+            with col3:
+                st.metric("Aciertos / Fallos", f"{estadisticas['aciertos']} / {estadisticas['fallos']}")
+            with col4:
+                st.metric("Expulsiones", estadisticas['expulsiones'])
+            
+            reporte = reporte_memoria_sesion(st.session_state)
+            if reporte:
+                df_memoria = pd.DataFrame(reporte)
+                df_memoria.columns = ['Clave', 'Tipo', 'Bytes en Sesión', 'Bytes en Almacén Compartido']
+                st.dataframe(df_memoria, use_container_width=True)
+                st.info(f"📊 Total en la sesión: {df_memoria['Bytes en Sesión'].sum():,} bytes")
+            else:
+                st.info("La sesión no tiene datos guardados.")
     
     def show_registros_auditoria(self):
         """Mostrar registros de auditoría"""
@@ -37,12 +66,8 @@ class AuditoriaView:
             st.markdown("**Nota:** Los registros aparecerán automáticamente cuando se realicen cambios en la base de datos.")
             return
         
-        # Convertir a DataFrame
-        df = pd.DataFrame(registros)
-        
-        # Formatear fecha_hora
-        if 'fecha_hora' in df.columns:
-            df['fecha_hora'] = pd.to_datetime(df['fecha_hora']).dt.strftime('%d/%m/%Y %H:%M:%S')
+        # Convertir a DataFrame (la fecha se formatea solo en la página que se muestra)
+        df = dataframe_entidad(registros, 'auditoria')
         
         # Mostrar métricas rápidas
         col1, col2, col3, col4 = st.columns(4)
@@ -73,17 +98,6 @@ class AuditoriaView:
             # Mostrar todos los registros (no solo los últimos 50)
             df_mostrar = df[columnas_disponibles]
             
-            # Renombrar columnas para mejor presentación
-            df_mostrar = df_mostrar.rename(columns={
-                'fecha_hora': 'Fecha y Hora',
-                'usuario_nombre': 'Usuario',
-                'tipo_accion': 'Acción',
-                'tabla': 'Tabla',
-                'registro_id': 'ID Registro',
-                'resultado': 'Resultado',
-                'detalles': 'Detalles'
-            })
-            
             # Implementar paginación
             total_registros = len(df_mostrar)
             registros_por_pagina = 5
@@ -111,7 +125,18 @@ class AuditoriaView:
             fin = min(inicio + registros_por_pagina, total_registros)
             
             # Mostrar registros de la página actual
-            df_pagina = df_mostrar.iloc[inicio:fin]
+            df_pagina = formatear(df_mostrar.iloc[inicio:fin], 'auditoria')
+            
+            # Renombrar columnas para mejor presentación
+            df_pagina = df_pagina.rename(columns={
+                'fecha_hora': 'Fecha y Hora',
+                'usuario_nombre': 'Usuario',
+                'tipo_accion': 'Acción',
+                'tabla': 'Tabla',
+                'registro_id': 'ID Registro',
+                'resultado': 'Resultado',
+                'detalles': 'Detalles'
+            })
             
             st.dataframe(df_pagina, use_container_width=True)
             
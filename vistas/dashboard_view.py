@@ -2,6 +2,14 @@ import streamlit as st
 import pandas as pd
 from datetime import time
 from logica_negocio.canchas_logic import CanchasLogic
+from logica_negocio.indices_busqueda_logic import indices_busqueda_logic
+from utils.almacen_resultados import almacen_resultados
+
+# Se guardan en el almacén compartido junto a las listas de edición (se
+# invalidan con ellas) y quedan como respaldo si la base deja de responder
+CLAVE_ESTADISTICAS_CANCHAS = 'listas:estadisticas_canchas'
+CLAVE_CANCHAS_CON_TIPOS = 'listas:canchas_con_tipos'
+TTL_DASHBOARD = 60
 
 class DashboardView:
     """
@@ -21,7 +29,9 @@ class DashboardView:
         st.markdown("## 📊 Dashboard")
         
         # Obtener estadísticas de canchas
-        stats_canchas = self.canchas_logic.obtener_estadisticas_canchas()
+        stats_canchas = almacen_resultados.obtener_o_calcular(
+            CLAVE_ESTADISTICAS_CANCHAS, self.canchas_logic.obtener_estadisticas_canchas, TTL_DASHBOARD
+        )
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -129,7 +139,9 @@ class DashboardView:
         
         try:
             # Obtener canchas con tipos
-            canchas_con_tipos = self.canchas_logic.obtener_canchas_con_tipos()
+            canchas_con_tipos = almacen_resultados.obtener_o_calcular(
+                CLAVE_CANCHAS_CON_TIPOS, self.canchas_logic.obtener_canchas_con_tipos, TTL_DASHBOARD
+            )
             
             if canchas_con_tipos:
                 # Crear DataFrame para mejor visualización
@@ -193,10 +205,10 @@ class DashboardView:
                 
                 # Información de paginación
                 st.info(f"📊 Mostrando registros {inicio + 1}-{fin} de {total_registros} canchas (5 por página)")
-                
+            
             else:
                 st.warning("⚠️ No se encontraron canchas en la base de datos.")
-                
+        
         except Exception as e:
             st.error(f"❌ Error al cargar las canchas: {str(e)}")
     
@@ -284,6 +296,8 @@ class DashboardView:
                             horario_cierre.strftime("%H:%M:%S"), 
                             cancha_descripcion, tipo_id
                         )
+                        almacen_resultados.invalidar_prefijo('listas:')
+                        indices_busqueda_logic.canchas.refrescar(forzar=True)
                         
                         if cancha_id:
                             st.success(f"""
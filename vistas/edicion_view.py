@@ -2,6 +2,13 @@ import streamlit as st
 import pandas as pd
 from datetime import time
 from logica_negocio.canchas_logic import CanchasLogic
+from logica_negocio.indices_busqueda_logic import indices_busqueda_logic
+from utils.almacen_resultados import almacen_resultados
+
+# Las listas se comparten entre sesiones; la sesión solo guarda el ID en edición
+CLAVE_CANCHAS = 'listas:canchas'
+CLAVE_TIPOS_CANCHA = 'listas:tipos_cancha'
+TTL_LISTAS = 60
 
 class EdicionView:
     """
@@ -26,6 +33,10 @@ class EdicionView:
             self.show_edicion_tipos_cancha()
     
     def obtener_canchas_para_edicion(self):
+        """Obtener lista de canchas desde el almacén compartido de resultados"""
+        return almacen_resultados.obtener_o_calcular(CLAVE_CANCHAS, self._cargar_canchas, TTL_LISTAS)
+    
+    def _cargar_canchas(self):
         """Obtener lista de canchas convertida a diccionarios para edición"""
         try:
             canchas_tuples = self.canchas_logic.obtener_canchas_con_tipos()
@@ -60,6 +71,10 @@ class EdicionView:
             return []
     
     def obtener_tipos_cancha_para_edicion(self):
+        """Obtener lista de tipos de cancha desde el almacén compartido de resultados"""
+        return almacen_resultados.obtener_o_calcular(CLAVE_TIPOS_CANCHA, self._cargar_tipos_cancha, TTL_LISTAS)
+    
+    def _cargar_tipos_cancha(self):
         """Obtener lista de tipos de cancha convertida a diccionarios para edición"""
         try:
             tipos_tuples = self.canchas_logic.obtener_tipos_cancha()
@@ -85,6 +100,18 @@ class EdicionView:
             st.error(f"Error al obtener tipos de cancha: {e}")
             return []
     
+    def buscar_por_id(self, registros, registro_id):
+        """Buscar un registro por ID dentro de una lista de diccionarios"""
+        for registro in registros:
+            if registro.get('id') == registro_id:
+                return registro
+        return None
+    
+    def invalidar_listas(self):
+        """Descartar las listas compartidas después de modificar canchas o tipos"""
+        almacen_resultados.invalidar_prefijo('listas:')
+        indices_busqueda_logic.canchas.refrescar(forzar=True)
+    
     def show_edicion_canchas(self):
         """Mostrar interfaz para editar canchas"""
         st.markdown("### 🏟️ Gestión de Canchas")
@@ -146,7 +173,7 @@ class EdicionView:
                 col_edit, col_delete = st.columns(2)
                 with col_edit:
                     if st.button(f"✏️ Editar", key=f"edit_cancha_{idx}"):
-                        st.session_state.editing_cancha = cancha
+                        st.session_state.editing_cancha = cancha.get('id')
                         st.session_state.show_edit_cancha_form = True
                 with col_delete:
                     if st.button(f"🗑️ Eliminar", key=f"delete_cancha_{idx}"):
@@ -156,7 +183,9 @@ class EdicionView:
         
         # Formulario de edición
         if st.session_state.get('show_edit_cancha_form', False) and st.session_state.get('editing_cancha'):
-            self.show_formulario_edicion_cancha(st.session_state.editing_cancha)
+            cancha = self.buscar_por_id(canchas, st.session_state.editing_cancha)
+            if cancha:
+                self.show_formulario_edicion_cancha(cancha)
     
     def show_formulario_edicion_cancha(self, cancha):
         """Mostrar formulario para editar una cancha"""
@@ -273,7 +302,7 @@ class EdicionView:
                 col_edit, col_delete = st.columns(2)
                 with col_edit:
                     if st.button(f"✏️ Editar", key=f"edit_tipo_{idx}"):
-                        st.session_state.editing_tipo = tipo
+                        st.session_state.editing_tipo = tipo.get('id')
                         st.session_state.show_edit_tipo_form = True
                 with col_delete:
                     if st.button(f"🗑️ Eliminar", key=f"delete_tipo_{idx}"):
@@ -283,7 +312,9 @@ class EdicionView:
         
         # Formulario de edición
         if st.session_state.get('show_edit_tipo_form', False) and st.session_state.get('editing_tipo'):
-            self.show_formulario_edicion_tipo_cancha(st.session_state.editing_tipo)
+            tipo = self.buscar_por_id(tipos_cancha, st.session_state.editing_tipo)
+            if tipo:
+                self.show_formulario_edicion_tipo_cancha(tipo)
     
     def show_formulario_edicion_tipo_cancha(self, tipo):
         """Mostrar formulario para editar un tipo de cancha"""
@@ -324,19 +355,30 @@ class EdicionView:
     def actualizar_cancha(self, cancha_id, nombre, tipo_deporte, capacidad, precio_hora, 
                          estado, horario_apertura, horario_cierre, descripcion, tipo_cancha_id):
         """Actualizar una cancha"""
-        return self.canchas_logic.actualizar_cancha(
+        resultado = self.canchas_logic.actualizar_cancha(
             cancha_id, nombre, tipo_deporte, capacidad, precio_hora,
             estado, horario_apertura, horario_cierre, descripcion, tipo_cancha_id
         )
+        self.invalidar_listas()
+        return resultado
     
     def actualizar_tipo_cancha(self, tipo_id, nombre, descripcion, precio_por_hora, activo):
         """Actualizar un tipo de cancha"""
-        return self.canchas_logic.actualizar_tipo_cancha(tipo_id, nombre, descripcion, precio_por_hora, activo)
+        resultado = self.canchas_logic.actualizar_tipo_cancha(tipo_id, nombre, descripcion, precio_por_hora, activo)
+        self.invalidar_listas()
+        return resultado
     
     def eliminar_cancha(self, cancha_id):
         """Eliminar una cancha"""
-        return self.canchas_logic.eliminar_cancha(cancha_id)
+        resultado = self.canchas_logic.eliminar_cancha(cancha_id)
+        if resultado:
+            # El borrado es físico: el refresco incremental no lo detecta
+            indices_busqueda_logic.canchas.eliminar(cancha_id)
+        self.invalidar_listas()
+        return resultado
     
     def eliminar_tipo_cancha(self, tipo_id):
         """Eliminar un tipo de cancha"""
-        return self.canchas_logic.eliminar_tipo_cancha(tipo_id) 
\ No newline at end of file
+        resultado = self.canchas_logic.eliminar_tipo_cancha(tipo_id)
+        self.invalidar_listas()
+        return resultado 
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Adaptador de Streamlit para los mensajes de capa_datos y logica_negocio
+
+Muestra los mensajes de capa_datos/notificaciones.py con st.error,
+st.warning, st.success y st.info, y entrega st.session_state como estado de
+la sesión. También lleva el contexto de Streamlit a los hilos de los lotes
+concurrentes. En un hilo sin contexto de Streamlit (por ejemplo, de un lote
+en segundo plano) los mensajes van al log y el estado es el del hilo.
+"""
+import threading
+import streamlit as st
+from capa_datos import notificaciones
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:  # Versiones de Streamlit sin este módulo
+    add_script_run_ctx = None
+    get_script_run_ctx = None
+
+_FUNCIONES = {
+    notificaciones.ERROR: st.error,
+    notificaciones.ADVERTENCIA: st.warning,
+    notificaciones.EXITO: st.success,
+    notificaciones.INFO: st.info
+}
+
+def _en_sesion():
+    return get_script_run_ctx is None or get_script_run_ctx() is not None
+
+class NotificadorStreamlit:
+    """
+    Muestra los mensajes en la página de la sesión que los produjo.
+    
+    Los de nivel DETALLE (diagnóstico) solo van al log.
+    """
+    
+    def __init__(self):
+        self._registro = notificaciones.NotificadorRegistro()
+    
+    def notificar(self, nivel, mensaje):
+        funcion = _FUNCIONES.get(nivel)
+        if funcion is None or not _en_sesion():
+            self._registro.notificar(nivel, mensaje)
+            return
+        funcion(mensaje)
+
+def _estado_streamlit():
+    return st.session_state if _en_sesion() else None
+
+def _capturar_contexto():
+    return get_script_run_ctx() if get_script_run_ctx else None
+
+def _activar_contexto(contexto):
+    add_script_run_ctx(threading.current_thread(), contexto)
+
+def instalar_notificador_streamlit():
+    """
+    Hace que capa_datos y logica_negocio informen a través de Streamlit.
+    """
+    if not isinstance(notificaciones.notificador_actual(), NotificadorStreamlit):
+        notificaciones.establecer_notificador(NotificadorStreamlit())
+    notificaciones.establecer_estado_sesion(_estado_streamlit)
+    if get_script_run_ctx is not None:
+        # Los hilos de los lotes concurrentes muestran sus mensajes en la sesión que los lanzó
+        notificaciones.establecer_contexto_hilos(_capturar_contexto, _activar_contexto)
@@ -2,7 +2,6 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, date
 import psycopg2
-from psycopg2.extras import RealDictCursor
 import sys
 import os
 
@@ -10,10 +9,20 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from capa_datos.database_connection import get_db_connection
+from capa_datos.unidad_trabajo import lectura
+from capa_datos.reintentos import ejecutar_con_reintentos
+from capa_datos.filas import CursorFilas
+from logica_negocio.pagos_logic import pagos_logic
+from logica_negocio.analitica_pagos_logic import analitica_pagos_logic
+from utils.pestanas_diferidas import PestanasDiferidas
+from utils.esquemas_df import dataframe_entidad, formatear
+
+METODOS_PAGO = ["Efectivo", "Tarjeta de Crédito", "Tarjeta de Débito", "Transferencia Bancaria", "Pago Móvil"]
 
 class PagosView:
     def __init__(self):
         self.db_connection = get_db_connection()
+        self.pestanas = PestanasDiferidas("pagos")
     
     def show(self):
         """Mostrar la vista principal de gestión de pagos"""
@@ -29,25 +38,13 @@ class PagosView:
         role_display = "👑 Administrador" if st.session_state.user_role == 'admin_reservas' else "👨‍💼 Operador"
         st.markdown(f'<div class="role-badge">{role_display}</div>', unsafe_allow_html=True)
         
-        # Pestañas para diferentes funcionalidades
-        tab1, tab2, tab3, tab4 = st.tabs([
-            "💳 Registrar Pago", 
-            "📋 Reservas Pendientes", 
-            "📊 Historial de Pagos",
-            "📈 Resumen de Pagos"
-        ])
-        
-        with tab1:
-            self.show_registrar_pago()
-        
-        with tab2:
-            self.show_reservas_pendientes()
-        
-        with tab3:
-            self.show_historial_pagos()
-        
-        with tab4:
-            self.show_resumen_pagos()
+        # Pestañas para diferentes funcionalidades (solo se ejecuta la activa)
+        self.pestanas.agregar("💳 Registrar Pago", self.show_registrar_pago)
+        self.pestanas.agregar("🧾 Registro en Lote", self.show_registrar_pagos_lote)
+        self.pestanas.agregar("📋 Reservas Pendientes", self.show_reservas_pendientes)
+        self.pestanas.agregar("📊 Historial de Pagos", self.show_historial_pagos)
+        self.pestanas.agregar("📈 Resumen de Pagos", self.show_resumen_pagos)
+        self.pestanas.mostrar()
     
     def show_registrar_pago(self):
         """Mostrar formulario para registrar un nuevo pago"""
@@ -113,7 +110,7 @@ class PagosView:
             
             metodo_pago = st.selectbox(
                 "Método de pago:",
-                ["Efectivo", "Tarjeta de Crédito", "Tarjeta de Débito", "Transferencia Bancaria", "Pago Móvil"],
+                METODOS_PAGO,
                 help="Selecciona el método de pago utilizado"
             )
             
@@ -129,6 +126,87 @@ class PagosView:
             if submitted and reserva_info:
                 self.registrar_pago(reserva_id, monto, metodo_pago, observaciones)
     
+    def show_registrar_pagos_lote(self):
+        """Mostrar grilla para registrar varios pagos en una sola operación"""
+        st.markdown("### 🧾 Registro de Pagos en Lote")
+        st.info("Marca las reservas a cobrar, ajusta monto y método, y registra todos los pagos en una sola transacción.")
+        
+        reservas_pendientes = self.get_reservas_pendientes_pago()
+        
+        if not reservas_pendientes:
+            st.warning("No hay reservas pendientes de pago.")
+            return
+        
+        df = pd.DataFrame([
+            {
+                'Incluir': False,
+                'ID Reserva': reserva['reserva_id'],
+                'Cliente': f"{reserva['nombre_cliente']} {reserva['apellido_cliente']}",
+                'Cancha': reserva['nombre_cancha'],
+                'Fecha': str(reserva['fecha_reserva']),
+                'Saldo': float(reserva['saldo_pendiente']),
+                'Monto': float(reserva['saldo_pendiente']),
+                'Método': METODOS_PAGO[0],
+                'Observaciones': ''
+            }
+            for reserva in reservas_pendientes
+        ])
+        
+        df_editado = st.data_editor(
+            df,
+            key="editor_pagos_lote",
+            hide_index=True,
+            use_container_width=True,
+            disabled=['ID Reserva', 'Cliente', 'Cancha', 'Fecha', 'Saldo'],
+            column_config={
+                'Incluir': st.column_config.CheckboxColumn("Incluir"),
+                'Saldo': st.column_config.NumberColumn("Saldo", format="$%.2f"),
+                'Monto': st.column_config.NumberColumn("Monto", min_value=0.01, step=0.01, format="$%.2f"),
+                'Método': st.column_config.SelectboxColumn("Método", options=METODOS_PAGO, required=True),
+                'Observaciones': st.column_config.TextColumn("Observaciones")
+            }
+        )
+        
+        seleccionados = df_editado[df_editado['Incluir']]
+        st.write(f"**Pagos seleccionados:** {len(seleccionados)} - **Total:** ${seleccionados['Monto'].sum():.2f}")
+        
+        if st.button("💳 Registrar Pagos Seleccionados", type="primary", disabled=seleccionados.empty):
+            pagos = [
+                {
+                    'reserva_id': fila['ID Reserva'],
+                    'monto': fila['Monto'],
+                    'metodo_pago': fila['Método'],
+                    'observaciones': fila['Observaciones']
+                }
+                for _, fila in seleccionados.iterrows()
+            ]
+            
+            resultados = pagos_logic.registrar_pagos_lote(pagos)
+            exitosos = sum(1 for resultado in resultados if resultado['exito'])
+            
+            if exitosos == len(resultados):
+                st.success(f"✅ {exitosos} pagos registrados exitosamente!")
+            elif exitosos:
+                st.warning(f"⚠️ {exitosos} de {len(resultados)} pagos registrados. Revisa las filas con error.")
+            else:
+                st.error("❌ No se registró ningún pago. Revisa las filas con error.")
+            
+            df_resultados = pd.DataFrame(resultados)
+            if not df_resultados.empty:
+                df_resultados['exito'] = df_resultados['exito'].map({True: '✅', False: '❌'})
+                st.dataframe(
+                    df_resultados.rename(columns={
+                        'fila': 'Fila',
+                        'reserva_id': 'ID Reserva',
+                        'monto': 'Monto',
+                        'pago_id': 'ID Pago',
+                        'exito': 'Resultado',
+                        'error': 'Error'
+                    }),
+                    use_container_width=True,
+                    hide_index=True
+                )
+    
     def show_reservas_pendientes(self):
         """Mostrar lista de reservas pendientes de pago"""
         st.markdown("### 📋 Reservas Pendientes de Pago")
@@ -140,17 +218,11 @@ class PagosView:
             return
         
         # Convertir a DataFrame para mejor visualización
-        df = pd.DataFrame(reservas_pendientes)
-        
-        # Formatear columnas
-        df['fecha_reserva'] = pd.to_datetime(df['fecha_reserva']).dt.strftime('%Y-%m-%d')
-        df['precio_total_calculado'] = df['precio_total_calculado'].apply(lambda x: f"${x:.2f}")
-        df['total_pagado'] = df['total_pagado'].apply(lambda x: f"${x:.2f}")
-        df['saldo_pendiente'] = df['saldo_pendiente'].apply(lambda x: f"${x:.2f}")
+        df = dataframe_entidad(reservas_pendientes, 'pago')
         
         # Mostrar tabla
         st.dataframe(
-            df[[
+            formatear(df, 'pago')[[
                 'reserva_id', 'nombre_cliente', 'apellido_cliente', 'nombre_cancha',
                 'fecha_reserva', 'hora_inicio', 'hora_fin', 'precio_total_calculado',
                 'total_pagado', 'saldo_pendiente', 'estado_pago'
@@ -218,16 +290,11 @@ class PagosView:
             return
         
         # Convertir a DataFrame
-        df = pd.DataFrame(historial)
-        
-        # Formatear columnas
-        df['fecha_pago'] = pd.to_datetime(df['fecha_pago']).dt.strftime('%Y-%m-%d %H:%M')
-        df['monto'] = df['monto'].apply(lambda x: f"${x:.2f}")
-        df['precio_total_reserva'] = df['precio_total_reserva'].apply(lambda x: f"${x:.2f}")
+        df = dataframe_entidad(historial, 'pago')
         
         # Mostrar tabla
         st.dataframe(
-            df[[
+            formatear(df, 'pago')[[
                 'pago_id', 'fecha_pago', 'nombre_cliente', 'apellido_cliente',
                 'nombre_cancha', 'monto', 'metodo_pago', 'estado_pago'
             ]].rename(columns={
@@ -268,16 +335,11 @@ class PagosView:
             return
         
         # Convertir a DataFrame
-        df = pd.DataFrame(resumen)
-        
-        # Formatear columnas
-        df['mes'] = pd.to_datetime(df['mes']).dt.strftime('%B %Y')
-        df['total_recaudado'] = df['total_recaudado'].apply(lambda x: f"${x:.2f}")
-        df['promedio_pago'] = df['promedio_pago'].apply(lambda x: f"${x:.2f}")
+        df = dataframe_entidad(resumen, 'pago')
         
         # Mostrar tabla
         st.dataframe(
-            df[[
+            formatear(df, 'pago')[[
                 'mes', 'total_pagos', 'total_recaudado', 'promedio_pago',
                 'clientes_unicos', 'canchas_utilizadas', 'pagos_completados'
             ]].rename(columns={
@@ -298,10 +360,8 @@ class PagosView:
         
         with col1:
             st.markdown("#### 📊 Pagos por Mes")
-            # Gráfico de barras para total de pagos por mes
-            chart_data = df.copy()
-            chart_data['mes'] = pd.to_datetime(chart_data['mes'], format='%B %Y')
-            chart_data = chart_data.sort_values('mes')
+            # Gráfico de barras para total de pagos por mes (columnas sin formatear)
+            chart_data = df.sort_values('mes')
             
             st.bar_chart(
                 chart_data.set_index('mes')['total_pagos'],
@@ -311,17 +371,21 @@ class PagosView:
         with col2:
             st.markdown("#### 💰 Recaudación por Mes")
             # Gráfico de líneas para recaudación
-            chart_data['total_recaudado_numeric'] = chart_data['total_recaudado'].str.replace('$', '').astype(float)
-            
             st.line_chart(
-                chart_data.set_index('mes')['total_recaudado_numeric'],
+                chart_data.set_index('mes')['total_recaudado'],
                 use_container_width=True
             )
     
     def get_reservas_pendientes_pago(self):
-        """Obtener reservas pendientes de pago"""
+        """Obtener reservas pendientes de pago (una sola consulta por rerun)"""
+        return self.pestanas.resultado('reservas_pendientes', self._consultar_reservas_pendientes_pago)
+    
+    def _consultar_reservas_pendientes_pago(self):
+        """Consultar las reservas pendientes de pago"""
         try:
-            with self.db_connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            # En autocommit: la conexión de la vista no queda "idle in transaction"
+            # y si la vista falla, la consulta de respaldo no encuentra la transacción abortada
+            with lectura(self.db_connection), self.db_connection.cursor(cursor_factory=CursorFilas) as cursor:
                 # Intentar usar la vista primero
                 try:
                     cursor.execute("""
@@ -334,7 +398,7 @@ class PagosView:
                 except Exception as vista_error:
                     st.warning(f"⚠️ No se pudo usar la vista optimizada: {vista_error}")
                 
-                # Fallback: consulta directa
+                # Fallback: consulta directa sobre el saldo mantenido en saldos_reserva
                 cursor.execute("""
                     SELECT 
                         r.id as reserva_id,
@@ -353,25 +417,21 @@ class PagosView:
                         ca.nombre as nombre_cancha,
                         ca.tipo_deporte,
                         ca.precio_hora,
-                        (r.duracion * ca.precio_hora) as precio_total_calculado,
-                        COALESCE(SUM(p.monto), 0) as total_pagado,
-                        ((r.duracion * ca.precio_hora) - COALESCE(SUM(p.monto), 0)) as saldo_pendiente,
+                        s.total_precio as precio_total_calculado,
+                        s.total_pagado,
+                        s.saldo as saldo_pendiente,
                         CASE 
-                            WHEN COALESCE(SUM(p.monto), 0) >= (r.duracion * ca.precio_hora) THEN 'Pagado'
-                            WHEN COALESCE(SUM(p.monto), 0) > 0 THEN 'Pago Parcial'
+                            WHEN s.total_pagado > 0 THEN 'Pago Parcial'
                             ELSE 'Sin Pago'
                         END as estado_pago,
                         r.fecha_creacion,
                         r.fecha_actualizacion
-                    FROM reservas r
+                    FROM saldos_reserva s
+                    JOIN reservas r ON s.reserva_id = r.id
                     JOIN clientes c ON r.cliente_id = c.id
                     JOIN canchas ca ON r.cancha_id = ca.id
-                    LEFT JOIN pagos p ON r.id = p.reserva_id AND p.estado = 'Completado'
-                    WHERE r.estado IN ('confirmada', 'pendiente', 'Confirmada', 'Pendiente')
-                    GROUP BY r.id, r.fecha_reserva, r.hora_inicio, r.hora_fin, r.duracion, r.estado, r.observaciones,
-                             c.id, c.nombre, c.apellido, c.email, c.telefono,
-                             ca.id, ca.nombre, ca.tipo_deporte, ca.precio_hora, r.fecha_creacion, r.fecha_actualizacion
-                    HAVING COALESCE(SUM(p.monto), 0) < (r.duracion * ca.precio_hora)
+                    WHERE s.saldo > 0
+                    AND r.estado IN ('confirmada', 'pendiente', 'Confirmada', 'Pendiente')
                     ORDER BY r.fecha_reserva DESC, r.hora_inicio
                 """)
                 return cursor.fetchall()
@@ -382,7 +442,7 @@ class PagosView:
     def get_historial_pagos(self, fecha_inicio, fecha_fin, metodo_filtro):
         """Obtener historial de pagos con filtros"""
         try:
-            with self.db_connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with lectura(self.db_connection), self.db_connection.cursor(cursor_factory=CursorFilas) as cursor:
                 query = """
                     SELECT * FROM vista_historial_pagos
                     WHERE fecha_pago::date BETWEEN %s AND %s
@@ -402,42 +462,37 @@ class PagosView:
             return []
     
     def get_resumen_pagos_periodo(self):
-        """Obtener resumen de pagos por período"""
-        try:
-            with self.db_connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute("""
-                    SELECT * FROM vista_resumen_pagos_periodo
-                    ORDER BY mes DESC
-                    LIMIT 12
-                """)
-                return cursor.fetchall()
-        except Exception as e:
-            st.error(f"Error al obtener resumen de pagos: {str(e)}")
-            return []
+        """Obtener resumen de pagos por período desde la analítica compartida de pagos"""
+        return analitica_pagos_logic.resumen_por_mes(12)
     
     def registrar_pago(self, reserva_id, monto, metodo_pago, observaciones):
         """Registrar un nuevo pago usando el procedimiento almacenado"""
-        try:
-            with self.db_connection.cursor() as cursor:
+        def registrar(conn):
+            with conn.cursor() as cursor:
                 # Llamar al procedimiento almacenado usando CALL
                 cursor.execute("""
                     CALL proc_registrar_pago(%s, %s, %s, %s)
                 """, (reserva_id, monto, metodo_pago, observaciones))
-                
-                self.db_connection.commit()
-                
-                st.success(f"✅ Pago registrado exitosamente!")
-                st.info(f"**Detalles del pago:**")
-                st.info(f"- Reserva ID: {reserva_id}")
-                st.info(f"- Monto: ${monto:.2f}")
-                st.info(f"- Método: {metodo_pago}")
-                if observaciones:
-                    st.info(f"- Observaciones: {observaciones}")
-                
-                # Recargar la página para actualizar los datos
-                st.rerun()
-                
+        
+        try:
+            # SERIALIZABLE con reintentos ante conflictos con otros pagos de la
+            # misma reserva; cada intento usa una conexión nueva del primario
+            ejecutar_con_reintentos(registrar, serializable=True)
         except Exception as e:
-            self.db_connection.rollback()
+            # Cada intento terminó en rollback
             st.error(f"❌ Error al registrar el pago: {str(e)}")
-            st.error("El pago no se pudo registrar. Verifica los datos e intenta nuevamente.") 
\ No newline at end of file
+            st.error("El pago no se pudo registrar. Verifica los datos e intenta nuevamente.")
+            return
+        
+        analitica_pagos_logic.invalidar()
+        
+        st.success(f"✅ Pago registrado exitosamente!")
+        st.info(f"**Detalles del pago:**")
+        st.info(f"- Reserva ID: {reserva_id}")
+        st.info(f"- Monto: ${monto:.2f}")
+        st.info(f"- Método: {metodo_pago}")
+        if observaciones:
+            st.info(f"- Observaciones: {observaciones}")
+        
+        # Recargar la página para actualizar los datos (fuera del try: st.rerun() lanza una excepción)
+        st.rerun()
@@ -2,6 +2,24 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, date, timedelta
 from logica_negocio.reports_logic import reports_logic
+from logica_negocio.analitica_pagos_logic import analitica_pagos_logic
+from logica_negocio.lote_reportes import manifiesto_vigente, cargar_reporte
+from utils.esquemas_df import dataframe_entidad, formatear
+
+# Columnas de los rankings de canchas -> encabezado
+ENCABEZADOS_RANKING = {
+    'posicion': 'Posición',
+    'nombre': 'Cancha',
+    'tipo_deporte': 'Deporte',
+    'precio_hora': 'Precio/Hora',
+    'total_reservas': 'Reservas',
+    'ingresos_totales': 'Ingresos',
+    'promedio_por_reserva': 'Promedio',
+    'ingreso_promedio_por_reserva': 'Ingreso/Reserva'
+}
+
+# EXTRACT(DOW ...) -> nombre del día
+DIAS_SEMANA = ['Domingo', 'Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado']
 
 class ReportesGeneralesView:
     """
@@ -78,14 +96,22 @@ class ReportesGeneralesView:
             limit_registros (int): Número de registros a mostrar
         """
         with st.spinner("🔄 Generando reportes..."):
-            # Obtener datos
-            canchas_mas_usadas = self.reports_logic.obtener_canchas_mas_usadas(
-                fecha_inicio, fecha_fin, limit_registros
-            )
+            # Paquete precalculado por herramientas/lote_reportes.py, si hay uno vigente
+            lote = manifiesto_vigente(fecha_inicio, fecha_fin)
+            canchas_mas_usadas = canchas_mas_recaudan = None
+            if lote is not None:
+                canchas_mas_usadas = cargar_reporte('canchas_mas_usadas', fecha_inicio, fecha_fin,
+                                                    limit_registros, manifiesto=lote)
+                canchas_mas_recaudan = cargar_reporte('canchas_mas_recaudan', fecha_inicio, fecha_fin,
+                                                      limit_registros, manifiesto=lote)
             
-            canchas_mas_recaudan = self.reports_logic.obtener_canchas_mas_recaudan(
-                fecha_inicio, fecha_fin, limit_registros
-            )
+            if canchas_mas_usadas is None or canchas_mas_recaudan is None:
+                # Obtener datos (ambas consultas se ejecutan en paralelo)
+                canchas_mas_usadas, canchas_mas_recaudan = self.reports_logic.obtener_reporte_canchas(
+                    fecha_inicio, fecha_fin, limit_registros
+                )
+            else:
+                st.caption(f"⚡ Datos precalculados el {lote['generado'].strftime('%d/%m/%Y %H:%M')}")
             
             # Mostrar resumen
             self.mostrar_resumen(fecha_inicio, fecha_fin, canchas_mas_usadas, canchas_mas_recaudan)
@@ -101,6 +127,9 @@ class ReportesGeneralesView:
             
             # Mostrar gráficos
             self.mostrar_graficos(canchas_mas_usadas, canchas_mas_recaudan)
+            
+            # Resto del paquete de reportes del período
+            self.mostrar_reportes_detallados(lote, fecha_inicio, fecha_fin, limit_registros)
     
     def mostrar_resumen(self, fecha_inicio, fecha_fin, canchas_mas_usadas, canchas_mas_recaudan):
         """
@@ -148,6 +177,26 @@ class ReportesGeneralesView:
         st.markdown(f"**Período analizado:** {fecha_inicio.strftime('%d/%m/%Y')} - {fecha_fin.strftime('%d/%m/%Y')}")
         st.markdown("---")
     
+    def _tabla_ranking(self, canchas, columnas):
+        """
+        Arma la tabla de un ranking de canchas con los tipos del esquema de canchas.
+        
+        Args:
+            canchas (list): Canchas en el orden del ranking
+            columnas (list): Columnas a mostrar (ver ENCABEZADOS_RANKING)
+        
+        Returns:
+            pd.DataFrame: Tabla tipada con la columna posicion al inicio
+        """
+        df = dataframe_entidad(canchas, 'cancha')
+        if 'ingreso_promedio_por_reserva' in columnas:
+            # No todas las consultas de ranking traen esta columna
+            if 'ingreso_promedio_por_reserva' not in df.columns:
+                df['ingreso_promedio_por_reserva'] = 0.0
+            df['ingreso_promedio_por_reserva'] = df['ingreso_promedio_por_reserva'].fillna(0)
+        df.insert(0, 'posicion', range(1, len(df) + 1))
+        return df[['posicion'] + columnas]
+    
     def mostrar_tabla_canchas_mas_usadas(self, canchas_mas_usadas):
         """
         Muestra la tabla de canchas más utilizadas.
@@ -158,21 +207,11 @@ class ReportesGeneralesView:
             st.info("📭 No hay datos de canchas utilizadas en el período seleccionado.")
             return
         
-        # Preparar datos para la tabla
-        datos_tabla = []
-        for i, cancha in enumerate(canchas_mas_usadas, 1):
-            datos_tabla.append({
-                "Posición": i,
-                "Cancha": cancha['nombre'],
-                "Deporte": cancha['tipo_deporte'],
-                "Precio/Hora": f"${cancha['precio_hora']:,.2f}",
-                "Reservas": cancha['total_reservas'],
-                "Ingresos": f"${cancha['ingresos_totales']:,.2f}",
-                "Promedio": f"${cancha['promedio_por_reserva']:,.2f}"
-            })
-        
-        # Crear DataFrame
-        df = pd.DataFrame(datos_tabla)
+        # Crear DataFrame (los montos se formatean solo en la página que se muestra)
+        df = self._tabla_ranking(canchas_mas_usadas, [
+            'nombre', 'tipo_deporte', 'precio_hora', 'total_reservas',
+            'ingresos_totales', 'promedio_por_reserva'
+        ])
         
         # Implementar paginación
         total_registros = len(df)
@@ -201,7 +240,7 @@ class ReportesGeneralesView:
         fin = min(inicio + registros_por_pagina, total_registros)
         
         # Mostrar registros de la página actual
-        df_pagina = df.iloc[inicio:fin]
+        df_pagina = formatear(df.iloc[inicio:fin], 'cancha').rename(columns=ENCABEZADOS_RANKING)
         
         # Mostrar tabla con estilo
         st.dataframe(
@@ -260,22 +299,11 @@ class ReportesGeneralesView:
             st.info("📭 No hay datos de ingresos en el período seleccionado.")
             return
         
-        # Preparar datos para la tabla
-        datos_tabla = []
-        for i, cancha in enumerate(canchas_mas_recaudan, 1):
-            datos_tabla.append({
-                "Posición": i,
-                "Cancha": cancha['nombre'],
-                "Deporte": cancha['tipo_deporte'],
-                "Precio/Hora": f"${cancha['precio_hora']:,.2f}",
-                "Reservas": cancha['total_reservas'],
-                "Ingresos": f"${cancha['ingresos_totales']:,.2f}",
-                "Promedio": f"${cancha['promedio_por_reserva']:,.2f}",
-                "Ingreso/Reserva": f"${cancha.get('ingreso_promedio_por_reserva', 0):,.2f}"
-            })
-        
-        # Crear DataFrame
-        df = pd.DataFrame(datos_tabla)
+        # Crear DataFrame (los montos se formatean solo en la página que se muestra)
+        df = self._tabla_ranking(canchas_mas_recaudan, [
+            'nombre', 'tipo_deporte', 'precio_hora', 'total_reservas',
+            'ingresos_totales', 'promedio_por_reserva', 'ingreso_promedio_por_reserva'
+        ])
         
         # Implementar paginación
         total_registros = len(df)
@@ -304,7 +332,7 @@ class ReportesGeneralesView:
         fin = min(inicio + registros_por_pagina, total_registros)
         
         # Mostrar registros de la página actual
-        df_pagina = df.iloc[inicio:fin]
+        df_pagina = formatear(df.iloc[inicio:fin], 'cancha').rename(columns=ENCABEZADOS_RANKING)
         
         # Mostrar tabla con estilo
         st.dataframe(
@@ -379,6 +407,148 @@ class ReportesGeneralesView:
         })
         st.bar_chart(chart_data.set_index("Cancha"))
     
+    def _reporte(self, lote, nombre, fecha_inicio, fecha_fin, limite, consultar):
+        """
+        Lee un reporte del paquete vigente o, si no está en él, lo consulta.
+        
+        Args:
+            lote (dict): Manifiesto vigente del período (o None)
+            nombre (str): Nombre del reporte en logica_negocio/lote_reportes.py
+            fecha_inicio (date): Fecha de inicio
+            fecha_fin (date): Fecha de fin
+            limite (int): Filas de los rankings (None para los demás reportes)
+            consultar (callable): Consulta en vivo si el paquete no lo tiene
+        
+        Returns:
+            list: Filas del reporte
+        """
+        if lote is not None:
+            filas = cargar_reporte(nombre, fecha_inicio, fecha_fin, limite, manifiesto=lote)
+            if filas is not None:
+                return filas
+        return consultar() or []
+    
+    def mostrar_reportes_detallados(self, lote, fecha_inicio, fecha_fin, limit_registros):
+        """
+        Muestra las estadísticas por período, horario y día, los rankings de
+        clientes y canchas y los resúmenes de pagos.
+        """
+        st.markdown("---")
+        st.markdown("### 🗂️ Reportes Detallados")
+        
+        reportes = self.reports_logic
+        tab_periodos, tab_horarios, tab_rankings, tab_pagos = st.tabs([
+            "📅 Mensual y Semanal", "🕐 Horarios y Días", "🏅 Clientes y Canchas", "💳 Pagos"
+        ])
+        
+        with tab_periodos:
+            mensual = self._reporte(lote, 'mensual', fecha_inicio, fecha_fin, None,
+                                    lambda: reportes.obtener_estadisticas_mensuales(fecha_fin.year))
+            st.markdown(f"#### 📅 Estadísticas Mensuales {fecha_fin.year}")
+            self._tabla_estadisticas(mensual, {
+                'mes': 'Mes', 'total_reservas': 'Reservas', 'ingresos_totales': 'Ingresos',
+                'clientes_unicos': 'Clientes Únicos', 'canchas_utilizadas': 'Canchas'
+            })
+            
+            semanal = self._reporte(lote, 'semanal', fecha_inicio, fecha_fin, None,
+                                    lambda: reportes.obtener_estadisticas_semanales(fecha_inicio, fecha_fin))
+            st.markdown("#### 🗓️ Estadísticas Semanales")
+            self._tabla_estadisticas(semanal, {
+                'semana_inicio': 'Semana', 'total_reservas': 'Reservas', 'ingresos_totales': 'Ingresos',
+                'clientes_unicos': 'Clientes Únicos', 'canchas_utilizadas': 'Canchas'
+            })
+        
+        with tab_horarios:
+            horarios = self._reporte(lote, 'horarios', fecha_inicio, fecha_fin, None,
+                                     lambda: reportes.obtener_estadisticas_horarios(fecha_inicio, fecha_fin))
+            st.markdown("#### 🕐 Reservas por Horario")
+            if horarios:
+                st.bar_chart(pd.DataFrame({
+                    "Hora": [f"{int(h['hora']):02d}:00" for h in horarios],
+                    "Reservas": [h['total_reservas'] for h in horarios]
+                }).set_index("Hora"))
+            self._tabla_estadisticas(horarios, {
+                'hora': 'Hora', 'total_reservas': 'Reservas', 'ingresos_totales': 'Ingresos',
+                'promedio_por_reserva': 'Promedio'
+            })
+            
+            dias = self._reporte(lote, 'dias_semana', fecha_inicio, fecha_fin, None,
+                                 lambda: reportes.obtener_estadisticas_dias_semana(fecha_inicio, fecha_fin))
+            st.markdown("#### 📆 Reservas por Día de la Semana")
+            dias = [dict(d, dia_semana=DIAS_SEMANA[int(d['dia_semana'])]) for d in dias]
+            self._tabla_estadisticas(dias, {
+                'dia_semana': 'Día', 'total_reservas': 'Reservas', 'ingresos_totales': 'Ingresos',
+                'promedio_por_reserva': 'Promedio'
+            })
+        
+        with tab_rankings:
+            top_clientes = self._reporte(lote, 'top_clientes', fecha_inicio, fecha_fin, limit_registros,
+                                         lambda: reportes.obtener_top_clientes(fecha_inicio, fecha_fin, limit_registros))
+            st.markdown("#### 👥 Clientes con Más Reservas")
+            self._tabla_estadisticas(top_clientes, {
+                'nombre': 'Nombre', 'apellido': 'Apellido', 'email': 'Email', 'total_reservas': 'Reservas',
+                'total_gastado': 'Total Gastado', 'promedio_por_reserva': 'Promedio'
+            })
+            
+            top_canchas = self._reporte(lote, 'top_canchas', fecha_inicio, fecha_fin, limit_registros,
+                                        lambda: reportes.obtener_top_canchas(fecha_inicio, fecha_fin, limit_registros))
+            st.markdown("#### 🏟️ Canchas con Más Reservas")
+            self._tabla_estadisticas(top_canchas, {
+                'nombre': 'Cancha', 'tipo_cancha': 'Tipo', 'total_reservas': 'Reservas',
+                'ingresos_totales': 'Ingresos', 'promedio_por_reserva': 'Promedio'
+            })
+            
+            estadisticas_canchas = self._reporte(
+                lote, 'estadisticas_canchas', fecha_inicio, fecha_fin, None,
+                lambda: reportes.obtener_vista_estadisticas_canchas(fecha_inicio, fecha_fin)
+            )
+            st.markdown("#### 📋 Estadísticas por Cancha")
+            self._tabla_estadisticas(estadisticas_canchas, None)
+        
+        with tab_pagos:
+            pagos = self._reporte(lote, 'pagos_periodo', fecha_inicio, fecha_fin, None,
+                                  lambda: [analitica_pagos_logic.estadisticas_pagos(fecha_inicio, fecha_fin)])
+            pagos = pagos[0] if pagos and pagos[0] else {}
+            st.markdown("#### 💳 Pagos del Período")
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Total Pagos", pagos.get('total_pagos', 0))
+            col2.metric("Total Recaudado", f"${float(pagos.get('total_recaudado', 0)):,.2f}")
+            col3.metric("Completados", pagos.get('pagos_completados', 0))
+            col4.metric("Pendientes", pagos.get('pagos_pendientes', 0))
+            
+            metodos = self._reporte(lote, 'pagos_metodos', fecha_inicio, fecha_fin, None,
+                                    lambda: analitica_pagos_logic.estadisticas_metodos_pago())
+            st.markdown("#### 💵 Pagos Completados por Método (histórico)")
+            self._tabla_estadisticas(metodos, {
+                'metodo': 'Método', 'total_pagos': 'Pagos', 'total_pagado': 'Total Pagado'
+            })
+            
+            por_mes = self._reporte(lote, 'pagos_por_mes', fecha_inicio, fecha_fin, None,
+                                    lambda: analitica_pagos_logic.resumen_por_mes(12))
+            st.markdown("#### 📈 Pagos de los Últimos 12 Meses")
+            self._tabla_estadisticas(por_mes, {
+                'mes': 'Mes', 'total_pagos': 'Pagos', 'total_recaudado': 'Total Recaudado',
+                'pagos_completados': 'Completados', 'pagos_pendientes': 'Pendientes'
+            })
+    
+    def _tabla_estadisticas(self, filas, encabezados):
+        """
+        Muestra una tabla de estadísticas.
+        
+        Args:
+            filas (list): Filas del reporte
+            encabezados (dict): Columna -> encabezado, en el orden a mostrar
+                (None muestra todas las columnas)
+        """
+        if not filas:
+            st.info("📭 No hay datos en el período seleccionado.")
+            return
+        
+        df = pd.DataFrame(filas)
+        if encabezados:
+            df = df[[columna for columna in encabezados if columna in df.columns]].rename(columns=encabezados)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    
     def exportar_reporte(self, fecha_inicio, fecha_fin, canchas_mas_usadas, canchas_mas_recaudan):
         """
         Permite exportar el reporte a diferentes formatos.
@@ -427,7 +597,7 @@ class ReportesGeneralesView:
             )
             
             st.success("✅ Reporte exportado exitosamente a Excel")
-            
+        
         except Exception as e:
             st.error(f"❌ Error al exportar a Excel: {e}")
     
@@ -457,6 +627,6 @@ class ReportesGeneralesView:
             )
             
             st.success("✅ Reporte exportado exitosamente a CSV")
-            
+        
         except Exception as e:
             st.error(f"❌ Error al exportar a CSV: {e}") 
\ No newline at end of file
@@ -1,9 +1,8 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, date, time, timedelta
 from logica_negocio.reservas_logic import ReservasLogic
-from logica_negocio.clientes_logic import ClientesLogic
-from logica_negocio.canchas_logic import CanchasLogic
+from logica_negocio.indices_busqueda_logic import indices_busqueda_logic
+from utils.esquemas_df import ESQUEMAS, aplicar_esquema, dataframe_entidad, formatear
 
 class ReservasView:
     """
@@ -12,8 +11,7 @@ class ReservasView:
     
     def __init__(self):
         self.reservas_logic = ReservasLogic()
-        self.clientes_logic = ClientesLogic()
-        self.canchas_logic = CanchasLogic()
+        self.indices = indices_busqueda_logic
     
     def show(self):
         """Mostrar la vista principal de reservas"""
@@ -36,47 +34,33 @@ class ReservasView:
         st.markdown("### ➕ Crear Nueva Reserva")
         st.markdown("*Complete todos los campos para crear una nueva reserva*")
         
-        # Obtener datos para los menús desplegables
-        clientes = self.obtener_clientes_para_select()
-        canchas = self.obtener_canchas_para_select()
-        
-        if not clientes:
+        # Los selectores van fuera del formulario: dentro de st.form los
+        # widgets no se recalculan hasta enviar, y la búsqueda no filtraría
+        if self.indices.clientes.total() == 0:
             st.error("❌ No hay clientes disponibles. Debe crear al menos un cliente primero.")
             return
         
-        if not canchas:
+        if self.indices.canchas.total() == 0:
             st.error("❌ No hay canchas disponibles. Debe crear al menos una cancha primero.")
             return
         
+        # Sección 1: Información básica
+        st.markdown("**👤 Información del Cliente y Cancha**")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            cliente_id = self.selector_con_busqueda(
+                self.indices.clientes, "Cliente", "reserva_cliente",
+                "Escriba parte del nombre, apellido, email o teléfono y seleccione el cliente"
+            )
+        
+        with col2:
+            cancha_id = self.selector_con_busqueda(
+                self.indices.canchas, "Cancha", "reserva_cancha",
+                "Escriba parte del nombre, tipo o deporte y seleccione la cancha"
+            )
+        
         with st.form("form_crear_reserva"):
-            # Sección 1: Información básica
-            st.markdown("**👤 Información del Cliente y Cancha**")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Menú desplegable para clientes
-                cliente_options = {f"{cliente['nombre'] or ''} {cliente['apellido'] or ''} (ID: {cliente['id']})": cliente['id'] 
-                                 for cliente in clientes}
-                cliente_seleccionado = st.selectbox(
-                    "Cliente *",
-                    options=list(cliente_options.keys()),
-                    help="Seleccione el cliente que realizará la reserva"
-                )
-                cliente_id = cliente_options[cliente_seleccionado] if cliente_seleccionado else None
-            
-            with col2:
-                # Menú desplegable para canchas
-                cancha_options = {f"{cancha['nombre']} - {cancha['tipo_cancha_nombre'] or 'Sin tipo'} (ID: {cancha['id']})": cancha['id']
-                                for cancha in canchas}
-                cancha_seleccionada = st.selectbox(
-                    "Cancha *",
-                    options=list(cancha_options.keys()),
-                    help="Seleccione la cancha para la reserva"
-                )
-                cancha_id = cancha_options[cancha_seleccionada] if cancha_seleccionada else None
-            
-            st.markdown("---")
-            
             # Sección 2: Fecha y horario
             st.markdown("**📅 Fecha y Horario**")
             col1, col2, col3 = st.columns(3)
@@ -158,67 +142,36 @@ class ReservasView:
         
         return time(hora_fin_hora, hora_fin_minuto)
     
-    def obtener_clientes_para_select(self):
-        """Obtener lista de clientes para el menú desplegable"""
-        try:
-            clientes_tuples = self.clientes_logic.obtener_clientes_activos()
-            if not clientes_tuples:
-                return []
-            
-            # Convertir tuplas a diccionarios
-            clientes = []
-            for cliente_tuple in clientes_tuples:
-                cliente_dict = {
-                    'id': cliente_tuple[0],
-                    'nombre': cliente_tuple[1],
-                    'apellido': cliente_tuple[2],
-                    'telefono': cliente_tuple[3],
-                    'email': cliente_tuple[4],
-                    'fecha_nacimiento': cliente_tuple[5],
-                    'estado': cliente_tuple[6],
-                    'fecha_registro': cliente_tuple[7],
-                    'fecha_actualizacion': cliente_tuple[8]
-                }
-                clientes.append(cliente_dict)
-            
-            return clientes
-        except Exception as e:
-            st.error(f"Error al obtener clientes: {e}")
-            return []
-    
-    def obtener_canchas_para_select(self):
-        """Obtener lista de canchas para el menú desplegable"""
-        try:
-            canchas_tuples = self.canchas_logic.obtener_canchas_con_tipos()
-            if not canchas_tuples:
-                return []
-            
-            # Convertir tuplas a diccionarios
-            canchas = []
-            for cancha_tuple in canchas_tuples:
-                cancha_dict = {
-                    'id': cancha_tuple[0],
-                    'nombre': cancha_tuple[1],
-                    'tipo_deporte': cancha_tuple[2],
-                    'capacidad': cancha_tuple[3],
-                    'precio_hora': cancha_tuple[4],
-                    'estado': cancha_tuple[5],
-                    'horario_apertura': cancha_tuple[6],
-                    'horario_cierre': cancha_tuple[7],
-                    'descripcion': cancha_tuple[8],
-                    'fecha_creacion': cancha_tuple[9],
-                    'fecha_actualizacion': cancha_tuple[10],
-                    'tipo_cancha_id': cancha_tuple[11],
-                    'tipo_cancha_nombre': cancha_tuple[12],
-                    'tipo_cancha_descripcion': cancha_tuple[13],
-                    'precio_por_hora': cancha_tuple[14]
-                }
-                canchas.append(cancha_dict)
-            
-            return canchas
-        except Exception as e:
-            st.error(f"Error al obtener canchas: {e}")
-            return []
+    def selector_con_busqueda(self, indice, titulo, clave, ayuda):
+        """
+        Mostrar un campo de búsqueda y un selector con las primeras coincidencias.
+        
+        La búsqueda se resuelve en el índice en memoria compartido y al
+        navegador solo se envían los resultados (20 como máximo).
+        
+        Returns:
+            int: ID del registro seleccionado o None
+        """
+        termino = st.text_input(
+            f"🔍 Buscar {titulo.lower()}",
+            key=f"{clave}_busqueda",
+            placeholder="Escriba para filtrar..."
+        )
+        
+        opciones = {etiqueta: id_registro for id_registro, etiqueta in indice.buscar(termino)}
+        if not opciones:
+            st.warning(f"⚠️ Ningún registro coincide con '{termino}'")
+            return None
+        
+        seleccionado = st.selectbox(
+            f"{titulo} *",
+            options=list(opciones.keys()),
+            help=ayuda
+        )
+        if len(opciones) >= indice.max_resultados:
+            st.caption(f"Mostrando las primeras {len(opciones)} coincidencias; escriba más para acotar")
+        
+        return opciones[seleccionado] if seleccionado else None
     
     def procesar_creacion_reserva(self, cliente_id, cancha_id, fecha_reserva, 
                                 hora_inicio, hora_fin, duracion, estado, observaciones):
@@ -274,28 +227,21 @@ class ReservasView:
                 st.error("❌ No se pudo conectar a la base de datos")
                 return
             
-            # Consulta directa y simple
-            with conn.cursor() as cur:
-                cur.execute("SELECT * FROM reservas ORDER BY fecha_reserva DESC, hora_inicio DESC")
-                reservas_raw = cur.fetchall()
-                
-                # Obtener nombres de columnas
-                column_names = [desc[0] for desc in cur.description]
+            # Consulta directa al DataFrame, sin pasar por tuplas ni diccionarios
+            from capa_datos.dataframes import fetch_dataframe
+            df = fetch_dataframe(
+                conn,
+                "SELECT * FROM reservas ORDER BY fecha_reserva DESC, hora_inicio DESC",
+                tipos=ESQUEMAS['reserva']
+            )
             
             conn.close()
             
-            if reservas_raw:
-                # Convertir a lista de diccionarios
-                reservas = []
-                for row in reservas_raw:
-                    reserva_dict = dict(zip(column_names, row))
-                    reservas.append(reserva_dict)
-                
-                # Crear DataFrame para mejor visualización
-                df = pd.DataFrame(reservas)
+            if df is not None and not df.empty:
+                aplicar_esquema(df, 'reserva')
                 
                 # Renombrar columnas para mejor visualización
-                df_renamed = df.rename(columns={
+                df_renamed = formatear(df, 'reserva').rename(columns={
                     'id': 'ID',
                     'cliente_id': 'Cliente ID',
                     'cancha_id': 'Cancha ID',
@@ -308,39 +254,21 @@ class ReservasView:
                     'fecha_creacion': 'Fecha Creación'
                 })
                 
-                # Formatear columnas de fecha y hora
-                if 'Fecha' in df_renamed.columns:
-                    df_renamed['Fecha'] = pd.to_datetime(df_renamed['Fecha']).dt.strftime('%d/%m/%Y')
-                
-                if 'Hora Inicio' in df_renamed.columns:
-                    # Convertir objetos time a string directamente
-                    df_renamed['Hora Inicio'] = df_renamed['Hora Inicio'].apply(
-                        lambda x: x.strftime('%H:%M') if hasattr(x, 'strftime') else str(x)
-                    )
-                
-                if 'Hora Fin' in df_renamed.columns:
-                    # Convertir objetos time a string directamente
-                    df_renamed['Hora Fin'] = df_renamed['Hora Fin'].apply(
-                        lambda x: x.strftime('%H:%M') if hasattr(x, 'strftime') else str(x)
-                    )
-                
                 # Mostrar registros
                 st.dataframe(df_renamed, use_container_width=True)
                 
                 # Estadísticas simples
-                total_registros = len(reservas)
+                total_registros = len(df)
+                conteo_estados = df['estado'].value_counts().groupby(lambda estado: str(estado).lower()).sum()
                 col1, col2, col3, col4 = st.columns(4)
                 with col1:
                     st.metric("Total Reservas", total_registros)
                 with col2:
-                    confirmadas = len([r for r in reservas if r.get('estado', '').lower() == 'confirmada'])
-                    st.metric("Confirmadas", confirmadas)
+                    st.metric("Confirmadas", int(conteo_estados.get('confirmada', 0)))
                 with col3:
-                    pendientes = len([r for r in reservas if r.get('estado', '').lower() == 'pendiente'])
-                    st.metric("Pendientes", pendientes)
+                    st.metric("Pendientes", int(conteo_estados.get('pendiente', 0)))
                 with col4:
-                    canceladas = len([r for r in reservas if r.get('estado', '').lower() == 'cancelada'])
-                    st.metric("Canceladas", canceladas)
+                    st.metric("Canceladas", int(conteo_estados.get('cancelada', 0)))
                     
                 st.success(f"✅ Se encontraron {total_registros} reservas en la base de datos")
             else:
@@ -387,7 +315,7 @@ class ReservasView:
             reservas = self.reservas_logic.obtener_reservas_por_fecha(fecha)
             
             if reservas:
-                df = pd.DataFrame(reservas)
+                df = formatear(dataframe_entidad(reservas, 'reserva'), 'reserva')
                 st.markdown(f"**Reservas para {fecha.strftime('%d/%m/%Y')}:**")
                 st.dataframe(df, use_container_width=True)
             else:
@@ -409,10 +337,10 @@ class ReservasView:
             
             if reservas_filtradas:
                 # Crear DataFrame para mejor visualización
-                df = pd.DataFrame(reservas_filtradas)
+                df = dataframe_entidad(reservas_filtradas, 'reserva')
                 
                 # Renombrar columnas para mejor visualización
-                df_renamed = df.rename(columns={
+                df_renamed = formatear(df, 'reserva').rename(columns={
                     'id': 'ID',
                     'cliente_id': 'Cliente ID',
                     'cancha_id': 'Cancha ID',
@@ -425,20 +353,6 @@ class ReservasView:
                     'fecha_creacion': 'Fecha Creación'
                 })
                 
-                # Formatear columnas de fecha y hora
-                if 'Fecha' in df_renamed.columns:
-                    df_renamed['Fecha'] = pd.to_datetime(df_renamed['Fecha']).dt.strftime('%d/%m/%Y')
-                
-                if 'Hora Inicio' in df_renamed.columns:
-                    df_renamed['Hora Inicio'] = df_renamed['Hora Inicio'].apply(
-                        lambda x: x.strftime('%H:%M') if hasattr(x, 'strftime') else str(x)
-                    )
-                
-                if 'Hora Fin' in df_renamed.columns:
-                    df_renamed['Hora Fin'] = df_renamed['Hora Fin'].apply(
-                        lambda x: x.strftime('%H:%M') if hasattr(x, 'strftime') else str(x)
-                    )
-                
                 st.markdown(f"**Reservas con estado '{estado}':**")
                 st.dataframe(df_renamed, use_container_width=True)
                 